@@ -0,0 +1,73 @@
+"""
+Measures the time per step of a loop launching a few small kernels on CPU, with and without `async_launch`.
+
+With `async_launch`, the Python overhead of preparing the launches of a step overlaps with the execution of the
+previously launched kernels.
+
+Usage:
+    python3 async_launch.py [--steps N] [--elements N]
+"""
+
+import argparse
+from time import perf_counter
+
+import gstaichi as ti
+
+
+def measure(num_elements, num_steps, **init_kwargs):
+    ti.init(arch=ti.cpu, **init_kwargs)
+
+    x = ti.ndarray(ti.f32, (num_elements,))
+    v = ti.ndarray(ti.f32, (num_elements,))
+
+    @ti.kernel
+    def apply_forces(v: ti.types.ndarray(), dt: ti.f32):
+        for i in v:
+            v[i] += dt * (-9.8 - 0.1 * v[i])
+
+    @ti.kernel
+    def integrate(x: ti.types.ndarray(), v: ti.types.ndarray(), dt: ti.f32):
+        for i in x:
+            x[i] += dt * v[i]
+
+    @ti.kernel
+    def collide(x: ti.types.ndarray(), v: ti.types.ndarray()):
+        for i in x:
+            if x[i] < 0.0:
+                x[i] = 0.0
+                v[i] = -0.5 * v[i]
+
+    def step():
+        apply_forces(v, 1e-3)
+        integrate(x, v, 1e-3)
+        collide(x, v)
+
+    # compile & warmup
+    for _ in range(10):
+        step()
+    ti.sync()
+
+    t0 = perf_counter()
+    for _ in range(num_steps):
+        step()
+    ti.sync()
+    elapsed = perf_counter() - t0
+    ti.reset()
+    return elapsed / num_steps * 1e6  # us
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=10000)
+    parser.add_argument("--elements", type=int, nargs="+", default=[1024, 65536, 1048576])
+    args = parser.parse_args()
+
+    print(f"{'elements':>9} {'sync us/step':>13} {'async us/step':>14}")
+    for num_elements in args.elements:
+        sync_time = measure(num_elements, args.steps)
+        async_time = measure(num_elements, args.steps, async_launch=True)
+        print(f"{num_elements:>9} {sync_time:>13.2f} {async_time:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
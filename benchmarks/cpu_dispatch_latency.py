@@ -0,0 +1,66 @@
+"""
+Measures the dispatch latency of small parallel kernels on CPU, for different configurations of the CPU thread pool.
+
+The kernels only touch a few thousand elements, so that their run time is dominated by waking up the worker threads
+of the pool and waiting for them to finish, rather than by the actual work.
+
+Usage:
+    python3 cpu_dispatch_latency.py [--repeat N] [--spin-us US ...] [--affinity]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+import gstaichi as ti
+
+
+def measure(num_elements, repeat, **init_kwargs):
+    ti.init(arch=ti.cpu, **init_kwargs)
+
+    x = ti.ndarray(ti.f32, (num_elements,))
+
+    @ti.kernel
+    def axpy(x: ti.types.ndarray(), a: ti.f32):
+        for i in x:
+            x[i] = a * x[i] + 1.0
+
+    # compile & warmup
+    for _ in range(repeat):
+        axpy(x, 0.5)
+    ti.sync()
+
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        t0 = perf_counter()
+        axpy(x, 0.5)
+        timings[i] = perf_counter() - t0
+    ti.sync()
+    ti.reset()
+    return timings * 1e6  # us
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10000)
+    parser.add_argument("--spin-us", type=int, nargs="+", default=[0, 20, 100])
+    parser.add_argument("--affinity", action="store_true", help="Also measure with pinned worker threads.")
+    args = parser.parse_args()
+
+    configs = [{"cpu_thread_spin_us": spin_us} for spin_us in args.spin_us]
+    if args.affinity:
+        configs += [{**config, "cpu_thread_affinity": True} for config in configs]
+
+    print(f"{'elements':>9} {'spin_us':>8} {'affinity':>9} {'median us':>10} {'p99 us':>8}")
+    for num_elements in (1024, 16384, 65536):
+        for config in configs:
+            timings = measure(num_elements, args.repeat, **config)
+            print(
+                f"{num_elements:>9} {config['cpu_thread_spin_us']:>8} {str(config.get('cpu_thread_affinity', False)):>9} "
+                f"{np.median(timings):>10.2f} {np.percentile(timings, 99):>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares the CPU implementation of `ti.algorithms.PrefixSumExecutor` with `np.cumsum`, for different data types and
+sizes.
+
+For `np.cumsum`, the time of the `to_numpy`/`from_numpy` round trip which would be needed to scan a GsTaichi array is
+reported separately.
+
+Usage:
+    python3 prefix_sum.py [--repeat N] [--sizes N ...]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+import gstaichi as ti
+
+
+def median_time_us(fn, repeat):
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        t0 = perf_counter()
+        fn()
+        timings[i] = perf_counter() - t0
+    return np.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5, 10**6, 10**7])
+    args = parser.parse_args()
+
+    ti.init(arch=ti.cpu)
+    dtypes = {ti.i32: np.int32, ti.i64: np.int64, ti.f32: np.float32, ti.f64: np.float64}
+
+    print(f"{'dtype':>6} {'elements':>9} {'gstaichi us':>12} {'np.cumsum us':>13} {'round trip us':>14}")
+    for dtype, np_dtype in dtypes.items():
+        for size in args.sizes:
+            # Zeros, so that repeated scans do not overflow
+            values = np.zeros(size, dtype=np_dtype)
+            arr = ti.ndarray(dtype, (size,))
+            arr.from_numpy(values)
+            executor = ti.algorithms.PrefixSumExecutor(size)
+
+            def scan():
+                executor.run(arr)
+                ti.sync()
+
+            def round_trip():
+                arr.from_numpy(arr.to_numpy())
+
+            scan()  # compile & warmup
+            ti_us = median_time_us(scan, args.repeat)
+            np_us = median_time_us(lambda: np.cumsum(values, out=values), args.repeat)
+            round_trip_us = median_time_us(round_trip, args.repeat)
+            print(f"{str(dtype):>6} {size:>9} {ti_us:>12.1f} {np_us:>13.1f} {round_trip_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares `ti.algorithms.segmented_reduce` on CPU with a kernel adding each value to its segment with atomics, the
+usual way of computing a sum per cell, for different numbers of segments. Few segments mean a lot of contention on the
+atomics.
+
+Usage:
+    python3 segmented_reduce.py [--repeat N] [--size N] [--segments N ...]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+import gstaichi as ti
+
+
+def median_time_ms(fn, repeat):
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        ti.sync()
+        t0 = perf_counter()
+        fn()
+        ti.sync()
+        timings[i] = perf_counter() - t0
+    return np.median(timings) * 1e3
+
+
+@ti.kernel
+def atomic_reduce(values: ti.types.ndarray(), keys: ti.types.ndarray(), out: ti.types.ndarray()):
+    for s in out:
+        out[s] = 0.0
+    for i in values:
+        out[keys[i]] += values[i]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--size", type=int, default=10**7)
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 100, 10**4, 10**6])
+    args = parser.parse_args()
+
+    ti.init(arch=ti.cpu)
+    rng = np.random.default_rng(0)
+    N = args.size
+    values = ti.ndarray(ti.f32, N)
+    values.from_numpy(rng.standard_normal(N).astype(np.float32))
+
+    print(f"{'segments':>9} {'offsets ms':>11} {'keys ms':>8} {'atomics ms':>11}")
+    for num_segments in args.segments:
+        # Sorted keys, as after sorting particles by cell
+        keys_np = np.sort(rng.integers(0, num_segments, N)).astype(np.int32)
+        offsets_np = np.searchsorted(keys_np, np.arange(num_segments + 1)).astype(np.int32)
+        keys = ti.ndarray(ti.i32, N)
+        keys.from_numpy(keys_np)
+        offsets = ti.ndarray(ti.i32, num_segments + 1)
+        offsets.from_numpy(offsets_np)
+        out = ti.ndarray(ti.f32, num_segments)
+        out_by_key = ti.ndarray(ti.f32, N)
+
+        def with_offsets():
+            ti.algorithms.segmented_reduce(values, out, offsets=offsets)
+
+        def with_keys():
+            ti.algorithms.segmented_reduce(values, out_by_key, keys=keys)
+
+        def with_atomics():
+            atomic_reduce(values, keys, out)
+
+        timings = []
+        for fn in (with_offsets, with_keys, with_atomics):
+            fn()  # compile & warmup
+            timings.append(median_time_ms(fn, args.repeat))
+        print(f"{num_segments:>9} {timings[0]:>11.2f} {timings[1]:>8.2f} {timings[2]:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
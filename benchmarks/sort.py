@@ -0,0 +1,79 @@
+"""
+Compares the radix sort of `ti.algorithms.parallel_sort` on CPU with the odd-even merge sort it replaces and with
+`np.argsort`, for different key types and sizes, sorting keys only or keys along with values.
+
+The odd-even merge sort is skipped for more than `--max-merge-sort` elements, since it is orders of magnitude slower.
+
+Usage:
+    python3 sort.py [--repeat N] [--sizes N ...] [--max-merge-sort N]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+import gstaichi as ti
+from gstaichi.algorithms._algorithms import _odd_even_merge_sort
+
+
+def median_time_ms(fn, reset, repeat):
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        reset()
+        ti.sync()
+        t0 = perf_counter()
+        fn()
+        ti.sync()
+        timings[i] = perf_counter() - t0
+    return np.median(timings) * 1e3
+
+
+def random_keys(np_dtype, size, rng):
+    if np.issubdtype(np_dtype, np.floating):
+        return rng.standard_normal(size).astype(np_dtype)
+    info = np.iinfo(np_dtype)
+    return rng.integers(info.min, info.max, size, dtype=np_dtype, endpoint=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5, 10**6, 10**7])
+    parser.add_argument("--max-merge-sort", type=int, default=10**6)
+    args = parser.parse_args()
+
+    ti.init(arch=ti.cpu)
+    dtypes = {ti.i32: np.int32, ti.i64: np.int64, ti.f32: np.float32, ti.f64: np.float64}
+    rng = np.random.default_rng(0)
+
+    print(f"{'dtype':>6} {'elements':>9} {'values':>7} {'radix ms':>9} {'merge ms':>9} {'np.argsort ms':>14}")
+    for dtype, np_dtype in dtypes.items():
+        for size in args.sizes:
+            keys_np = random_keys(np_dtype, size, rng)
+            keys = ti.field(dtype, size)
+            values = ti.field(ti.i32, size)
+            values_np = np.arange(size, dtype=np.int32)
+
+            def reset():
+                keys.from_numpy(keys_np)
+                values.from_numpy(values_np)
+
+            for with_values in (False, True):
+                sorted_values = values if with_values else None
+                reset()
+                ti.algorithms.radix_sort(keys, sorted_values)  # compile & warmup
+                radix_ms = median_time_ms(lambda: ti.algorithms.radix_sort(keys, sorted_values), reset, args.repeat)
+                merge_ms = float("nan")
+                if size <= args.max_merge_sort:
+                    reset()
+                    _odd_even_merge_sort(keys, sorted_values)  # compile & warmup
+                    merge_ms = median_time_ms(lambda: _odd_even_merge_sort(keys, sorted_values), reset, args.repeat)
+                np_ms = median_time_ms(lambda: np.argsort(keys_np, kind="stable"), lambda: None, args.repeat)
+                print(
+                    f"{str(dtype):>6} {size:>9} {str(with_values):>7} {radix_ms:>9.2f} {merge_ms:>9.2f} {np_ms:>14.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
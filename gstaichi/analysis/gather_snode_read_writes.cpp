@@ -27,6 +27,10 @@ gather_snode_read_writes(IRNode *root) {
       ptr = global_atomic->dest;
     }
     if (ptr) {
+      // Accesses to the elements of a matrix field
+      while (auto *matrix_ptr = ptr->cast<MatrixPtrStmt>()) {
+        ptr = matrix_ptr->origin;
+      }
       if (auto *global_ptr = ptr->cast<GlobalPtrStmt>()) {
         if (read)
           accessed.first.emplace(global_ptr->snode);
@@ -57,6 +57,7 @@ static std::vector<std::uint8_t> get_offline_cache_key_of_compile_config(
   if (arch_is_cpu(config.arch)) {
     serializer(config.default_cpu_block_dim);
     serializer(config.cpu_max_num_threads);
+    serializer(config.cpu_gc_free_list_threshold);
   } else if (arch_is_gpu(config.arch)) {
     serializer(config.default_gpu_block_dim);
     serializer(config.gpu_max_reg);
@@ -189,6 +190,11 @@ std::string get_hashed_offline_cache_key(const CompileConfig &config,
   hasher.process(kernel_rets_string.begin(), kernel_rets_string.end());
   hasher.process(kernel_body_string.begin(), kernel_body_string.end());
   hasher.process(autodiff_mode.begin(), autodiff_mode.end());
+  if (kernel->fuse_offloads) {
+    // Only hashed when set, so that the keys of other kernels do not change
+    const std::string fuse_offloads = "fuse_offloads";
+    hasher.process(fuse_offloads.begin(), fuse_offloads.end());
+  }
   hasher.finish();
 
   auto res = picosha2::get_hash_hex_string(hasher);
@@ -16,6 +16,7 @@
 #include "gstaichi/ir/analysis.h"
 #include "gstaichi/ir/transforms.h"
 #include "gstaichi/analysis/offline_cache_util.h"
+#include "gstaichi/program/compile_profiler.h"
 
 namespace gstaichi::lang {
 
@@ -85,8 +86,14 @@ LLVMCompiledKernel KernelCodeGen::compile_kernel_to_module() {
   }
   worker.flush();
 
+  auto profile = make_profiled_pass_printer([](const std::string &) {}, kernel,
+                                            "llvm", ir);
+
+  auto _ = tlctx_.lock_linking_context();
   auto llvm_compiled_kernel = tlctx_.link_compiled_tasks(std::move(data));
+  profile("Linked");
   optimize_module(llvm_compiled_kernel.module.get());
+  profile("Optimized");
   return llvm_compiled_kernel;
 }
 
@@ -9,6 +9,7 @@
 #include "gstaichi/analysis/offline_cache_util.h"
 #include "gstaichi/ir/statements.h"
 #include "gstaichi/ir/transforms.h"
+#include "gstaichi/program/compile_profiler.h"
 #include "gstaichi/program/extension.h"
 #include "gstaichi/runtime/program_impls/llvm/llvm_program.h"
 #include "gstaichi/codegen/llvm/struct_llvm.h"
@@ -1152,7 +1153,9 @@ void TaskCodeGenLLVM::emit_list_gen(OffloadedStmt *listgen) {
 
 void TaskCodeGenLLVM::emit_gc(OffloadedStmt *stmt) {
   auto snode = stmt->snode->id;
-  call("node_gc", get_runtime(), tlctx->get_constant(snode));
+  call("node_gc", get_runtime(), tlctx->get_constant(snode),
+       tlctx->get_constant(compile_config.cpu_max_num_threads),
+       tlctx->get_constant(compile_config.cpu_gc_free_list_threshold));
 }
 
 void TaskCodeGenLLVM::create_increment(llvm::Value *ptr, llvm::Value *value) {
@@ -2728,8 +2731,11 @@ LLVMCompiledTask TaskCodeGenLLVM::run_compilation() {
 
   offload_to_executable(ir, compile_config, kernel);
 
+  auto profile = make_profiled_pass_printer([](const std::string &) {}, kernel,
+                                            "llvm", ir);
   emit_to_module();
   eliminate_unused_functions();
+  profile("Emitted");
 
   if (compile_config.arch == Arch::cuda) {
     // CUDA specific metadata
@@ -14,6 +14,9 @@ class OffloadedTask {
   int block_dim{0};
   int grid_dim{0};
   int dynamic_shared_array_bytes{0};
+  // Whether the task may run concurrently with the previous ones, see
+  // OffloadedStmt::concurrent_with_previous.
+  bool concurrent_with_previous{false};
 
   explicit OffloadedTask(const std::string &name = "",
                          int block_dim = 0,
@@ -23,7 +26,11 @@ class OffloadedTask {
         block_dim(block_dim),
         grid_dim(grid_dim),
         dynamic_shared_array_bytes(dynamic_shared_array_bytes) {};
-  TI_IO_DEF(name, block_dim, grid_dim, dynamic_shared_array_bytes);
+  TI_IO_DEF(name,
+            block_dim,
+            grid_dim,
+            dynamic_shared_array_bytes,
+            concurrent_with_previous);
 };
 
 struct LLVMCompiledTask {
@@ -1,9 +1,14 @@
 #include "gstaichi/compilation_manager/kernel_compilation_manager.h"
 
+#include <exception>
+
 #include "gstaichi/analysis/offline_cache_util.h"
 #include "gstaichi/codegen/compiled_kernel_data.h"
+#include "gstaichi/program/compile_profiler.h"
 #include "gstaichi/util/offline_cache.h"
 #include "gstaichi/util/environ_config.h"
+#include "gstaichi/system/timeline.h"
+#include "gstaichi/system/timer.h"
 
 namespace gstaichi::lang {
 
@@ -89,6 +94,100 @@ CompileResult KernelCompilationManager::load_or_compile(
                        cache_hit, kernel_key};
 }
 
+std::vector<CompileResult> KernelCompilationManager::load_or_compile_many(
+    const CompileConfig &compile_config,
+    const DeviceCapabilityConfig &caps,
+    const std::vector<const Kernel *> &kernel_defs) {
+  const auto num_kernels = kernel_defs.size();
+  std::vector<std::string> kernel_keys(num_kernels);
+  std::vector<const CompiledKernelData *> cached_kernels(num_kernels, nullptr);
+  std::vector<bool> cache_hits(num_kernels, false);
+
+  // Keys generation and cache lookups are cheap and mutate the cache
+  // registries, so they are done serially, in order.
+  std::unordered_map<std::string, std::size_t> pending_index_by_key;
+  std::vector<std::size_t> pending;
+  for (std::size_t i = 0; i < num_kernels; i++) {
+    const auto &kernel_def = *kernel_defs[i];
+    auto cache_mode = get_cache_mode(compile_config, kernel_def.ir_is_ast());
+    kernel_keys[i] = make_kernel_key(compile_config, caps, kernel_def);
+    cached_kernels[i] = try_load_cached_kernel(
+        kernel_def.get_name(), kernel_keys[i], compile_config.arch, cache_mode);
+    cache_hits[i] = (cached_kernels[i] != nullptr);
+    if (!cache_hits[i] && !pending_index_by_key.count(kernel_keys[i])) {
+      pending_index_by_key[kernel_keys[i]] = pending.size();
+      pending.push_back(i);
+    }
+  }
+
+  // Compile all the missing kernels concurrently. Exceptions must not escape
+  // the worker threads, so they are forwarded to the calling thread.
+  std::vector<std::unique_ptr<CompiledKernelData>> compiled(pending.size());
+  std::vector<std::exception_ptr> errors(pending.size());
+  if (!pending.empty()) {
+    auto &workers = get_compile_workers(compile_config);
+    for (std::size_t j = 0; j < pending.size(); j++) {
+      const auto &kernel_def = *kernel_defs[pending[j]];
+      if (get_environ_config("TI_SHOW_COMPILING")) {
+        TI_INFO("Compiling kernel '{}'", kernel_def.get_name());
+      }
+      workers.enqueue([&, j] {
+        try {
+          compiled[j] =
+              compile_kernel(compile_config, caps, *kernel_defs[pending[j]]);
+        } catch (...) {
+          errors[j] = std::current_exception();
+        }
+      });
+    }
+    workers.flush();
+  }
+  for (const auto &error : errors) {
+    if (error) {
+      std::rethrow_exception(error);
+    }
+  }
+
+  // Register the newly compiled kernels in the in-memory cache, exactly like
+  // 'compile_and_cache_kernel' does.
+  for (std::size_t j = 0; j < pending.size(); j++) {
+    const auto &kernel_def = *kernel_defs[pending[j]];
+    const auto &kernel_key = kernel_keys[pending[j]];
+    TI_ASSERT(caching_kernels_.find(kernel_key) == caching_kernels_.end());
+    KernelCacheData k;
+    k.metadata.kernel_key = kernel_key;
+    k.metadata.created_at = k.metadata.last_used_at = std::time(nullptr);
+    k.compiled_kernel_data = std::move(compiled[j]);
+    k.metadata.size = 0;
+    k.metadata.cache_mode =
+        get_cache_mode(compile_config, kernel_def.ir_is_ast());
+    caching_kernels_[kernel_key] = std::move(k);
+  }
+
+  std::vector<CompileResult> results;
+  results.reserve(num_kernels);
+  for (std::size_t i = 0; i < num_kernels; i++) {
+    const auto *ckd = cached_kernels[i];
+    if (!ckd) {
+      ckd = caching_kernels_.at(kernel_keys[i]).compiled_kernel_data.get();
+    }
+    results.push_back(CompileResult{*ckd, cache_hits[i], kernel_keys[i]});
+  }
+  return results;
+}
+
+ParallelExecutor &KernelCompilationManager::get_compile_workers(
+    const CompileConfig &compile_config) {
+  if (!compile_workers_) {
+    // Keep the output readable when the IR is printed during compilation.
+    int num_threads =
+        compile_config.print_ir ? 1 : compile_config.num_compile_threads;
+    compile_workers_ =
+        std::make_unique<ParallelExecutor>("compile_kernels", num_threads);
+  }
+  return *compile_workers_;
+}
+
 void KernelCompilationManager::dump() {
   if (caching_kernels_.empty()) {
     return;
@@ -180,10 +279,16 @@ std::unique_ptr<CompiledKernelData> KernelCompilationManager::compile_kernel(
     const CompileConfig &compile_config,
     const DeviceCapabilityConfig &caps,
     const Kernel &kernel_def) const {
+  TI_KERNEL_TIMELINE("compile_kernel", kernel_def.get_name());
+  auto start_t = Time::get_time();
   auto &compiler = *config_.kernel_compiler;
   auto ir = compiler.compile(compile_config, kernel_def);
   auto ckd = compiler.compile(compile_config, caps, kernel_def, *ir);
   TI_ASSERT(ckd->check() == CompiledKernelData::Err::kNoError);
+  if (auto *profiler = get_compile_profiler(&kernel_def)) {
+    profiler->insert_compilation(kernel_def.get_name(),
+                                 Time::get_time() - start_t);
+  }
   return ckd;
 }
 
@@ -229,7 +334,7 @@ const CompiledKernelData *KernelCompilationManager::try_load_cached_kernel(
         TI_DEBUG("Create kernel '{}' from cache (key='{}')", kernel_name,
                  kernel_key);
         return k.compiled_kernel_data.get();
-      } else if (auto loaded = load_ckd(kernel_key, arch)) {
+      } else if (auto loaded = load_ckd(kernel_name, kernel_key, arch)) {
         TI_DEBUG("Create kernel '{}' from cache (key='{}')", kernel_name,
                  kernel_key);
         TI_ASSERT(loaded->arch() == arch);
@@ -301,8 +406,10 @@ const CompiledKernelData *KernelCompilationManager::load_fast_cache(
 }
 
 std::unique_ptr<CompiledKernelData> KernelCompilationManager::load_ckd(
+    const std::string &kernel_name,
     const std::string &kernel_key,
     Arch arch) {
+  TI_KERNEL_TIMELINE("load_offline_cache", kernel_name);
   const auto filename = make_filename(kernel_key);
   if (std::ifstream ifs(filename, std::ios::in | std::ios::binary);
       ifs.is_open()) {
@@ -8,6 +8,7 @@
 #include "gstaichi/util/offline_cache.h"
 #include "gstaichi/codegen/kernel_compiler.h"
 #include "gstaichi/codegen/compiled_kernel_data.h"
+#include "gstaichi/program/parallel_executor.h"
 
 namespace gstaichi::lang {
 
@@ -71,6 +72,14 @@ class KernelCompilationManager final {
                                 const DeviceCapabilityConfig &caps,
                                 const Kernel &kernel_def);
 
+  // Same as load_or_compile, for a batch of kernels. Cache lookups are done
+  // serially in order, then all the kernels that must be compiled are
+  // compiled concurrently on a pool of num_compile_threads workers.
+  std::vector<CompileResult> load_or_compile_many(
+      const CompileConfig &compile_config,
+      const DeviceCapabilityConfig &caps,
+      const std::vector<const Kernel *> &kernel_defs);
+
   // Dump the cached data in memory to disk
   void dump();
 
@@ -114,14 +123,18 @@ class KernelCompilationManager final {
       const DeviceCapabilityConfig &caps,
       const Kernel &kernel_def);
 
-  std::unique_ptr<CompiledKernelData> load_ckd(const std::string &kernel_key,
+  std::unique_ptr<CompiledKernelData> load_ckd(const std::string &kernel_name,
+                                               const std::string &kernel_key,
                                                Arch arch);
 
   static CacheData::CacheMode get_cache_mode(
       const CompileConfig &compile_config,
       bool kernel_ir_is_ast);
 
+  ParallelExecutor &get_compile_workers(const CompileConfig &compile_config);
+
   Config config_;
+  std::unique_ptr<ParallelExecutor> compile_workers_{nullptr};
   CachingKernels caching_kernels_;
   CacheData cached_data_;
   std::vector<KernelCacheData *> updated_data_;
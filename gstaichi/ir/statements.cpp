@@ -400,6 +400,7 @@ std::unique_ptr<Stmt> OffloadedStmt::clone() const {
   new_stmt->reversed = reversed;
   new_stmt->is_bit_vectorized = is_bit_vectorized;
   new_stmt->num_cpu_threads = num_cpu_threads;
+  new_stmt->concurrent_with_previous = concurrent_with_previous;
   new_stmt->index_offsets = index_offsets;
 
   new_stmt->mesh = mesh;
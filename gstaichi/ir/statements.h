@@ -1415,6 +1415,10 @@ class OffloadedStmt : public Stmt {
   bool reversed{false};
   bool is_bit_vectorized{false};
   int num_cpu_threads{1};
+  // No conflicting global memory accesses with the previous tasks of the
+  // kernel, up to the last one not having this flag set. See
+  // irpass::mark_concurrent_offloads.
+  bool concurrent_with_previous{false};
   Stmt *end_stmt{nullptr};
   std::string range_hint = "";
 
@@ -1480,6 +1484,7 @@ class OffloadedStmt : public Stmt {
                      block_dim,
                      reversed,
                      num_cpu_threads,
+                     concurrent_with_previous,
                      index_offsets,
                      mem_access_opt);
   TI_DEFINE_ACCEPT
@@ -50,6 +50,11 @@ CompileConfig::CompileConfig() {
   saturating_grid_dim = 0;
   max_block_dim = 0;
   cpu_max_num_threads = std::thread::hardware_concurrency();
+  cpu_thread_spin_us = 0;
+  cpu_thread_affinity = false;
+  cpu_concurrent_tasks = false;
+  async_launch = false;
+  cpu_gc_free_list_threshold = 0;
   random_seed = 0;
 
   // LLVM backend options:
@@ -32,7 +32,12 @@ struct CompileConfig {
   bool use_llvm;
   bool verbose_kernel_launches;
   bool kernel_profiler;
+  // Only the most recent records of the kernel profiler are kept beyond this,
+  // if positive. The statistics of each kernel cover all the records.
+  int kernel_profiler_max_traced_records{0};
   bool timeline{false};
+  // Records the time spent in each compilation pass of each kernel.
+  bool compile_profiler{false};
   bool verbose;
   bool fast_math;
   bool flatten_if;
@@ -60,6 +65,19 @@ struct CompileConfig {
   int saturating_grid_dim;
   int max_block_dim;
   int cpu_max_num_threads;
+  // Microseconds the CPU thread pool busy-waits for work before sleeping.
+  int cpu_thread_spin_us;
+  bool cpu_thread_affinity;
+  // Run the consecutive offloaded tasks of a kernel that do not conflict with
+  // each other at the same time, each one on a single thread.
+  bool cpu_concurrent_tasks;
+  // Return from kernel launches right away on CPU, the kernels being run in
+  // order by a dedicated thread. See LlvmRuntimeExecutor::get_launch_queue.
+  bool async_launch;
+  // Only reclaim the nodes deactivated in pointer and dynamic SNodes on CPU
+  // once fewer free nodes than this are left, rather than after every kernel
+  // deactivating some. Disabled if not positive.
+  int cpu_gc_free_list_threshold;
   int random_seed;
 
   // Debugging options:
@@ -0,0 +1,97 @@
+#include "gstaichi/program/compile_profiler.h"
+
+#include <algorithm>
+#include <memory>
+
+#include "gstaichi/ir/analysis.h"
+#include "gstaichi/program/kernel.h"
+#include "gstaichi/program/program.h"
+#include "gstaichi/system/timer.h"
+
+namespace gstaichi::lang {
+
+void CompileProfiler::insert_compilation(const std::string &kernel_name,
+                                         double time) {
+  std::lock_guard<std::mutex> _(mut_);
+  auto &stats = get_kernel_stats(kernel_name);
+  stats.num_compilations++;
+  stats.total_time += time;
+}
+
+void CompileProfiler::insert_pass(const std::string &kernel_name,
+                                  const std::string &pipeline,
+                                  const std::string &pass,
+                                  double time,
+                                  int statements_before,
+                                  int statements_after) {
+  std::lock_guard<std::mutex> _(mut_);
+  auto &passes = get_kernel_stats(kernel_name).passes;
+  auto it = std::find_if(passes.begin(), passes.end(), [&](const auto &p) {
+    return p.pipeline == pipeline && p.pass == pass;
+  });
+  if (it == passes.end()) {
+    it = passes.insert(passes.end(), CompilePassStats{pipeline, pass});
+  }
+  it->num_runs++;
+  it->time += time;
+  it->statements_before += statements_before;
+  it->statements_after += statements_after;
+}
+
+std::vector<KernelCompileStats> CompileProfiler::get_stats() {
+  std::lock_guard<std::mutex> _(mut_);
+  return stats_;
+}
+
+void CompileProfiler::clear() {
+  std::lock_guard<std::mutex> _(mut_);
+  stats_.clear();
+  stats_ids_.clear();
+}
+
+KernelCompileStats &CompileProfiler::get_kernel_stats(
+    const std::string &kernel_name) {
+  auto [it, inserted] = stats_ids_.try_emplace(kernel_name, stats_.size());
+  if (inserted) {
+    stats_.emplace_back();
+    stats_.back().kernel_name = kernel_name;
+  }
+  return stats_[it->second];
+}
+
+CompileProfiler *get_compile_profiler(const Kernel *kernel) {
+  if (!kernel || !kernel->program) {
+    return nullptr;
+  }
+  return kernel->program->compile_profiler.get();
+}
+
+std::function<void(const std::string &)> make_profiled_pass_printer(
+    std::function<void(const std::string &)> printer,
+    const Kernel *kernel,
+    const std::string &pipeline,
+    IRNode *ir) {
+  auto *profiler = get_compile_profiler(kernel);
+  if (!profiler) {
+    return printer;
+  }
+  struct PassStart {
+    double time;
+    int num_statements;
+  };
+  auto start = std::make_shared<PassStart>(
+      PassStart{0.0, irpass::analysis::count_statements(ir)});
+  start->time = Time::get_time();
+  return [=, kernel_name = kernel->get_name(),
+          printer = std::move(printer)](const std::string &pass) {
+    double time = Time::get_time() - start->time;
+    int num_statements = irpass::analysis::count_statements(ir);
+    profiler->insert_pass(kernel_name, pipeline, pass, time,
+                          start->num_statements, num_statements);
+    printer(pass);
+    start->num_statements = num_statements;
+    start->time = Time::get_time();
+  };
+}
+
+}  // namespace gstaichi::lang
@@ -0,0 +1,75 @@
+#pragma once
+
+#include "gstaichi/util/lang_util.h"
+
+#include <functional>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+namespace gstaichi::lang {
+
+class IRNode;
+class Kernel;
+
+// Time spent in a pass of a compilation pipeline, along with the number of
+// IR statements before and after it, summed over the runs of the pass, e.g.
+// once per offloaded task.
+struct CompilePassStats {
+  std::string pipeline;
+  std::string pass;
+  int num_runs{0};
+  double time{0.0};  // s
+  int64 statements_before{0};
+  int64 statements_after{0};
+};
+
+struct KernelCompileStats {
+  std::string kernel_name;
+  int num_compilations{0};
+  double total_time{0.0};  // s
+  // In the order they were first run
+  std::vector<CompilePassStats> passes;
+};
+
+// Records the time spent compiling each kernel, pass by pass. It is only
+// created when ti.init(compile_profiler=True), see
+// Program::compile_profiler.
+class CompileProfiler {
+ public:
+  void insert_compilation(const std::string &kernel_name, double time);
+
+  void insert_pass(const std::string &kernel_name,
+                   const std::string &pipeline,
+                   const std::string &pass,
+                   double time,
+                   int statements_before,
+                   int statements_after);
+
+  std::vector<KernelCompileStats> get_stats();
+
+  void clear();
+
+ private:
+  KernelCompileStats &get_kernel_stats(const std::string &kernel_name);
+
+  std::mutex mut_;
+  std::vector<KernelCompileStats> stats_;
+  std::unordered_map<std::string, std::size_t> stats_ids_;
+};
+
+// The compile profiler of the program owning |kernel|, if enabled.
+CompileProfiler *get_compile_profiler(const Kernel *kernel);
+
+// Wraps the |printer| called after the passes of the |pipeline| compiling
+// |ir|, so that the passes run since the previous call are timed and their
+// statements counted when the compile profiler is enabled. Printing is not
+// timed. Returns |printer| as is otherwise.
+std::function<void(const std::string &)> make_profiled_pass_printer(
+    std::function<void(const std::string &)> printer,
+    const Kernel *kernel,
+    const std::string &pipeline,
+    IRNode *ir);
+
+}  // namespace gstaichi::lang
@@ -18,6 +18,10 @@ class TI_DLL_EXPORT Kernel : public Callable {
 
   bool is_accessor{false};
 
+  // Fuse consecutive offloaded loops over the same iteration space, see
+  // irpass::fuse_offloads. Set by ti.fuse.
+  bool fuse_offloads{false};
+
   Kernel(Program &program,
          const std::function<void()> &func,
          const std::string &name = "",
@@ -1,5 +1,8 @@
 #include "kernel_profiler.h"
 
+#include <cmath>
+#include <limits>
+
 #include "gstaichi/system/timer.h"
 #include "gstaichi/rhi/cuda/cuda_driver.h"
 #include "gstaichi/rhi/cuda/cuda_profiler.h"
@@ -9,6 +12,45 @@
 
 namespace gstaichi::lang {
 
+void KernelProfileHistogram::insert(double t) {
+  if (counts_.empty()) {
+    counts_.resize(kNumBuckets, 0);
+  }
+  int bucket = 0;
+  if (t > kMinTime) {
+    bucket = int(std::min(std::log(t / kMinTime) / std::log(kGrowth),
+                          double(kNumBuckets - 1)));
+  }
+  counts_[bucket]++;
+  total_count_++;
+}
+
+double KernelProfileHistogram::percentile(double q) const {
+  if (total_count_ == 0) {
+    return 0.0;
+  }
+  const uint64 rank = std::max<uint64>(
+      uint64(std::ceil(std::clamp(q, 0.0, 1.0) * total_count_)), 1);
+  uint64 count = 0;
+  int bucket = 0;
+  for (; bucket < kNumBuckets - 1; bucket++) {
+    count += counts_[bucket];
+    if (count >= rank) {
+      break;
+    }
+  }
+  // The first and last buckets are unbounded, the times they hold are
+  // estimated by the min and max times
+  if (bucket == 0) {
+    return 0.0;
+  }
+  if (bucket == kNumBuckets - 1) {
+    return std::numeric_limits<double>::infinity();
+  }
+  // Geometric middle of the bucket
+  return kMinTime * std::pow(kGrowth, bucket + 0.5);
+}
+
 void KernelProfileStatisticalResult::insert_record(double t) {
   if (counter == 0) {
     min = t;
@@ -18,6 +60,23 @@ void KernelProfileStatisticalResult::insert_record(double t) {
   min = std::min(min, t);
   max = std::max(max, t);
   total += t;
+  total_squares += t * t;
+  histogram.insert(t);
+}
+
+double KernelProfileStatisticalResult::percentile(double q) const {
+  if (counter == 0) {
+    return 0.0;
+  }
+  return std::clamp(histogram.percentile(q), min, max);
+}
+
+double KernelProfileStatisticalResult::stddev() const {
+  if (counter == 0) {
+    return 0.0;
+  }
+  const double avg = total / counter;
+  return std::sqrt(std::max(total_squares / counter - avg * avg, 0.0));
 }
 
 bool KernelProfileStatisticalResult::operator<(
@@ -41,20 +100,28 @@ void KernelProfilerBase::query(const std::string &kernel_name,
                                int &counter,
                                double &min,
                                double &max,
-                               double &avg) {
+                               double &avg,
+                               std::map<int, double> &percentiles) {
   sync();
   std::regex name_regex(kernel_name + "(.*)");
   for (auto &rec : statistical_results_) {
     if (std::regex_match(rec.name, name_regex)) {
+      // The statistics of the offloaded tasks of the kernel are added up
       if (counter == 0) {
         counter = rec.counter;
         min = rec.min;
         max = rec.max;
         avg = rec.total / rec.counter;
+        for (auto &[p, value] : percentiles) {
+          value = rec.percentile(p / 100.0);
+        }
       } else if (counter == rec.counter) {
         min += rec.min;
         max += rec.max;
         avg += rec.total / rec.counter;
+        for (auto &[p, value] : percentiles) {
+          value += rec.percentile(p / 100.0);
+        }
       } else {
         TI_WARN("{}.counter({}) != {}.counter({}).", kernel_name, counter,
                 rec.name, rec.counter);
@@ -67,22 +134,44 @@ double KernelProfilerBase::get_total_time() const {
   return total_time_ms_ / 1000.0;
 }
 
+KernelProfileStatisticalResult &KernelProfilerBase::get_statistical_result(
+    const std::string &kernel_name) {
+  auto [it, inserted] = statistical_result_ids_.try_emplace(
+      kernel_name, statistical_results_.size());
+  if (inserted) {
+    statistical_results_.emplace_back(kernel_name);
+  }
+  return statistical_results_[it->second];
+}
+
+void KernelProfilerBase::clear_statistical_results() {
+  statistical_results_.clear();
+  statistical_result_ids_.clear();
+}
+
+void KernelProfilerBase::trim_traced_records() {
+  if (max_traced_records_ > 0 && traced_records_.size() > max_traced_records_) {
+    traced_records_.erase(traced_records_.begin(),
+                          traced_records_.end() - max_traced_records_);
+  }
+}
+
 void KernelProfilerBase::insert_record(const std::string &kernel_name,
                                        double duration_ms) {
   // Trace record
+  if (max_traced_records_ > 0 &&
+      traced_records_.size() >= max_traced_records_) {
+    // Drop the oldest half of the records at once, so that this is amortized
+    traced_records_.erase(
+        traced_records_.begin(),
+        traced_records_.begin() + (traced_records_.size() + 1) / 2);
+  }
   KernelProfileTracedRecord record;
   record.name = kernel_name;
   record.kernel_elapsed_time_in_ms = duration_ms;
   traced_records_.push_back(record);
   // Count record
-  auto it = std::find_if(
-      statistical_results_.begin(), statistical_results_.end(),
-      [&](KernelProfileStatisticalResult &r) { return r.name == record.name; });
-  if (it == statistical_results_.end()) {
-    statistical_results_.emplace_back(record.name);
-    it = std::prev(statistical_results_.end());
-  }
-  it->insert_record(duration_ms);
+  get_statistical_result(kernel_name).insert_record(duration_ms);
   total_time_ms_ += duration_ms;
 }
 
@@ -100,7 +189,7 @@ class DefaultProfiler : public KernelProfilerBase {
     // sync(); //decoupled: trigger from the foront end
     total_time_ms_ = 0;
     traced_records_.clear();
-    statistical_results_.clear();
+    clear_statistical_results();
   }
 
   void start(const std::string &kernel_name) override {
@@ -110,24 +199,7 @@ class DefaultProfiler : public KernelProfilerBase {
 
   void stop() override {
     auto t = Time::get_time() - start_t_;
-    auto ms = t * 1000.0;
-    // trace record
-    KernelProfileTracedRecord record;
-    record.name = event_name_;
-    record.kernel_elapsed_time_in_ms = ms;
-    traced_records_.push_back(record);
-    // count record
-    auto it =
-        std::find_if(statistical_results_.begin(), statistical_results_.end(),
-                     [&](KernelProfileStatisticalResult &r) {
-                       return r.name == event_name_;
-                     });
-    if (it == statistical_results_.end()) {
-      statistical_results_.emplace_back(event_name_);
-      it = std::prev(statistical_results_.end());
-    }
-    it->insert_record(ms);
-    total_time_ms_ += ms;
+    insert_record(event_name_, t * 1000.0);
   }
 
  private:
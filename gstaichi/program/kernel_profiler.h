@@ -6,6 +6,7 @@
 #include <algorithm>
 #include <map>
 #include <string>
+#include <unordered_map>
 #include <vector>
 #include <memory>
 #include <regex>
@@ -26,20 +27,47 @@ struct KernelProfileTracedRecord {
   std::vector<float> metric_values;  // user selected metrics
 };
 
+// Histogram of kernel times of bounded size. The bucket bounds grow
+// geometrically from 1 ns to 1000 s, so that percentiles are estimated within
+// 1% whatever the times.
+class KernelProfileHistogram {
+ public:
+  void insert(double t);
+
+  // Estimated time that a fraction |q| of the times do not exceed.
+  double percentile(double q) const;
+
+ private:
+  static constexpr double kMinTime = 1e-6;  // ms
+  static constexpr double kGrowth = 1.02;
+  static constexpr int kNumBuckets = 1400;
+
+  std::vector<uint64> counts_;
+  uint64 total_count_{0};
+};
+
 struct KernelProfileStatisticalResult {
   std::string name;
   int counter;
   double min;
   double max;
   double total;
+  double total_squares;
+  KernelProfileHistogram histogram;
 
   explicit KernelProfileStatisticalResult(const std::string &name)
-      : name(name), counter(0), min(0), max(0), total(0) {
+      : name(name), counter(0), min(0), max(0), total(0), total_squares(0) {
   }
 
   void insert_record(double t);  // TODO replace `double time` with
                                  // `KernelProfileTracedRecord record`
 
+  // Estimated time that a fraction |q| of the records do not exceed.
+  double percentile(double q) const;
+
+  // Standard deviation of the times, i.e. their jitter.
+  double stddev() const;
+
   bool operator<(const KernelProfileStatisticalResult &o) const;
 };
 
@@ -47,7 +75,20 @@ class KernelProfilerBase {
  protected:
   std::vector<KernelProfileTracedRecord> traced_records_;
   std::vector<KernelProfileStatisticalResult> statistical_results_;
+  // Index of the statistical result of each kernel
+  std::unordered_map<std::string, std::size_t> statistical_result_ids_;
   double total_time_ms_{0};
+  // Only the most recent traced records are kept beyond this, if positive.
+  std::size_t max_traced_records_{0};
+
+  KernelProfileStatisticalResult &get_statistical_result(
+      const std::string &kernel_name);
+
+  void clear_statistical_results();
+
+  // Drops the oldest traced records beyond |max_traced_records_|, for the
+  // profilers appending records on their own, once they are counted.
+  void trim_traced_records();
 
  public:
   // Needed for the CUDA backend since we need to know which task to "stop"
@@ -87,12 +128,21 @@ class KernelProfilerBase {
              int &counter,
              double &min,
              double &max,
-             double &avg);
+             double &avg,
+             std::map<int, double> &percentiles);  // in %, filled in
 
   std::vector<KernelProfileTracedRecord> get_traced_records() {
     return traced_records_;
   }
 
+  std::vector<KernelProfileStatisticalResult> get_statistical_results() {
+    return statistical_results_;
+  }
+
+  void set_max_traced_records(std::size_t max_traced_records) {
+    max_traced_records_ = max_traced_records;
+  }
+
   double get_total_time() const;
 
   void insert_record(const std::string &kernel_name, double duration_ms);
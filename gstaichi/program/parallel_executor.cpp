@@ -112,7 +112,9 @@ void ParallelExecutor::worker_loop() {
     }
     if (notify_flush_cv) {
       // It is fine to notify |flush_cv_| while nobody is waiting on it.
-      flush_cv_.notify_one();
+      // Several threads may be waiting for a flush at the same time, e.g. when
+      // kernels are compiled concurrently, so all of them must be woken up.
+      flush_cv_.notify_all();
     }
   }
 }
@@ -64,6 +64,13 @@ Program::Program(Arch desired_arch) : snode_rw_accessors_bank_(this) {
   config.fit();
 
   profiler = make_profiler(config.arch, config.kernel_profiler);
+  if (profiler) {
+    profiler->set_max_traced_records(
+        std::max(config.kernel_profiler_max_traced_records, 0));
+  }
+  if (config.compile_profiler) {
+    compile_profiler = std::make_unique<CompileProfiler>();
+  }
   if (arch_uses_llvm(config.arch)) {
 #ifdef TI_WITH_LLVM
     program_impl_ = std::make_unique<LlvmProgramImpl>(config, profiler.get());
@@ -158,6 +165,14 @@ Kernel &Program::create_kernel(const std::function<void(Kernel *)> &body,
   return *kernels.back();
 }
 
+void Program::delete_kernel(const Kernel *kernel) {
+  auto it = std::find_if(
+      kernels.begin(), kernels.end(),
+      [kernel](const std::unique_ptr<Kernel> &k) { return k.get() == kernel; });
+  TI_ASSERT(it != kernels.end());
+  kernels.erase(it);
+}
+
 CompileResult Program::compile_kernel(const CompileConfig &compile_config,
                                       const DeviceCapabilityConfig &device_caps,
                                       const Kernel &kernel_def) {
@@ -170,14 +185,72 @@ CompileResult Program::compile_kernel(const CompileConfig &compile_config,
   return compile_result;
 }
 
+std::vector<CompileResult> Program::compile_kernels(
+    const CompileConfig &compile_config,
+    const DeviceCapabilityConfig &device_caps,
+    const std::vector<const Kernel *> &kernel_defs) {
+  auto start_t = Time::get_time();
+  TI_AUTO_PROF;
+  auto &mgr = program_impl_->get_kernel_compilation_manager();
+  auto compile_results =
+      mgr.load_or_compile_many(compile_config, device_caps, kernel_defs);
+  total_compilation_time_ += Time::get_time() - start_t;
+  return compile_results;
+}
+
 void Program::launch_kernel(const CompiledKernelData &compiled_kernel_data,
                             LaunchContextBuilder &ctx) {
+  TI_TIMELINE("launch_kernel");
   program_impl_->get_kernel_launcher().launch_kernel(compiled_kernel_data, ctx);
   if (compile_config().debug && arch_uses_llvm(compiled_kernel_data.arch())) {
     program_impl_->check_runtime_error(result_buffer);
   }
 }
 
+void Program::launch_kernels(
+    const std::vector<const CompiledKernelData *> &compiled_kernel_data,
+    const std::vector<LaunchContextBuilder *> &ctxs,
+    int num_iterations) {
+  TI_ASSERT(compiled_kernel_data.size() == ctxs.size());
+  for (int i = 0; i < num_iterations; i++) {
+    for (std::size_t j = 0; j < ctxs.size(); j++) {
+      launch_kernel(*compiled_kernel_data[j], *ctxs[j]);
+    }
+  }
+}
+
+void Program::launch_kernel_batch(
+    const CompiledKernelData &compiled_kernel_data,
+    Kernel *kernel,
+    const LaunchContextBuilder &base_ctx,
+    int num_launches,
+    const std::vector<int> &float_ids,
+    const std::vector<std::vector<float64>> &float_values,
+    const std::vector<int> &int_ids,
+    const std::vector<std::vector<int64>> &int_values,
+    const std::vector<int> &uint_ids,
+    const std::vector<std::vector<uint64>> &uint_values) {
+  TI_ASSERT(float_ids.empty() ||
+            float_values.size() == (std::size_t)num_launches);
+  TI_ASSERT(int_ids.empty() || int_values.size() == (std::size_t)num_launches);
+  TI_ASSERT(uint_ids.empty() ||
+            uint_values.size() == (std::size_t)num_launches);
+  for (int i = 0; i < num_launches; i++) {
+    auto ctx = kernel->make_launch_context();
+    ctx.copy(base_ctx);
+    if (!float_ids.empty()) {
+      ctx.set_args_float(float_ids, float_values[i]);
+    }
+    if (!int_ids.empty()) {
+      ctx.set_args_int(int_ids, int_values[i]);
+    }
+    if (!uint_ids.empty()) {
+      ctx.set_args_uint(uint_ids, uint_values[i]);
+    }
+    launch_kernel(compiled_kernel_data, ctx);
+  }
+}
+
 void Program::materialize_runtime() {
   program_impl_->materialize_runtime(profiler.get(), &result_buffer);
 }
@@ -240,6 +313,7 @@ SNode *Program::get_snode_root(int tree_id) {
 }
 
 void Program::synchronize() {
+  TI_TIMELINE("synchronize");
   program_impl_->synchronize();
 }
 
@@ -399,6 +473,10 @@ void Program::delete_ndarray(Ndarray *ndarray) {
   // - All kernels using it are executed.
   if (ndarrays_.count(ndarray) &&
       !program_impl_->used_in_kernel(ndarray->ndarray_alloc_.alloc_id)) {
+    if (compile_config().async_launch) {
+      // The pending launches may still use it
+      synchronize();
+    }
     ndarrays_.erase(ndarray);
   }
 }
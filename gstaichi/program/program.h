@@ -18,6 +18,7 @@
 #include "gstaichi/program/callable.h"
 #include "gstaichi/program/function.h"
 #include "gstaichi/program/kernel.h"
+#include "gstaichi/program/compile_profiler.h"
 #include "gstaichi/program/kernel_profiler.h"
 #include "gstaichi/program/snode_expr_utils.h"
 #include "gstaichi/program/snode_rw_accessors_bank.h"
@@ -56,6 +57,9 @@ class TI_DLL_EXPORT Program {
 
   std::unique_ptr<KernelProfilerBase> profiler{nullptr};
 
+  // Only created if |compile_config().compile_profiler|.
+  std::unique_ptr<CompileProfiler> compile_profiler{nullptr};
+
   // Note: for now we let all Programs share a single TypeFactory for smooth
   // migration. In the future each program should have its own copy.
   static TypeFactory &get_type_factory();
@@ -76,12 +80,15 @@ class TI_DLL_EXPORT Program {
     double min{0.0};
     double max{0.0};
     double avg{0.0};
+    std::map<int, double> percentiles{{50, 0.0}, {90, 0.0}, {95, 0.0},
+                                      {99, 0.0}};
   };
 
   KernelProfilerQueryResult query_kernel_profile_info(const std::string &name) {
     KernelProfilerQueryResult query_result;
     profiler->query(name, query_result.counter, query_result.min,
-                    query_result.max, query_result.avg);
+                    query_result.max, query_result.avg,
+                    query_result.percentiles);
     return query_result;
   }
 
@@ -130,15 +137,53 @@ class TI_DLL_EXPORT Program {
                         const std::string &name = "",
                         AutodiffMode autodiff_mode = AutodiffMode::kNone);
 
+  // Destroys a kernel created by create_kernel, freeing its IR. Its compiled
+  // kernel data, if any, is owned by the kernel compilation manager and is
+  // not affected.
+  void delete_kernel(const Kernel *kernel);
+
   Function *create_function(const FunctionKey &func_key);
 
   CompileResult compile_kernel(const CompileConfig &compile_config,
                                const DeviceCapabilityConfig &device_caps,
                                const Kernel &kernel_def);
 
+  // Compiles a batch of kernels concurrently, see
+  // KernelCompilationManager::load_or_compile_many.
+  std::vector<CompileResult> compile_kernels(
+      const CompileConfig &compile_config,
+      const DeviceCapabilityConfig &device_caps,
+      const std::vector<const Kernel *> &kernel_defs);
+
   void launch_kernel(const CompiledKernelData &compiled_kernel_data,
                      LaunchContextBuilder &ctx);
 
+  // Launches a sequence of kernels |num_iterations| times, in order. This is
+  // used to replay launch graphs recorded from Python. The launch contexts are
+  // reused as is, which is only valid for CPU backends.
+  void launch_kernels(
+      const std::vector<const CompiledKernelData *> &compiled_kernel_data,
+      const std::vector<LaunchContextBuilder *> &ctxs,
+      int num_iterations);
+
+  // Launches a kernel |num_launches| times. Each launch gets a fresh copy of
+  // |base_ctx|, whose scalar arguments |float_ids|, |int_ids| and |uint_ids|
+  // are overwritten with the values of that launch, i.e. |float_values[i]|,
+  // |int_values[i]| and |uint_values[i]| for the i-th launch. This amortizes
+  // the Python overhead of launching the same kernel many times with different
+  // scalar arguments.
+  void launch_kernel_batch(
+      const CompiledKernelData &compiled_kernel_data,
+      Kernel *kernel,
+      const LaunchContextBuilder &base_ctx,
+      int num_launches,
+      const std::vector<int> &float_ids,
+      const std::vector<std::vector<float64>> &float_values,
+      const std::vector<int> &int_ids,
+      const std::vector<std::vector<int64>> &int_values,
+      const std::vector<int> &uint_ids,
+      const std::vector<std::vector<uint64>> &uint_values);
+
   DeviceCapabilityConfig get_device_caps() {
     return program_impl_->get_device_caps();
   }
@@ -176,6 +221,14 @@ class TI_DLL_EXPORT Program {
   // it's exposed to python.
   void print_memory_profiler_info();
 
+  std::vector<float64> get_cpu_thread_busy_times() {
+    return program_impl_->get_cpu_thread_busy_times();
+  }
+
+  void clear_cpu_thread_busy_times() {
+    program_impl_->clear_cpu_thread_busy_times();
+  }
+
   // Returns zero if the SNode is statically allocated
   std::size_t get_snode_num_dynamically_allocated(SNode *snode);
 
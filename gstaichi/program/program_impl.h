@@ -132,6 +132,16 @@ class ProgramImpl {
         "print_memory_profiler_info() not implemented on the current backend");
   }
 
+  // Time spent running tasks by each thread of the CPU thread pool, in
+  // seconds. Only counted with the kernel profiler on. Empty if the backend has
+  // no such thread pool.
+  virtual std::vector<float64> get_cpu_thread_busy_times() {
+    return {};
+  }
+
+  virtual void clear_cpu_thread_busy_times() {
+  }
+
   virtual void check_runtime_error(uint64 *result_buffer) {
     TI_ERROR("check_runtime_error() not implemented on the current backend");
   }
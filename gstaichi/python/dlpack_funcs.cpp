@@ -154,6 +154,9 @@ pybind11::capsule field_to_dlpack(Program *program,
                                   int element_ndim,
                                   int n,
                                   int m) {
+  // The tensor is read as soon as it is returned, so that the pending
+  // launches must have completed
+  program->synchronize();
   if (!snode->is_path_all_dense) {
     TI_ERROR("Only dense fields are supported for dlpack conversion");
   }
@@ -224,9 +227,33 @@ pybind11::capsule field_to_dlpack(Program *program,
   return capsule;
 }
 
+uint64_t field_data_ptr(Program *program, SNode *snode) {
+  Arch arch = program->compile_config().arch;
+  validate_arch(arch);
+
+  // The field must be the only one placed in a dense SNode directly under the
+  // root, so that its memory is laid out like the one of an ndarray
+  SNode *dense_parent = snode->parent;
+  if (dense_parent == nullptr || dense_parent->type != SNodeType::dense ||
+      dense_parent->parent == nullptr ||
+      dense_parent->parent->parent != nullptr) {
+    TI_ERROR("Only fields created with a shape can be accessed as arrays");
+  }
+
+  int tree_id = snode->get_snode_tree_id();
+  DevicePtr tree_device_ptr = program->get_snode_tree_device_ptr(tree_id);
+
+  void *raw_ptr = nullptr;
+  DLDeviceType device_type = DLDeviceType::kDLCPU;
+  std::tie(raw_ptr, device_type) = get_raw_ptr(arch, program, tree_device_ptr);
+  return (uint64_t)raw_ptr + dense_parent->offset_bytes_in_parent_cell +
+         snode->offset_bytes_in_parent_cell;
+}
+
 pybind11::capsule ndarray_to_dlpack(Program *program,
                                     pybind11::object owner,
                                     Ndarray *ndarray) {
+  program->synchronize();
   Arch arch = program->compile_config().arch;
   validate_arch(arch);
 
@@ -16,4 +16,7 @@ pybind11::capsule field_to_dlpack(Program *program,
                                   int element_ndim,
                                   int n,
                                   int m);
+// Address of the memory of a field placed in a dense SNode directly under the
+// root, on the device of the program.
+uint64_t field_data_ptr(Program *program, SNode *snode);
 }  // namespace gstaichi::lang
@@ -1,8 +1,10 @@
 // Bindings for the python frontend
 
 #include <optional>
+#include <sstream>
 #include <string>
 #include "gstaichi/ir/snode.h"
+#include "gstaichi/analysis/offline_cache_util.h"
 
 #if TI_WITH_LLVM
 #include "llvm/Config/llvm-config.h"
@@ -16,6 +18,7 @@
 #include "gstaichi/ir/expression_ops.h"
 #include "gstaichi/ir/frontend_ir.h"
 #include "gstaichi/ir/statements.h"
+#include "gstaichi/ir/analysis.h"
 #include "gstaichi/program/extension.h"
 #include "gstaichi/program/ndarray.h"
 #include "gstaichi/program/matrix.h"
@@ -197,6 +200,14 @@ void export_lang(py::module &m) {
       .def_readwrite("saturating_grid_dim", &CompileConfig::saturating_grid_dim)
       .def_readwrite("max_block_dim", &CompileConfig::max_block_dim)
       .def_readwrite("cpu_max_num_threads", &CompileConfig::cpu_max_num_threads)
+      .def_readwrite("cpu_thread_spin_us", &CompileConfig::cpu_thread_spin_us)
+      .def_readwrite("cpu_thread_affinity",
+                     &CompileConfig::cpu_thread_affinity)
+      .def_readwrite("cpu_concurrent_tasks",
+                     &CompileConfig::cpu_concurrent_tasks)
+      .def_readwrite("async_launch", &CompileConfig::async_launch)
+      .def_readwrite("cpu_gc_free_list_threshold",
+                     &CompileConfig::cpu_gc_free_list_threshold)
       .def_readwrite("random_seed", &CompileConfig::random_seed)
       .def_readwrite("verbose_kernel_launches",
                      &CompileConfig::verbose_kernel_launches)
@@ -204,7 +215,10 @@ void export_lang(py::module &m) {
       .def_readwrite("demote_dense_struct_fors",
                      &CompileConfig::demote_dense_struct_fors)
       .def_readwrite("kernel_profiler", &CompileConfig::kernel_profiler)
+      .def_readwrite("kernel_profiler_max_traced_records",
+                     &CompileConfig::kernel_profiler_max_traced_records)
       .def_readwrite("timeline", &CompileConfig::timeline)
+      .def_readwrite("compile_profiler", &CompileConfig::compile_profiler)
       .def_readwrite("default_fp", &CompileConfig::default_fp)
       .def_readwrite("default_ip", &CompileConfig::default_ip)
       .def_readwrite("default_up", &CompileConfig::default_up)
@@ -273,7 +287,33 @@ void export_lang(py::module &m) {
       .def_readwrite("counter", &Program::KernelProfilerQueryResult::counter)
       .def_readwrite("min", &Program::KernelProfilerQueryResult::min)
       .def_readwrite("max", &Program::KernelProfilerQueryResult::max)
-      .def_readwrite("avg", &Program::KernelProfilerQueryResult::avg);
+      .def_readwrite("avg", &Program::KernelProfilerQueryResult::avg)
+      .def_readwrite("percentiles",
+                     &Program::KernelProfilerQueryResult::percentiles);
+
+  py::class_<KernelProfileStatisticalResult>(m,
+                                             "KernelProfileStatisticalResult")
+      .def_readonly("name", &KernelProfileStatisticalResult::name)
+      .def_readonly("counter", &KernelProfileStatisticalResult::counter)
+      .def_readonly("min", &KernelProfileStatisticalResult::min)
+      .def_readonly("max", &KernelProfileStatisticalResult::max)
+      .def_readonly("total", &KernelProfileStatisticalResult::total)
+      .def("percentile", &KernelProfileStatisticalResult::percentile)
+      .def("stddev", &KernelProfileStatisticalResult::stddev);
+
+  py::class_<CompilePassStats>(m, "CompilePassStats")
+      .def_readonly("pipeline", &CompilePassStats::pipeline)
+      .def_readonly("pass_name", &CompilePassStats::pass)
+      .def_readonly("num_runs", &CompilePassStats::num_runs)
+      .def_readonly("time", &CompilePassStats::time)
+      .def_readonly("statements_before", &CompilePassStats::statements_before)
+      .def_readonly("statements_after", &CompilePassStats::statements_after);
+
+  py::class_<KernelCompileStats>(m, "KernelCompileStats")
+      .def_readonly("kernel_name", &KernelCompileStats::kernel_name)
+      .def_readonly("num_compilations", &KernelCompileStats::num_compilations)
+      .def_readonly("total_time", &KernelCompileStats::total_time)
+      .def_readonly("passes", &KernelCompileStats::passes);
 
   py::class_<KernelProfileTracedRecord>(m, "KernelProfileTracedRecord")
       .def_readwrite("register_per_thread",
@@ -358,7 +398,12 @@ void export_lang(py::module &m) {
   auto compiled_kernel_data =
       py::class_<CompiledKernelData>(m, "CompiledKernelData")
           .def("_debug_dump_to_string",
-               &CompiledKernelData::debug_dump_to_string);
+               &CompiledKernelData::debug_dump_to_string)
+          .def("size_in_bytes", [](const CompiledKernelData *self) {
+            std::ostringstream oss;
+            self->dump(oss);
+            return oss.str().size();
+          });
 
   py::class_<Program>(m, "Program")
       .def(py::init<>())
@@ -370,6 +415,10 @@ void export_lang(py::module &m) {
            [](Program *program, SNode *snode, int element_ndim, int n, int m) {
              return field_to_dlpack(program, snode, element_ndim, n, m);
            })
+      .def("get_field_data_ptr",
+           [](Program *program, SNode *snode) {
+             return field_data_ptr(program, snode);
+           })
       .def("config", &Program::compile_config,
            py::return_value_policy::reference)
       .def("sync_kernel_profiler",
@@ -377,7 +426,12 @@ void export_lang(py::module &m) {
       .def("update_kernel_profiler",
            [](Program *program) { program->profiler->update(); })
       .def("clear_kernel_profiler",
-           [](Program *program) { program->profiler->clear(); })
+           [](Program *program) {
+             program->profiler->clear();
+             program->clear_cpu_thread_busy_times();
+           })
+      .def("get_kernel_profiler_thread_busy_times",
+           &Program::get_cpu_thread_busy_times)
       .def("query_kernel_profile_info",
            [](Program *program, const std::string &name) {
              return program->query_kernel_profile_info(name);
@@ -386,6 +440,23 @@ void export_lang(py::module &m) {
            [](Program *program) {
              return program->profiler->get_traced_records();
            })
+      .def("get_kernel_profiler_statistical_results",
+           [](Program *program) {
+             return program->profiler->get_statistical_results();
+           })
+      .def("get_compile_profiler_stats",
+           [](Program *program) {
+             TI_ERROR_IF(!program->compile_profiler,
+                         "The compile profiler is disabled, please enable it "
+                         "using ti.init(compile_profiler=True).");
+             return program->compile_profiler->get_stats();
+           })
+      .def("clear_compile_profiler_stats",
+           [](Program *program) {
+             if (program->compile_profiler) {
+               program->compile_profiler->clear();
+             }
+           })
       .def(
           "get_kernel_profiler_device_name",
           [](Program *program) { return program->profiler->get_device_name(); })
@@ -429,6 +500,7 @@ void export_lang(py::module &m) {
           py::return_value_policy::reference)
       .def("create_function", &Program::create_function,
            py::return_value_policy::reference)
+      .def("delete_kernel", &Program::delete_kernel)
       .def("create_sparse_matrix",
            [](Program *program, int n, int m, DataType dtype,
               std::string storage_format) {
@@ -486,7 +558,19 @@ void export_lang(py::module &m) {
            [](Program *program) { return program->get_graphics_device(); })
       .def("compile_kernel", &Program::compile_kernel,
            py::return_value_policy::reference)
+      .def(
+          "compile_kernels",
+          [](Program *program, const CompileConfig &compile_config,
+             const DeviceCapabilityConfig &device_caps,
+             const std::vector<const Kernel *> &kernel_defs) {
+            // The whole batch is compiled without calling back into Python.
+            py::gil_scoped_release release;
+            return program->compile_kernels(compile_config, device_caps,
+                                            kernel_defs);
+          })
       .def("launch_kernel", &Program::launch_kernel)
+      .def("launch_kernels", &Program::launch_kernels)
+      .def("launch_kernel_batch", &Program::launch_kernel_batch)
       .def("get_device_caps", &Program::get_device_caps);
 
   py::class_<CompileResult>(m, "CompileResult")
@@ -506,6 +590,10 @@ void export_lang(py::module &m) {
       .def_readonly("id", &SNode::id)
       .def("get_snode_tree_id", &SNode::get_snode_tree_id)
       .def_readonly("offset", &SNode::index_offsets)
+      .def("get_hashed_offline_cache_key",
+           [](SNode *snode) {
+             return get_hashed_offline_cache_key_of_snode(snode);
+           })
       .def("dense",
            (SNode & (SNode::*)(const std::vector<Axis> &,
                                const std::vector<int> &,
@@ -614,6 +702,11 @@ void export_lang(py::module &m) {
              self->no_activate.push_back(snode);
            })
       .def("to_string", &Kernel::to_string)
+      .def_readwrite("fuse_offloads", &Kernel::fuse_offloads)
+      .def("num_statements",
+           [](Kernel *self) {
+             return irpass::analysis::count_statements(self->ir.get());
+           })
       .def("insert_scalar_param", &Kernel::insert_scalar_param)
       .def("insert_arr_param", &Kernel::insert_arr_param)
       .def("insert_ndarray_param", &Kernel::insert_ndarray_param)
@@ -17,6 +17,7 @@
 #include "gstaichi/system/benchmark.h"
 #include "gstaichi/system/hacked_signal_handler.h"
 #include "gstaichi/system/profiler.h"
+#include "gstaichi/system/timeline.h"
 #if defined(TI_WITH_CUDA)
 #include "gstaichi/rhi/cuda/cuda_driver.h"
 #endif
@@ -116,6 +117,19 @@ void export_misc(py::module &m) {
         [&]() { Profiling::get_instance().print_profile_info(); });
   m.def("clear_profile_info",
         [&]() { Profiling::get_instance().clear_profile_info(); });
+  m.def("set_timeline_enabled", [](bool enabled) {
+    Timelines::get_instance().set_enabled(enabled);
+  });
+  m.def("timeline_begin", [](const std::string &name, const std::string &args) {
+    auto &timeline = Timeline::get_this_thread_instance();
+    timeline.insert_event(
+        {name, true, Time::get_time(), timeline.get_name(), args});
+  });
+  m.def("timeline_end", [](const std::string &name) {
+    auto &timeline = Timeline::get_this_thread_instance();
+    timeline.insert_event(
+        {name, false, Time::get_time(), timeline.get_name(), ""});
+  });
   m.def("start_memory_monitoring", start_memory_monitoring);
   m.def("get_repo_dir", get_repo_dir);
   m.def("get_python_package_dir", get_python_package_dir);
@@ -79,17 +79,12 @@ void KernelProfilerAMDGPU::stop(KernelProfilerBase::TaskHandle handle) {
 }
 
 bool KernelProfilerAMDGPU::statistics_on_traced_records() {
-  for (auto &record : traced_records_) {
-    auto it =
-        std::find_if(statistical_results_.begin(), statistical_results_.end(),
-                     [&](KernelProfileStatisticalResult &result) {
-                       return result.name == record.name;
-                     });
-    if (it == statistical_results_.end()) {
-      statistical_results_.emplace_back(record.name);
-      it = std::prev(statistical_results_.end());
-    }
-    it->insert_record(record.kernel_elapsed_time_in_ms);
+  // Only the records since the last update are new
+  for (std::size_t i = records_size_after_sync_; i < traced_records_.size();
+       i++) {
+    auto &record = traced_records_[i];
+    get_statistical_result(record.name)
+        .insert_record(record.kernel_elapsed_time_in_ms);
     total_time_ms_ += record.kernel_elapsed_time_in_ms;
   }
 
@@ -105,6 +100,7 @@ void KernelProfilerAMDGPU::update() {
   event_toolkit_->update_timeline(traced_records_);
   statistics_on_traced_records();
   event_toolkit_->clear();
+  trim_traced_records();
   records_size_after_sync_ = traced_records_.size();
 }
 
@@ -113,7 +109,7 @@ void KernelProfilerAMDGPU::clear() {
   total_time_ms_ = 0;
   records_size_after_sync_ = 0;
   traced_records_.clear();
-  statistical_results_.clear();
+  clear_statistical_results();
 }
 
 #else
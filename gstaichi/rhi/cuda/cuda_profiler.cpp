@@ -148,17 +148,12 @@ void KernelProfilerCUDA::stop(KernelProfilerBase::TaskHandle handle) {
 }
 
 bool KernelProfilerCUDA::statistics_on_traced_records() {
-  for (auto &record : traced_records_) {
-    auto it =
-        std::find_if(statistical_results_.begin(), statistical_results_.end(),
-                     [&](KernelProfileStatisticalResult &result) {
-                       return result.name == record.name;
-                     });
-    if (it == statistical_results_.end()) {
-      statistical_results_.emplace_back(record.name);
-      it = std::prev(statistical_results_.end());
-    }
-    it->insert_record(record.kernel_elapsed_time_in_ms);
+  // Only the records since the last update are new
+  for (std::size_t i = records_size_after_sync_; i < traced_records_.size();
+       i++) {
+    auto &record = traced_records_[i];
+    get_statistical_result(record.name)
+        .insert_record(record.kernel_elapsed_time_in_ms);
     total_time_ms_ += record.kernel_elapsed_time_in_ms;
   }
 
@@ -181,6 +176,7 @@ void KernelProfilerCUDA::update() {
     this->reinit_with_metrics(metric_list_);
   }
 
+  trim_traced_records();
   records_size_after_sync_ = traced_records_.size();
 }
 
@@ -190,7 +186,7 @@ void KernelProfilerCUDA::clear() {
   total_time_ms_ = 0;
   records_size_after_sync_ = 0;
   traced_records_.clear();
-  statistical_results_.clear();
+  clear_statistical_results();
 }
 
 // must be called immediately after KernelProfilerCUDA::trace()
@@ -4,16 +4,34 @@
 namespace gstaichi::lang {
 namespace cpu {
 
+namespace {
+
+struct TaskGroupContext {
+  RuntimeContext *context;
+  const KernelLauncher::TaskFunc *task_funcs;
+};
+
+void run_task_in_group(void *group_context, int thread_id, int i) {
+  auto *group = (TaskGroupContext *)group_context;
+  // Each task needs its own thread id, e.g. for its random states.
+  RuntimeContext this_thread_context = *group->context;
+  this_thread_context.cpu_thread_id = thread_id;
+  group->task_funcs[i](&this_thread_context);
+}
+
+}  // namespace
+
 void KernelLauncher::launch_llvm_kernel(Handle handle,
                                         LaunchContextBuilder &ctx) {
   TI_ASSERT(handle.get_launch_id() < contexts_.size());
-  auto launcher_ctx = contexts_[handle.get_launch_id()];
+  const auto &launcher_ctx = contexts_[handle.get_launch_id()];
   auto *executor = get_runtime_executor();
 
   ctx.get_context().runtime = executor->get_llvm_runtime();
   // For gstaichi ndarrays, context.array_ptrs saves pointer to its
   // |DeviceAllocation|, CPU backend actually want to use the raw ptr here.
   const auto &parameters = *launcher_ctx.parameters;
+  bool has_external_array = false;
   for (int i = 0; i < (int)parameters.size(); i++) {
     const auto &kv = parameters[i];
     const auto &arg_id = kv.first;
@@ -26,6 +44,7 @@ void KernelLauncher::launch_llvm_kernel(Handle handle,
 
       if (ctx.device_allocation_type[arg_id] ==
           LaunchContextBuilder::DevAllocType::kNone) {
+        has_external_array = true;
         ctx.set_ndarray_ptrs(arg_id, (uint64)data_ptr, (uint64)grad_ptr);
       } else if (ctx.array_runtime_sizes[arg_id] > 0) {
         uint64 host_ptr = (uint64)executor->get_device_alloc_info_ptr(
@@ -41,8 +60,46 @@ void KernelLauncher::launch_llvm_kernel(Handle handle,
       }
     }
   }
-  for (auto task : launcher_ctx.task_funcs) {
-    task(&ctx.get_context());
+
+  auto *thread_pool = executor->get_thread_pool();
+  auto *launch_queue = executor->get_launch_queue();
+  if (!launch_queue) {
+    run_tasks(launcher_ctx, thread_pool, &ctx.get_context());
+    return;
+  }
+  if (ctx.result_buffer_size > 0 || has_external_array) {
+    // The caller reads the results, or the external arrays, right after the
+    // launch. External arrays may also not outlive it.
+    launch_queue->wait();
+    run_tasks(launcher_ctx, thread_pool, &ctx.get_context());
+    return;
+  }
+  // |ctx| may be reused or destroyed by the caller as soon as we return, so
+  // the queued launch gets its own copy of the arguments. |launcher_ctx| is
+  // not moved by later registrations, see |contexts_|.
+  auto arg_buffer = std::make_shared<std::vector<char>>(
+      ctx.get_context().arg_buffer,
+      ctx.get_context().arg_buffer + ctx.arg_buffer_size);
+  RuntimeContext context = ctx.get_context();
+  context.arg_buffer = arg_buffer->data();
+  // Only used by the kernels returning values
+  context.result_buffer = nullptr;
+  launch_queue->push([&launcher_ctx, thread_pool, context, arg_buffer]() {
+    RuntimeContext task_context = context;
+    run_tasks(launcher_ctx, thread_pool, &task_context);
+  });
+}
+
+void KernelLauncher::run_tasks(const Context &launcher_ctx,
+                               ThreadPool *thread_pool,
+                               RuntimeContext *context) {
+  for (const auto &[begin, end] : launcher_ctx.task_groups) {
+    if (end - begin == 1) {
+      launcher_ctx.task_funcs[begin](context);
+      continue;
+    }
+    TaskGroupContext group{context, launcher_ctx.task_funcs.data() + begin};
+    thread_pool->run(end - begin, end - begin, &group, run_task_in_group);
   }
 }
 
@@ -62,7 +119,6 @@ KernelLauncher::Handle KernelLauncher::register_llvm_kernel(
     auto *jit_module = executor->create_jit_module(std::move(data.module));
 
     // Construct task_funcs
-    using TaskFunc = int32 (*)(void *);
     std::vector<TaskFunc> task_funcs;
     task_funcs.reserve(data.tasks.size());
     for (auto &task : data.tasks) {
@@ -72,9 +128,24 @@ KernelLauncher::Handle KernelLauncher::register_llvm_kernel(
       task_funcs.push_back((TaskFunc)(func_ptr));
     }
 
+    // Group the tasks that can run concurrently. The kernel profiler times the
+    // tasks one at a time, so it requires running them in order.
+    const auto &config = executor->get_config();
+    bool concurrent = config.cpu_concurrent_tasks && !config.kernel_profiler;
+    std::vector<std::pair<int, int>> task_groups;
+    for (int i = 0; i < (int)data.tasks.size(); i++) {
+      if (concurrent && !task_groups.empty() &&
+          data.tasks[i].concurrent_with_previous) {
+        task_groups.back().second = i + 1;
+      } else {
+        task_groups.emplace_back(i, i + 1);
+      }
+    }
+
     // Populate ctx
     ctx.parameters = &compiled.get_internal_data().args;
     ctx.task_funcs = std::move(task_funcs);
+    ctx.task_groups = std::move(task_groups);
 
     compiled.set_handle(handle);
   }
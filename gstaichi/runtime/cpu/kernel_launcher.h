@@ -1,5 +1,7 @@
 #pragma once
 
+#include <deque>
+
 #include "gstaichi/codegen/llvm/compiled_kernel_data.h"
 #include "gstaichi/runtime/llvm/kernel_launcher.h"
 
@@ -9,13 +11,9 @@ namespace cpu {
 class KernelLauncher : public LLVM::KernelLauncher {
   using Base = LLVM::KernelLauncher;
 
-  struct Context {
-    using TaskFunc = int32 (*)(void *);
-    std::vector<TaskFunc> task_funcs;
-    const std::vector<std::pair<int, Callable::Parameter>> *parameters;
-  };
-
  public:
+  using TaskFunc = int32 (*)(void *);
+
   using Base::Base;
 
   void launch_llvm_kernel(Handle handle, LaunchContextBuilder &ctx) override;
@@ -23,7 +21,22 @@ class KernelLauncher : public LLVM::KernelLauncher {
       const LLVM::CompiledKernelData &compiled) override;
 
  private:
-  std::vector<Context> contexts_;
+  struct Context {
+    std::vector<TaskFunc> task_funcs;
+    // Ranges [begin, end) of task_funcs that run concurrently
+    std::vector<std::pair<int, int>> task_groups;
+    const std::vector<std::pair<int, Callable::Parameter>> *parameters;
+  };
+
+  // Runs the tasks of a kernel, each group of concurrent tasks being run as a
+  // single parallel-for.
+  static void run_tasks(const Context &launcher_ctx,
+                        ThreadPool *thread_pool,
+                        RuntimeContext *context);
+
+  // A deque, so that the launches pending in the launch queue can keep
+  // references to their elements while new kernels are registered.
+  std::deque<Context> contexts_;
 };
 
 }  // namespace cpu
@@ -128,6 +128,13 @@ class GsTaichiLLVMContext {
   LLVMCompiledKernel link_compiled_tasks(
       std::vector<std::unique_ptr<LLVMCompiledTask>> data_list);
 
+  // The linking context is shared by all threads. It must be locked while
+  // linking and optimizing kernel modules when kernels are compiled
+  // concurrently.
+  std::unique_lock<std::mutex> lock_linking_context() {
+    return std::unique_lock<std::mutex>(linking_context_mut_);
+  }
+
   static llvm::DataLayout get_data_layout(Arch arch);
 
  private:
@@ -160,6 +167,7 @@ class GsTaichiLLVMContext {
   ThreadLocalData *main_thread_data_{nullptr};
   std::mutex mut_;
   std::mutex thread_map_mut_;
+  std::mutex linking_context_mut_;
 
   std::unordered_map<int, std::vector<std::string>> snode_tree_funcs_;
 };
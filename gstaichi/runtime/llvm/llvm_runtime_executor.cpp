@@ -80,7 +80,16 @@ LlvmRuntimeExecutor::LlvmRuntimeExecutor(CompileConfig &config,
   }
 
   snode_tree_buffer_manager_ = std::make_unique<SNodeTreeBufferManager>(this);
-  thread_pool_ = std::make_unique<ThreadPool>(config.cpu_max_num_threads);
+  thread_pool_ = std::make_unique<ThreadPool>(config.cpu_max_num_threads,
+                                              config.cpu_thread_spin_us,
+                                              config.cpu_thread_affinity,
+                                              config.kernel_profiler);
+  // The kernel profiler is not thread-safe, and times the kernels as if they
+  // were run synchronously.
+  if (config.async_launch && arch_is_cpu(config.arch) &&
+      !config.kernel_profiler) {
+    launch_queue_ = std::make_unique<SerialTaskQueue>();
+  }
 
   llvm_runtime_ = nullptr;
 
@@ -203,7 +212,14 @@ void LlvmRuntimeExecutor::print_list_manager_info(void *list_manager,
       size_MB);
 }
 
+void LlvmRuntimeExecutor::wait_for_launches() {
+  if (launch_queue_) {
+    launch_queue_->wait();
+  }
+}
+
 void LlvmRuntimeExecutor::synchronize() {
+  wait_for_launches();
   if (config_.arch == Arch::cuda) {
 #if defined(TI_WITH_CUDA)
     CUDADriver::get_instance().stream_synchronize(nullptr);
@@ -387,6 +403,7 @@ DevicePtr LlvmRuntimeExecutor::get_snode_tree_device_ptr(int tree_id) {
 void LlvmRuntimeExecutor::initialize_llvm_runtime_snodes(
     const LlvmOfflineCache::FieldCacheData &field_cache_data,
     uint64 *result_buffer) {
+  wait_for_launches();
   auto *const runtime_jit = get_runtime_jit_module();
   // By the time this creator is called, "this" is already destroyed.
   // Therefore it is necessary to capture members by values.
@@ -472,6 +489,7 @@ LlvmDevice *LlvmRuntimeExecutor::llvm_device() {
 DeviceAllocation LlvmRuntimeExecutor::allocate_memory_on_device(
     std::size_t alloc_size,
     uint64 *result_buffer) {
+  wait_for_launches();
   auto devalloc = llvm_device()->allocate_memory_runtime(
       {{alloc_size, /*host_write=*/false, /*host_read=*/false,
         /*export_sharing=*/false, AllocUsage::Storage},
@@ -487,6 +505,7 @@ DeviceAllocation LlvmRuntimeExecutor::allocate_memory_on_device(
 }
 
 void LlvmRuntimeExecutor::deallocate_memory_on_device(DeviceAllocation handle) {
+  wait_for_launches();
   TI_ASSERT(allocated_runtime_memory_allocs_.find(handle.alloc_id) !=
             allocated_runtime_memory_allocs_.end());
   llvm_device()->dealloc_memory(handle);
@@ -496,6 +515,7 @@ void LlvmRuntimeExecutor::deallocate_memory_on_device(DeviceAllocation handle) {
 void LlvmRuntimeExecutor::fill_ndarray(const DeviceAllocation &alloc,
                                        std::size_t size,
                                        uint32_t data) {
+  wait_for_launches();
   auto ptr = get_device_alloc_info_ptr(alloc);
   if (config_.arch == Arch::cuda) {
 #if defined(TI_WITH_CUDA)
@@ -543,6 +563,8 @@ uint64_t *LlvmRuntimeExecutor::get_device_alloc_info_ptr(
 }
 
 void LlvmRuntimeExecutor::finalize() {
+  // Runs the pending launches before freeing anything
+  launch_queue_.reset();
   profiler_ = nullptr;
   if (config_.arch == Arch::cuda || config_.arch == Arch::amdgpu) {
     preallocated_runtime_objects_allocs_.reset();
@@ -752,6 +774,7 @@ void LlvmRuntimeExecutor::materialize_runtime(KernelProfilerBase *profiler,
 }
 
 void LlvmRuntimeExecutor::destroy_snode_tree(SNodeTree *snode_tree) {
+  wait_for_launches();
   get_llvm_context()->delete_snode_tree(snode_tree->id());
   snode_tree_buffer_manager_->destroy(snode_tree);
 }
@@ -83,6 +83,17 @@ class LlvmRuntimeExecutor {
     return use_device_memory_pool_;
   }
 
+  ThreadPool *get_thread_pool() {
+    return thread_pool_.get();
+  }
+
+  // The queue the CPU kernel launches are pushed to when `async_launch` is
+  // enabled, nullptr otherwise. The host-side operations on the runtime or on
+  // the device memory, as well as synchronize(), wait for it to be drained.
+  SerialTaskQueue *get_launch_queue() {
+    return launch_queue_.get();
+  }
+
  private:
   /* ----------------------- */
   /* ------ Allocation ----- */
@@ -116,11 +127,20 @@ class LlvmRuntimeExecutor {
       std::vector<std::unique_ptr<SNodeTree>> &snode_trees_,
       uint64 *result_buffer);
 
+  std::vector<float64> get_cpu_thread_busy_times() const {
+    return thread_pool_->get_busy_times();
+  }
+
+  void clear_cpu_thread_busy_times() {
+    thread_pool_->clear_busy_times();
+  }
+
   template <typename T, typename... Args>
   T runtime_query(const std::string &key,
                   uint64 *result_buffer,
                   Args &&...args) {
     TI_ASSERT(arch_uses_llvm(config_.arch));
+    wait_for_launches();
 
     auto runtime = get_runtime_jit_module();
     runtime->call<void *>("runtime_" + key, llvm_runtime_,
@@ -141,6 +161,8 @@ class LlvmRuntimeExecutor {
 
   void init_runtime_jit_module(std::unique_ptr<llvm::Module> module);
 
+  void wait_for_launches();
+
  private:
   CompileConfig &config_;
 
@@ -150,6 +172,7 @@ class LlvmRuntimeExecutor {
   void *llvm_runtime_{nullptr};
 
   std::unique_ptr<ThreadPool> thread_pool_{nullptr};
+  std::unique_ptr<SerialTaskQueue> launch_queue_{nullptr};
   std::shared_ptr<Device> device_{nullptr};
 
   std::unique_ptr<SNodeTreeBufferManager> snode_tree_buffer_manager_{nullptr};
@@ -544,6 +544,15 @@ struct ListManager {
     num_elements = n;
   }
 
+  // Resizes the list, allocating the chunks holding its new elements.
+  void resize_and_touch(i32 n) {
+    for (int i = num_elements; i < n;
+         i = ((i >> log2chunk_num_elements) + 1) << log2chunk_num_elements) {
+      touch_chunk(i >> log2chunk_num_elements);
+    }
+    num_elements = n;
+  }
+
   Ptr get_element_ptr(i32 i) {
     return chunks[i >> log2chunk_num_elements] +
            element_size * (i & ((1 << log2chunk_num_elements) - 1));
@@ -749,6 +758,13 @@ struct NodeManager {
     recycled_list->append(&index);
   }
 
+  // Number of free nodes left to allocate before new ones are needed.
+  i32 num_free() {
+    return max_i32(free_list->size() - free_list_used, 0);
+  }
+
+  void gc_parallel(int num_threads);
+
   void gc_serial() {
     // compact free list
     for (int i = free_list_used; i < free_list->size(); i++) {
@@ -1774,8 +1790,99 @@ Ptr ListManager::allocate() {
   return get_element_ptr(i);
 }
 
-void node_gc(LLVMRuntime *runtime, int snode_id) {
-  runtime->node_allocators[snode_id]->gc_serial();
+// Number of elements of the lists processed by each task of the parallel GC
+constexpr int gc_grain_size = 4096;
+
+struct gc_helper_context {
+  NodeManager *allocator;
+  // Moves the free list elements from |src_begin| on to |dst_begin| on
+  i32 src_begin;
+  i32 dst_begin;
+  i32 num_elements;
+  // Whether the recycled nodes are zero-filled as well
+  bool recycle;
+};
+
+void gc_helper(void *ctx_, int thread_id, int i) {
+  auto ctx = (gc_helper_context *)ctx_;
+  auto allocator = ctx->allocator;
+  using T = NodeManager::list_data_type;
+  int begin = i * gc_grain_size;
+  int end = std::min(begin + gc_grain_size, ctx->num_elements);
+  for (int j = begin; j < end; j++) {
+    if (ctx->recycle) {
+      auto idx = allocator->recycled_list->get<T>(j);
+      auto ptr = allocator->data_list->get_element_ptr(idx);
+      std::memset(ptr, 0, allocator->element_size);
+      allocator->free_list->get<T>(ctx->dst_begin + j) = idx;
+    } else {
+      allocator->free_list->get<T>(ctx->dst_begin + j) =
+          allocator->free_list->get<T>(ctx->src_begin + j);
+    }
+  }
+}
+
+void run_gc_helper(LLVMRuntime *runtime,
+                   gc_helper_context *ctx,
+                   int num_threads) {
+  int num_tasks = (ctx->num_elements + gc_grain_size - 1) / gc_grain_size;
+  if (num_tasks <= 1) {
+    for (int i = 0; i < num_tasks; i++) {
+      gc_helper(ctx, 0, i);
+    }
+  } else {
+    runtime->parallel_for(runtime->thread_pool, num_tasks, num_threads, ctx,
+                          gc_helper);
+  }
+}
+
+// Same as gc_serial, splitting the moves of the free list elements and the
+// zero-fill of the recycled nodes across the CPU thread pool.
+void NodeManager::gc_parallel(int num_threads) {
+  // Move the unused elements to the beginning of the free list. Only the ones
+  // which do not end up there already are moved, so that the ranges moved
+  // from and to do not overlap.
+  const i32 size = free_list->size();
+  const i32 num_unused = num_free();
+  gc_helper_context ctx;
+  ctx.allocator = this;
+  ctx.num_elements = std::min(num_unused, size - num_unused);
+  ctx.src_begin = size - ctx.num_elements;
+  ctx.dst_begin = 0;
+  ctx.recycle = false;
+  run_gc_helper(runtime, &ctx, num_threads);
+  free_list_used = 0;
+
+  // Zero-fill the recycled nodes and append them to the free list
+  const i32 num_recycled = recycled_list->size();
+  free_list->resize(num_unused);
+  free_list->resize_and_touch(num_unused + num_recycled);
+  ctx.num_elements = num_recycled;
+  ctx.dst_begin = num_unused;
+  ctx.recycle = true;
+  run_gc_helper(runtime, &ctx, num_threads);
+  recycled_list->clear();
+}
+
+// Garbage collection of the nodes of |snode_id| deactivated by the preceding
+// offloaded task, on CPU. With a positive |free_list_threshold|, the
+// deactivated nodes are only reclaimed once fewer free nodes than that are
+// left, instead of every time.
+void node_gc(LLVMRuntime *runtime,
+             int snode_id,
+             int num_threads,
+             int free_list_threshold) {
+  auto allocator = runtime->node_allocators[snode_id];
+  if (allocator->recycled_list->size() == 0 ||
+      (free_list_threshold > 0 &&
+       allocator->num_free() >= free_list_threshold)) {
+    return;
+  }
+#if ARCH_cuda || ARCH_amdgpu
+  allocator->gc_serial();
+#else
+  allocator->gc_parallel(num_threads);
+#endif
 }
 
 void gc_parallel_impl_0(RuntimeContext *context, NodeManager *allocator) {
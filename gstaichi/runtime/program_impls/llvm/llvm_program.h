@@ -159,6 +159,17 @@ class LlvmProgramImpl : public ProgramImpl {
     runtime_exec_->print_memory_profiler_info(snode_trees_, result_buffer);
   }
 
+  std::vector<float64> get_cpu_thread_busy_times() override {
+    if (!arch_is_cpu(config->arch)) {
+      return {};
+    }
+    return runtime_exec_->get_cpu_thread_busy_times();
+  }
+
+  void clear_cpu_thread_busy_times() override {
+    runtime_exec_->clear_cpu_thread_busy_times();
+  }
+
   GsTaichiLLVMContext *get_llvm_context() {
     return runtime_exec_->get_llvm_context();
   }
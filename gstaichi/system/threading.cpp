@@ -6,12 +6,137 @@
 #include "gstaichi/system/threading.h"
 
 #include <algorithm>
+#include <chrono>
 #include <condition_variable>
 #include <thread>
 #include <vector>
 
+#if defined(__x86_64__) || defined(_M_X64) || defined(__i386__) || \
+    defined(_M_IX86)
+#include <immintrin.h>
+#endif
+
+#if defined(TI_PLATFORM_LINUX)
+#include <pthread.h>
+#include <sched.h>
+#endif
+
 namespace gstaichi {
 
+namespace {
+
+// The pool the current thread is a worker of, if any, and its id in there.
+thread_local ThreadPool *current_pool = nullptr;
+thread_local int current_thread_id = 0;
+
+inline void cpu_relax() {
+#if defined(__x86_64__) || defined(_M_X64) || defined(__i386__) || \
+    defined(_M_IX86)
+  _mm_pause();
+#elif defined(__aarch64__) && !defined(_MSC_VER)
+  asm volatile("yield");
+#else
+  std::this_thread::yield();
+#endif
+}
+
+// Busy-waits until `pred` holds or `spin_us` microseconds have elapsed.
+// Returns whether `pred` holds.
+template <typename Pred>
+bool spin_wait(int spin_us, const Pred &pred) {
+  if (spin_us <= 0) {
+    return pred();
+  }
+  auto deadline =
+      std::chrono::steady_clock::now() + std::chrono::microseconds(spin_us);
+  while (true) {
+    // Only query the clock once in a while, it is much slower than `pred`.
+    for (int i = 0; i < 64; i++) {
+      if (pred()) {
+        return true;
+      }
+      cpu_relax();
+    }
+    if (std::chrono::steady_clock::now() >= deadline) {
+      return pred();
+    }
+    // Let the other threads run if the cores are oversubscribed.
+    std::this_thread::yield();
+  }
+}
+
+void pin_current_thread(int core) {
+#if defined(TI_PLATFORM_LINUX)
+  cpu_set_t cpuset;
+  CPU_ZERO(&cpuset);
+  CPU_SET(core, &cpuset);
+  if (pthread_setaffinity_np(pthread_self(), sizeof(cpuset), &cpuset) != 0) {
+    TI_WARN("Failed to pin CPU worker thread to core {}.", core);
+  }
+#elif defined(TI_PLATFORM_WINDOWS)
+  if (SetThreadAffinityMask(GetCurrentThread(), DWORD_PTR(1) << core) == 0) {
+    TI_WARN("Failed to pin CPU worker thread to core {}.", core);
+  }
+#endif
+}
+
+inline uint64 pack_range(int head, int tail) {
+  return ((uint64)(uint32)head << 32) | (uint32)tail;
+}
+
+inline void unpack_range(uint64 range, int &head, int &tail) {
+  head = (int)(uint32)(range >> 32);
+  tail = (int)(uint32)range;
+}
+
+// Pops the first task of the queue owned by the calling thread.
+bool pop_task(ThreadPool::WorkerQueue &queue, int &task_id) {
+  uint64 range = queue.range.load(std::memory_order_acquire);
+  while (true) {
+    int head, tail;
+    unpack_range(range, head, tail);
+    if (head >= tail) {
+      return false;
+    }
+    if (queue.range.compare_exchange_weak(range, pack_range(head + 1, tail),
+                                          std::memory_order_acq_rel)) {
+      task_id = head;
+      return true;
+    }
+  }
+}
+
+// Moves the back half of the first non-empty queue of another thread into
+// the (empty) queue of thread `thread_id`.
+bool steal_tasks(ThreadPool::WorkerQueue *queues,
+                 int num_queues,
+                 int thread_id) {
+  for (int k = 1; k < num_queues; k++) {
+    auto &victim = queues[(thread_id + k) % num_queues];
+    uint64 range = victim.range.load(std::memory_order_acquire);
+    while (true) {
+      int head, tail;
+      unpack_range(range, head, tail);
+      if (head >= tail) {
+        break;
+      }
+      int stolen_head = tail - (tail - head + 1) / 2;
+      if (victim.range.compare_exchange_weak(range,
+                                             pack_range(head, stolen_head),
+                                             std::memory_order_acq_rel)) {
+        // Nobody else writes to an empty queue, and task ids are never handed
+        // out twice, so the thieves of this queue cannot suffer from ABA.
+        queues[thread_id].range.store(pack_range(stolen_head, tail),
+                                      std::memory_order_release);
+        return true;
+      }
+    }
+  }
+  return false;
+}
+
+}  // namespace
+
 bool test_threading() {
   auto tp = ThreadPool(20);
   for (int j = 0; j < 100; j++) {
@@ -26,14 +151,26 @@ bool test_threading() {
   return true;
 }
 
-ThreadPool::ThreadPool(int max_num_threads) : max_num_threads(max_num_threads) {
+ThreadPool::ThreadPool(int max_num_threads,
+                       int spin_us,
+                       bool pin_threads,
+                       bool track_busy_time)
+    : queues(new WorkerQueue[max_num_threads]),
+      max_num_threads(max_num_threads),
+      spin_us(spin_us),
+      pin_threads(pin_threads),
+      track_busy_time(track_busy_time) {
+#if !defined(TI_PLATFORM_LINUX) && !defined(TI_PLATFORM_WINDOWS)
+  if (pin_threads) {
+    TI_WARN("Pinning CPU worker threads is not supported on this platform.");
+    this->pin_threads = false;
+  }
+#endif
   exiting = false;
   started = false;
   running_threads = 0;
   timestamp = 1;
   last_finished = 0;
-  task_head = 0;
-  task_tail = 0;
   thread_counter = 0;
   threads.resize((std::size_t)max_num_threads);
   for (int i = 0; i < max_num_threads; i++) {
@@ -45,6 +182,16 @@ void ThreadPool::run(int splits,
                      int desired_num_threads,
                      void *range_for_task_context,
                      RangeForTaskFunc *func) {
+  if (current_pool == this) {
+    // Called from a task of this pool, e.g. by offloaded tasks running
+    // concurrently. The other threads may all be busy, so run the tasks here.
+    for (int i = 0; i < splits; i++) {
+      func(range_for_task_context, current_thread_id, i);
+    }
+    return;
+  }
+  uint64 run_timestamp;
+  int num_queues;
   {
     std::lock_guard _(mutex);
     this->range_for_task_context = range_for_task_context;
@@ -53,30 +200,57 @@ void ThreadPool::run(int splits,
     TI_ASSERT(this->desired_num_threads > 0);
     // TI_P(this->desired_num_threads);
     started = false;
-    task_head = 0;
-    task_tail = splits;
-    timestamp++;
-    TI_ASSERT(timestamp < (1LL << 62));  // avoid overflowing here
+    num_queues = this->desired_num_threads;
+    for (int i = 0; i < num_queues; i++) {
+      int head = (int)((int64)splits * i / num_queues);
+      int tail = (int)((int64)splits * (i + 1) / num_queues);
+      queues[i].range.store(pack_range(head, tail), std::memory_order_relaxed);
+    }
+    run_timestamp = ++timestamp;
+    TI_ASSERT(run_timestamp < (1ULL << 62));  // avoid overflowing here
   }
 
-  // wake up all slaves
+  // wake up all slaves. This is cheap when they are all spinning, since no one
+  // is waiting on the condition variable then.
   slave_cv.notify_all();
+  // Small tasks usually finish within the spin budget, which saves putting the
+  // master thread to sleep and waking it up again.
+  spin_wait(spin_us, [this, run_timestamp] {
+    return last_finished.load(std::memory_order_acquire) >= run_timestamp;
+  });
   {
     std::unique_lock<std::mutex> lock(mutex);
     // TODO: the workers may have finished before master waiting on master_cv
     master_cv.wait(lock, [this] { return started && running_threads == 0; });
   }
-  TI_ASSERT(task_head >= task_tail);
+  for (int i = 0; i < num_queues; i++) {
+    int head, tail;
+    unpack_range(queues[i].range.load(std::memory_order_relaxed), head, tail);
+    TI_ASSERT(head >= tail);
+  }
 }
 
 void ThreadPool::target() {
   uint64 last_timestamp = 0;
   int thread_id;
+  int num_queues;
   {
     std::lock_guard<std::mutex> lock(mutex);
     thread_id = thread_counter++;
   }
+  current_pool = this;
+  current_thread_id = thread_id;
+  if (pin_threads) {
+    int num_cores = std::max(1, (int)std::thread::hardware_concurrency());
+    pin_current_thread(thread_id % num_cores);
+  }
   while (true) {
+    // Tasks usually come in bursts, so look for the next one for a while
+    // before going to sleep.
+    spin_wait(spin_us, [this, &last_timestamp] {
+      return timestamp.load(std::memory_order_acquire) > last_timestamp ||
+             exiting.load(std::memory_order_relaxed);
+    });
     {
       std::unique_lock<std::mutex> lock(mutex);
       slave_cv.wait(lock, [this, last_timestamp, thread_id] {
@@ -96,21 +270,36 @@ void ThreadPool::target() {
         } else {
           started = true;
           running_threads++;
+          num_queues = desired_num_threads;
         }
       }
     }
 
+    std::chrono::steady_clock::time_point start_time;
+    if (track_busy_time) {
+      start_time = std::chrono::steady_clock::now();
+    }
+    auto &queue = queues[thread_id];
     while (true) {
       // For a single parallel task
       int task_id;
-      {
-        task_id = task_head.fetch_add(1, std::memory_order_relaxed);
-        if (task_id >= task_tail)
+      if (!pop_task(queue, task_id)) {
+        // Tasks only move to the queues of running threads, which run them
+        // before leaving, so this thread is done once a scan finds nothing.
+        if (!steal_tasks(queues.get(), num_queues, thread_id))
           break;
+        continue;
       }
 
       func(this->range_for_task_context, thread_id, task_id);
     }
+    if (track_busy_time) {
+      auto busy_time = std::chrono::steady_clock::now() - start_time;
+      queue.busy_ns.fetch_add(
+          std::chrono::duration_cast<std::chrono::nanoseconds>(busy_time)
+              .count(),
+          std::memory_order_relaxed);
+    }
 
     bool all_finished = false;
     {
@@ -126,6 +315,20 @@ void ThreadPool::target() {
   }
 }
 
+std::vector<float64> ThreadPool::get_busy_times() const {
+  std::vector<float64> busy_times((std::size_t)max_num_threads);
+  for (int i = 0; i < max_num_threads; i++) {
+    busy_times[i] = queues[i].busy_ns.load(std::memory_order_relaxed) * 1e-9;
+  }
+  return busy_times;
+}
+
+void ThreadPool::clear_busy_times() {
+  for (int i = 0; i < max_num_threads; i++) {
+    queues[i].busy_ns.store(0, std::memory_order_relaxed);
+  }
+}
+
 ThreadPool::~ThreadPool() {
   {
     std::lock_guard<std::mutex> lg(mutex);
@@ -136,4 +339,73 @@ ThreadPool::~ThreadPool() {
     th.join();
 }
 
+SerialTaskQueue::SerialTaskQueue() {
+  thread_ = std::thread([this] { target(); });
+}
+
+void SerialTaskQueue::push(std::function<void()> task) {
+  {
+    std::lock_guard<std::mutex> lg(mutex_);
+    tasks_.push_back(std::move(task));
+  }
+  task_cv_.notify_one();
+}
+
+void SerialTaskQueue::wait() {
+  if (std::this_thread::get_id() == thread_.get_id()) {
+    return;
+  }
+  std::exception_ptr error;
+  {
+    std::unique_lock<std::mutex> lock(mutex_);
+    idle_cv_.wait(lock, [this] { return tasks_.empty() && !busy_; });
+    std::swap(error, error_);
+  }
+  if (error) {
+    std::rethrow_exception(error);
+  }
+}
+
+void SerialTaskQueue::target() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  while (true) {
+    task_cv_.wait(lock, [this] { return exiting_ || !tasks_.empty(); });
+    if (tasks_.empty()) {
+      // Exiting
+      break;
+    }
+    auto task = std::move(tasks_.front());
+    tasks_.pop_front();
+    busy_ = true;
+    lock.unlock();
+    std::exception_ptr error;
+    try {
+      task();
+    } catch (...) {
+      error = std::current_exception();
+    }
+    lock.lock();
+    busy_ = false;
+    if (error) {
+      // The following tasks may depend on the results of the failed one
+      tasks_.clear();
+      if (!error_) {
+        error_ = error;
+      }
+    }
+    if (tasks_.empty()) {
+      idle_cv_.notify_all();
+    }
+  }
+}
+
+SerialTaskQueue::~SerialTaskQueue() {
+  {
+    std::lock_guard<std::mutex> lg(mutex_);
+    exiting_ = true;
+  }
+  task_cv_.notify_one();
+  thread_.join();
+}
+
 }  // namespace gstaichi
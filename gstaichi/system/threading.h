@@ -9,7 +9,10 @@
 
 #include <atomic>
 #include <condition_variable>
+#include <deque>
+#include <exception>
 #include <functional>
+#include <memory>
 #include <thread>
 
 namespace gstaichi {
@@ -19,19 +22,38 @@ using ParallelFor = void(int n, int num_threads, void *, RangeForTaskFunc func);
 
 class ThreadPool {
  public:
+  // The task queue of a worker thread. The tasks of a `run` are split evenly
+  // between the queues of the desired threads. Each thread pops tasks from the
+  // front of its own queue, and steals the back half of another queue once
+  // its own is empty.
+  struct alignas(64) WorkerQueue {
+    // Task ids [head, tail), packed as (head << 32) | tail so that the owner
+    // and the thieves can both update it with a single CAS.
+    std::atomic<uint64> range{0};
+    // Nanoseconds spent running tasks, only counted if `track_busy_time`.
+    std::atomic<int64> busy_ns{0};
+  };
+
   std::vector<std::thread> threads;
   std::condition_variable slave_cv;
   std::condition_variable master_cv;
   std::mutex mutex;
-  std::atomic<int> task_head;
-  int task_tail;
+  std::unique_ptr<WorkerQueue[]> queues;
   int running_threads;
   int max_num_threads;
   int desired_num_threads;
-  uint64 timestamp;
-  uint64 last_finished;
+  // Written under `mutex`, but also polled without it while spinning.
+  std::atomic<uint64> timestamp;
+  std::atomic<uint64> last_finished;
   bool started;
-  bool exiting;
+  std::atomic<bool> exiting;
+  // How long the workers (resp. the master) busy-wait for a new task (resp.
+  // for the task to finish) before parking on the condition variables. Zero
+  // parks right away.
+  int spin_us;
+  // Pin worker `i` to logical core `i`.
+  bool pin_threads;
+  bool track_busy_time;
   RangeForTaskFunc *func;
   void *range_for_task_context;  // Note: this is a pointer to a
                                  // range_task_helper_context defined in the
@@ -39,7 +61,10 @@ class ThreadPool {
                                  // gstaichi::lang::Context.
   int thread_counter;
 
-  explicit ThreadPool(int max_num_threads);
+  explicit ThreadPool(int max_num_threads,
+                      int spin_us = 0,
+                      bool pin_threads = false,
+                      bool track_busy_time = false);
 
   void run(int splits,
            int desired_num_threads,
@@ -56,7 +81,40 @@ class ThreadPool {
 
   void target();
 
+  // Time spent running tasks by each worker thread, in seconds.
+  std::vector<float64> get_busy_times() const;
+
+  void clear_busy_times();
+
   ~ThreadPool();
 };
 
+// Runs the tasks pushed to it one at a time, in order, on a dedicated thread.
+class SerialTaskQueue {
+ public:
+  SerialTaskQueue();
+
+  void push(std::function<void()> task);
+
+  // Blocks until all the tasks pushed so far have run. If one of them threw,
+  // the tasks pushed after it are dropped and its exception is rethrown here.
+  // Returns right away when called from a task.
+  void wait();
+
+  // Waits for the pending tasks, ignoring their exceptions.
+  ~SerialTaskQueue();
+
+ private:
+  void target();
+
+  std::mutex mutex_;
+  std::condition_variable task_cv_;
+  std::condition_variable idle_cv_;
+  std::deque<std::function<void()>> tasks_;
+  bool busy_{false};
+  bool exiting_{false};
+  std::exception_ptr error_;
+  std::thread thread_;
+};
+
 }  // namespace gstaichi
@@ -1,15 +1,21 @@
 #include "gstaichi/system/timeline.h"
 
+#include <unordered_map>
+
 namespace gstaichi {
 
-std::string TimelineEvent::to_json() {
+std::string TimelineEvent::to_json(int thread_id) const {
   std::string json{"{"};
   json += fmt::format("\"cat\":\"gstaichi\",");
   json += fmt::format("\"pid\":0,");
-  json += fmt::format("\"tid\":\"{}\",", tid);
+  json += fmt::format("\"tid\":{},", thread_id);
   json += fmt::format("\"ph\":\"{}\",", begin ? "B" : "E");
   json += fmt::format("\"name\":\"{}\",", name);
-  json += fmt::format("\"ts\":\"{}\"", uint64(time * 1000000));
+  if (!args.empty()) {
+    json += fmt::format("\"args\":{{{}}},", args);
+  }
+  // In microseconds
+  json += fmt::format("\"ts\":{:.3f}", time * 1000000);
   json += "}";
   return json;
 }
@@ -46,14 +52,38 @@ std::vector<TimelineEvent> Timeline::fetch_events() {
   return fetched;
 }
 
-Timeline::Guard::Guard(const std::string &name) : name_(name) {
+Timeline::Guard::Guard(const std::string &name) {
+  if (!Timelines::get_instance().get_enabled()) {
+    return;
+  }
+  active_ = true;
+  name_ = name;
   auto &timeline = Timeline::get_this_thread_instance();
   timeline.insert_event({name, true, Time::get_time(), timeline.tid_});
 }
 
+Timeline::Guard::Guard(const std::string &name,
+                       const std::string &kernel_name) {
+  if (!Timelines::get_instance().get_enabled()) {
+    return;
+  }
+  active_ = true;
+  name_ = name;
+  auto &timeline = Timeline::get_this_thread_instance();
+  timeline.insert_event({name, true, Time::get_time(), timeline.tid_,
+                         fmt::format("\"kernel\":\"{}\"", kernel_name)});
+}
+
 Timeline::Guard::~Guard() {
+  if (!active_) {
+    return;
+  }
+  // The end of a span is recorded even if the timeline got disabled in the
+  // meantime, so that spans stay balanced.
   auto &timeline = Timeline::get_this_thread_instance();
-  timeline.insert_event({name_, false, Time::get_time(), timeline.tid_});
+  std::lock_guard<std::mutex> _(timeline.mut_);
+  timeline.events_.push_back(
+      {name_, false, Time::get_time(), timeline.tid_, ""});
 }
 
 void Timelines::insert_events(const std::vector<TimelineEvent> &events) {
@@ -90,16 +120,31 @@ void Timelines::save(const std::string &filename) {
   if (!ends_with(filename, ".json")) {
     TI_WARN("Timeline filename {} should end with '.json'.", filename);
   }
+  // Trace viewers expect integer thread ids, the name of each thread is
+  // given by a metadata event instead.
+  std::unordered_map<std::string, int> thread_ids;
   std::ofstream fout(filename);
   fout << "[";
   bool first = true;
-  for (auto &e : events_) {
+  auto separate = [&]() {
     if (first) {
       first = false;
     } else {
       fout << ",";
     }
-    fout << e.to_json() << std::endl;
+  };
+  for (auto &e : events_) {
+    auto [it, inserted] = thread_ids.try_emplace(e.tid, thread_ids.size());
+    if (inserted) {
+      separate();
+      fout << fmt::format(
+                  "{{\"ph\":\"M\",\"pid\":0,\"tid\":{},"
+                  "\"name\":\"thread_name\",\"args\":{{\"name\":\"{}\"}}}}",
+                  it->second, e.tid)
+           << std::endl;
+    }
+    separate();
+    fout << e.to_json(it->second) << std::endl;
   }
   fout << "]";
 }
@@ -1,5 +1,6 @@
 #pragma once
 
+#include <atomic>
 #include <vector>
 #include <mutex>
 
@@ -13,8 +14,11 @@ struct TimelineEvent {
   bool begin;
   float64 time;
   std::string tid;
+  // Arguments of the event, as the members of a JSON object, e.g.
+  // `"kernel":"foo"`. May be empty.
+  std::string args;
 
-  std::string to_json();
+  std::string to_json(int thread_id) const;
 };
 
 class Timeline {
@@ -39,13 +43,18 @@ class Timeline {
 
   std::vector<TimelineEvent> fetch_events();
 
+  // Records a span lasting for the lifetime of the guard. Nothing is copied
+  // nor timed when the timeline is disabled.
   class Guard {
    public:
     explicit Guard(const std::string &name);
 
+    Guard(const std::string &name, const std::string &kernel_name);
+
     ~Guard();
 
    private:
+    bool active_{false};
     std::string name_;
   };
 
@@ -80,7 +89,7 @@ class Timelines {
   std::mutex mut_;
   std::vector<TimelineEvent> events_;
   std::vector<Timeline *> timelines_;
-  bool enabled_{false};
+  std::atomic<bool> enabled_{false};
 };
 
 #define TI_TIMELINE(name) \
@@ -88,4 +97,7 @@ class Timelines {
 
 #define TI_AUTO_TIMELINE TI_TIMELINE(__FUNCTION__)
 
+#define TI_KERNEL_TIMELINE(name, kernel_name) \
+  gstaichi::Timeline::Guard _timeline_guard_##__LINE__(name, kernel_name);
+
 }  // namespace gstaichi
@@ -4,6 +4,8 @@
 #include "gstaichi/program/function.h"
 #include "gstaichi/program/compile_config.h"
 
+#include <mutex>
+
 namespace gstaichi::lang {
 
 class CompileGsTaichiFunctions : public BasicStmtVisitor {
@@ -45,6 +47,10 @@ void compile_gstaichi_functions(IRNode *ir,
                                 const CompileConfig &compile_config,
                                 Function::IRStage target_stage) {
   TI_AUTO_PROF;
+  // Functions are shared between kernels and compiled in-place, while kernels
+  // may be compiled concurrently. compile_function may recurse into this pass.
+  static std::recursive_mutex mut;
+  std::lock_guard<std::recursive_mutex> _(mut);
   CompileGsTaichiFunctions::run(ir, compile_config, target_stage);
 }
 
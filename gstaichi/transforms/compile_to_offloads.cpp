@@ -4,6 +4,7 @@
 #include "gstaichi/ir/pass.h"
 #include "gstaichi/ir/visitors.h"
 #include "gstaichi/program/compile_config.h"
+#include "gstaichi/program/compile_profiler.h"
 #include "gstaichi/program/extension.h"
 #include "gstaichi/program/function.h"
 #include "gstaichi/program/kernel.h"
@@ -23,8 +24,10 @@ void compile_to_offloads(IRNode *ir,
                          bool start_from_ast) {
   TI_AUTO_PROF;
 
-  auto print = make_pass_printer(verbose, config.print_ir_dbg_info,
-                                 kernel->get_name(), ir);
+  auto print = make_profiled_pass_printer(
+      make_pass_printer(verbose, config.print_ir_dbg_info, kernel->get_name(),
+                        ir),
+      kernel, "compile_to_offloads", ir);
   print("Initial IR");
 
   if (!verbose && config.print_preprocessed_ir && start_from_ast) {
@@ -185,8 +188,10 @@ void offload_to_executable(IRNode *ir,
                            bool make_block_local) {
   TI_AUTO_PROF;
 
-  auto print = make_pass_printer(verbose, config.print_ir_dbg_info,
-                                 kernel->get_name(), ir);
+  auto print = make_profiled_pass_printer(
+      make_pass_printer(verbose, config.print_ir_dbg_info, kernel->get_name(),
+                        ir),
+      kernel, "offload_to_executable", ir);
 
   // TODO: This is just a proof that we can demote struct-fors after offloading.
   // Eventually we might want the order to be TLS/BLS -> demote struct-for.
@@ -198,11 +203,22 @@ void offload_to_executable(IRNode *ir,
   print("Start offload_to_executable");
   irpass::analysis::verify(ir);
 
+  if (kernel->fuse_offloads) {
+    irpass::fuse_offloads(ir);
+    print("Offloads fused");
+    irpass::analysis::verify(ir);
+  }
+
   if (config.detect_read_only) {
     irpass::detect_read_only(ir);
     print("Detect read-only accesses");
   }
 
+  if (arch_is_cpu(config.arch)) {
+    irpass::mark_concurrent_offloads(ir);
+    print("Concurrent offloads marked");
+  }
+
   irpass::demote_atomics(ir, config);
   print("Atomics demoted I");
   irpass::analysis::verify(ir);
@@ -0,0 +1,322 @@
+#include "gstaichi/ir/ir.h"
+#include "gstaichi/ir/statements.h"
+#include "gstaichi/ir/analysis.h"
+#include "gstaichi/ir/snode.h"
+#include "gstaichi/ir/transforms.h"
+
+#include <array>
+#include <unordered_map>
+#include <unordered_set>
+
+namespace gstaichi::lang {
+
+namespace irpass {
+
+namespace {
+
+using TaskType = OffloadedStmt::TaskType;
+
+// The global memory accessed by the body of an offloaded task.
+struct TaskAccesses {
+  // Pointers to the leaf SNodes accessed. Bit-level SNodes are replaced by
+  // the SNode holding their physical storage.
+  std::unordered_map<SNode *, std::vector<GlobalPtrStmt *>> snode_ptrs;
+  std::unordered_set<SNode *> snode_writes;
+  // SNode trees accessed (resp. whose sparse structure may be modified).
+  std::unordered_set<int> tree_reads;
+  std::unordered_set<int> tree_writes;
+  // External arrays may alias each other, so they are all treated as one.
+  bool external_read{false};
+  bool external_write{false};
+  bool temporary_read{false};
+  bool temporary_write{false};
+  // Side effects whose order would change, or accesses that cannot be
+  // tracked.
+  bool unknown{false};
+};
+
+SNode *storage_snode(SNode *snode) {
+  while (snode->is_bit_level && snode->parent) {
+    snode = snode->parent;
+  }
+  return snode;
+}
+
+TaskAccesses gather_task_accesses(OffloadedStmt *offload) {
+  TaskAccesses accesses;
+  irpass::analysis::gather_statements(offload->body.get(), [&](Stmt *stmt) {
+    Stmt *ptr = nullptr;
+    bool read = false, write = false;
+    if (auto global_ptr = stmt->cast<GlobalPtrStmt>()) {
+      auto *snode = global_ptr->snode;
+      accesses.snode_ptrs[storage_snode(snode)].push_back(global_ptr);
+      accesses.tree_reads.insert(snode->get_snode_tree_id());
+    } else if (auto global_load = stmt->cast<GlobalLoadStmt>()) {
+      read = true;
+      ptr = global_load->src;
+    } else if (auto global_store = stmt->cast<GlobalStoreStmt>()) {
+      write = true;
+      ptr = global_store->dest;
+    } else if (auto global_atomic = stmt->cast<AtomicOpStmt>()) {
+      read = true;
+      write = true;
+      ptr = global_atomic->dest;
+    } else if (stmt->is<SNodeOpStmt>() || stmt->is<PrintStmt>() ||
+               stmt->is<ReturnStmt>() || stmt->is<ExternalFuncCallStmt>() ||
+               stmt->is<InternalFuncStmt>() || stmt->is<FuncCallStmt>()) {
+      accesses.unknown = true;
+    }
+    if (ptr) {
+      while (auto *matrix_ptr = ptr->cast<MatrixPtrStmt>()) {
+        ptr = matrix_ptr->origin;
+      }
+      if (auto global_ptr = ptr->cast<GlobalPtrStmt>()) {
+        if (write) {
+          auto *snode = global_ptr->snode;
+          accesses.snode_writes.insert(storage_snode(snode));
+          if (!snode->is_path_all_dense) {
+            // Writing to a sparse SNode activates it
+            accesses.tree_writes.insert(snode->get_snode_tree_id());
+          }
+        }
+      } else if (ptr->is<ExternalPtrStmt>()) {
+        accesses.external_read |= read;
+        accesses.external_write |= write;
+      } else if (ptr->is<GlobalTemporaryStmt>()) {
+        accesses.temporary_read |= read;
+        accesses.temporary_write |= write;
+      } else if (!ptr->is<AllocaStmt>()) {
+        accesses.unknown = true;
+      }
+    }
+    return false;
+  });
+  return accesses;
+}
+
+// Whether |ptr| points to the element of the current iteration of |offload|,
+// i.e. is indexed by the loop indices of |offload| and nothing else.
+bool is_iteration_local(GlobalPtrStmt *ptr, OffloadedStmt *offload) {
+  auto *snode = ptr->snode;
+  if (snode->is_bit_level || !snode->is_path_all_dense) {
+    return false;
+  }
+  const int num_indices = ptr->indices.size();
+  if (offload->task_type == TaskType::range_for && num_indices != 1) {
+    return false;
+  }
+  if (num_indices == 0 || num_indices != snode->num_active_indices) {
+    return false;
+  }
+  for (int k = 0; k < num_indices; k++) {
+    auto *index = ptr->indices[k]->cast<LoopIndexStmt>();
+    if (!index || index->loop != offload) {
+      return false;
+    }
+    int expected = offload->task_type == TaskType::range_for
+                       ? 0
+                       : snode->physical_index_position[k];
+    if (index->index != expected) {
+      return false;
+    }
+  }
+  return true;
+}
+
+bool all_iteration_local(const std::vector<GlobalPtrStmt *> &ptrs,
+                         OffloadedStmt *offload) {
+  for (auto *ptr : ptrs) {
+    if (!is_iteration_local(ptr, offload)) {
+      return false;
+    }
+  }
+  return true;
+}
+
+template <typename T>
+bool intersects(const std::unordered_set<T> &a,
+                const std::unordered_set<T> &b) {
+  for (const auto &x : a) {
+    if (b.count(x)) {
+      return true;
+    }
+  }
+  return false;
+}
+
+// Whether an iteration of |b| may depend on another iteration of |a| than
+// the same one, in which case running both bodies one after the other
+// within a single loop would not be equivalent to running |a| to completion
+// first.
+bool has_cross_iteration_dependency(OffloadedStmt *a,
+                                    const TaskAccesses &a_accesses,
+                                    OffloadedStmt *b,
+                                    const TaskAccesses &b_accesses) {
+  if (a_accesses.unknown || b_accesses.unknown) {
+    return true;
+  }
+  if (intersects(a_accesses.tree_writes, b_accesses.tree_reads) ||
+      intersects(b_accesses.tree_writes, a_accesses.tree_reads)) {
+    return true;
+  }
+  if ((a_accesses.external_write &&
+       (b_accesses.external_read || b_accesses.external_write)) ||
+      (b_accesses.external_write && a_accesses.external_read)) {
+    return true;
+  }
+  if ((a_accesses.temporary_write &&
+       (b_accesses.temporary_read || b_accesses.temporary_write)) ||
+      (b_accesses.temporary_write && a_accesses.temporary_read)) {
+    return true;
+  }
+  for (auto &[snode, a_ptrs] : a_accesses.snode_ptrs) {
+    auto b_it = b_accesses.snode_ptrs.find(snode);
+    if (b_it == b_accesses.snode_ptrs.end()) {
+      continue;
+    }
+    if (!a_accesses.snode_writes.count(snode) &&
+        !b_accesses.snode_writes.count(snode)) {
+      continue;
+    }
+    if (!all_iteration_local(a_ptrs, a) ||
+        !all_iteration_local(b_it->second, b)) {
+      return true;
+    }
+  }
+  return false;
+}
+
+std::array<int, gstaichi_max_num_indices> iteration_shape(SNode *snode) {
+  std::array<int, gstaichi_max_num_indices> shape;
+  shape.fill(1);
+  for (; snode->type != SNodeType::root; snode = snode->parent) {
+    for (int j = 0; j < gstaichi_max_num_indices; j++) {
+      shape[j] *= snode->extractors[j].shape;
+    }
+  }
+  return shape;
+}
+
+bool same_iteration_space(OffloadedStmt *a, OffloadedStmt *b) {
+  if (a->task_type != b->task_type || a->block_dim != b->block_dim ||
+      a->grid_dim != b->grid_dim || a->num_cpu_threads != b->num_cpu_threads) {
+    return false;
+  }
+  for (auto *offload : {a, b}) {
+    if (offload->reversed || offload->is_bit_vectorized ||
+        !offload->index_offsets.empty() ||
+        !offload->mem_access_opt.get_all().empty()) {
+      return false;
+    }
+  }
+  if (a->task_type == TaskType::range_for) {
+    return a->const_begin && a->const_end && b->const_begin && b->const_end &&
+           a->begin_value == b->begin_value && a->end_value == b->end_value;
+  }
+  if (a->task_type == TaskType::struct_for) {
+    // Only dense struct-fors visit the same coordinates whenever their
+    // shapes match
+    return a->snode->is_path_all_dense && b->snode->is_path_all_dense &&
+           !a->snode->is_bit_level && !b->snode->is_bit_level &&
+           iteration_shape(a->snode) == iteration_shape(b->snode);
+  }
+  return false;
+}
+
+bool has_continue(OffloadedStmt *offload) {
+  auto is_top_level_continue = [&](Stmt *s) {
+    auto cont = s->cast<ContinueStmt>();
+    // A continue without scope may be a top-level one
+    return cont && (cont->scope == offload || cont->scope == nullptr);
+  };
+  return !irpass::analysis::gather_statements(offload->body.get(),
+                                              is_top_level_continue)
+              .empty();
+}
+
+// Appends the body of |b| to the body of |a|.
+void merge_into(OffloadedStmt *a, OffloadedStmt *b) {
+  irpass::analysis::gather_statements(b->body.get(), [&](Stmt *stmt) {
+    if (auto loop_index = stmt->cast<LoopIndexStmt>()) {
+      if (loop_index->loop == b) {
+        loop_index->loop = a;
+      }
+    } else if (auto linear_index = stmt->cast<LoopLinearIndexStmt>()) {
+      if (linear_index->loop == b) {
+        linear_index->loop = a;
+      }
+    } else if (auto block_corner = stmt->cast<BlockCornerIndexStmt>()) {
+      if (block_corner->loop == b) {
+        block_corner->loop = a;
+      }
+    } else if (auto cont = stmt->cast<ContinueStmt>()) {
+      if (cont->scope == b) {
+        // Skips the rest of the fused body, which is the rest of |b|
+        cont->scope = a;
+      }
+    }
+    return false;
+  });
+  VecStatement stmts;
+  for (auto &stmt : b->body->statements) {
+    stmts.push_back(std::move(stmt));
+  }
+  b->body->statements.clear();
+  a->body->insert(std::move(stmts));
+}
+
+bool uses_linear_index(OffloadedStmt *offload) {
+  auto is_linear_index = [&](Stmt *s) {
+    if (auto linear_index = s->cast<LoopLinearIndexStmt>()) {
+      return linear_index->loop == offload;
+    }
+    if (auto block_corner = s->cast<BlockCornerIndexStmt>()) {
+      return block_corner->loop == offload;
+    }
+    return false;
+  };
+  return !irpass::analysis::gather_statements(offload->body.get(),
+                                              is_linear_index)
+              .empty();
+}
+
+bool can_fuse(OffloadedStmt *a, OffloadedStmt *b) {
+  if (!same_iteration_space(a, b)) {
+    return false;
+  }
+  // A `continue` in |a| would skip the body of |b|. Linear and block corner
+  // indices depend on the layout of the SNode being iterated.
+  if (has_continue(a) ||
+      (a->task_type == TaskType::struct_for && uses_linear_index(b))) {
+    return false;
+  }
+  return !has_cross_iteration_dependency(a, gather_task_accesses(a), b,
+                                         gather_task_accesses(b));
+}
+
+}  // namespace
+
+// Fuses consecutive parallel loops iterating over the same space into a
+// single offloaded task, as long as every iteration of the second loop only
+// depends on the same iteration of the first one. This saves a launch and a
+// pass over memory for each fused loop.
+void fuse_offloads(IRNode *root) {
+  auto *block = root->cast<Block>();
+  if (!block) {
+    return;
+  }
+  for (int i = 0; i + 1 < (int)block->statements.size();) {
+    auto *a = block->statements[i]->as<OffloadedStmt>();
+    auto *b = block->statements[i + 1]->as<OffloadedStmt>();
+    if (can_fuse(a, b)) {
+      merge_into(a, b);
+      block->erase(b);
+    } else {
+      i++;
+    }
+  }
+}
+
+}  // namespace irpass
+
+}  // namespace gstaichi::lang
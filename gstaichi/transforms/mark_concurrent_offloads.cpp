@@ -0,0 +1,211 @@
+#include "gstaichi/ir/ir.h"
+#include "gstaichi/ir/statements.h"
+#include "gstaichi/ir/analysis.h"
+#include "gstaichi/ir/snode.h"
+#include "gstaichi/ir/transforms.h"
+
+#include <unordered_set>
+
+namespace gstaichi::lang {
+
+namespace irpass {
+
+namespace {
+
+using TaskType = OffloadedStmt::TaskType;
+
+// The global memory an offloaded task may touch.
+struct TaskAccesses {
+  // Leaf SNodes read or written. Bit-level SNodes are replaced by the SNode
+  // holding their physical storage.
+  std::unordered_set<SNode *> snode_reads;
+  std::unordered_set<SNode *> snode_writes;
+  // SNode trees whose sparse structure is read (resp. modified).
+  std::unordered_set<int> tree_reads;
+  std::unordered_set<int> tree_writes;
+  // External arrays may alias each other, so they are all treated as one.
+  bool external_read{false};
+  bool external_write{false};
+  // Global temporaries, e.g. dynamic loop bounds.
+  bool temporary_read{false};
+  bool temporary_write{false};
+  // Side effects that are not tracked above, or whose order matters.
+  bool unknown{false};
+
+  void merge(const TaskAccesses &o) {
+    snode_reads.insert(o.snode_reads.begin(), o.snode_reads.end());
+    snode_writes.insert(o.snode_writes.begin(), o.snode_writes.end());
+    tree_reads.insert(o.tree_reads.begin(), o.tree_reads.end());
+    tree_writes.insert(o.tree_writes.begin(), o.tree_writes.end());
+    external_read |= o.external_read;
+    external_write |= o.external_write;
+    temporary_read |= o.temporary_read;
+    temporary_write |= o.temporary_write;
+    unknown |= o.unknown;
+  }
+};
+
+template <typename T>
+bool intersects(const std::unordered_set<T> &a,
+                const std::unordered_set<T> &b) {
+  const auto &smaller = a.size() < b.size() ? a : b;
+  const auto &larger = a.size() < b.size() ? b : a;
+  for (const auto &x : smaller) {
+    if (larger.count(x)) {
+      return true;
+    }
+  }
+  return false;
+}
+
+bool conflict(const TaskAccesses &a, const TaskAccesses &b) {
+  return a.unknown || b.unknown ||
+         intersects(a.snode_writes, b.snode_reads) ||
+         intersects(a.snode_writes, b.snode_writes) ||
+         intersects(a.snode_reads, b.snode_writes) ||
+         intersects(a.tree_writes, b.tree_reads) ||
+         intersects(a.tree_writes, b.tree_writes) ||
+         intersects(a.tree_reads, b.tree_writes) ||
+         (a.external_write && (b.external_read || b.external_write)) ||
+         (b.external_write && a.external_read) ||
+         (a.temporary_write && (b.temporary_read || b.temporary_write)) ||
+         (b.temporary_write && a.temporary_read);
+}
+
+SNode *storage_snode(SNode *snode) {
+  while (snode->is_bit_level && snode->parent) {
+    snode = snode->parent;
+  }
+  return snode;
+}
+
+void add_snode_access(TaskAccesses &accesses, SNode *snode, bool write) {
+  if (!snode->is_path_all_dense) {
+    accesses.tree_reads.insert(snode->get_snode_tree_id());
+    if (write) {
+      // Writing to a sparse SNode activates it
+      accesses.tree_writes.insert(snode->get_snode_tree_id());
+    }
+  }
+  if (write) {
+    accesses.snode_writes.insert(storage_snode(snode));
+  } else {
+    accesses.snode_reads.insert(storage_snode(snode));
+  }
+}
+
+TaskAccesses gather_task_accesses(OffloadedStmt *offload) {
+  TaskAccesses accesses;
+  auto [snode_reads, snode_writes] =
+      irpass::analysis::gather_snode_read_writes(offload);
+  for (auto *snode : snode_reads) {
+    add_snode_access(accesses, snode, /*write=*/false);
+  }
+  for (auto *snode : snode_writes) {
+    add_snode_access(accesses, snode, /*write=*/true);
+  }
+  if (offload->task_type == TaskType::struct_for) {
+    add_snode_access(accesses, offload->snode, /*write=*/false);
+    // Iterates the element lists of the SNode tree, which the clear-list and
+    // listgen tasks of the next struct-for rebuild
+    accesses.tree_reads.insert(offload->snode->get_snode_tree_id());
+  }
+  if (offload->task_type == TaskType::range_for &&
+      (!offload->const_begin || !offload->const_end)) {
+    accesses.temporary_read = true;
+  }
+
+  // Everything gather_snode_read_writes does not cover
+  irpass::analysis::gather_statements(offload, [&](Stmt *stmt) {
+    Stmt *ptr = nullptr;
+    bool read = false, write = false;
+    if (auto global_load = stmt->cast<GlobalLoadStmt>()) {
+      read = true;
+      ptr = global_load->src;
+    } else if (auto global_store = stmt->cast<GlobalStoreStmt>()) {
+      write = true;
+      ptr = global_store->dest;
+    } else if (auto global_atomic = stmt->cast<AtomicOpStmt>()) {
+      read = true;
+      write = true;
+      ptr = global_atomic->dest;
+    } else if (auto snode_op = stmt->cast<SNodeOpStmt>()) {
+      bool modifies = snode_op->op_type != SNodeOpType::is_active &&
+                      snode_op->op_type != SNodeOpType::length &&
+                      snode_op->op_type != SNodeOpType::get_addr;
+      accesses.tree_reads.insert(snode_op->snode->get_snode_tree_id());
+      if (modifies) {
+        accesses.tree_writes.insert(snode_op->snode->get_snode_tree_id());
+        accesses.snode_writes.insert(storage_snode(snode_op->snode));
+      } else {
+        accesses.snode_reads.insert(storage_snode(snode_op->snode));
+      }
+    } else if (auto clear_list = stmt->cast<ClearListStmt>()) {
+      accesses.tree_writes.insert(clear_list->snode->get_snode_tree_id());
+      accesses.snode_writes.insert(storage_snode(clear_list->snode));
+    } else if (stmt->is<RandStmt>() || stmt->is<PrintStmt>() ||
+               stmt->is<ReturnStmt>() || stmt->is<ExternalFuncCallStmt>() ||
+               stmt->is<InternalFuncStmt>()) {
+      accesses.unknown = true;
+    }
+    if (ptr) {
+      while (auto *matrix_ptr = ptr->cast<MatrixPtrStmt>()) {
+        ptr = matrix_ptr->origin;
+      }
+      if (ptr->is<GlobalPtrStmt>()) {
+        // Already gathered
+      } else if (ptr->is<ExternalPtrStmt>()) {
+        accesses.external_read |= read;
+        accesses.external_write |= write;
+      } else if (ptr->is<GlobalTemporaryStmt>()) {
+        accesses.temporary_read |= read;
+        accesses.temporary_write |= write;
+      } else if (!ptr->is<AllocaStmt>()) {
+        accesses.unknown = true;
+      }
+    }
+    return false;
+  });
+  return accesses;
+}
+
+}  // namespace
+
+// Marks the offloaded tasks that have no conflicting global memory accesses
+// with the preceding tasks of their group, so that the backend may run the
+// tasks of a group concurrently. Tasks without a body (listgen, gc) and
+// mesh-fors always start a new group.
+void mark_concurrent_offloads(IRNode *root) {
+  auto *block = root->cast<Block>();
+  if (!block) {
+    return;
+  }
+  TaskAccesses group;
+  bool group_open = false;
+  for (auto &stmt : block->statements) {
+    auto *offload = stmt->as<OffloadedStmt>();
+    offload->concurrent_with_previous = false;
+    if (offload->task_type != TaskType::serial &&
+        offload->task_type != TaskType::range_for &&
+        offload->task_type != TaskType::struct_for) {
+      group_open = false;
+      continue;
+    }
+    auto accesses = gather_task_accesses(offload);
+    if (accesses.unknown) {
+      group_open = false;
+      continue;
+    }
+    if (group_open && !conflict(group, accesses)) {
+      offload->concurrent_with_previous = true;
+      group.merge(accesses);
+    } else {
+      group = std::move(accesses);
+      group_open = true;
+    }
+  }
+}
+
+}  // namespace irpass
+
+}  // namespace gstaichi::lang
@@ -16,7 +16,7 @@ from gstaichi.types.primitive_types import f16, f32, f64, i32, u8  # noqa pylint
 
 
 # A set of helper (meta)functions
-@kernel
+@kernel(fastcache=True)
 def fill_field(field: template(), val: template()):
     value = ops.cast(val, field.dtype)
     for I in grouped(field):
@@ -35,7 +35,7 @@ def fill_ndarray_matrix(ndarray: ndarray_type.ndarray(), val: template()):
         ndarray[I] = val
 
 
-@kernel
+@kernel(fastcache=True)
 def tensor_to_ext_arr(tensor: template(), arr: ndarray_type.ndarray()):
     # default value of offset is [], replace it with [0] * len
     offset = static(tensor.snode.ptr.offset if len(tensor.snode.ptr.offset) != 0 else [0] * len(tensor.shape))
@@ -72,7 +72,7 @@ def ndarray_matrix_to_ext_arr(
                         arr[p, q, I] = ndarray[I][p, q]
 
 
-@kernel
+@kernel(fastcache=True)
 def tensor_to_tensor(tensor: template(), other: template()):
     static_assert(tensor.shape == other.shape)
     shape = static(tensor.shape)
@@ -83,7 +83,7 @@ def tensor_to_tensor(tensor: template(), other: template()):
         tensor[I + tensor_offset] = other[I + other_offset]
 
 
-@kernel
+@kernel(fastcache=True)
 def ext_arr_to_tensor(arr: ndarray_type.ndarray(), tensor: template()):
     # default value of offset is [], replace it with [0] * len
     offset = static(tensor.snode.ptr.offset if len(tensor.snode.ptr.offset) != 0 else [0] * len(tensor.shape))
@@ -341,3 +341,348 @@ def blit_from_field_to_field(dst: template(), src: template(), offset: i32, size
     src_offset = static(src.snode.ptr.offset if len(src.snode.ptr.offset) != 0 else 0)
     for i in range(size):
         dst[i + dst_offset + offset] = src[i + src_offset]
+
+
+# Blocked parallel prefix sum (scan) for the CPU backends
+@func
+def scan_blocks_cpu(
+    arr,
+    arr_offset: template(),
+    block_sums,
+    num_blocks,
+    block_size,
+    length,
+    dtype: template(),
+    exclusive: template(),
+):
+    # Local scan of each block, by a single thread
+    for b in range(num_blocks):
+        begin = b * block_size
+        end = ops.min(begin + block_size, length)
+        acc = ops.cast(0, dtype)
+        for i in range(begin, end):
+            val = arr[i + arr_offset]
+            if static(exclusive):
+                arr[i + arr_offset] = acc
+                acc += val
+            else:
+                acc += val
+                arr[i + arr_offset] = acc
+        block_sums[b] = acc
+
+    # Exclusive scan of the block sums
+    total = ops.cast(0, dtype)
+    loop_config(serialize=True)
+    for b in range(num_blocks):
+        block_sum = block_sums[b]
+        block_sums[b] = total
+        total += block_sum
+
+    # Uniform add of the sums of the preceding blocks
+    for i in range(block_size, length):
+        arr[i + arr_offset] += block_sums[i // block_size]
+
+
+@kernel
+def scan_field_cpu(
+    arr: template(),
+    block_sums: ndarray_type.ndarray(),
+    num_blocks: i32,
+    block_size: i32,
+    length: i32,
+    exclusive: template(),
+):
+    arr_offset = static(arr.snode.ptr.offset[0] if len(arr.snode.ptr.offset) != 0 else 0)
+    scan_blocks_cpu(arr, arr_offset, block_sums, num_blocks, block_size, length, arr.dtype, exclusive)
+
+
+@kernel
+def scan_ndarray_cpu(
+    arr: ndarray_type.ndarray(),
+    block_sums: ndarray_type.ndarray(),
+    num_blocks: i32,
+    block_size: i32,
+    length: i32,
+    dtype: template(),
+    exclusive: template(),
+):
+    scan_blocks_cpu(arr, 0, block_sums, num_blocks, block_size, length, dtype, exclusive)
+
+
+# LSD radix sort for the CPU backends
+@func
+def radix_sort_key_bits(key, key_kind: template(), bits_type: template(), num_bits: template()):
+    # Unsigned integer ordered as the keys. Signed integers have their sign bit flipped, negative floats have all
+    # their bits flipped, since they are ordered backwards, and positive floats only their sign bit.
+    bits = ops.bit_cast(key, bits_type)
+    sign = ops.cast(1, bits_type) << ops.cast(num_bits - 1, bits_type)
+    if static(key_kind == 1):
+        bits ^= sign
+    elif static(key_kind == 2):
+        negative = bits >> ops.cast(num_bits - 1, bits_type)
+        bits ^= (ops.cast(0, bits_type) - negative) | sign
+    return bits
+
+
+@kernel
+def radix_sort_varying_bits(
+    keys: ndarray_type.ndarray(),
+    block_masks: ndarray_type.ndarray(),
+    num_blocks: i32,
+    block_size: i32,
+    length: i32,
+    key_kind: template(),
+    bits_type: template(),
+    num_bits: template(),
+):
+    # Bits which are not the same for all the keys, in block_masks[0]
+    first = radix_sort_key_bits(keys[0], key_kind, bits_type, num_bits)
+    for b in range(num_blocks):
+        mask = ops.cast(0, bits_type)
+        for i in range(b * block_size, ops.min((b + 1) * block_size, length)):
+            mask |= radix_sort_key_bits(keys[i], key_kind, bits_type, num_bits) ^ first
+        block_masks[b] = mask
+    loop_config(serialize=True)
+    for b in range(1, num_blocks):
+        block_masks[0] |= block_masks[b]
+
+
+@kernel
+def radix_sort_histogram(
+    keys: ndarray_type.ndarray(),
+    hist: ndarray_type.ndarray(),
+    num_blocks: i32,
+    block_size: i32,
+    length: i32,
+    shift: i32,
+    key_kind: template(),
+    bits_type: template(),
+    num_bits: template(),
+):
+    # Digit counts of each block, stored digit-major, so that their exclusive prefix sum is the position of the first
+    # key of each block having each digit in the sorted keys
+    for b in range(num_blocks):
+        for d in range(256):
+            hist[d * num_blocks + b] = 0
+        for i in range(b * block_size, ops.min((b + 1) * block_size, length)):
+            bits = radix_sort_key_bits(keys[i], key_kind, bits_type, num_bits)
+            d = ops.cast((bits >> ops.cast(shift, bits_type)) & 255, i32)
+            # Only this thread updates the counts of the block, so no atomic is needed
+            count = hist[d * num_blocks + b]
+            hist[d * num_blocks + b] = count + 1
+
+
+@kernel
+def radix_sort_scatter(
+    src_keys: ndarray_type.ndarray(),
+    dst_keys: ndarray_type.ndarray(),
+    src_values: ndarray_type.ndarray(),
+    dst_values: ndarray_type.ndarray(),
+    hist: ndarray_type.ndarray(),
+    num_blocks: i32,
+    block_size: i32,
+    length: i32,
+    shift: i32,
+    key_kind: template(),
+    bits_type: template(),
+    num_bits: template(),
+    with_values: template(),
+):
+    # Stable scatter of the keys of each block, given the exclusive prefix sum of the histogram
+    for b in range(num_blocks):
+        for i in range(b * block_size, ops.min((b + 1) * block_size, length)):
+            bits = radix_sort_key_bits(src_keys[i], key_kind, bits_type, num_bits)
+            d = ops.cast((bits >> ops.cast(shift, bits_type)) & 255, i32)
+            pos = hist[d * num_blocks + b]
+            hist[d * num_blocks + b] = pos + 1
+            dst_keys[pos] = src_keys[i]
+            if static(with_values):
+                dst_values[pos] = src_values[i]
+
+
+# Segmented reductions and scans for the CPU backends. Segment s covers the elements from offsets[s] to
+# offsets[s + 1], the offsets starting at 0 and ending at the number of elements.
+@func
+def segment_combine(a, b, op: template()):
+    result = a
+    if static(op == "add"):
+        result = a + b
+    elif static(op == "min"):
+        result = ops.min(a, b)
+    else:
+        result = ops.max(a, b)
+    return result
+
+
+@func
+def segment_containing(offsets, num_segments, i):
+    # Binary search of the last segment starting at or before i, which is not empty
+    lo = 1
+    hi = num_segments
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if offsets[mid] <= i:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return lo - 1
+
+
+@kernel
+def segment_heads(keys: ndarray_type.ndarray(), heads: ndarray_type.ndarray(), length: i32):
+    # Whether each key starts a run of equal keys, the last flag being left for the number of runs
+    for i in range(length + 1):
+        head = 0
+        if i == 0:
+            head = 1
+        elif i < length:
+            if keys[i] != keys[i - 1]:
+                head = 1
+        heads[i] = head
+
+
+@kernel
+def segment_offsets_from_heads(heads: ndarray_type.ndarray(), offsets: ndarray_type.ndarray(), length: i32):
+    # Given the exclusive prefix sum of the head flags, which is the segment of each head
+    for i in range(length):
+        if heads[i + 1] != heads[i]:
+            offsets[heads[i]] = i
+    offsets[heads[length]] = length
+
+
+@kernel
+def segment_keys(
+    keys: ndarray_type.ndarray(),
+    offsets: ndarray_type.ndarray(),
+    out_keys: ndarray_type.ndarray(),
+    num_segments: i32,
+):
+    for s in range(num_segments):
+        out_keys[s] = keys[offsets[s]]
+
+
+@kernel
+def segmented_reduce_cpu(
+    values: ndarray_type.ndarray(),
+    offsets: ndarray_type.ndarray(),
+    out: ndarray_type.ndarray(),
+    block_prefix: ndarray_type.ndarray(),
+    block_tail: ndarray_type.ndarray(),
+    block_segment: ndarray_type.ndarray(),
+    num_segments: i32,
+    num_blocks: i32,
+    block_size: i32,
+    length: i32,
+    op: template(),
+    identity: template(),
+    dtype: template(),
+):
+    # Empty segments are left to the identity
+    for s in range(num_segments):
+        out[s] = Expr(identity, dtype=dtype)
+
+    # Reduction of each block by a single thread. The segments starting and ending within the block are written
+    # directly, the reduction of the elements before the first segment start is kept in block_prefix, and that of the
+    # elements of the last segment starting in the block, if any, in block_tail.
+    for b in range(num_blocks):
+        begin = b * block_size
+        end = ops.min(begin + block_size, length)
+        s = segment_containing(offsets, num_segments, begin)
+        next_begin = offsets[s + 1]
+        has_head = offsets[s] == begin
+        prefix = Expr(identity, dtype=dtype)
+        acc = Expr(identity, dtype=dtype)
+        for i in range(begin, end):
+            if i == next_begin:
+                if has_head:
+                    out[s] = acc
+                else:
+                    prefix = acc
+                    has_head = True
+                while offsets[s + 1] <= i:
+                    s += 1
+                next_begin = offsets[s + 1]
+                acc = Expr(identity, dtype=dtype)
+            acc = segment_combine(acc, values[i], op)
+        if has_head:
+            block_prefix[b] = prefix
+            block_tail[b] = acc
+            block_segment[b] = s
+        else:
+            block_prefix[b] = acc
+            block_segment[b] = -1
+
+    # Reduction of the segments spanning several blocks
+    open_segment = -1
+    carry = Expr(identity, dtype=dtype)
+    loop_config(serialize=True)
+    for b in range(num_blocks):
+        if block_segment[b] == -1:
+            carry = segment_combine(carry, block_prefix[b], op)
+        else:
+            if open_segment != -1:
+                out[open_segment] = segment_combine(carry, block_prefix[b], op)
+            open_segment = block_segment[b]
+            carry = block_tail[b]
+    out[open_segment] = carry
+
+
+@kernel
+def segmented_scan_cpu(
+    values: ndarray_type.ndarray(),
+    offsets: ndarray_type.ndarray(),
+    block_carries: ndarray_type.ndarray(),
+    block_heads: ndarray_type.ndarray(),
+    num_segments: i32,
+    num_blocks: i32,
+    block_size: i32,
+    length: i32,
+    op: template(),
+    identity: template(),
+    dtype: template(),
+    exclusive: template(),
+):
+    # Local segmented scan of each block, by a single thread, keeping the first segment start of the block and the
+    # reduction of its last elements, since the last segment start
+    for b in range(num_blocks):
+        begin = b * block_size
+        end = ops.min(begin + block_size, length)
+        s = segment_containing(offsets, num_segments, begin)
+        next_begin = offsets[s + 1]
+        first_head = end
+        if offsets[s] == begin:
+            first_head = begin
+        acc = Expr(identity, dtype=dtype)
+        for i in range(begin, end):
+            if i == next_begin:
+                while offsets[s + 1] <= i:
+                    s += 1
+                next_begin = offsets[s + 1]
+                first_head = ops.min(first_head, i)
+                acc = Expr(identity, dtype=dtype)
+            val = values[i]
+            if static(exclusive):
+                values[i] = acc
+                acc = segment_combine(acc, val, op)
+            else:
+                acc = segment_combine(acc, val, op)
+                values[i] = acc
+        block_heads[b] = first_head
+        block_carries[b] = acc
+
+    # Exclusive scan of the block reductions, restarting after each segment start
+    carry = Expr(identity, dtype=dtype)
+    loop_config(serialize=True)
+    for b in range(num_blocks):
+        block_carry = block_carries[b]
+        block_carries[b] = carry
+        if block_heads[b] < ops.min((b + 1) * block_size, length):
+            carry = block_carry
+        else:
+            carry = segment_combine(carry, block_carry, op)
+
+    # The elements of each block before its first segment start continue the segment of the preceding blocks
+    for b in range(1, num_blocks):
+        preceding = block_carries[b]
+        for i in range(b * block_size, block_heads[b]):
+            values[i] = segment_combine(preceding, values[i], op)
@@ -1,21 +1,186 @@
 # type: ignore
 
+import math
+
 from gstaichi._kernels import (
     blit_from_field_to_field,
+    ext_arr_to_tensor,
+    ndarray_to_ndarray,
+    radix_sort_histogram,
+    radix_sort_scatter,
+    radix_sort_varying_bits,
     scan_add_inclusive,
+    scan_field_cpu,
+    scan_ndarray_cpu,
+    segment_heads,
+    segment_keys,
+    segment_offsets_from_heads,
+    segmented_reduce_cpu,
+    segmented_scan_cpu,
     sort_stage,
+    tensor_to_ext_arr,
     uniform_add,
     warp_shfl_up_i32,
 )
-from gstaichi.lang.impl import current_cfg, field
+from gstaichi.lang._ndarray import Ndarray, ScalarNdarray
+from gstaichi.lang.field import ScalarField
+from gstaichi.lang.impl import current_cfg, field, ndarray
 from gstaichi.lang.kernel_impl import data_oriented
-from gstaichi.lang.misc import cuda, vulkan
+from gstaichi.lang.misc import arm64, cuda, vulkan, x64
 from gstaichi.lang.runtime_ops import sync
 from gstaichi.lang.simt import subgroup
-from gstaichi.types.primitive_types import i32
+from gstaichi.types.primitive_types import f32, f64, i32, i64, u32, u64
+
+# Minimum number of elements processed by a single thread on CPU
+_CPU_MIN_BLOCK_SIZE = 4096
+
+# Radix sort key types: 0 for unsigned integers, 1 for signed integers, 2 for floats
+_RADIX_SORT_KEY_KINDS = {u32: 0, u64: 0, i32: 1, i64: 1, f32: 2, f64: 2}
+
+_SEGMENTED_OPS = ("add", "min", "max")
+
+# Lowest and highest values of the types supported by the segmented operations
+_SEGMENTED_DTYPE_LIMITS = {
+    i32: (-(2**31), 2**31 - 1),
+    i64: (-(2**63), 2**63 - 1),
+    u32: (0, 2**32 - 1),
+    u64: (0, 2**64 - 1),
+    f32: (-math.inf, math.inf),
+    f64: (-math.inf, math.inf),
+}
+
+
+def _is_cpu():
+    return current_cfg().arch in (x64, arm64)
+
+
+def _cpu_blocks(length):
+    """Splits an array into blocks processed by a single thread each, returning their number and size.
+
+    There are a few blocks per thread for load balancing, but not too many, since each of them has a serial cost.
+    """
+    num_threads = max(1, current_cfg().cpu_max_num_threads)
+    num_blocks = max(1, min(4 * num_threads, length // _CPU_MIN_BLOCK_SIZE))
+    block_size = max(1, (length + num_blocks - 1) // num_blocks)
+    return num_blocks, block_size
+
+
+def _as_ndarray(arr):
+    """Returns the array itself if it is an ndarray, or an ndarray copy of it if it is a field."""
+    if isinstance(arr, Ndarray):
+        return arr
+    arr_copy = ndarray(arr.dtype, arr.shape)
+    tensor_to_ext_arr(arr, arr_copy)
+    return arr_copy
+
+
+def _copy_back(arr, result):
+    """Copies the result computed in an ndarray returned by :func:`_as_ndarray` into the original array."""
+    if arr is result:
+        return
+    if isinstance(arr, Ndarray):
+        ndarray_to_ndarray(arr, result)
+    else:
+        ext_arr_to_tensor(result, arr)
+
+
+def _supports_radix_sort(keys, values):
+    return (
+        _is_cpu()
+        and isinstance(keys, (ScalarField, ScalarNdarray))
+        and len(keys.shape) == 1
+        and keys.dtype in _RADIX_SORT_KEY_KINDS
+        and (values is None or (isinstance(values, (ScalarField, ScalarNdarray)) and len(values.shape) == 1))
+    )
 
 
 def parallel_sort(keys, values=None):
+    """Sorts keys in ascending order, along with values if given.
+
+    On CPU, scalar keys of type ti.i32, ti.u32, ti.i64, ti.u64, ti.f32 or ti.f64 are sorted using :func:`radix_sort`.
+    Otherwise, an odd-even merge sort is used, which is not stable.
+
+    Args:
+        keys (Union[Field, Ndarray]): The 1D keys to sort in place. Only fields are supported by the odd-even merge sort.
+        values (Union[Field, Ndarray], optional): 1D values to reorder as the keys.
+    """
+    if _supports_radix_sort(keys, values):
+        radix_sort(keys, values)
+    else:
+        _odd_even_merge_sort(keys, values)
+
+
+def radix_sort(keys, values=None):
+    """Stable least significant digit radix sort, on CPU only.
+
+    Each pass sorts the keys by one of their bytes, from the lowest to the highest one, skipping the bytes which are
+    the same for all the keys. The keys are split into a few blocks per thread: in each pass, the digits of each block
+    are counted, the exclusive prefix sum of these counts gives where each block writes the keys having each digit,
+    then each block scatters its keys accordingly.
+
+    Args:
+        keys (Union[ScalarField, ScalarNdarray]): The 1D keys to sort in place, of type ti.i32, ti.u32, ti.i64, ti.u64,
+            ti.f32 or ti.f64.
+        values (Union[ScalarField, ScalarNdarray], optional): 1D values of any type, reordered as the keys.
+    """
+    if not _is_cpu():
+        raise RuntimeError(f"Radix sort is not supported on {str(current_cfg().arch)}.")
+    key_kind = _RADIX_SORT_KEY_KINDS.get(keys.dtype)
+    if key_kind is None:
+        raise RuntimeError(f"Radix sort does not support keys of type {keys.dtype}.")
+    if len(keys.shape) != 1 or (values is not None and len(values.shape) != 1):
+        raise RuntimeError("Radix sort only supports 1D keys and values.")
+    N = keys.shape[0]
+    if values is not None and values.shape[0] != N:
+        raise RuntimeError(f"Radix sort expects as many values as keys, got {values.shape[0]} and {N}.")
+    if N <= 1:
+        return
+    num_bits = 64 if keys.dtype in (i64, u64, f64) else 32
+    bits_type = u64 if num_bits == 64 else u32
+    num_blocks, block_size = _cpu_blocks(N)
+    with_values = values is not None
+
+    # Sort ndarrays, which are swapped after each pass
+    src_keys = _as_ndarray(keys)
+    dst_keys = ndarray(keys.dtype, (N,))
+    src_values = _as_ndarray(values) if with_values else src_keys
+    dst_values = ndarray(values.dtype, (N,)) if with_values else dst_keys
+
+    block_masks = ndarray(bits_type, (num_blocks,))
+    radix_sort_varying_bits(src_keys, block_masks, num_blocks, block_size, N, key_kind, bits_type, num_bits)
+    varying_bits = int(block_masks[0])
+
+    hist = ndarray(i32, (256 * num_blocks,))
+    scan = PrefixSumExecutor(256 * num_blocks)
+    for shift in range(0, num_bits, 8):
+        if (varying_bits >> shift) & 255 == 0:
+            continue
+        radix_sort_histogram(src_keys, hist, num_blocks, block_size, N, shift, key_kind, bits_type, num_bits)
+        scan.run(hist, exclusive=True)
+        radix_sort_scatter(
+            src_keys,
+            dst_keys,
+            src_values,
+            dst_values,
+            hist,
+            num_blocks,
+            block_size,
+            N,
+            shift,
+            key_kind,
+            bits_type,
+            num_bits,
+            with_values,
+        )
+        src_keys, dst_keys = dst_keys, src_keys
+        src_values, dst_values = dst_values, src_values
+
+    _copy_back(keys, src_keys)
+    if with_values:
+        _copy_back(values, src_values)
+
+
+def _odd_even_merge_sort(keys, values=None):
     """Odd-even merge sort
 
     References:
@@ -44,7 +209,11 @@ def parallel_sort(keys, values=None):
 class PrefixSumExecutor:
     """Parallel Prefix Sum (Scan) Helper
 
-    Use this helper to perform an inclusive in-place's parallel prefix sum.
+    Use this helper to perform an in-place parallel prefix sum.
+
+    On CUDA and Vulkan, only inclusive scans of ti.i32 fields are supported. On CPU, fields and ndarrays of ti.i32,
+    ti.i64, ti.f32 or ti.f64 can be scanned, either inclusively or exclusively. The array is split into a few blocks
+    per thread, which are scanned independently, then the sums of the preceding blocks are added to each block.
 
     References:
         https://developer.download.nvidia.com/compute/cuda/1.1-Beta/x86_website/projects/scan/doc/scan.pdf
@@ -54,6 +223,12 @@ class PrefixSumExecutor:
     def __init__(self, length):
         self.sorting_length = length
 
+        if _is_cpu():
+            self.num_blocks, self.block_size = _cpu_blocks(length)
+            # Buffer of block sums, per data type
+            self.block_sums = {}
+            return
+
         BLOCK_SZ = 64
         GRID_SZ = int((length + BLOCK_SZ - 1) / BLOCK_SZ)
 
@@ -72,11 +247,25 @@ class PrefixSumExecutor:
 
         self.large_arr = field(i32, shape=start_pos)
 
-    def run(self, input_arr):
+    def run(self, input_arr, exclusive=False):
+        """Replaces the first elements of the array by their prefix sums.
+
+        Args:
+            input_arr (Union[Field, Ndarray]): The 1D array to scan in place. Its number of elements must be at least
+                the length given to the executor.
+            exclusive (bool): Whether each element is replaced by the sum of the elements before it, rather than the
+                sum of the elements up to it. Only supported on CPU.
+        """
+        if _is_cpu():
+            self._run_cpu(input_arr, exclusive)
+            return
+
         length = self.sorting_length
         ele_nums = self.ele_nums
         ele_nums_pos = self.ele_nums_pos
 
+        if exclusive:
+            raise RuntimeError(f"Exclusive prefix sum is not supported on {str(current_cfg().arch)}.")
         if input_arr.dtype != i32:
             raise RuntimeError("Only ti.i32 type is supported for prefix sum.")
 
@@ -113,5 +302,175 @@ class PrefixSumExecutor:
 
         blit_from_field_to_field(input_arr, self.large_arr, 0, length)
 
+    def _run_cpu(self, input_arr, exclusive):
+        dtype = input_arr.dtype
+        if dtype not in (i32, i64, f32, f64):
+            raise RuntimeError(f"Prefix sum only supports ti.i32, ti.i64, ti.f32 and ti.f64 on CPU, got {dtype}.")
+        block_sums = self.block_sums.get(dtype)
+        if block_sums is None:
+            block_sums = self.block_sums[dtype] = ndarray(dtype, (self.num_blocks,))
+        if isinstance(input_arr, Ndarray):
+            scan_ndarray_cpu(
+                input_arr, block_sums, self.num_blocks, self.block_size, self.sorting_length, dtype, exclusive
+            )
+        else:
+            scan_field_cpu(input_arr, block_sums, self.num_blocks, self.block_size, self.sorting_length, exclusive)
+
+
+def _segment_identity(op, dtype):
+    if op not in _SEGMENTED_OPS:
+        raise ValueError(f"Unsupported segmented operation {op!r}, expected one of {_SEGMENTED_OPS}.")
+    limits = _SEGMENTED_DTYPE_LIMITS.get(dtype)
+    if limits is None:
+        raise RuntimeError(f"Segmented operations do not support values of type {dtype}.")
+    if op == "add":
+        return 0.0 if dtype in (f32, f64) else 0
+    return limits[1] if op == "min" else limits[0]
+
+
+def _segments(values, offsets, keys):
+    """Checks the arguments of a segmented operation, returning the values as an ndarray, the segment offsets as an
+    ndarray and the number of segments."""
+    if not _is_cpu():
+        raise RuntimeError(f"Segmented operations are not supported on {str(current_cfg().arch)}.")
+    if (offsets is None) == (keys is None):
+        raise ValueError("Exactly one of offsets and keys must be given.")
+    if len(values.shape) != 1:
+        raise RuntimeError("Segmented operations only support 1D values.")
+    N = values.shape[0]
+    if offsets is not None:
+        if len(offsets.shape) != 1 or offsets.shape[0] == 0:
+            raise ValueError("Segment offsets must be a non-empty 1D array.")
+        num_segments = offsets.shape[0] - 1
+        offsets = _as_ndarray(offsets)
+        if offsets[0] != 0 or offsets[num_segments] != N:
+            raise ValueError(f"Segment offsets must start at 0 and end at the number of values, {N}.")
+        return _as_ndarray(values), offsets, num_segments
+
+    if len(keys.shape) != 1 or keys.shape[0] != N:
+        raise ValueError(f"Segment keys must be a 1D array of as many elements as the values, {N}.")
+    # The exclusive prefix sum of the flags of the keys starting a segment is the segment of each key
+    keys = _as_ndarray(keys)
+    heads = ndarray(i32, (N + 1,))
+    segment_heads(keys, heads, N)
+    PrefixSumExecutor(N + 1).run(heads, exclusive=True)
+    offsets = ndarray(i32, (N + 1,))
+    segment_offsets_from_heads(heads, offsets, N)
+    return _as_ndarray(values), offsets, int(heads[N])
+
+
+def segmented_reduce(values, out, offsets=None, keys=None, op="add", out_keys=None):
+    """Reduces each segment of the values, on CPU only.
+
+    The segments are either given by their offsets, segment `s` covering the values from `offsets[s]` to
+    `offsets[s + 1]`, or by keys, each run of equal keys being a segment, e.g. after sorting them with
+    :func:`parallel_sort`. The values are split into a few blocks per thread, each of which is reduced by a single
+    thread, so that large segments are reduced in parallel too, then the reductions of the segments spanning several
+    blocks are completed.
+
+    Args:
+        values (Union[ScalarField, ScalarNdarray]): The 1D values to reduce, of type ti.i32, ti.u32, ti.i64, ti.u64,
+            ti.f32 or ti.f64.
+        out (Union[ScalarField, ScalarNdarray]): The 1D array receiving the reduction of each segment in its first
+            elements. Empty segments are reduced to the identity of the operation, e.g. 0 for "add" or the largest
+            value of the type for "min".
+        offsets (Union[ScalarField, ScalarNdarray], optional): The 1D integer offsets of the segments, starting at 0
+            and ending at the number of values.
+        keys (Union[ScalarField, ScalarNdarray], optional): 1D keys of the values, of the same length.
+        op (str): The reduction, one of "add", "min" or "max".
+        out_keys (Union[ScalarField, ScalarNdarray], optional): 1D array receiving the key of each segment in its first
+            elements, when keys are given.
+
+    Returns:
+        int: The number of segments.
+    """
+    identity = _segment_identity(op, values.dtype)
+    if keys is not None:
+        # Also read to output the keys of the segments
+        keys = _as_ndarray(keys)
+    values_arr, offsets_arr, num_segments = _segments(values, offsets, keys)
+    if len(out.shape) != 1 or out.shape[0] < num_segments:
+        raise ValueError(f"The output must be a 1D array of at least {num_segments} elements.")
+    if out_keys is not None:
+        if keys is None:
+            raise ValueError("Segment keys can only be output when keys are given.")
+        if len(out_keys.shape) != 1 or out_keys.shape[0] < num_segments:
+            raise ValueError(f"The output keys must be a 1D array of at least {num_segments} elements.")
+    N = values.shape[0]
+    if N == 0:
+        return num_segments
+
+    dtype = values.dtype
+    num_blocks, block_size = _cpu_blocks(N)
+    out_arr = _as_ndarray(out)
+    segmented_reduce_cpu(
+        values_arr,
+        offsets_arr,
+        out_arr,
+        ndarray(dtype, (num_blocks,)),
+        ndarray(dtype, (num_blocks,)),
+        ndarray(i32, (num_blocks,)),
+        num_segments,
+        num_blocks,
+        block_size,
+        N,
+        op,
+        identity,
+        dtype,
+    )
+    _copy_back(out, out_arr)
+    if out_keys is not None:
+        out_keys_arr = _as_ndarray(out_keys)
+        segment_keys(keys, offsets_arr, out_keys_arr, num_segments)
+        _copy_back(out_keys, out_keys_arr)
+    return num_segments
+
+
+def segmented_scan(values, offsets=None, keys=None, op="add", exclusive=False):
+    """Scans each segment of the values in place, on CPU only.
+
+    The segments are given as in :func:`segmented_reduce`. As in the CPU implementation of
+    :class:`PrefixSumExecutor`, the values are split into a few blocks per thread, which are scanned independently,
+    then the reduction of the preceding blocks is combined with the elements of each block before its first segment
+    start.
+
+    Args:
+        values (Union[ScalarField, ScalarNdarray]): The 1D values to scan in place, of type ti.i32, ti.u32, ti.i64,
+            ti.u64, ti.f32 or ti.f64.
+        offsets (Union[ScalarField, ScalarNdarray], optional): The 1D integer offsets of the segments, starting at 0
+            and ending at the number of values.
+        keys (Union[ScalarField, ScalarNdarray], optional): 1D keys of the values, of the same length.
+        op (str): The operation, one of "add", "min" or "max".
+        exclusive (bool): Whether each element is replaced by the reduction of the elements of its segment before it,
+            the first element of each segment being replaced by the identity of the operation, rather than up to it.
+
+    Returns:
+        int: The number of segments.
+    """
+    identity = _segment_identity(op, values.dtype)
+    values_arr, offsets_arr, num_segments = _segments(values, offsets, keys)
+    N = values.shape[0]
+    if N == 0:
+        return num_segments
+
+    dtype = values.dtype
+    num_blocks, block_size = _cpu_blocks(N)
+    segmented_scan_cpu(
+        values_arr,
+        offsets_arr,
+        ndarray(dtype, (num_blocks,)),
+        ndarray(i32, (num_blocks,)),
+        num_segments,
+        num_blocks,
+        block_size,
+        N,
+        op,
+        identity,
+        dtype,
+        exclusive,
+    )
+    _copy_back(values, values_arr)
+    return num_segments
+
 
-__all__ = ["parallel_sort", "PrefixSumExecutor"]
+__all__ = ["parallel_sort", "radix_sort", "segmented_reduce", "segmented_scan", "PrefixSumExecutor"]
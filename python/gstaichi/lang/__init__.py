@@ -8,6 +8,7 @@ from gstaichi.lang.exception import *
 from gstaichi.lang.field import *
 from gstaichi.lang.impl import *
 from gstaichi.lang.kernel_impl import *
+from gstaichi.lang.launch_graph import *
 from gstaichi.lang.matrix import *
 from gstaichi.lang.mesh import *
 from gstaichi.lang.misc import *  # pylint: disable=W0622
@@ -34,6 +35,7 @@ __all__ = [
         "inspect",
         "kernel_arguments",
         "kernel_impl",
+        "launch_graph",
         "matrix",
         "mesh",
         "misc",
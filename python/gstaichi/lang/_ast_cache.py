@@ -0,0 +1,135 @@
+"""
+Process-wide cache of the parsed python AST of @ti.func and @ti.kernel functions.
+
+Every materialization of a kernel, and every inlined call of a @ti.func inside it, needs the python AST of the
+function being transformed. Retrieving the source code with 'inspect', normalizing tabs with 'textwrap.fill' line by
+line and running 'ast.parse' again for every single call site is by far the most expensive part of the front-end for
+heavily templated kernels, even though the source is exactly the same every time.
+
+Parsed trees are stored once and for all, keyed by the function source info plus the modification time of the file
+it has been read from, so that editing the source file on disk invalidates the entry. Each caller gets its own copy of
+the tree, because the AST transformer mutates the tree in place. Note that 'copy.deepcopy' is actually slower than
+parsing the source again, because of its memo bookkeeping, so a specialized copy routine is used instead.
+"""
+
+import ast
+import os
+import textwrap
+import time
+from types import CodeType
+from typing import Callable
+
+from ._wrap_inspect import FunctionSourceInfo, get_source_info_and_src
+
+g_num_hits = 0
+g_num_misses = 0
+g_parsing_time = 0.0
+g_copy_time = 0.0
+
+CacheKey = tuple[FunctionSourceInfo, int]
+
+# Parsed tree and normalized source lines, keyed by source info and file modification time
+_tree_by_key: dict[CacheKey, tuple[ast.Module, list[str]]] = {}
+# Avoid calling 'inspect' at all on cache hit, since it has to tokenize the whole source file
+_key_by_code: dict[CodeType, CacheKey] = {}
+
+
+def _get_mtime_ns(filepath: str) -> int | None:
+    try:
+        return os.stat(filepath).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _copy_tree(node: ast.AST) -> ast.AST:
+    """
+    Copy an AST recursively.
+
+    Leaf values (identifiers, constants, line numbers...) are immutable, so they can be shared across copies.
+    """
+    node_type = type(node)
+    node_copy = node_type.__new__(node_type)
+    node_copy_dict = node_copy.__dict__
+    for name, value in node.__dict__.items():
+        if isinstance(value, ast.AST):
+            value = _copy_tree(value)
+        elif type(value) is list:
+            value = [_copy_tree(item) if isinstance(item, ast.AST) else item for item in value]
+        node_copy_dict[name] = value
+    return node_copy
+
+
+def _parse(src: list[str]) -> tuple[ast.Module, list[str]]:
+    src = [textwrap.fill(line, tabsize=4, width=9999) for line in src]
+    tree = ast.parse(textwrap.dedent("\n".join(src)))
+    return tree, src
+
+
+def get_source_info_src_and_tree(func: Callable) -> tuple[FunctionSourceInfo, list[str], ast.Module]:
+    """
+    Returns the source info of a function, its normalized source lines, and a private copy of its parsed AST.
+    """
+    global g_num_hits, g_num_misses, g_parsing_time, g_copy_time
+
+    code = getattr(func, "__code__", None)
+    key = _key_by_code.get(code) if code is not None else None
+    if key is not None:
+        entry = _tree_by_key.get(key)
+        if entry is not None and _get_mtime_ns(key[0].filepath) == key[1]:
+            g_num_hits += 1
+            start = time.perf_counter()
+            tree, src = entry
+            tree_copy = _copy_tree(tree)
+            g_copy_time += time.perf_counter() - start
+            return key[0], list(src), tree_copy  # type: ignore[return-value]
+        # The source file has been modified since then
+        _tree_by_key.pop(key, None)
+
+    g_num_misses += 1
+    function_source_info, src = get_source_info_and_src(func)
+    start = time.perf_counter()
+    tree, src = _parse(src)
+    g_parsing_time += time.perf_counter() - start
+
+    mtime_ns = _get_mtime_ns(function_source_info.filepath)
+    if mtime_ns is None:
+        # Source not backed by an actual file (interactive shell...), nothing can be used to detect changes.
+        return function_source_info, src, tree
+    key = (function_source_info, mtime_ns)
+    _tree_by_key[key] = (tree, src)
+    if code is not None:
+        _key_by_code[code] = key
+    return function_source_info, list(src), _copy_tree(tree)  # type: ignore[return-value]
+
+
+def get_source_info(func: Callable) -> FunctionSourceInfo:
+    """
+    Returns the source info of a function, without paying for a copy of its AST if it is already cached.
+    """
+    code = getattr(func, "__code__", None)
+    key = _key_by_code.get(code) if code is not None else None
+    if key is not None and key in _tree_by_key and _get_mtime_ns(key[0].filepath) == key[1]:
+        return key[0]
+    function_source_info, _src, _tree = get_source_info_src_and_tree(func)
+    return function_source_info
+
+
+def clear() -> None:
+    global g_num_hits, g_num_misses, g_parsing_time, g_copy_time
+    _tree_by_key.clear()
+    _key_by_code.clear()
+    g_num_hits = 0
+    g_num_misses = 0
+    g_parsing_time = 0.0
+    g_copy_time = 0.0
+
+
+def dump_stats() -> None:
+    print("ast cache dump stats")
+    print("hits", g_num_hits)
+    print("misses", g_num_misses)
+    print("cached trees", len(_tree_by_key))
+    print("parsing time", g_parsing_time)
+    print("copy time", g_copy_time)
+    if g_num_misses:
+        print("estimated time saved", g_num_hits * g_parsing_time / g_num_misses - g_copy_time)
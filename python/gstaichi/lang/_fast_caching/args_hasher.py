@@ -1,19 +1,21 @@
 import dataclasses
 import enum
 import numbers
+import os
 import time
-from typing import Any, Sequence
+from typing import Any, Callable, Hashable, Sequence
 
 import numpy as np
 
 from gstaichi import _logging
 from gstaichi.types.annotations import Template
 
+from .. import impl
 from .._ndarray import ScalarNdarray
-from ..field import ScalarField
+from ..field import Field, ScalarField
 from ..kernel_arguments import ArgMetadata
 from ..matrix import MatrixField, MatrixNdarray, VectorNdarray
-from ..util import is_data_oriented
+from ..util import is_data_oriented, is_data_oriented_type
 from .hash_utils import hash_iterable_strings
 
 try:
@@ -24,15 +26,24 @@ except ImportError:
     torch_type = ()
 
 
+# Timings are only collected when profiling, since even reading the clock is not negligible on the hot path
+g_profiling = os.environ.get("TI_FAST_CACHE_PROFILING", "0") == "1"
+
 g_num_calls = 0
 g_num_args = 0
 g_hashing_time = 0
 g_repr_time = 0
+g_signature_time = 0
 g_num_ignored_calls = 0
+g_num_signature_hits = 0
 
 
 FIELD_METADATA_CACHE_VALUE = "add_value_to_cache_key"
 
+# Offline cache keys of the SNode trees seen during the current call to hash_args, by SNode tree id. Hashing a tree
+# is proportional to its size, and a lot of fields typically live in the same tree.
+_snode_tree_keys: dict[int, str] = {}
+
 
 def dataclass_to_repr(raise_on_templated_floats: bool, path: tuple[str, ...], arg: Any) -> str:
     repr_l = []
@@ -46,6 +57,49 @@ def dataclass_to_repr(raise_on_templated_floats: bool, path: tuple[str, ...], ar
     return "[" + ",".join(repr_l) + "]"
 
 
+def _snode_path_repr(snode_cxx) -> tuple[str, str]:
+    """
+    Returns the ids of the SNodes from the root of the tree down to snode_cxx, and the offline cache key of the tree.
+    """
+    path = []
+    while True:
+        path.append(str(snode_cxx.id))
+        if snode_cxx.parent is None:
+            break
+        snode_cxx = snode_cxx.parent
+    tree_id = snode_cxx.get_snode_tree_id()
+    tree_key = _snode_tree_keys.get(tree_id)
+    if tree_key is None:
+        tree_key = snode_cxx.get_hashed_offline_cache_key()
+        _snode_tree_keys[tree_id] = tree_key
+    return ".".join(reversed(path)), tree_key
+
+
+def field_to_repr(field: Field) -> str:
+    """
+    Layout-based representation of a field, stable across processes as long as the fields are declared in the same
+    order, with the same layout.
+
+    Kernels taking fields as template parameters have the location of the fields baked in: the SNode tree and the
+    path down to the place SNode of each member. The cache key of the whole tree is included, since the layout of
+    other fields in the same tree changes the memory offsets.
+    """
+    # The layout of the tree is only known once it is finalized
+    impl.get_runtime().materialize_root_fb(False)
+    member_reprs = []
+    for var in field._get_field_members():
+        snode_cxx = var.ptr.snode()
+        path, tree_key = _snode_path_repr(snode_cxx)
+        member_reprs.append(f"{snode_cxx.get_snode_tree_id()}:{path}:{tree_key}")
+    snode = field._snode
+    offset = tuple(snode.ptr.offset)
+    if isinstance(field, MatrixField):
+        kind = f"fieldm-{field.n}-{field.m}-{field.ndim}-{field._get_dynamic_index_stride()}"
+    else:
+        kind = "field"
+    return f"[{kind}-{field.dtype}-{field.shape}-{offset}-{','.join(member_reprs)}]"
+
+
 def _is_template(arg_meta: ArgMetadata | None) -> bool:
     if arg_meta is None:
         return False
@@ -63,7 +117,7 @@ def stringify_obj_type(
     to be the actual python type string, just a string that is representative of the type, and won't collide
     with different (allowed) types. String should be non-empty.
 
-    Note that fields are not included in fast cache.
+    Fields are represented by their layout, see field_to_repr.
 
     arg_meta should only be non-None for the top level arguments and for data oriented objects. It is
     used currently to determine whether a value is added to the cache key, as well as the name. eg
@@ -78,10 +132,7 @@ def stringify_obj_type(
     if isinstance(obj, VectorNdarray):
         return f"[ndv-{obj.n}-{obj.dtype}-{len(obj.shape)}]"
     if isinstance(obj, ScalarField):
-        # disabled for now, because we need to think about how to handle field offset
-        # etc
-        # TODO: think about whether there is a way to include fields
-        return None
+        return field_to_repr(obj)
     if isinstance(obj, MatrixNdarray):
         return f"[ndm-{obj.m}-{obj.n}-{obj.dtype}-{len(obj.shape)}]"
     if isinstance(obj, torch_type):
@@ -89,10 +140,7 @@ def stringify_obj_type(
     if isinstance(obj, np.ndarray):
         return f"[np-{obj.dtype}-{obj.ndim}]"
     if isinstance(obj, MatrixField):
-        # disabled for now, because we need to think about how to handle field offset
-        # etc
-        # TODO: think about whether there is a way to include fields
-        return None
+        return field_to_repr(obj)
     if dataclasses.is_dataclass(obj):
         return dataclass_to_repr(raise_on_templated_floats, path, obj)
     if is_data_oriented(obj):
@@ -138,28 +186,166 @@ The data oriented object was of type {type(obj)} and the child {k}={type(v)} was
     return None
 
 
-def hash_args(
+SignatureExtractor = Callable[[bool, Any], Hashable | None]
+
+# Signature extractors, by argument type and whether the argument is a template
+_extractor_by_type: dict[tuple[type, bool], SignatureExtractor | None] = {}
+# Hash of the arguments, by signature of the arguments
+_hash_by_signature: dict[tuple, str] = {}
+_MAX_NUM_SIGNATURES = 10000
+
+
+def _make_dataclass_extractor(arg_type: type) -> SignatureExtractor:
+    layout = tuple(
+        (field.name, field.metadata.get(FIELD_METADATA_CACHE_VALUE, False)) for field in dataclasses.fields(arg_type)
+    )
+
+    def extract(raise_on_templated_floats: bool, obj: Any) -> Hashable | None:
+        signature = []
+        for name, cache_value in layout:
+            child_value = getattr(obj, name)
+            child_signature = _extract_signature(raise_on_templated_floats, child_value, False)
+            if child_signature is None:
+                return None
+            signature.append(child_signature)
+            if cache_value:
+                signature.append(str(child_value))
+        return tuple(signature)
+
+    return extract
+
+
+def _extract_data_oriented_signature(raise_on_templated_floats: bool, obj: Any) -> Hashable | None:
+    try:
+        _dict = getattr(obj, "_asdict")()
+    except AttributeError:
+        _dict = obj.__dict__
+    signature = []
+    for k, v in _dict.items():
+        child_signature = _extract_signature(raise_on_templated_floats, v, True)
+        if child_signature is None:
+            return None
+        signature.append((k, child_signature))
+    return tuple(signature)
+
+
+def _extract_template_number_signature(raise_on_templated_floats: bool, obj: Any) -> Hashable | None:
+    if raise_on_templated_floats and isinstance(obj, float):
+        raise ValueError("Floats should not be used in template parameters.")
+    # Not the value itself, since equal values may have different representations, e.g. 0.0 and -0.0
+    return str(obj)
+
+
+def _make_extractor(arg_type: type, is_template: bool) -> SignatureExtractor | None:
+    """
+    Builds a function extracting the signature of objects of a given type.
+
+    The signature must capture everything stringify_obj_type depends on, but unlike its result, it is a plain tuple
+    that is cheap to build and to look up. Dispatching on the type is done once and for all here, following the same
+    order as stringify_obj_type. None is returned for types that have to go through stringify_obj_type every time.
+    """
+    if issubclass(arg_type, ScalarNdarray):
+        return lambda _r, obj: (obj.dtype, len(obj.shape))
+    if issubclass(arg_type, VectorNdarray):
+        return lambda _r, obj: (obj.n, obj.dtype, len(obj.shape))
+    if issubclass(arg_type, ScalarField):
+        return lambda _r, obj: field_to_repr(obj)
+    if issubclass(arg_type, MatrixNdarray):
+        return lambda _r, obj: (obj.m, obj.n, obj.dtype, len(obj.shape))
+    if issubclass(arg_type, torch_type):
+        return lambda _r, obj: (obj.dtype, obj.ndim)
+    if issubclass(arg_type, np.ndarray):
+        return lambda _r, obj: (obj.dtype, obj.ndim)
+    if issubclass(arg_type, MatrixField):
+        return lambda _r, obj: field_to_repr(obj)
+    if dataclasses.is_dataclass(arg_type):
+        return _make_dataclass_extractor(arg_type)
+    if is_data_oriented_type(arg_type):
+        return _extract_data_oriented_signature
+    if issubclass(arg_type, (numbers.Number, np.number)):
+        return _extract_template_number_signature if is_template else lambda _r, _obj: ()
+    if arg_type is np.bool_:
+        return (lambda _r, obj: bool(obj)) if is_template else lambda _r, _obj: ()
+    if issubclass(arg_type, enum.Enum):
+        return lambda _r, obj: obj
+    return None
+
+
+def _extract_signature(raise_on_templated_floats: bool, obj: Any, is_template: bool) -> Hashable | None:
+    arg_type = type(obj)
+    key = (arg_type, is_template)
+    try:
+        extractor = _extractor_by_type[key]
+    except KeyError:
+        extractor = _extractor_by_type[key] = _make_extractor(arg_type, is_template)
+    if extractor is None:
+        return None
+    signature = extractor(raise_on_templated_floats, obj)
+    if signature is None:
+        return None
+    return (arg_type, signature)
+
+
+def _hash_args_slow(
     raise_on_templated_floats: bool, args: Sequence[Any], arg_metas: Sequence[ArgMetadata | None]
 ) -> str | None:
-    global g_num_calls, g_num_args, g_hashing_time, g_repr_time, g_num_ignored_calls
-    g_num_calls += 1
-    g_num_args += len(args)
+    global g_hashing_time, g_repr_time
     hash_l = []
-    if len(args) != len(arg_metas):
-        raise RuntimeError(
-            f"Number of args passed in {len(args)} doesnt match number of declared args {len(arg_metas)}"
-        )
     for i_arg, arg in enumerate(args):
-        start = time.time()
+        start = time.perf_counter() if g_profiling else 0.0
         _hash = stringify_obj_type(raise_on_templated_floats, (str(i_arg),), arg, arg_metas[i_arg])
-        g_repr_time += time.time() - start
+        if g_profiling:
+            g_repr_time += time.perf_counter() - start
         if not _hash:
-            g_num_ignored_calls += 1
             return None
         hash_l.append(_hash)
-    start = time.time()
+    start = time.perf_counter() if g_profiling else 0.0
     res = hash_iterable_strings(hash_l)
-    g_hashing_time += time.time() - start
+    if g_profiling:
+        g_hashing_time += time.perf_counter() - start
+    return res
+
+
+def hash_args(
+    raise_on_templated_floats: bool, args: Sequence[Any], arg_metas: Sequence[ArgMetadata | None]
+) -> str | None:
+    """
+    Hashes the types of the arguments, and the values of the template ones.
+
+    The hash is only computed from the string representation of the arguments the first time a given signature is
+    seen, see _make_extractor.
+    """
+    global g_num_calls, g_num_args, g_signature_time, g_num_ignored_calls, g_num_signature_hits
+    g_num_calls += 1
+    g_num_args += len(args)
+    if len(args) != len(arg_metas):
+        raise RuntimeError(
+            f"Number of args passed in {len(args)} doesnt match number of declared args {len(arg_metas)}"
+        )
+    _snode_tree_keys.clear()
+    start = time.perf_counter() if g_profiling else 0.0
+    signature_l = []
+    for arg, arg_meta in zip(args, arg_metas):
+        arg_signature = _extract_signature(raise_on_templated_floats, arg, _is_template(arg_meta))
+        if arg_signature is None:
+            break
+        signature_l.append(arg_signature)
+    signature = tuple(signature_l) if len(signature_l) == len(args) else None
+    if g_profiling:
+        g_signature_time += time.perf_counter() - start
+
+    if signature is not None:
+        res = _hash_by_signature.get(signature)
+        if res is not None:
+            g_num_signature_hits += 1
+            return res
+    res = _hash_args_slow(raise_on_templated_floats, args, arg_metas)
+    if res is None:
+        g_num_ignored_calls += 1
+    elif signature is not None:
+        if len(_hash_by_signature) >= _MAX_NUM_SIGNATURES:
+            _hash_by_signature.clear()
+        _hash_by_signature[signature] = res
     return res
 
 
@@ -168,5 +354,7 @@ def dump_stats() -> None:
     print("total calls", g_num_calls)
     print("ignored calls", g_num_ignored_calls)
     print("total args", g_num_args)
+    print("signature hits", g_num_signature_hits)
     print("hashing time", g_hashing_time)
     print("arg representation time", g_repr_time)
+    print("signature extraction time", g_signature_time)
@@ -1,5 +1,5 @@
 import os
-from itertools import islice
+import time
 from typing import TYPE_CHECKING, Iterable
 
 from ..._test_tools import warnings_helper
@@ -10,6 +10,22 @@ from .hash_utils import hash_iterable_strings
 if TYPE_CHECKING:
     from gstaichi.lang.kernel_impl import GsTaichiCallable
 
+g_num_file_reads = 0
+g_num_hash_hits = 0
+g_num_hash_misses = 0
+g_reading_time = 0.0
+g_hashing_time = 0.0
+
+# Identifies a given version of a source file. ctime is included on top of mtime because tools such as
+# 'shutil.copy2' or 'touch -r' preserve mtime, whereas any write to the file updates ctime.
+FileKey = tuple[str, int, int, int]
+
+# Per-process memo, so that each source file is read once, and each function hashed once, no matter how many kernels
+# are calling them. Only the latest version of each file is kept.
+_file_key_by_path: dict[str, FileKey] = {}
+_lines_by_file_key: dict[FileKey, list[str]] = {}
+_hash_by_range: dict[tuple[FileKey, int, int], str] = {}
+
 
 def pure(fn: "GsTaichiCallable") -> "GsTaichiCallable":
     warnings_helper.warn_once(
@@ -19,18 +35,62 @@ def pure(fn: "GsTaichiCallable") -> "GsTaichiCallable":
     return fn
 
 
+def _get_file_key(filepath: str) -> FileKey:
+    stat = os.stat(filepath)
+    return (filepath, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+
+
+def _read_file_lines(file_key: FileKey) -> list[str]:
+    global g_num_file_reads, g_reading_time
+    lines = _lines_by_file_key.get(file_key)
+    if lines is not None:
+        return lines
+    filepath = file_key[0]
+    old_file_key = _file_key_by_path.pop(filepath, None)
+    if old_file_key is not None:
+        _lines_by_file_key.pop(old_file_key, None)
+        for range_key in [range_key for range_key in _hash_by_range if range_key[0] == old_file_key]:
+            del _hash_by_range[range_key]
+    start = time.perf_counter()
+    with open(filepath, encoding="utf-8") as f:
+        lines = f.readlines()
+    g_reading_time += time.perf_counter() - start
+    g_num_file_reads += 1
+    _file_key_by_path[filepath] = file_key
+    _lines_by_file_key[file_key] = lines
+    return lines
+
+
 def _read_file(function_info: FunctionSourceInfo) -> list[str]:
     try:
-        with open(function_info.filepath, encoding="utf-8") as f:
-            return list(islice(f, function_info.start_lineno, function_info.end_lineno + 1))
+        lines = _read_file_lines(_get_file_key(function_info.filepath))
     except Exception as e:
         raise Exception(
             f"Couldnt read file {function_info.filepath} lines {function_info.start_lineno}-{function_info.end_lineno} {function_info} exception {e}"
         )
+    return lines[function_info.start_lineno : function_info.end_lineno + 1]
 
 
 def _hash_function(function_info: FunctionSourceInfo) -> str:
-    return hash_iterable_strings(_read_file(function_info))
+    global g_num_hash_hits, g_num_hash_misses, g_hashing_time
+    try:
+        range_key = (_get_file_key(function_info.filepath), function_info.start_lineno, function_info.end_lineno)
+    except OSError:
+        # Let _read_file raise the usual error
+        range_key = None
+    if range_key is not None:
+        _hash = _hash_by_range.get(range_key)
+        if _hash is not None:
+            g_num_hash_hits += 1
+            return _hash
+    g_num_hash_misses += 1
+    lines = _read_file(function_info)
+    start = time.perf_counter()
+    _hash = hash_iterable_strings(lines)
+    g_hashing_time += time.perf_counter() - start
+    if range_key is not None and _file_key_by_path.get(function_info.filepath) == range_key[0]:
+        _hash_by_range[range_key] = _hash
+    return _hash
 
 
 def hash_functions(function_infos: Iterable[FunctionSourceInfo]) -> list[HashedFunctionSourceInfo]:
@@ -45,8 +105,26 @@ def hash_kernel(kernel_info: FunctionSourceInfo) -> str:
     return _hash_function(kernel_info)
 
 
+def clear_memo() -> None:
+    global g_num_file_reads, g_num_hash_hits, g_num_hash_misses, g_reading_time, g_hashing_time
+    _file_key_by_path.clear()
+    _lines_by_file_key.clear()
+    _hash_by_range.clear()
+    g_num_file_reads = 0
+    g_num_hash_hits = 0
+    g_num_hash_misses = 0
+    g_reading_time = 0.0
+    g_hashing_time = 0.0
+
+
 def dump_stats() -> None:
     print("function hasher dump stats")
+    print("file reads", g_num_file_reads)
+    print("memoized files", len(_lines_by_file_key))
+    print("hash hits", g_num_hash_hits)
+    print("hash misses", g_num_hash_misses)
+    print("reading time", g_reading_time)
+    print("hashing time", g_hashing_time)
 
 
 def _validate_hashed_function_info(hashed_function_info: HashedFunctionSourceInfo) -> bool:
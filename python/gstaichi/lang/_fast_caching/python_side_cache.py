@@ -6,6 +6,12 @@ import warnings
 import pydantic
 
 from .. import impl
+from .python_side_cache_index import PythonSideCacheIndex
+
+
+def get_cache_folder() -> str:
+    _cache_parent_folder = impl.get_runtime().prog.config().offline_cache_file_path
+    return os.path.join(_cache_parent_folder, "python_side_cache")
 
 
 class PythonSideCache:
@@ -28,8 +34,7 @@ class PythonSideCache:
     """
 
     def __init__(self) -> None:
-        _cache_parent_folder = impl.get_runtime().prog.config().offline_cache_file_path
-        self.cache_folder = os.path.join(_cache_parent_folder, "python_side_cache")
+        self.cache_folder = get_cache_folder()
         os.makedirs(self.cache_folder, exist_ok=True)
 
     def _get_filepath(self, key: str) -> str:
@@ -67,3 +72,12 @@ class PythonSideCache:
         except (pydantic.ValidationError, json.JSONDecodeError, UnicodeDecodeError) as e:
             warnings.warn(f"Failed to read from cache at {filepath} {e}")
         return None
+
+
+def get_python_side_cache() -> PythonSideCache | PythonSideCacheIndex:
+    """
+    Returns the python side cache backend selected with ti.init(src_ll_cache_backend=...)
+    """
+    if impl.get_runtime().src_ll_cache_backend == "index":
+        return PythonSideCacheIndex.get(get_cache_folder())
+    return PythonSideCache()
@@ -0,0 +1,343 @@
+"""
+Single-file backend for the python side cache.
+
+The default backend (see python_side_cache.py) stores one small file per cache key. With thousands of kernel
+instantiations, this means thousands of open/fsync/utime syscalls on every cold start, which is especially slow on
+network file systems.
+
+This backend stores all the entries of a cache folder in a single append-only log file instead:
+
+    [magic][record][record]...
+
+where each record is:
+
+    [kind: u8][key length: u32][value length: u32][timestamp ns: i64][crc32 of key + value: u32][key][value]
+
+Records of kind STORE add or replace an entry, records of kind TOUCH (empty value) only bump the last-used timestamp
+of an entry, and are used for LRU eviction. The log is memory-mapped and scanned once per process to build an
+in-memory hash index from key to value location. New entries and timestamps are kept in memory, and appended to the
+log in a single write, either when enough of them are pending, or at exit.
+
+Multiple processes can safely share the same cache folder:
+- appends, and rewrites of the log during eviction, are done while holding an exclusive lock on a sibling lock file,
+- scanning the log is done while holding a shared lock, so that partially written records are never observed,
+- a record truncated because its writer crashed fails the crc check; it is discarded by the next writer,
+- eviction replaces the log atomically, and other processes detect the replacement by its changed inode.
+"""
+
+import atexit
+import mmap
+import os
+import struct
+import tempfile
+import time
+import warnings
+import zlib
+from dataclasses import dataclass
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+INDEX_FILENAME = "python_side_cache.idx"
+LOCK_FILENAME = "python_side_cache.lock"
+
+# Size above which the log is compacted, evicting the least recently used entries
+DEFAULT_MAX_SIZE_BYTES = 64 * 1024 * 1024
+# Eviction keeps the most recently used entries up to this fraction of the max size, to avoid evicting on every flush
+EVICTION_TARGET_RATIO = 0.75
+# Pending entries are flushed early once they reach this size, so that memory usage stays bounded
+FLUSH_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+_MAGIC = b"TIPSC\x00\x00\x01"
+_RECORD_STORE = 0
+_RECORD_TOUCH = 1
+_RECORD_HEADER = struct.Struct("<BIIqI")
+
+
+@dataclass
+class _Entry:
+    offset: int  # offset of the value in the log
+    size: int
+    last_used_ns: int
+
+
+class _FileLock:
+    def __init__(self, path: str, exclusive: bool) -> None:
+        self.path = path
+        self.exclusive = exclusive
+        self.fd = -1
+
+    def __enter__(self) -> "_FileLock":
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+            else:
+                # msvcrt only supports exclusive locks, and gives up after 10 seconds
+                while True:
+                    try:
+                        msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass
+        except BaseException:
+            os.close(self.fd)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self.fd)
+
+
+def _pack_record(kind: int, key: bytes, value: bytes, timestamp_ns: int) -> bytes:
+    crc = zlib.crc32(value, zlib.crc32(key))
+    return _RECORD_HEADER.pack(kind, len(key), len(value), timestamp_ns, crc) + key + value
+
+
+class PythonSideCacheIndex:
+    """
+    Python side cache backed by a single memory-mapped, append-only log file.
+
+    Has the same interface as PythonSideCache. There is a single instance per cache folder and per process, which is
+    obtained using PythonSideCacheIndex.get(cache_folder), so that the log is only scanned once.
+    """
+
+    _instances: dict[str, "PythonSideCacheIndex"] = {}
+
+    def __init__(self, cache_folder: str, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES) -> None:
+        self.cache_folder = cache_folder
+        self.index_path = os.path.join(cache_folder, INDEX_FILENAME)
+        self.lock_path = os.path.join(cache_folder, LOCK_FILENAME)
+        self.max_size_bytes = max_size_bytes
+        os.makedirs(cache_folder, exist_ok=True)
+
+        self._entries: dict[str, _Entry] = {}
+        self._pending: dict[str, bytes] = {}
+        self._pending_bytes = 0
+        self._touched: dict[str, int] = {}
+        self._mmap: mmap.mmap | None = None
+        self._file_id: tuple[int, int] | None = None
+        self._scanned_end = 0
+
+        with _FileLock(self.lock_path, exclusive=False):
+            self._refresh()
+
+    @classmethod
+    def get(cls, cache_folder: str) -> "PythonSideCacheIndex":
+        cache_folder = os.path.abspath(cache_folder)
+        instance = cls._instances.get(cache_folder)
+        if instance is None:
+            instance = cls(cache_folder)
+            cls._instances[cache_folder] = instance
+        return instance
+
+    def __len__(self) -> int:
+        return len(self._entries.keys() | self._pending.keys())
+
+    def _reset_mapping(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = None
+        self._file_id = None
+        self._scanned_end = 0
+        self._entries.clear()
+
+    def _is_up_to_date(self) -> bool:
+        try:
+            st = os.stat(self.index_path)
+        except FileNotFoundError:
+            return self._file_id is None
+        return (st.st_dev, st.st_ino) == self._file_id and st.st_size == self._scanned_end
+
+    def _refresh(self) -> None:
+        """
+        Indexes the records appended to the log since the last scan, possibly by other processes.
+
+        Must be called while holding the lock.
+        """
+        try:
+            st = os.stat(self.index_path)
+        except FileNotFoundError:
+            self._reset_mapping()
+            return
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id:
+            # The log has been replaced by an eviction pass, so all the offsets are stale
+            self._reset_mapping()
+            self._file_id = file_id
+        if st.st_size <= self._scanned_end:
+            return
+        with open(self.index_path, "rb") as f:
+            new_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = new_mmap
+        self._scan()
+
+    def _scan(self) -> None:
+        assert self._mmap is not None
+        buf = self._mmap
+        end = len(buf)
+        pos = self._scanned_end
+        if pos == 0:
+            if buf[: len(_MAGIC)] != _MAGIC:
+                # Leave _scanned_end at 0, so that the next flush overwrites the file
+                return
+            pos = len(_MAGIC)
+        header_size = _RECORD_HEADER.size
+        entries = self._entries
+        while pos + header_size <= end:
+            kind, key_len, value_len, timestamp_ns, crc = _RECORD_HEADER.unpack_from(buf, pos)
+            key_start = pos + header_size
+            value_start = key_start + key_len
+            record_end = value_start + value_len
+            if kind not in (_RECORD_STORE, _RECORD_TOUCH) or record_end > end:
+                break
+            key_bytes = buf[key_start:value_start]
+            if zlib.crc32(buf[value_start:record_end], zlib.crc32(key_bytes)) != crc:
+                break
+            key = key_bytes.decode("utf-8", errors="replace")
+            entry = entries.get(key)
+            if kind == _RECORD_STORE:
+                last_used_ns = timestamp_ns if entry is None else max(timestamp_ns, entry.last_used_ns)
+                entries[key] = _Entry(value_start, value_len, last_used_ns)
+            elif entry is not None and timestamp_ns > entry.last_used_ns:
+                entry.last_used_ns = timestamp_ns
+            pos = record_end
+        self._scanned_end = pos
+
+    def store(self, key: str, value: str) -> None:
+        data = value.encode("utf-8")
+        previous = self._pending.get(key)
+        self._pending_bytes += len(data) - (len(previous) if previous is not None else 0)
+        self._pending[key] = data
+        self._touched.pop(key, None)
+        if self._pending_bytes >= FLUSH_THRESHOLD_BYTES:
+            self.flush()
+
+    def try_load(self, key: str) -> str | None:
+        data = self._pending.get(key)
+        if data is None:
+            entry = self._entries.get(key)
+            if entry is None:
+                # Maybe stored by another process since the log was scanned
+                if self._is_up_to_date():
+                    return None
+                with _FileLock(self.lock_path, exclusive=False):
+                    self._refresh()
+                entry = self._entries.get(key)
+                if entry is None:
+                    return None
+            assert self._mmap is not None
+            data = self._mmap[entry.offset : entry.offset + entry.size]
+            entry.last_used_ns = time.time_ns()
+            self._touched[key] = entry.last_used_ns
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            warnings.warn(f"Failed to read from cache at {self.index_path} {e}")
+        return None
+
+    def flush(self) -> None:
+        """
+        Appends all the pending entries and timestamps to the log, in a single write.
+
+        Runs an eviction pass afterwards if the log grew larger than max_size_bytes.
+        """
+        if not self._pending and not self._touched:
+            return
+        now = time.time_ns()
+        records = [_pack_record(_RECORD_STORE, key.encode("utf-8"), data, now) for key, data in self._pending.items()]
+        records += [
+            _pack_record(_RECORD_TOUCH, key.encode("utf-8"), b"", timestamp_ns)
+            for key, timestamp_ns in self._touched.items()
+        ]
+        with _FileLock(self.lock_path, exclusive=True):
+            self._refresh()
+            fd = os.open(self.index_path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                # Discard whatever follows the last valid record, e.g. left behind by a crashed writer
+                if os.fstat(fd).st_size != self._scanned_end:
+                    os.ftruncate(fd, self._scanned_end)
+                if self._scanned_end == 0:
+                    records.insert(0, _MAGIC)
+                data = memoryview(b"".join(records))
+                os.lseek(fd, self._scanned_end, os.SEEK_SET)
+                while data:
+                    data = data[os.write(fd, data) :]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._pending.clear()
+            self._pending_bytes = 0
+            self._touched.clear()
+            self._refresh()
+            if self._scanned_end > self.max_size_bytes:
+                self._evict(int(self.max_size_bytes * EVICTION_TARGET_RATIO))
+
+    def evict(self, max_size_bytes: int | None = None) -> int:
+        """
+        LRU eviction pass: rewrites the log keeping only the most recently used entries fitting into max_size_bytes.
+
+        Returns the number of evicted entries.
+        """
+        self.flush()
+        with _FileLock(self.lock_path, exclusive=True):
+            self._refresh()
+            return self._evict(self.max_size_bytes if max_size_bytes is None else max_size_bytes)
+
+    def _evict(self, max_size_bytes: int) -> int:
+        """
+        Must be called while holding the exclusive lock.
+        """
+        if self._mmap is None:
+            return 0
+        buf = self._mmap
+        kept: list[bytes] = []
+        size = len(_MAGIC)
+        by_last_used = sorted(self._entries.items(), key=lambda item: item[1].last_used_ns, reverse=True)
+        for key, entry in by_last_used:
+            record = _pack_record(
+                _RECORD_STORE, key.encode("utf-8"), buf[entry.offset : entry.offset + entry.size], entry.last_used_ns
+            )
+            if size + len(record) > max_size_bytes:
+                break
+            kept.append(record)
+            size += len(record)
+        num_evicted = len(by_last_used) - len(kept)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_folder, prefix=f"{INDEX_FILENAME}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_MAGIC)
+            f.writelines(reversed(kept))
+            f.flush()
+            os.fsync(f.fileno())
+        # The mapping has to be closed before replacing the file on Windows
+        self._reset_mapping()
+        try:
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            os.unlink(tmp_path)
+            warnings.warn(f"Failed to compact cache at {self.index_path} {e}")
+            num_evicted = 0
+        self._refresh()
+        return num_evicted
+
+
+@atexit.register
+def _flush_all() -> None:
+    for instance in PythonSideCacheIndex._instances.values():
+        try:
+            instance.flush()
+        except OSError as e:
+            warnings.warn(f"Failed to flush cache at {instance.index_path} {e}")
@@ -12,7 +12,7 @@ from ..kernel_arguments import ArgMetadata
 from . import args_hasher, config_hasher, function_hasher
 from .fast_caching_types import HashedFunctionSourceInfo
 from .hash_utils import hash_iterable_strings
-from .python_side_cache import PythonSideCache
+from .python_side_cache import get_python_side_cache
 
 
 def create_cache_key(
@@ -20,6 +20,7 @@ def create_cache_key(
     kernel_source_info: FunctionSourceInfo,
     args: Sequence[Any],
     arg_metas: Sequence[ArgMetadata],
+    has_bound_members: bool = False,
 ) -> str | None:
     """
     cache key takes into account:
@@ -27,6 +28,7 @@ def create_cache_key(
     - cache value arg values
     - kernel function (but not sub functions)
     - compilation config (which includes arch, and debug)
+    - whether members of template args are passed at launch instead of being compiled in the kernel
     """
     args_hash = args_hasher.hash_args(raise_on_templated_floats, args, arg_metas)
     if args_hash is None:
@@ -39,7 +41,10 @@ def create_cache_key(
         return None
     kernel_hash = function_hasher.hash_kernel(kernel_source_info)
     config_hash = config_hasher.hash_compile_config()
-    cache_key = hash_iterable_strings((kernel_hash, args_hash, config_hash, "pruned"))
+    cache_key_parts = [kernel_hash, args_hash, config_hash, "pruned"]
+    if has_bound_members:
+        cache_key_parts.append("bound_members")
+    cache_key = hash_iterable_strings(cache_key_parts)
     return cache_key
 
 
@@ -66,7 +71,7 @@ def store(
     """
     if not cache_key:
         return
-    cache = PythonSideCache()
+    cache = get_python_side_cache()
     hashed_function_source_infos = function_hasher.hash_functions(function_source_infos)
     cache_value_obj = CacheValue(
         hashed_function_source_infos=list(hashed_function_source_infos),
@@ -76,7 +81,7 @@ def store(
 
 
 def _try_load(cache_key: str) -> tuple[Sequence[HashedFunctionSourceInfo], set[str]] | tuple[None, None]:
-    cache = PythonSideCache()
+    cache = get_python_side_cache()
     maybe_cache_value_json = cache.try_load(cache_key)
     if maybe_cache_value_json is None:
         return None, None
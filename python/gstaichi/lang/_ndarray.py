@@ -6,7 +6,7 @@ import numpy as np
 
 from gstaichi._lib import core as _ti_core
 from gstaichi.lang import impl
-from gstaichi.lang.exception import GsTaichiIndexError
+from gstaichi.lang.exception import GsTaichiIndexError, GsTaichiRuntimeError
 from gstaichi.lang.util import cook_dtype, get_traceback, python_scope, to_numpy_type
 from gstaichi.types import primitive_types
 from gstaichi.types.enums import Layout
@@ -19,6 +19,22 @@ if TYPE_CHECKING:
     TensorNdarray = Union["ScalarNdarray", VectorNdarray, MatrixNdarray]
 
 
+class _NdarrayHostBuffer:
+    """Exposes the host memory of an ndarray through the numpy array interface.
+
+    Numpy arrays created from it keep it as their base, which keeps the ndarray alive.
+    """
+
+    def __init__(self, ndarray, data_ptr, shape, dtype):
+        self.ndarray = ndarray
+        self.__array_interface__ = {
+            "version": 3,
+            "data": (data_ptr, False),
+            "shape": tuple(shape),
+            "typestr": np.dtype(dtype).str,
+        }
+
+
 class Ndarray:
     """GsTaichi ndarray class.
 
@@ -121,6 +137,33 @@ class Ndarray:
         impl.get_runtime().sync()
         return arr
 
+    @python_scope
+    def numpy_view(self):
+        """Returns a numpy array sharing memory with this ndarray, without copying.
+
+        Only supported on CPU backends, where the memory of ndarrays already lives on the host. Writing to the returned
+        array writes to this ndarray, and conversely. The returned array keeps this ndarray alive, but must not be used
+        anymore after ``ti.reset()``. With ``ti.init(async_launch=True)``, call ``ti.sync()`` before reading the
+        view after launching kernels.
+
+        Returns:
+            numpy.ndarray: The view, with the same shape as returned by ``to_numpy()``.
+        """
+        arch = impl.current_cfg().arch
+        if arch not in (_ti_core.x64, _ti_core.arm64):
+            raise GsTaichiRuntimeError(
+                f"Zero-copy conversion to numpy is only supported on CPU, not on {_ti_core.arch_name(arch)}."
+            )
+        runtime = impl.get_runtime()
+        # Kernels writing to this ndarray may still be running
+        runtime.sync()
+        shape = self.arr.total_shape()
+        dtype = to_numpy_type(self.dtype)
+        if self.arr.nelement() == 0:
+            return np.zeros(shape=shape, dtype=dtype)
+        data_ptr = runtime.prog.get_ndarray_data_ptr_as_int(self.arr)
+        return np.asarray(_NdarrayHostBuffer(self, data_ptr, shape, dtype))
+
     @python_scope
     def _ndarray_matrix_to_numpy(self, as_vector):
         """Converts matrix ndarray to a numpy array.
@@ -291,7 +334,15 @@ class ScalarNdarray(Ndarray):
         return self.host_accessor.getter(*self._pad_key(key))
 
     @python_scope
-    def to_numpy(self):
+    def to_numpy(self, copy=True):
+        """Converts this ndarray to a `numpy.ndarray`.
+
+        Args:
+            copy (bool): If False, returns a view sharing memory with this ndarray instead of a copy, see
+                :meth:`numpy_view`. Only supported on CPU backends.
+        """
+        if not copy:
+            return self.numpy_view()
         return self._ndarray_to_numpy()
 
     @python_scope
@@ -30,15 +30,19 @@ A direct consequence of this breaking type checking because pyright is not able
 
 import weakref
 from dataclasses import _FIELD, _FIELDS
-from typing import Any, Callable, Union
+from operator import getitem
+from typing import Any, Callable, Hashable, Union
 
 from gstaichi._lib import core as _ti_core
+from gstaichi.lang import impl
 from gstaichi.lang._dataclass_util import create_flat_name
 from gstaichi.lang._ndarray import Ndarray
 from gstaichi.lang.any_array import AnyArray
 from gstaichi.lang.exception import GsTaichiRuntimeTypeError
 from gstaichi.lang.expr import Expr
-from gstaichi.lang.matrix import MatrixType
+from gstaichi.lang.field import Field, ScalarField
+from gstaichi.lang.kernel_arguments import ArgMetadata
+from gstaichi.lang.matrix import MatrixField, MatrixType
 from gstaichi.lang.snode import SNode
 from gstaichi.lang.util import is_data_oriented, to_gstaichi_type
 from gstaichi.types import (
@@ -63,6 +67,242 @@ AnnotationType = Union[
 _ExprCxx = _ti_core.ExprCxx
 _composite_mutable_types = {list, dict, set}
 _primitive_types = {int, float, bool}
+_structural_value_types = {int, float, bool, str, type(None)}
+# Archs on which the memory of the fields can be accessed through a raw pointer, like an external array
+_bound_field_archs = {_ti_core.x64, _ti_core.arm64, _ti_core.cuda}
+
+# Location of a member inside a template argument, as (getter, key) steps, with 'getter' either 'getattr' or 'getitem'
+MemberPath = tuple[tuple[Callable[[Any, Any], Any], Any], ...]
+# Field or ndarray member of a template argument bound at launch: (arg_position, path, features)
+BoundMember = tuple[int, MemberPath, tuple[Any, ...]]
+_MemberFeatures = tuple[MemberPath, tuple[Any, ...]]
+
+
+class _NotStructuralError(Exception):
+    pass
+
+
+def _extract_bound_field(field: Field) -> tuple[Any, ...] | None:
+    """
+    Returns the features of a field that can be bound at launch as an external array, or None if it cannot.
+
+    Only fields laid out in memory like an ndarray can be bound this way, i.e. the ones created by
+    ti.field(shape=...) and ti.Vector/Matrix.field(shape=...).
+    """
+    if impl.current_cfg().arch not in _bound_field_archs or field.dual is not None:
+        return None
+    # Materializing may add SNodes next to the components of the field, e.g. the adjoint checkbits in debug mode, so
+    # that it must be done before checking the layout of the field, as it is before compiling the kernel
+    impl.get_runtime().materialize()
+    field_type = type(field)
+    if field_type is ScalarField:
+        element_shape: tuple[int, ...] = ()
+    elif field_type is MatrixField and field.ndim > 0:
+        element_shape = (field.n, field.m)[: field.ndim]
+    else:
+        return None
+    snodes = [var.ptr.snode() for var in field.vars]
+    if None in snodes:
+        return None
+    dense = snodes[0].parent
+    # The components of the field must be the only children of a dense SNode directly under the root, in order
+    if dense.type != _ti_core.SNodeType.dense or dense.parent is None or dense.parent.parent is not None:
+        return None
+    if dense.get_num_ch() != len(snodes) or any(dense.get_ch(i).id != snode.id for i, snode in enumerate(snodes)):
+        return None
+    if any(snodes[0].offset) or _ti_core.is_quant(field.dtype):
+        return None
+    needs_grad = field.grad is not None
+    if needs_grad and _extract_bound_field(field.grad) is None:
+        return None
+    if element_shape:
+        element_type = _ti_core.get_type_factory_instance().get_tensor_type(list(element_shape), field.dtype)
+    else:
+        element_type = field.dtype
+    return Field, element_type, field.shape, needs_grad
+
+
+def _extract_bound_member(value: Any) -> tuple[Any, ...] | None:
+    """
+    Returns the features of a member of a template argument that can be bound at launch, or None if it cannot.
+    """
+    value_type = type(value)
+    if issubclass(value_type, Ndarray):
+        type_id = id(value.element_type)
+        element_type = type_id if type_id in primitive_types.type_ids else value.element_type
+        return Ndarray, element_type, len(value.shape), value.grad is not None
+    if issubclass(value_type, Field):
+        return _extract_bound_field(value)
+    return None
+
+
+def _resolve_bound_member(arg: Any, path: MemberPath) -> Any:
+    for getter, key in path:
+        arg = getter(arg, key)
+    return arg
+
+
+def _bound_member_name(arg_name: str, path: MemberPath) -> str:
+    return arg_name + "".join([f".{key}" if getter is getattr else f"[{key!r}]" for getter, key in path])
+
+
+def _extract_structural_member(
+    value: Any, arg_name: str, visiting: set[int], path: MemberPath | None, bound_members: list[_MemberFeatures]
+) -> Hashable:
+    value_type = type(value)
+    if value_type in _structural_value_types:
+        return value
+    if value_type in _composite_mutable_types or is_data_oriented(value):
+        return _extract_structural_composite(value, arg_name, visiting, path, bound_members)
+    if issubclass(value_type, tuple):
+        return tuple(
+            [
+                _extract_structural_member(
+                    item, arg_name, visiting, None if path is None else (*path, (getitem, i)), bound_members
+                )
+                for i, item in enumerate(value)
+            ]
+        )
+    if value_type is SNode or value_type is Expr or value_type is _ExprCxx:
+        return _extract_arg(False, value, template, arg_name)
+    if path is not None:
+        # Fields and ndarrays are passed to the kernel at launch, so that only their features matter
+        features = _extract_bound_member(value)
+        if features is not None:
+            bound_members.append((path, features))
+            return features
+    if issubclass(value_type, Field):
+        # Other fields are compiled in the kernels, so they can only be identified by identity. They live as long as
+        # the program, so keeping a strong reference is fine.
+        return value
+    # Any other object is identified by identity, as a whole data_oriented object would be otherwise
+    try:
+        return weakref.ref(value)
+    except TypeError:
+        return value
+
+
+def _extract_structural_composite(
+    arg: Any, arg_name: str, visiting: set[int], path: MemberPath | None, bound_members: list[_MemberFeatures]
+) -> Hashable:
+    arg_id = id(arg)
+    if arg_id in visiting:
+        raise _NotStructuralError()
+    visiting.add(arg_id)
+    arg_type = type(arg)
+    # The members of a set have no location, so that they cannot be bound at launch
+    if arg_type is list:
+        key: Hashable = (
+            list,
+            tuple(
+                [
+                    _extract_structural_member(
+                        item, arg_name, visiting, None if path is None else (*path, (getitem, i)), bound_members
+                    )
+                    for i, item in enumerate(arg)
+                ]
+            ),
+        )
+    elif arg_type is dict:
+        key = (
+            dict,
+            tuple(
+                [
+                    (
+                        k,
+                        _extract_structural_member(
+                            v, arg_name, visiting, None if path is None else (*path, (getitem, k)), bound_members
+                        ),
+                    )
+                    for k, v in arg.items()
+                ]
+            ),
+        )
+    elif arg_type is set:
+        key = (
+            set,
+            frozenset([_extract_structural_member(item, arg_name, visiting, None, bound_members) for item in arg]),
+        )
+    else:
+        key = (
+            arg_type,
+            tuple(
+                [
+                    (
+                        k,
+                        _extract_structural_member(
+                            v, arg_name, visiting, None if path is None else (*path, (getattr, k)), bound_members
+                        ),
+                    )
+                    for k, v in vars(arg).items()
+                ]
+            ),
+        )
+    visiting.remove(arg_id)
+    return key
+
+
+def _extract_structural_key(
+    arg: Any, arg_name: str, path: MemberPath = (), bound_members: list[_MemberFeatures] | None = None
+) -> Hashable | None:
+    """
+    Returns a key identifying a data_oriented object or a list/dict/set template argument by its content, i.e. its
+    type and the type and value of all its members, recursively, instead of its identity.
+
+    Field and ndarray members are identified by their features only, i.e. their dtype, shape and layout, or number of
+    dimensions for ndarrays, because they are passed to the kernel at launch instead of being compiled in it. They are
+    appended to 'bound_members' if any, see '_extract_bound_members'.
+
+    Returns None if the object cannot be identified this way, e.g. because of reference cycles or unhashable members.
+    """
+    members: list[_MemberFeatures] = []
+    try:
+        key = _extract_structural_composite(arg, arg_name, set(), path, members)
+        hash(key)
+    except (_NotStructuralError, TypeError):
+        return None
+    if bound_members is not None:
+        bound_members += members
+    return key
+
+
+def _collect_bound_members(
+    arg: Any, annotation: AnnotationType, arg_name: str, path: MemberPath, bound_members: list[_MemberFeatures]
+) -> None:
+    # Must follow '_extract_arg' exactly, so that the members bound at launch are the ones identified by their
+    # features in the key of the kernel instance
+    if annotation is template or type(annotation) is template:
+        arg_type = type(arg)
+        if issubclass(arg_type, tuple):
+            for i, item in enumerate(arg):
+                _collect_bound_members(item, annotation, arg_name, (*path, (getitem, i)), bound_members)
+        elif arg_type in _composite_mutable_types or is_data_oriented(arg):
+            _extract_structural_key(arg, arg_name, path, bound_members)
+        return
+    annotation_fields = getattr(annotation, _FIELDS, None)
+    if annotation_fields is not None:
+        for field in annotation_fields.values():
+            if field._field_type is _FIELD:
+                _collect_bound_members(
+                    getattr(arg, field.name),
+                    field.type,
+                    create_flat_name(arg_name, field.name),
+                    (*path, (getattr, field.name)),
+                    bound_members,
+                )
+
+
+def _extract_bound_members(args: tuple[Any, ...], arg_metas: list[ArgMetadata]) -> tuple[BoundMember, ...]:
+    """
+    Returns the field and ndarray members of the template arguments that are passed to the kernel at launch, when
+    ti.init(structural_template_keys=True), in the order of their kernel parameters.
+    """
+    bound_members: list[BoundMember] = []
+    for arg_position, (arg, arg_meta) in enumerate(zip(args, arg_metas)):
+        members: list[_MemberFeatures] = []
+        _collect_bound_members(arg, arg_meta.annotation, arg_meta.name, (), members)
+        bound_members += [(arg_position, path, features) for path, features in members]
+    return tuple(bound_members)
 
 
 def _extract_arg(raise_on_templated_floats: bool, arg: Any, annotation: AnnotationType, arg_name: str) -> Any:
@@ -82,6 +322,12 @@ def _extract_arg(raise_on_templated_floats: bool, arg: Any, annotation: Annotati
                 "Ndarray shouldn't be passed in via `ti.template()`, please annotate your kernel using `ti.types.ndarray(...)` instead"
             )
         if arg_type in _composite_mutable_types or is_data_oriented(arg):
+            # [Composite arguments] Opt-in: return a key based on the content of the object, which is stable across
+            # instances, so that identical objects share the same instantiation.
+            if impl.get_runtime().structural_template_keys:
+                key = _extract_structural_key(arg, arg_name)
+                if key is not None:
+                    return key
             # [Composite arguments] Return weak reference to the object
             # GsTaichi kernel will cache the extracted arguments, thus we can't simply return the original argument.
             # Instead, a weak reference to the original value is returned to avoid memory leak.
@@ -0,0 +1,24 @@
+from gstaichi._lib import core as _ti_core
+
+
+class TimelineSpan:
+    """
+    Records a span of the host-side timeline, from entering to exiting the context, with the name and instance id of
+    the kernel it belongs to.
+
+    Only meant to be used when the timeline is enabled, i.e. when 'runtime.timeline' is True, so that nothing is
+    formatted nor called into C++ otherwise.
+    """
+
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, kernel_name: str, instance_id: int) -> None:
+        self.name = name
+        self.args = f'"kernel":"{kernel_name}","instance_id":{instance_id}'
+
+    def __enter__(self) -> "TimelineSpan":
+        _ti_core.timeline_begin(self.name, self.args)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _ti_core.timeline_end(self.name)
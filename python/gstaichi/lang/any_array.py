@@ -66,6 +66,35 @@ class AnyArray:
         return self.ptr
 
 
+class FieldArray(AnyArray):
+    """Class for fields passed to kernels as arrays in Python AST, see ``ti.init(structural_template_keys=True)``.
+
+    Args:
+        ptr (gstaichi_python.Expr): A gstaichi_python.Expr wrapping a gstaichi_python.ExternalTensorExpression.
+        shape (Tuple[Int]): Shape of the field, which is part of the kernel instance.
+    """
+
+    def __init__(self, ptr, shape):
+        super().__init__(ptr)
+        self._shape = shape
+
+    @property
+    @gstaichi_scope
+    def grad(self):
+        """Returns the gradient of this field."""
+        return FieldArray(_ti_core.make_external_tensor_grad_expr(self.ptr), self._shape)
+
+    @property
+    @gstaichi_scope
+    def shape(self):
+        """Gets the shape of the field, which is known at compile time.
+
+        Returns:
+            Tuple[Int]: The shape of the field.
+        """
+        return self._shape
+
+
 class AnyArrayAccess:
     """Class for first-level access to AnyArray with Vector/Matrix elements in Python AST.
 
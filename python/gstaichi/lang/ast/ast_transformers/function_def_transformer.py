@@ -1,6 +1,7 @@
 # type: ignore
 
 import ast
+import copy
 import dataclasses
 from typing import Any, Callable
 
@@ -18,12 +19,14 @@ from gstaichi.lang import (
 )
 from gstaichi.lang import ops as ti_ops
 from gstaichi.lang._dataclass_util import create_flat_name
+from gstaichi.lang._template_mapper_hotpath import MemberPath, _bound_member_name
 from gstaichi.lang.ast.ast_transformer_utils import (
     ASTTransformerContext,
 )
 from gstaichi.lang.exception import (
     GsTaichiSyntaxError,
 )
+from gstaichi.lang.field import Field
 from gstaichi.lang.matrix import MatrixType
 from gstaichi.lang.struct import StructType
 from gstaichi.lang.util import to_gstaichi_type
@@ -150,11 +153,63 @@ class FunctionDefTransformer:
                 arg_meta.annotation,
                 ctx.arg_features[i] if ctx.arg_features is not None else (),
             )
+        if ctx.is_kernel:
+            FunctionDefTransformer._bind_template_members(ctx)
 
         compiling_callable.finalize_params()
         # remove original args
         node.args.args = []
 
+    @staticmethod
+    def _bind_template_members(ctx: ASTTransformerContext) -> None:
+        """
+        Declares the field and ndarray members of the template arguments that are passed at launch, after the
+        parameters of the arguments themselves, see 'Kernel._materialize'. The template variables are replaced by
+        shallow copies of the arguments, whose bound members are replaced by the corresponding parameters.
+        """
+        kernel = ctx.func
+        bound_members = kernel.bound_members_by_key.get(kernel.currently_compiling_materialize_key, ())
+        for arg_position, path, (member_type, element_type, shape_or_ndim, needs_grad) in bound_members:
+            arg_meta = kernel.arg_metas[arg_position]
+            name = _bound_member_name(arg_meta.name, path)
+            # Template fields of dataclasses have their own variable
+            var_name, annotation = arg_meta.name, arg_meta.annotation
+            while dataclasses.is_dataclass(annotation):
+                (_, field_name), path = path[0], path[1:]
+                annotation = {field.name: field.type for field in dataclasses.fields(annotation)}[field_name]
+                var_name = create_flat_name(var_name, field_name)
+            ndim = len(shape_or_ndim) if member_type is Field else shape_or_ndim
+            member = kernel_arguments.decl_ndarray_arg(
+                to_gstaichi_type(element_type), ndim, name, needs_grad, BoundaryMode.UNSAFE
+            )
+            if member_type is Field:
+                member = any_array.FieldArray(member.ptr, shape_or_ndim)
+            var = FunctionDefTransformer._replace_member(ctx.template_vars[var_name], path, member)
+            ctx.template_vars[var_name] = var
+            if var_name in ctx.current_scope():
+                ctx.current_scope()[var_name] = var
+
+    @staticmethod
+    def _replace_member(value: Any, path: MemberPath, member: Any) -> Any:
+        """
+        Returns a shallow copy of value whose member at path is replaced by member, copying the objects along the way.
+        """
+        if not path:
+            return member
+        (getter, key), path = path[0], path[1:]
+        child = FunctionDefTransformer._replace_member(getter(value, key), path, member)
+        if getter is getattr:
+            value = copy.copy(value)
+            vars(value)[key] = child
+        elif isinstance(value, tuple):
+            items = list(value)
+            items[key] = child
+            value = type(value)(*items) if hasattr(value, "_fields") else type(value)(items)
+        else:
+            value = copy.copy(value)
+            value[key] = child
+        return value
+
     @staticmethod
     def _transform_func_arg(
         ctx: ASTTransformerContext,
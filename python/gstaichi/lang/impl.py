@@ -1,5 +1,6 @@
 import numbers
 import weakref
+from collections import OrderedDict
 from types import FunctionType, MethodType
 from typing import TYPE_CHECKING, Any, Iterable, Sequence
 
@@ -71,6 +72,9 @@ from gstaichi.types.primitive_types import (
 
 if TYPE_CHECKING:
     from gstaichi.lang._ndarray import Ndarray
+    from gstaichi.lang._template_mapper_hotpath import CompiledKernelKeyType
+    from gstaichi.lang.launch_graph import LaunchGraph
+    from gstaichi.profiler.launch_profiler import LaunchProfiler
 
 
 @gstaichi_scope
@@ -362,6 +366,18 @@ class PyGsTaichi:
         self.short_circuit_operators: bool = False
         self.unrolling_limit: int = 0
         self.src_ll_cache: bool = True
+        self.src_ll_cache_backend: str = "files"
+        self.structural_template_keys: bool = False
+        # Limits on the number of materialized kernel instances, and LRU order of all the instances across kernels
+        self.max_kernel_instances: int | None = None
+        self.max_kernel_instances_per_kernel: int | None = None
+        self.kernel_instances_lru: OrderedDict[tuple[int, CompiledKernelKeyType], Kernel] = OrderedDict()
+        # Whether the host-side timeline records spans, see ti.init(timeline=True)
+        self.timeline: bool = False
+        # Times the stages of the kernel calls, if enabled by ti.profiler.enable_launch_profiler()
+        self.launch_profiler: "LaunchProfiler | None" = None
+        # Launch graph being recorded by ti.record(), if any
+        self.launch_recorder: "LaunchGraph | None" = None
 
     @property
     def compiling_callable(self) -> KernelCxx | Kernel | Function:
@@ -7,7 +7,6 @@ import os
 import pathlib
 import re
 import sys
-import textwrap
 import time
 import types
 import typing
@@ -26,7 +25,7 @@ from functools import partial, update_wrapper, wraps
 from typing import Any, Callable, DefaultDict, Type, TypeAlias, TypeVar, cast, overload
 
 # Must import 'ReferenceType' directly instead of the entire module to avoid attribute lookup overhead.
-from weakref import ReferenceType
+from weakref import ReferenceType, finalize
 
 import numpy as np
 
@@ -40,11 +39,19 @@ from gstaichi._lib.core.gstaichi_python import (
     KernelCxx,
     KernelLaunchContext,
 )
-from gstaichi.lang import _kernel_impl_dataclass, impl, ops, runtime_ops
+from gstaichi.lang import _ast_cache, _kernel_impl_dataclass, impl, ops, runtime_ops
 from gstaichi.lang._fast_caching import src_hasher
 from gstaichi.lang._ndarray import Ndarray
 from gstaichi.lang._template_mapper import TemplateMapper
-from gstaichi.lang._wrap_inspect import FunctionSourceInfo, get_source_info_and_src
+from gstaichi.lang._template_mapper_hotpath import (
+    BoundMember,
+    _bound_member_name,
+    _extract_bound_member,
+    _extract_bound_members,
+    _resolve_bound_member,
+)
+from gstaichi.lang._timeline import TimelineSpan
+from gstaichi.lang._wrap_inspect import FunctionSourceInfo
 from gstaichi.lang.any_array import AnyArray
 from gstaichi.lang.ast import (
     ASTTransformerContext,
@@ -63,6 +70,7 @@ from gstaichi.lang.exception import (
 from gstaichi.lang.expr import Expr
 from gstaichi.lang.impl import Program
 from gstaichi.lang.kernel_arguments import ArgMetadata
+from gstaichi.lang.launch_graph import LaunchGraph, RecordedLaunch
 from gstaichi.lang.matrix import MatrixType
 from gstaichi.lang.shell import _shell_pop_print
 from gstaichi.lang.struct import StructType
@@ -189,6 +197,18 @@ class GsTaichiCallable:
             return self
         return BoundGsTaichiCallable(instance, self)
 
+    def launch_batch(self, args_list: typing.Iterable[tuple[Any, ...]]) -> None:
+        """Launches the wrapped kernel once per tuple of arguments in args_list. See Kernel.launch_batch."""
+        if not self._is_wrapped_kernel or self._is_classkernel:
+            raise GsTaichiSyntaxError(f"{self.fn.__name__} is not a kernel that can be launched in batch")
+        assert self._primal is not None
+        try:
+            self._primal.launch_batch(args_list)
+        except (GsTaichiCompilationError, GsTaichiRuntimeError) as e:
+            if impl.get_runtime().print_full_traceback:
+                raise e
+            raise type(e)("\n" + str(e)) from None
+
 
 class BoundGsTaichiCallable:
     def __init__(self, instance: Any, gstaichi_callable: "GsTaichiCallable"):
@@ -309,9 +329,7 @@ def _get_tree_and_ctx(
     is_real_function: bool = False,
     current_kernel: "Kernel | None" = None,
 ) -> tuple[ast.Module, ASTTransformerContext]:
-    function_source_info, src = get_source_info_and_src(self.func)
-    src = [textwrap.fill(line, tabsize=4, width=9999) for line in src]
-    tree = ast.parse(textwrap.dedent("\n".join(src)))
+    function_source_info, src, tree = _ast_cache.get_source_info_src_and_tree(self.func)
 
     func_body = tree.body[0]
     func_body.decorator_list = []  # type: ignore , kick that can down the road...
@@ -700,6 +718,19 @@ _FLOAT, _INT, _UINT, _TI_ARRAY, _TI_ARRAY_WITH_GRAD = _KernelBatchedArgType
 
 ArgsHash: TypeAlias = tuple[int, ...]
 
+# Location of a scalar kernel argument: kind, kernel arg index, and path of attribute names down from the python arg.
+ScalarArgSlot: TypeAlias = tuple[_KernelBatchedArgType, int, tuple[str, ...]]
+# Scalar kernel arguments grouped by kind: kind, kernel arg indices, and (python arg position, attribute path) of each.
+ScalarArgSlots: TypeAlias = tuple[
+    tuple[_KernelBatchedArgType, tuple[int, ...], tuple[tuple[int, tuple[str, ...]], ...]], ...
+]
+
+_SCALAR_ARG_CONVERSIONS = {
+    _FLOAT: ((float, int, np.floating, np.integer), float, "set_args_float"),
+    _INT: ((int, np.integer), int, "set_args_int"),
+    _UINT: ((int, np.integer), int, "set_args_uint"),
+}
+
 
 @dataclass
 class LaunchStats:
@@ -711,6 +742,7 @@ def _destroy_callback(kernel_ref: ReferenceType["Kernel"], ref: ReferenceType):
     if maybe_kernel is not None:
         maybe_kernel._launch_ctx_cache.clear()
         maybe_kernel._launch_ctx_cache_tracker.clear()
+        maybe_kernel._launch_ctx_scalar_slots.clear()
         maybe_kernel._prog_weakref = None
 
 
@@ -725,6 +757,7 @@ def _recursive_set_args(
     index: int,
     actual_argument_slot: int,
     callbacks: list[Callable[[], Any]],
+    scalar_slots: list[ScalarArgSlot],
 ) -> tuple[int, bool]:
     """
     This function processes all the input python-side arguments of a given kernel so as to add them to the current
@@ -733,7 +766,8 @@ def _recursive_set_args(
     overhead for every single argument.
 
     Returns the number of underlying kernel args being set for a given Python arg, and whether the launch context
-    buffer can be cached (see 'launch_kernel' for details).
+    buffer can be cached (see 'launch_kernel' for details). The location of scalar values is recorded in
+    'scalar_slots', so that they can be updated when the launch context is restored from cache.
 
     Note that templates don't set kernel args, and a single scalar, an external array (numpy or torch) or a taichi
     ndarray all set 1 kernel arg. Similarlty, a struct of N ndarrays would set N kernel args.
@@ -753,15 +787,15 @@ def _recursive_set_args(
         if not isinstance(v, (float, int, np.floating, np.integer)):
             raise GsTaichiRuntimeTypeError.get((index,), needed_arg_type.to_string(), provided_arg_type)
         launch_ctx_buffer[_FLOAT].append((index, float(v)))
-        return 1, False
+        scalar_slots.append((_FLOAT, index, py_dataclass_basename))
+        return 1, True
     if needed_arg_type_id in primitive_types.integer_type_ids:
         if not isinstance(v, (int, np.integer)):
             raise GsTaichiRuntimeTypeError.get((index,), needed_arg_type.to_string(), provided_arg_type)
-        if is_signed(cook_dtype(needed_arg_type)):
-            launch_ctx_buffer[_INT].append((index, int(v)))
-        else:
-            launch_ctx_buffer[_UINT].append((index, int(v)))
-        return 1, False
+        kind = _INT if is_signed(cook_dtype(needed_arg_type)) else _UINT
+        launch_ctx_buffer[kind].append((index, int(v)))
+        scalar_slots.append((kind, index, py_dataclass_basename))
+        return 1, True
     needed_arg_fields = getattr(needed_arg_type, _FIELDS, None)
     if needed_arg_fields is not None:
         if provided_arg_type is not needed_arg_type:
@@ -791,6 +825,7 @@ def _recursive_set_args(
                 index + idx,
                 actual_argument_slot,
                 callbacks,
+                scalar_slots,
             )
             idx += num_args_
             is_launch_ctx_cacheable &= is_launch_ctx_cacheable_
@@ -931,6 +966,97 @@ def _recursive_set_args(
     raise ValueError(f"Argument type mismatch. Expecting {needed_arg_type}, got {type(v)}.")
 
 
+def _set_bound_member_args(
+    prog: Program,
+    launch_ctx: KernelLaunchContext,
+    launch_ctx_buffer: DefaultDict[_KernelBatchedArgType, list[tuple]],
+    arg_metas: list[ArgMetadata],
+    bound_members: tuple[BoundMember, ...],
+    bound_values: list[Any],
+    index: int,
+) -> None:
+    """
+    Sets the field and ndarray members of the template arguments bound at launch, whose parameters follow the ones
+    of the arguments themselves.
+
+    Fields are passed as external arrays pointing to their memory, which never moves, so that the launch context
+    remains cacheable.
+    """
+    for (arg_position, path, features), value in zip(bound_members, bound_values):
+        # The instance is looked up by the identity of the arguments, so that their members may have been reassigned
+        # since it was compiled
+        if _extract_bound_member(value) != features:
+            raise GsTaichiRuntimeTypeError(
+                f"Member {_bound_member_name(arg_metas[arg_position].name, path)} does not match the kernel instance "
+                "it was compiled for anymore. Members that are fields or ndarrays can only be reassigned to fields or "
+                "ndarrays with the same dtype and shape, or number of dimensions for ndarrays."
+            )
+        member_type, _, shape, needs_grad = features
+        if member_type is Ndarray:
+            if needs_grad:
+                launch_ctx_buffer[_TI_ARRAY_WITH_GRAD].append((index, value.arr, value.grad.arr))
+            else:
+                launch_ctx_buffer[_TI_ARRAY].append((index, value.arr))
+        else:
+            nbytes = math.prod(shape) * len(value.vars) * _ti_core.data_type_size(value.dtype)
+            grad_ptr = prog.get_field_data_ptr(value.grad.vars[0].ptr.snode()) if needs_grad else 0
+            launch_ctx.set_arg_external_array_with_shape(
+                index, prog.get_field_data_ptr(value.vars[0].ptr.snode()), nbytes, list(shape), grad_ptr
+            )
+        index += 1
+
+
+def _group_scalar_arg_slots(scalar_slots: list[ScalarArgSlot], arg_position_by_name: dict[str, int]) -> ScalarArgSlots:
+    slots_by_kind: DefaultDict[_KernelBatchedArgType, list[tuple[int, tuple[int, tuple[str, ...]]]]] = defaultdict(list)
+    for kind, index, path in scalar_slots:
+        slots_by_kind[kind].append((index, (arg_position_by_name[path[0]], path[1:])))
+    return tuple((kind, *zip(*slots)) for kind, slots in slots_by_kind.items())  # type: ignore[misc]
+
+
+def _patch_scalar_args(launch_ctx: KernelLaunchContext, scalar_slots: ScalarArgSlots, args: tuple[Any, ...]) -> bool:
+    """
+    Updates the scalar arguments of a launch context restored from cache, with a single batched call per kind.
+
+    Returns False if any value has an unexpected type, in which case the arguments must be processed from scratch,
+    so that the usual error gets reported.
+    """
+    for kind, indices, getters in scalar_slots:
+        values = _get_scalar_arg_values(kind, getters, args)
+        if values is None:
+            return False
+        getattr(launch_ctx, _SCALAR_ARG_CONVERSIONS[kind][2])(indices, values)
+    return True
+
+
+def _get_scalar_arg_values(
+    kind: _KernelBatchedArgType, getters: tuple[tuple[int, tuple[str, ...]], ...], args: tuple[Any, ...]
+) -> list[int | float] | None:
+    """
+    Returns the values of the scalar arguments of a given kind, or None if any value has an unexpected type.
+    """
+    accepted_types, cast_func, _ = _SCALAR_ARG_CONVERSIONS[kind]
+    values = []
+    for arg_position, attr_path in getters:
+        v = args[arg_position]
+        for attr in attr_path:
+            v = getattr(v, attr)
+        if not isinstance(v, accepted_types):
+            return None
+        values.append(cast_func(v))
+    return values
+
+
+def _unpin_instance(pinned_instance_keys: dict[CompiledKernelKeyType, int], key: CompiledKernelKeyType) -> None:
+    """
+    Releases the reference of a launch graph being garbage collected to a kernel instance, see 'Kernel._record_launch'.
+    """
+    count = pinned_instance_keys[key] - 1
+    if count:
+        pinned_instance_keys[key] = count
+    else:
+        del pinned_instance_keys[key]
+
+
 class Kernel:
     counter = 0
 
@@ -950,6 +1076,8 @@ class Kernel:
         self.arg_metas_expanded: list[ArgMetadata] = []
         self.return_type = None
         self.classkernel = _classkernel
+        # Whether to fuse the consecutive parallel loops of this kernel, see 'fuse'
+        self.fuse_offloads = False
         self.extract_arguments()
         self.template_slot_locations = []
         for i, arg in enumerate(self.arg_metas):
@@ -986,8 +1114,18 @@ class Kernel:
         # * '_prog_weakref'is used for bounding the lifetime of the entire cache to the Taichi programm managing all
         #   the launch context being stored in cache.
         # See 'launch_kernel' for details regarding the intended use of caching.
+        # * '_launch_ctx_scalar_slots' is storing the location of the scalar arguments of each cache entry, which are
+        #   updated at every launch, and therefore not part of the cache key.
         self._launch_ctx_cache: dict[ArgsHash, KernelLaunchContext] = {}
         self._launch_ctx_cache_tracker: dict[ArgsHash, list[ReferenceType]] = {}
+        self._launch_ctx_scalar_slots: dict[ArgsHash, ScalarArgSlots] = {}
+        self._arg_position_by_name = {arg_meta.name: i for i, arg_meta in enumerate(self.arg_metas)}
+        scalar_type_ids = primitive_types.real_type_ids | primitive_types.integer_type_ids
+        self._non_scalar_arg_positions: tuple[int, ...] | None = None
+        if any(id(arg_meta.annotation) in scalar_type_ids for arg_meta in self.arg_metas):
+            self._non_scalar_arg_positions = tuple(
+                i for i, arg_meta in enumerate(self.arg_metas) if id(arg_meta.annotation) not in scalar_type_ids
+            )
         self._prog_weakref: ReferenceType[Program] | None = None
 
     def ast_builder(self) -> ASTBuilder:
@@ -1004,7 +1142,13 @@ class Kernel:
         self.used_py_dataclass_leaves_by_key_collecting = defaultdict(set)
         self.used_py_dataclass_leaves_by_key_enforcing = {}
         self.used_py_dataclass_leaves_by_key_enforcing_dotted = {}
+        # Field and ndarray members of the template arguments passed at launch, see '_materialize'
+        self.bound_members_by_key: dict[CompiledKernelKeyType, tuple[BoundMember, ...]] = {}
+        self._has_bound_members = False
         self.currently_compiling_materialize_key = None
+        # Instances that must not be evicted, because they are referenced by launch graphs, with the number of graphs
+        # referencing each of them
+        self._pinned_instance_keys: dict[CompiledKernelKeyType, int] = {}
 
     def extract_arguments(self) -> None:
         sig = inspect.signature(self.func)
@@ -1069,6 +1213,13 @@ class Kernel:
     def materialize(self, key: CompiledKernelKeyType | None, args: tuple[Any, ...], arg_features=None):
         if key is None:
             key = (self.func, 0, self.autodiff_mode)
+        if self.runtime.timeline and key not in self.materialized_kernels:
+            with TimelineSpan("materialize", self.func.__name__, key[1]):
+                self._materialize(key, args, arg_features)
+        else:
+            self._materialize(key, args, arg_features)
+
+    def _materialize(self, key: CompiledKernelKeyType, args: tuple[Any, ...], arg_features) -> None:
         self.runtime.materialize()
         self.fast_checksum = None
 
@@ -1079,10 +1230,23 @@ class Kernel:
 
         used_py_dataclass_parameters: set[str] | None = None
 
+        # The field and ndarray members of structurally keyed template arguments are not compiled in the instance,
+        # but declared as extra kernel parameters, which are set from the current members at every launch
+        bound_members: tuple[BoundMember, ...] = ()
+        if self.runtime.structural_template_keys:
+            bound_members = _extract_bound_members(args, self.arg_metas)
+            if bound_members:
+                self.bound_members_by_key[key] = bound_members
+                self._has_bound_members = True
+
         if self.runtime.src_ll_cache and self.gstaichi_callable and self.gstaichi_callable.is_pure:
-            kernel_source_info, _src = get_source_info_and_src(self.func)
+            kernel_source_info = _ast_cache.get_source_info(self.func)
             self.fast_checksum = src_hasher.create_cache_key(
-                self.raise_on_templated_floats, kernel_source_info, args, self.arg_metas
+                self.raise_on_templated_floats,
+                kernel_source_info,
+                args,
+                self.arg_metas,
+                has_bound_members=bool(bound_members),
             )
             if self.fast_checksum:
                 self.src_ll_cache_observations.cache_key_generated = True
@@ -1201,7 +1365,11 @@ class Kernel:
                         struct_locals = used_py_dataclass_parameters
                     tree = _kernel_impl_dataclass.unpack_ast_struct_expressions(tree, struct_locals=struct_locals)
                     ctx.only_parse_function_def = self.compiled_kernel_data_by_key.get(key) is not None
-                    transform_tree(tree, ctx)
+                    if self.runtime.timeline:
+                        with TimelineSpan("ast_transform", self.func.__name__, key[1]):
+                            transform_tree(tree, ctx)
+                    else:
+                        transform_tree(tree, ctx)
                     if not ctx.is_real_function and not ctx.only_parse_function_def:
                         if self.return_type and ctx.returned != ReturnStatus.ReturnedValue:
                             raise GsTaichiSyntaxError("Kernel has a return type but does not have a return statement")
@@ -1214,6 +1382,8 @@ class Kernel:
             gstaichi_kernel = impl.get_runtime().prog.create_kernel(
                 gstaichi_ast_generator, kernel_name, self.autodiff_mode
             )
+            if self.fuse_offloads:
+                gstaichi_kernel.fuse_offloads = True
             if _pass == 1:
                 assert key not in self.materialized_kernels
                 self.materialized_kernels[key] = gstaichi_kernel
@@ -1245,7 +1415,11 @@ class Kernel:
         # context for this kernel call.
         # A launch context buffer is considered cache-friendly if and only if no direct call to the launch context
         # where made preemptively during the recursive processing of the arguments, all of leaves of the arguments are
-        # pointers, the address of these pointers cannot change, and the set of leaves is fixed.
+        # either pointers or scalars, the address of these pointers cannot change, and the set of leaves is fixed.
+        # Scalar leaves are the exception to the rule of resolving everything once and for all: their values are
+        # expected to change from one call to another (e.g. time step), so top-level scalar arguments are not part of
+        # the cache key, and all the scalar slots are patched after restoring the launch context from cache, with a
+        # single batched call per type.
         # The lifetime of a cache entry is bound to the lifetime of any of its input arguments: the first being garbage
         # collected will invalidate the entire entry. Moreover, the entire cache registry is bound to the lifetime of
         # the taichi prog itself, which means that calling `ti.reset()` will automatically clear the cache. Note that
@@ -1254,88 +1428,137 @@ class Kernel:
         launch_ctx = t_kernel.make_launch_context()
         launch_ctx_cache: KernelLaunchContext | None = None
         launch_ctx_cache_tracker: list[ReferenceType] | None = None
-        args_hash: ArgsHash = tuple(map(id, args))
+        if self._non_scalar_arg_positions is None:
+            args_hash: ArgsHash = tuple(map(id, args))
+        else:
+            args_hash = tuple([id(args[i]) for i in self._non_scalar_arg_positions])
+        bound_members: tuple[BoundMember, ...] = ()
+        bound_values: list[Any] = []
+        if self._has_bound_members:
+            assert self.currently_compiling_materialize_key is not None
+            bound_members = self.bound_members_by_key.get(self.currently_compiling_materialize_key, ())
+            # The members may have been reassigned since the previous launch, so that they are part of the cache key
+            bound_values = [_resolve_bound_member(args[i], path) for i, path, _ in bound_members]
+            args_hash += tuple(map(id, bound_values))
         try:
             launch_ctx_cache_tracker = self._launch_ctx_cache_tracker[args_hash]
         except KeyError:
             pass
-        if not launch_ctx_cache_tracker:  # Empty or none
-            launch_ctx_buffer: DefaultDict[_KernelBatchedArgType, list[tuple]] = defaultdict(list)
-            actual_argument_slot = 0
-            is_launch_ctx_cacheable = True
-            template_num = 0
-            i_out = 0
-            assert self.currently_compiling_materialize_key
-            used_py_dataclass_parameters_enforcing_dotted = self.used_py_dataclass_leaves_by_key_enforcing_dotted[
-                self.currently_compiling_materialize_key
-            ]
-            for i_in, val in enumerate(args):
-                needed_ = self.arg_metas[i_in].annotation
-                if needed_ is template or type(needed_) is template:
-                    template_num += 1
-                    i_out += 1
-                    continue
-                num_args_, is_launch_ctx_cacheable_ = _recursive_set_args(
-                    used_py_dataclass_parameters_enforcing_dotted,
-                    (self.arg_metas[i_in].name,),
-                    launch_ctx,
-                    launch_ctx_buffer,
-                    needed_,
-                    type(val),
-                    val,
-                    i_out - template_num,
-                    actual_argument_slot,
-                    callbacks,
-                )
-                i_out += num_args_
-                is_launch_ctx_cacheable &= is_launch_ctx_cacheable_
-
-            kernel_args_count_by_type = defaultdict(int)
-            kernel_args_count_by_type.update(
-                {key: len(launch_ctx_args) for key, launch_ctx_args in launch_ctx_buffer.items()}
+        launch_recorder = self.runtime.launch_recorder
+        timeline = self.runtime.timeline
+        if timeline:
+            assert self.currently_compiling_materialize_key is not None
+            _ti_core.timeline_begin(
+                "pack_args",
+                f'"kernel":"{self.func.__name__}","instance_id":{self.currently_compiling_materialize_key[1]}',
             )
-            self.launch_stats = LaunchStats(kernel_args_count_by_type=kernel_args_count_by_type)
-
-            # All arguments to context in batches to mitigate overhead of calling Python bindings repeatedly.
-            # This is essential because calling any pybind11 function is adding ~180ns penalty no matter what.
-            # Note that we are allowed to do this because GsTaichi Launch Kernel context is storing the input
-            # arguments in an unordered list. The actual runtime (gfx, llvm...) will later query this context
-            # in correct order.
-            if launch_ctx_args := launch_ctx_buffer.get(_FLOAT):
-                launch_ctx.set_args_float(*zip(*launch_ctx_args))  # type: ignore
-            if launch_ctx_args := launch_ctx_buffer.get(_INT):
-                launch_ctx.set_args_int(*zip(*launch_ctx_args))  # type: ignore
-            if launch_ctx_args := launch_ctx_buffer.get(_UINT):
-                launch_ctx.set_args_uint(*zip(*launch_ctx_args))  # type: ignore
-            if launch_ctx_args := launch_ctx_buffer.get(_TI_ARRAY):
-                launch_ctx.set_args_ndarray(*zip(*launch_ctx_args))  # type: ignore
-            if launch_ctx_args := launch_ctx_buffer.get(_TI_ARRAY_WITH_GRAD):
-                launch_ctx.set_args_ndarray_with_grad(*zip(*launch_ctx_args))  # type: ignore
-
-            if is_launch_ctx_cacheable and args_hash is not None:
-                # TODO: It some rare occurrences, arguments can be cached yet not hashable. Ignoring for now...
-                launch_ctx_cache = t_kernel.make_launch_context()
-                launch_ctx_cache.copy(launch_ctx)
-                self._launch_ctx_cache[args_hash] = launch_ctx_cache
-
-                # Note that the clearing callback will only be called once despite being registered for each tracked
-                # objects, because all the weakrefs get deallocated right away, and their respective callback
-                # vanishes with them, without even getting a chance to get called. This means that registring the
-                # clearing callback systematically does not incur any cumulative runtime penalty yet ensures full
-                # memory safety.
-                launch_ctx_cache_tracker_: list[ReferenceType] = []
-                clear_callback = lambda ref: launch_ctx_cache_tracker_.clear()
+        try:
+            launch_scalar_slots: ScalarArgSlots = ()
+            is_launch_ctx_cache_hit = False
+            if launch_ctx_cache_tracker:  # Neither empty nor none
+                launch_ctx.copy(self._launch_ctx_cache[args_hash])
+                launch_scalar_slots = self._launch_ctx_scalar_slots[args_hash]
+                is_launch_ctx_cache_hit = _patch_scalar_args(launch_ctx, launch_scalar_slots, args)
+            if not is_launch_ctx_cache_hit:
+                launch_ctx_buffer: DefaultDict[_KernelBatchedArgType, list[tuple]] = defaultdict(list)
+                scalar_slots: list[ScalarArgSlot] = []
+                actual_argument_slot = 0
+                is_launch_ctx_cacheable = True
+                template_num = 0
+                i_out = 0
+                assert self.currently_compiling_materialize_key
+                used_py_dataclass_parameters_enforcing_dotted = self.used_py_dataclass_leaves_by_key_enforcing_dotted[
+                    self.currently_compiling_materialize_key
+                ]
+                for i_in, val in enumerate(args):
+                    needed_ = self.arg_metas[i_in].annotation
+                    if needed_ is template or type(needed_) is template:
+                        template_num += 1
+                        i_out += 1
+                        continue
+                    num_args_, is_launch_ctx_cacheable_ = _recursive_set_args(
+                        used_py_dataclass_parameters_enforcing_dotted,
+                        (self.arg_metas[i_in].name,),
+                        launch_ctx,
+                        launch_ctx_buffer,
+                        needed_,
+                        type(val),
+                        val,
+                        i_out - template_num,
+                        actual_argument_slot,
+                        callbacks,
+                        scalar_slots,
+                    )
+                    i_out += num_args_
+                    is_launch_ctx_cacheable &= is_launch_ctx_cacheable_
+                if bound_members:
+                    _set_bound_member_args(
+                        prog,
+                        launch_ctx,
+                        launch_ctx_buffer,
+                        self.arg_metas,
+                        bound_members,
+                        bound_values,
+                        i_out - template_num,
+                    )
+
+                kernel_args_count_by_type = defaultdict(int)
+                kernel_args_count_by_type.update(
+                    {key: len(launch_ctx_args) for key, launch_ctx_args in launch_ctx_buffer.items()}
+                )
+                self.launch_stats = LaunchStats(kernel_args_count_by_type=kernel_args_count_by_type)
+
+                # All arguments to context in batches to mitigate overhead of calling Python bindings repeatedly.
+                # This is essential because calling any pybind11 function is adding ~180ns penalty no matter what.
+                # Note that we are allowed to do this because GsTaichi Launch Kernel context is storing the input
+                # arguments in an unordered list. The actual runtime (gfx, llvm...) will later query this context
+                # in correct order.
+                if launch_ctx_args := launch_ctx_buffer.get(_FLOAT):
+                    launch_ctx.set_args_float(*zip(*launch_ctx_args))  # type: ignore
+                if launch_ctx_args := launch_ctx_buffer.get(_INT):
+                    launch_ctx.set_args_int(*zip(*launch_ctx_args))  # type: ignore
+                if launch_ctx_args := launch_ctx_buffer.get(_UINT):
+                    launch_ctx.set_args_uint(*zip(*launch_ctx_args))  # type: ignore
                 if launch_ctx_args := launch_ctx_buffer.get(_TI_ARRAY):
-                    _, arrs = zip(*launch_ctx_args)
-                    launch_ctx_cache_tracker_ += [ReferenceType(arr, clear_callback) for arr in arrs]
+                    launch_ctx.set_args_ndarray(*zip(*launch_ctx_args))  # type: ignore
                 if launch_ctx_args := launch_ctx_buffer.get(_TI_ARRAY_WITH_GRAD):
-                    _, arrs, arrs_grad = zip(*launch_ctx_args)
-                    launch_ctx_cache_tracker_ += [ReferenceType(arr, clear_callback) for arr in arrs]
-                    launch_ctx_cache_tracker_ += [ReferenceType(arr_grad, clear_callback) for arr_grad in arrs_grad]
-                self._launch_ctx_cache_tracker[args_hash] = launch_ctx_cache_tracker_
-        else:
-            assert args_hash is not None
-            launch_ctx.copy(self._launch_ctx_cache[args_hash])
+                    launch_ctx.set_args_ndarray_with_grad(*zip(*launch_ctx_args))  # type: ignore
+
+                if is_launch_ctx_cacheable or launch_recorder is not None:
+                    launch_scalar_slots = _group_scalar_arg_slots(scalar_slots, self._arg_position_by_name)
+
+                if is_launch_ctx_cacheable and args_hash is not None:
+                    # TODO: It some rare occurrences, arguments can be cached yet not hashable. Ignoring for now...
+                    launch_ctx_cache = t_kernel.make_launch_context()
+                    launch_ctx_cache.copy(launch_ctx)
+                    self._launch_ctx_cache[args_hash] = launch_ctx_cache
+                    self._launch_ctx_scalar_slots[args_hash] = launch_scalar_slots
+
+                    # Note that the clearing callback will only be called once despite being registered for each tracked
+                    # objects, because all the weakrefs get deallocated right away, and their respective callback
+                    # vanishes with them, without even getting a chance to get called. This means that registring the
+                    # clearing callback systematically does not incur any cumulative runtime penalty yet ensures full
+                    # memory safety.
+                    # The program itself is always tracked, so that entries without any pointer argument (e.g. only
+                    # scalars) still have a non-empty tracker.
+                    clear_callback = lambda ref: launch_ctx_cache_tracker_.clear()
+                    launch_ctx_cache_tracker_: list[ReferenceType] = [ReferenceType(prog, clear_callback)]
+                    if launch_ctx_args := launch_ctx_buffer.get(_TI_ARRAY):
+                        _, arrs = zip(*launch_ctx_args)
+                        launch_ctx_cache_tracker_ += [ReferenceType(arr, clear_callback) for arr in arrs]
+                    if launch_ctx_args := launch_ctx_buffer.get(_TI_ARRAY_WITH_GRAD):
+                        _, arrs, arrs_grad = zip(*launch_ctx_args)
+                        launch_ctx_cache_tracker_ += [ReferenceType(arr, clear_callback) for arr in arrs]
+                        launch_ctx_cache_tracker_ += [ReferenceType(arr_grad, clear_callback) for arr_grad in arrs_grad]
+                    launch_ctx_cache_tracker_ += [ReferenceType(value, clear_callback) for value in bound_values]
+                    self._launch_ctx_cache_tracker[args_hash] = launch_ctx_cache_tracker_
+        finally:
+            if timeline:
+                _ti_core.timeline_end("pack_args")
+        launch_profiler = self.runtime.launch_profiler
+        if launch_profiler is not None:
+            launch_profiler.mark("set_args")
+            launch_profiler.record_launch_ctx_cache(is_launch_ctx_cache_hit)
 
         try:
             if not compiled_kernel_data:
@@ -1344,49 +1567,33 @@ class Kernel:
                 prog_device_cap = prog.get_device_caps()
 
                 compile_result: CompileResult = prog.compile_kernel(prog_config, prog_device_cap, t_kernel)
-                if os.environ.get("TI_DUMP_KERNEL_CHECKSUMS", "0") == "1":
-                    debug_dump_path = pathlib.Path(impl.current_cfg().debug_dump_path)
-                    checksums_file_path = debug_dump_path / "checksums.csv"
-                    kernels_dump_dir = debug_dump_path / "kernels"
-                    file_exists = checksums_file_path.exists()
-                    if self.fast_checksum:
-                        with checksums_file_path.open("a") as f:
-                            dict_writer = csv.DictWriter(f, fieldnames=["kernel", "fe", "src"])
-                            if not file_exists:
-                                dict_writer.writeheader()
-                            dict_writer.writerow(
-                                {
-                                    "kernel": self.func.__name__,
-                                    "fe": compile_result.cache_key,
-                                    "src": self.fast_checksum,
-                                }
-                            )
-                            f.flush()
-                        kernels_dump_dir.mkdir(exist_ok=True)
-                        ch_ir_path = kernels_dump_dir / f"{compile_result.cache_key}.ll"
-                        if not ch_ir_path.exists() and self.kernel_cpp:
-                            with ch_ir_path.open("w") as f:
-                                f.write(self.kernel_cpp.to_string())
-                compiled_kernel_data = compile_result.compiled_kernel_data
-                if compile_result.cache_hit:
-                    self.fe_ll_cache_observations.cache_hit = True
-                if self.fast_checksum:
-                    assert self.currently_compiling_materialize_key is not None
-                    src_hasher.store(
-                        self.fast_checksum,
-                        self.visited_functions,
-                        self.used_py_dataclass_leaves_by_key_enforcing[self.currently_compiling_materialize_key],
-                    )
-                    prog.store_fast_cache(
-                        self.fast_checksum,
-                        self.kernel_cpp,
-                        prog_config,
-                        prog_device_cap,
-                        compiled_kernel_data,
-                    )
-                    self.src_ll_cache_observations.cache_stored = True
+                assert self.currently_compiling_materialize_key is not None
+                compiled_kernel_data = self._process_compile_result(
+                    prog,
+                    prog_config,
+                    prog_device_cap,
+                    self.currently_compiling_materialize_key,
+                    t_kernel,
+                    self.fast_checksum,
+                    compile_result,
+                )
             self._last_compiled_kernel_data = compiled_kernel_data
+            if launch_recorder is not None:
+                # The members bound at launch must be kept alive along with the arguments, as they may be reassigned
+                self._record_launch(
+                    launch_recorder,
+                    t_kernel,
+                    compiled_kernel_data,
+                    launch_ctx,
+                    (*args, *bound_values),
+                    launch_scalar_slots,
+                    callbacks,
+                )
+            if launch_profiler is not None:
+                launch_profiler.mark("compile")
             prog.launch_kernel(compiled_kernel_data, launch_ctx)
+            if launch_profiler is not None:
+                launch_profiler.end_call("launch_kernel")
         except Exception as e:
             e = handle_exception_from_cpp(e)
             if impl.get_runtime().print_full_traceback:
@@ -1408,6 +1615,99 @@ class Kernel:
             return self.construct_kernel_ret(launch_ctx, return_type[0], (0,))
         return tuple([self.construct_kernel_ret(launch_ctx, ret_type, (i,)) for i, ret_type in enumerate(return_type)])
 
+    def _record_launch(
+        self,
+        launch_recorder: LaunchGraph,
+        t_kernel: KernelCxx,
+        compiled_kernel_data: CompiledKernelData,
+        launch_ctx: KernelLaunchContext,
+        args: tuple[Any, ...],
+        scalar_slots: ScalarArgSlots,
+        callbacks: list[Callable[[], None]],
+    ) -> None:
+        """
+        Adds a launch that is about to happen to the graph being recorded by ti.record().
+        """
+        if callbacks:
+            raise GsTaichiRuntimeError(
+                f"Kernel {self.func.__name__} cannot be recorded, because some of its arguments must be copied back "
+                "after launch (e.g. non-contiguous numpy arrays, or torch tensors on another device)."
+            )
+        key = self.currently_compiling_materialize_key
+        assert key is not None
+        pinned_key = (id(self), key)
+        if pinned_key not in launch_recorder._pinned_instance_keys:
+            # The instance is pinned for as long as the graph is alive
+            launch_recorder._pinned_instance_keys.add(pinned_key)
+            pinned_instance_keys = self._pinned_instance_keys
+            pinned_instance_keys[key] = pinned_instance_keys.get(key, 0) + 1
+            finalize(launch_recorder, _unpin_instance, pinned_instance_keys, key)
+        recorded_launch_ctx = t_kernel.make_launch_context()
+        recorded_launch_ctx.copy(launch_ctx)
+        scalar_args = {}
+        for kind, indices, getters in scalar_slots:
+            for index, (arg_position, attr_path) in zip(indices, getters):
+                name = ".".join((self.arg_metas[arg_position].name, *attr_path))
+                scalar_args[name] = (*_SCALAR_ARG_CONVERSIONS[kind], index)
+        launch_recorder._add(
+            RecordedLaunch(self.func.__name__, compiled_kernel_data, recorded_launch_ctx, args, scalar_args)
+        )
+
+    def _process_compile_result(
+        self,
+        prog: Program,
+        prog_config,
+        prog_device_cap,
+        key: CompiledKernelKeyType,
+        t_kernel: KernelCxx,
+        fast_checksum: str | None,
+        compile_result: CompileResult,
+    ) -> CompiledKernelData:
+        """
+        Records the outcome of compiling a materialized kernel, and stores it in the fast cache if applicable.
+        """
+        if os.environ.get("TI_DUMP_KERNEL_CHECKSUMS", "0") == "1":
+            debug_dump_path = pathlib.Path(impl.current_cfg().debug_dump_path)
+            checksums_file_path = debug_dump_path / "checksums.csv"
+            kernels_dump_dir = debug_dump_path / "kernels"
+            file_exists = checksums_file_path.exists()
+            if fast_checksum:
+                with checksums_file_path.open("a") as f:
+                    dict_writer = csv.DictWriter(f, fieldnames=["kernel", "fe", "src"])
+                    if not file_exists:
+                        dict_writer.writeheader()
+                    dict_writer.writerow(
+                        {
+                            "kernel": self.func.__name__,
+                            "fe": compile_result.cache_key,
+                            "src": fast_checksum,
+                        }
+                    )
+                    f.flush()
+                kernels_dump_dir.mkdir(exist_ok=True)
+                ch_ir_path = kernels_dump_dir / f"{compile_result.cache_key}.ll"
+                if not ch_ir_path.exists():
+                    with ch_ir_path.open("w") as f:
+                        f.write(t_kernel.to_string())
+        compiled_kernel_data = compile_result.compiled_kernel_data
+        if compile_result.cache_hit:
+            self.fe_ll_cache_observations.cache_hit = True
+        if fast_checksum:
+            src_hasher.store(
+                fast_checksum,
+                self.visited_functions,
+                self.used_py_dataclass_leaves_by_key_enforcing[key],
+            )
+            prog.store_fast_cache(
+                fast_checksum,
+                t_kernel,
+                prog_config,
+                prog_device_cap,
+                compiled_kernel_data,
+            )
+            self.src_ll_cache_observations.cache_stored = True
+        return compiled_kernel_data
+
     def construct_kernel_ret(self, launch_ctx: KernelLaunchContext, ret_type: Any, indices: tuple[int, ...]):
         if isinstance(ret_type, CompoundType):
             return ret_type.from_kernel_struct_ret(launch_ctx, indices)
@@ -1420,45 +1720,238 @@ class Kernel:
         raise GsTaichiRuntimeTypeError(f"Invalid return type on index={indices}")
 
     def ensure_compiled(self, *args: tuple[Any, ...]) -> tuple[Callable, int, AutodiffMode]:
+        launch_profiler = self.runtime.launch_profiler
+        if launch_profiler is not None:
+            launch_profiler.record_mapping_cache(self.mapper, args)
         try:
             instance_id, arg_features = self.mapper.lookup(self.raise_on_templated_floats, args)
         except Exception as e:
             raise type(e)(f"exception while trying to ensure compiled {self.func}:\n{e}") from e
         key = (self.func, instance_id, self.autodiff_mode)
+        if launch_profiler is not None:
+            launch_profiler.mark("template_lookup")
         self.materialize(key=key, args=args, arg_features=arg_features)
+        if launch_profiler is not None:
+            launch_profiler.mark("materialize")
+        runtime = self.runtime
+        if runtime.max_kernel_instances is not None or runtime.max_kernel_instances_per_kernel is not None:
+            self._touch_instance(key)
         return key
 
+    def _touch_instance(self, key: CompiledKernelKeyType) -> None:
+        """
+        Marks an instance as the most recently used one, then evicts the least recently used instances exceeding the
+        limits set by ti.init(max_kernel_instances=..., max_kernel_instances_per_kernel=...).
+
+        The order of 'materialized_kernels' is used as LRU order for this kernel, and the order of
+        'runtime.kernel_instances_lru' as LRU order across all the kernels.
+        """
+        materialized_kernels = self.materialized_kernels
+        materialized_kernels[key] = materialized_kernels.pop(key)
+        runtime = self.runtime
+        lru = runtime.kernel_instances_lru
+        lru_key = (id(self), key)
+        lru[lru_key] = self
+        lru.move_to_end(lru_key)
+
+        max_per_kernel = runtime.max_kernel_instances_per_kernel
+        if max_per_kernel is not None and len(materialized_kernels) > max_per_kernel:
+            num_to_evict = len(materialized_kernels) - max_per_kernel
+            for old_key in list(materialized_kernels)[:-1]:
+                if num_to_evict == 0:
+                    break
+                if old_key not in self._pinned_instance_keys:
+                    self._evict_instance(old_key)
+                    num_to_evict -= 1
+
+        max_total = runtime.max_kernel_instances
+        if max_total is not None and len(lru) > max_total:
+            num_to_evict = len(lru) - max_total
+            for (_, old_key), lru_kernel in list(lru.items())[:-1]:
+                if num_to_evict == 0:
+                    break
+                if old_key not in lru_kernel._pinned_instance_keys:
+                    lru_kernel._evict_instance(old_key)
+                    num_to_evict -= 1
+
+    def _evict_instance(self, key: CompiledKernelKeyType) -> None:
+        """
+        Frees the IR of a materialized instance. It is materialized again on demand if needed, in which case its
+        compiled kernel data is retrieved from the kernel compilation manager, or from the fast cache, instead of being
+        compiled again.
+        """
+        t_kernel = self.materialized_kernels.pop(key)
+        self.compiled_kernel_data_by_key.pop(key, None)
+        self.used_py_dataclass_leaves_by_key_collecting.pop(key, None)
+        self.used_py_dataclass_leaves_by_key_enforcing.pop(key, None)
+        self.used_py_dataclass_leaves_by_key_enforcing_dotted.pop(key, None)
+        self.bound_members_by_key.pop(key, None)
+        self.runtime.kernel_instances_lru.pop((id(self), key), None)
+        # Cached launch contexts are not indexed by instance, and may point to the C++ kernel being destroyed
+        self._launch_ctx_cache.clear()
+        self._launch_ctx_cache_tracker.clear()
+        self._launch_ctx_scalar_slots.clear()
+        if self.kernel_cpp is t_kernel:
+            self.kernel_cpp = None
+        self.runtime.prog.delete_kernel(t_kernel)
+
     # For small kernels (< 3us), the performance can be pretty sensitive to overhead in __call__
     # Thus this part needs to be fast. (i.e. < 3us on a 4 GHz x64 CPU)
     @_shell_pop_print
     def __call__(self, *args, **kwargs) -> Any:
-        self.raise_on_templated_floats = impl.current_cfg().raise_on_templated_floats
-
-        args = _process_args(self, is_func=False, is_pyfunc=False, args=args, kwargs=kwargs)
+        launch_profiler = self.runtime.launch_profiler
+        if launch_profiler is not None:
+            launch_profiler.begin_call(self)
+        try:
+            self.raise_on_templated_floats = impl.current_cfg().raise_on_templated_floats
+
+            args = _process_args(self, is_func=False, is_pyfunc=False, args=args, kwargs=kwargs)
+            if launch_profiler is not None:
+                launch_profiler.mark("process_args")
+
+            # Transform the primal kernel to forward mode grad kernel
+            # then recover to primal when exiting the forward mode manager
+            if self.runtime.fwd_mode_manager and not self.runtime.grad_replaced:
+                # TODO: if we would like to compute 2nd-order derivatives by forward-on-reverse in a nested context
+                # manager fashion, i.e., a `Tape` nested in the `FwdMode`, we can transform the kernels with
+                # `mode_original == AutodiffMode.REVERSE` only, to avoid duplicate computation for 1st-order
+                # derivatives.
+                self.runtime.fwd_mode_manager.insert(self)
+
+            # Both the class kernels and the plain-function kernels are unified now.
+            # In both cases, |self.grad| is another Kernel instance that computes the
+            # gradient. For class kernels, args[0] is always the kernel owner.
+
+            # No need to capture grad kernels because they are already bound with their primal kernels
+            if (
+                self.autodiff_mode in (_NONE, _VALIDATION)
+                and self.runtime.target_tape
+                and not self.runtime.grad_replaced
+            ):
+                self.runtime.target_tape.insert(self, args)
+
+            if self.autodiff_mode != _NONE and impl.current_cfg().opt_level == 0:
+                _logging.warn("""opt_level = 1 is enforced to enable gradient computation.""")
+                impl.current_cfg().opt_level = 1
+            key = self.ensure_compiled(*args)
+            kernel_cpp = self.materialized_kernels[key]
+            compiled_kernel_data = self.compiled_kernel_data_by_key.get(key, None)
+            if self.runtime.timeline:
+                with TimelineSpan("launch", self.func.__name__, key[1]):
+                    return self.launch_kernel(kernel_cpp, compiled_kernel_data, *args)
+            return self.launch_kernel(kernel_cpp, compiled_kernel_data, *args)
+        except BaseException:
+            if launch_profiler is not None:
+                launch_profiler.cancel_call()
+            raise
 
-        # Transform the primal kernel to forward mode grad kernel
-        # then recover to primal when exiting the forward mode manager
-        if self.runtime.fwd_mode_manager and not self.runtime.grad_replaced:
-            # TODO: if we would like to compute 2nd-order derivatives by forward-on-reverse in a nested context manager
-            # fashion, i.e., a `Tape` nested in the `FwdMode`, we can transform the kernels with
-            # `mode_original == AutodiffMode.REVERSE` only, to avoid duplicate computation for 1st-order derivatives.
-            self.runtime.fwd_mode_manager.insert(self)
+    @_shell_pop_print
+    def launch_batch(self, args_list: typing.Iterable[tuple[Any, ...]]) -> None:
+        """
+        Launches this kernel once per tuple of arguments in args_list, in order.
+
+        Consecutive launches whose arguments only differ by the value of scalars share the same instantiation and
+        launch context. For each such run, the template mapping and the compiled kernel are resolved once, then all
+        the launch contexts are built and launched back-to-back by a single call to C++, extending the batching of
+        'set_args_*' across launches instead of across arguments. Other launches go through the usual path.
+
+        Kernels returning values cannot be launched in batch.
+
+        When the timeline is enabled, each run of launches sharing the same instance is recorded as a single ``launch``
+        span. Batched launches are not timed by the launch profiler, see ``ti.profiler.enable_launch_profiler``.
+        """
+        if self.return_type:
+            raise GsTaichiRuntimeError(
+                f"Kernel {self.func.__name__} returns values, so it cannot be launched in batch."
+            )
+        runtime = self.runtime
+        if self.autodiff_mode != _NONE or runtime.fwd_mode_manager or runtime.target_tape or runtime.launch_recorder:
+            # Every launch must be intercepted individually
+            for args in args_list:
+                self(*args)
+            return
 
-        # Both the class kernels and the plain-function kernels are unified now.
-        # In both cases, |self.grad| is another Kernel instance that computes the
-        # gradient. For class kernels, args[0] is always the kernel owner.
+        self.raise_on_templated_floats = impl.current_cfg().raise_on_templated_floats
+        run: list[tuple[Any, ...]] = []
+        run_args_hash: ArgsHash = ()
+        for args in args_list:
+            args = _process_args(self, is_func=False, is_pyfunc=False, args=tuple(args), kwargs={})
+            if self._non_scalar_arg_positions is None:
+                args_hash: ArgsHash = tuple(map(id, args))
+            else:
+                args_hash = tuple([id(args[i]) for i in self._non_scalar_arg_positions])
+            if run and args_hash != run_args_hash:
+                self._launch_run(run_args_hash, run)
+                run = []
+            run.append(args)
+            run_args_hash = args_hash
+        if run:
+            self._launch_run(run_args_hash, run)
+
+    def _launch_run(self, args_hash: ArgsHash, run: list[tuple[Any, ...]]) -> None:
+        """
+        Launches a run of 'launch_batch' sharing the same non-scalar arguments.
+        """
+        key = self.ensure_compiled(*run[0])
+        if self.runtime.timeline:
+            # A single span for the whole run, since its launches are not seen individually from Python
+            with TimelineSpan("launch", self.func.__name__, key[1]):
+                return self._launch_run_instance(key, args_hash, run)
+        return self._launch_run_instance(key, args_hash, run)
+
+    def _launch_run_instance(self, key: CompiledKernelKeyType, args_hash: ArgsHash, run: list[tuple[Any, ...]]) -> None:
+        """
+        Launches a run of 'launch_batch', whose first launch is an instance of the given key.
+        """
+        t_kernel = self.materialized_kernels[key]
+        self.launch_kernel(t_kernel, self.compiled_kernel_data_by_key.get(key), *run[0])
+        remaining = run[1:]
+        if not remaining:
+            return
+        if self._has_bound_members:
+            # The launch context was cached along with the members of the template arguments bound at launch
+            args_hash += tuple(
+                [id(_resolve_bound_member(run[0][i], path)) for i, path, _ in self.bound_members_by_key.get(key, ())]
+            )
 
-        # No need to capture grad kernels because they are already bound with their primal kernels
-        if self.autodiff_mode in (_NONE, _VALIDATION) and self.runtime.target_tape and not self.runtime.grad_replaced:
-            self.runtime.target_tape.insert(self, args)
+        # The first launch stored its launch context in cache if it could be shared
+        values_by_kind: dict[_KernelBatchedArgType, tuple[tuple[int, ...], list[list[int | float]]]] = {}
+        is_batchable = bool(self._launch_ctx_cache_tracker.get(args_hash))
+        if is_batchable:
+            for kind, indices, getters in self._launch_ctx_scalar_slots[args_hash]:
+                values = [_get_scalar_arg_values(kind, getters, args) for args in remaining]
+                if None in values:
+                    # Let the usual path report the type error
+                    is_batchable = False
+                    break
+                values_by_kind[kind] = (indices, cast(list[list[int | float]], values))
+        if not is_batchable:
+            for args in remaining:
+                key = self.ensure_compiled(*args)
+                self.launch_kernel(self.materialized_kernels[key], self.compiled_kernel_data_by_key.get(key), *args)
+            return
 
-        if self.autodiff_mode != _NONE and impl.current_cfg().opt_level == 0:
-            _logging.warn("""opt_level = 1 is enforced to enable gradient computation.""")
-            impl.current_cfg().opt_level = 1
-        key = self.ensure_compiled(*args)
-        kernel_cpp = self.materialized_kernels[key]
-        compiled_kernel_data = self.compiled_kernel_data_by_key.get(key, None)
-        return self.launch_kernel(kernel_cpp, compiled_kernel_data, *args)
+        assert self._prog_weakref is not None
+        prog = self._prog_weakref()
+        assert prog is not None
+        batch_args: list[Any] = []
+        for kind in (_FLOAT, _INT, _UINT):
+            batch_args += values_by_kind.get(kind, ((), []))
+        try:
+            prog.launch_kernel_batch(
+                self._last_compiled_kernel_data,
+                t_kernel,
+                self._launch_ctx_cache[args_hash],
+                len(remaining),
+                *batch_args,
+            )
+        except Exception as e:
+            e = handle_exception_from_cpp(e)
+            if impl.get_runtime().print_full_traceback:
+                raise e
+            raise e from None
+        if self.has_print:
+            runtime_ops.sync()
 
 
 # For a GsTaichi class definition like below:
@@ -1636,6 +2129,17 @@ class _BoundedDifferentiableMethod:
                 raise e
             raise type(e)("\n" + str(e)) from None
 
+    def launch_batch(self, args_list: typing.Iterable[tuple[Any, ...]]) -> None:
+        assert self._primal is not None
+        if not self._is_staticmethod:
+            args_list = ((self._kernel_owner, *args) for args in args_list)
+        try:
+            self._primal.launch_batch(args_list)
+        except (GsTaichiCompilationError, GsTaichiRuntimeError) as e:
+            if impl.get_runtime().print_full_traceback:
+                raise e
+            raise type(e)("\n" + str(e)) from None
+
     def grad(self, *args, **kwargs) -> Kernel:
         assert self._adjoint is not None
         return self._adjoint(self._kernel_owner, *args, **kwargs)
@@ -1710,4 +2214,144 @@ def data_oriented(cls):
     return cls
 
 
-__all__ = ["data_oriented", "func", "kernel", "pyfunc", "real_func", "_KernelBatchedArgType"]
+def _resolve_kernel_and_args(kernel_obj: Any, args: tuple[Any, ...]) -> tuple[Kernel, tuple[Any, ...]]:
+    """
+    Returns the primal kernel underlying a kernel as exposed to the user, along with its full list of arguments.
+    """
+    if isinstance(kernel_obj, Kernel):
+        return kernel_obj, args
+    if isinstance(kernel_obj, _BoundedDifferentiableMethod):
+        assert kernel_obj._primal is not None
+        if kernel_obj._is_staticmethod:
+            return kernel_obj._primal, args
+        return kernel_obj._primal, (kernel_obj._kernel_owner, *args)
+    if (
+        isinstance(kernel_obj, (GsTaichiCallable, BoundGsTaichiCallable))
+        and kernel_obj._is_wrapped_kernel
+        and not kernel_obj._is_classkernel
+    ):
+        assert kernel_obj._primal is not None
+        return kernel_obj._primal, args
+    raise GsTaichiSyntaxError(f"Expecting a GsTaichi kernel, got {kernel_obj}")
+
+
+def compile_many(kernels_and_args: typing.Iterable[tuple[Any, tuple[Any, ...]]]) -> None:
+    """Compiles many kernel instantiations at once.
+
+    The Python front-end (template instantiation, AST transform) is done in order for each
+    (kernel, example arguments) pair, then all the kernels that are neither in memory nor in
+    any cache are compiled concurrently by the backend, using ``num_compile_threads`` workers.
+    This function returns when every kernel is ready to be launched. The kernels being compiled
+    are stored in the fast cache along the way, and in the offline cache, if enabled, which is
+    written to disk when the program is finalized as usual.
+
+    Args:
+        kernels_and_args: pairs of kernel and example arguments, as they would be passed to the kernel
+            when calling it. Only the types (and the values of templates) of the arguments matter.
+
+    Example::
+
+        >>> @ti.kernel
+        >>> def fill(a: ti.types.NDArray[ti.f32, 1], value: ti.f32):
+        >>>     for i in a:
+        >>>         a[i] = value
+        >>>
+        >>> a = ti.ndarray(ti.f32, (16,))
+        >>> ti.compile_many([(fill, (a, 0.0)), (other_kernel, (a,))])
+    """
+    runtime = impl.get_runtime()
+    raise_on_templated_floats = impl.current_cfg().raise_on_templated_floats
+    pending: dict[tuple[int, CompiledKernelKeyType], tuple[Kernel, CompiledKernelKeyType, str | None]] = {}
+    for kernel_obj, args in kernels_and_args:
+        kernel_, args = _resolve_kernel_and_args(kernel_obj, tuple(args))
+        kernel_.raise_on_templated_floats = raise_on_templated_floats
+        args = _process_args(kernel_, is_func=False, is_pyfunc=False, args=args, kwargs={})
+        key = kernel_.ensure_compiled(*args)
+        # 'fast_checksum' only holds the checksum of the latest materialized instance, so it must be captured now
+        if kernel_.compiled_kernel_data_by_key.get(key) is None:
+            pending.setdefault((id(kernel_), key), (kernel_, key, kernel_.fast_checksum))
+        kernel_.currently_compiling_materialize_key = None
+    # Instances may have been evicted already if there are more of them than ti.init(max_kernel_instances=...)
+    pending = {k: v for k, v in pending.items() if v[1] in v[0].materialized_kernels}
+    if not pending:
+        return
+
+    prog = runtime.prog
+    prog_config = prog.config()
+    prog_device_cap = prog.get_device_caps()
+    kernels_cpp = [kernel_.materialized_kernels[key] for kernel_, key, _ in pending.values()]
+    try:
+        compile_results: list[CompileResult] = prog.compile_kernels(prog_config, prog_device_cap, kernels_cpp)
+    except Exception as e:
+        e = handle_exception_from_cpp(e)
+        if runtime.print_full_traceback:
+            raise e
+        raise e from None
+    for (kernel_, key, fast_checksum), kernel_cpp, compile_result in zip(
+        pending.values(), kernels_cpp, compile_results
+    ):
+        kernel_.compiled_kernel_data_by_key[key] = kernel_._process_compile_result(
+            prog, prog_config, prog_device_cap, key, kernel_cpp, fast_checksum, compile_result
+        )
+
+
+def fuse(*kernels: Any) -> GsTaichiCallable:
+    """Fuses kernels into a single one.
+
+    Calling the returned kernel runs the given kernels in order, as a single launch. On top of that, consecutive
+    parallel loops iterating over the same constant range, or over dense fields of the same shape, are merged into a
+    single loop, as long as each iteration of a loop only depends on the same iteration of the previous one, i.e. the
+    fields written by one loop and accessed by the other are only indexed by the loop index. This saves a launch, and
+    a pass over memory for each merged loop, which matters for memory-bound sequences of small kernels, such as the
+    vector updates of iterative solvers. Loops that cannot be merged are still run one after the other.
+
+    Args:
+        kernels: kernels to run in order, possibly bound to a data-oriented object. They must not take any argument,
+            nor return any value.
+
+    Returns:
+        Callable: The fused kernel, taking no argument.
+
+    Example::
+
+        >>> @ti.kernel
+        >>> def update_x():
+        >>>     for i in x:
+        >>>         x[i] += alpha[None] * p[i]
+        >>>
+        >>> @ti.kernel
+        >>> def update_r():
+        >>>     for i in r:
+        >>>         r[i] -= alpha[None] * Ap[i]
+        >>>
+        >>> update_x_and_r = ti.fuse(update_x, update_r)
+        >>> update_x_and_r()  # a single loop updating both x and r
+    """
+    if not kernels:
+        raise GsTaichiSyntaxError("At least one kernel is needed to be fused")
+    funcs_and_args = []
+    names = []
+    for kernel_obj in kernels:
+        primal, args = _resolve_kernel_and_args(kernel_obj, ())
+        name = primal.func.__name__
+        if len(primal.arg_metas) != len(args) or primal.return_type:
+            raise GsTaichiSyntaxError(f"Kernel {name} cannot be fused, since it takes arguments or returns values")
+        # Inline the body of the kernel as if it were a function
+        inlined = GsTaichiCallable(primal.func, Func(primal.func, _classfunc=primal.classkernel))
+        inlined._is_gstaichi_function = True
+        funcs_and_args.append((inlined, args))
+        names.append(name)
+    funcs_and_args = tuple(funcs_and_args)
+
+    def fused():
+        for f, args in impl.static(funcs_and_args):
+            f(*args)
+
+    fused.__name__ = fused.__qualname__ = "_".join(["fused", *names])
+    wrapped = _kernel_impl(fused, level_of_class_stackframe=1)
+    assert wrapped._primal is not None
+    wrapped._primal.fuse_offloads = True
+    return wrapped
+
+
+__all__ = ["compile_many", "data_oriented", "func", "fuse", "kernel", "pyfunc", "real_func", "_KernelBatchedArgType"]
@@ -0,0 +1,154 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+from weakref import ReferenceType
+
+from gstaichi._lib import core as _ti_core
+from gstaichi._lib.core.gstaichi_python import (
+    CompiledKernelData,
+    KernelLaunchContext,
+)
+from gstaichi.lang import impl
+from gstaichi.lang.exception import (
+    GsTaichiRuntimeError,
+    GsTaichiRuntimeTypeError,
+    handle_exception_from_cpp,
+)
+
+
+class RecordedLaunch:
+    """A kernel launch captured by :func:`record`.
+
+    Args:
+        kernel_name (str): Name of the launched kernel.
+        compiled_kernel_data (CompiledKernelData): Compiled kernel being launched.
+        launch_ctx (KernelLaunchContext): Arguments of the launch.
+        args (tuple): Python arguments of the launch, kept alive for as long as the launch can be replayed, since the
+            launch context only stores raw pointers to the underlying memory.
+        scalar_args (dict[str, tuple]): Conversion info and kernel arg index of each scalar argument, by argument name.
+            Scalar members of dataclass arguments are named by their dotted path, e.g. ``"state.dt"``.
+    """
+
+    def __init__(
+        self,
+        kernel_name: str,
+        compiled_kernel_data: CompiledKernelData,
+        launch_ctx: KernelLaunchContext,
+        args: tuple[Any, ...],
+        scalar_args: dict[str, tuple[tuple[type, ...], Any, str, int]],
+    ) -> None:
+        self.kernel_name = kernel_name
+        self.compiled_kernel_data = compiled_kernel_data
+        self.launch_ctx = launch_ctx
+        self.args = args
+        self.scalar_args = scalar_args
+
+    def set_arg(self, name: str, value: int | float) -> None:
+        """Updates the value of a scalar argument of this launch.
+
+        Args:
+            name (str): Name of the argument, or dotted path for members of dataclass arguments.
+            value (Union[int, float]): New value.
+        """
+        try:
+            accepted_types, cast, setter_name, index = self.scalar_args[name]
+        except KeyError:
+            raise GsTaichiRuntimeError(
+                f"Kernel {self.kernel_name} has no scalar argument named '{name}'. "
+                f"Available scalar arguments: {list(self.scalar_args)}"
+            ) from None
+        if not isinstance(value, accepted_types):
+            raise GsTaichiRuntimeTypeError(
+                f"Argument '{name}' of kernel {self.kernel_name} cannot be set to a value of type {type(value)}"
+            )
+        getattr(self.launch_ctx, setter_name)([index], [cast(value)])
+
+
+class LaunchGraph:
+    """A sequence of kernel launches captured by :func:`record`, that can be replayed without any Python overhead."""
+
+    def __init__(self) -> None:
+        self.launches: list[RecordedLaunch] = []
+        self._prog_weakref: ReferenceType | None = None
+        # Kernel instances pinned by this graph, as (id(kernel), key), see 'Kernel._record_launch'
+        self._pinned_instance_keys: set[tuple[int, Any]] = set()
+
+    def _add(self, launch: RecordedLaunch) -> None:
+        prog = impl.get_runtime().prog
+        if self._prog_weakref is None:
+            self._prog_weakref = ReferenceType(prog)
+        self.launches.append(launch)
+
+    def set_args(self, **values: int | float) -> None:
+        """Updates scalar arguments, in every recorded launch having an argument of that name.
+
+        Example::
+
+            >>> with ti.record() as graph:
+            >>>     step(x, dt=0.01)
+            >>> graph.set_args(dt=0.02)
+            >>> graph.replay(100)
+        """
+        for name, value in values.items():
+            found = False
+            for launch in self.launches:
+                if name in launch.scalar_args:
+                    launch.set_arg(name, value)
+                    found = True
+            if not found:
+                raise GsTaichiRuntimeError(f"No recorded launch has a scalar argument named '{name}'")
+
+    def replay(self, n: int = 1) -> None:
+        """Launches the recorded sequence of kernels n times, in recording order.
+
+        The whole loop runs in C++, with the arguments as they were at record time, apart from the scalar arguments
+        updated using :meth:`set_args`. Return values are discarded.
+
+        Args:
+            n (int): Number of times the sequence is launched.
+        """
+        prog = impl.get_runtime().prog
+        if self.launches and (self._prog_weakref is None or self._prog_weakref() is not prog):
+            raise GsTaichiRuntimeError("This launch graph was recorded with a program that has been reset since then.")
+        try:
+            prog.launch_kernels(
+                [launch.compiled_kernel_data for launch in self.launches],
+                [launch.launch_ctx for launch in self.launches],
+                n,
+            )
+        except Exception as e:
+            e = handle_exception_from_cpp(e)
+            if impl.get_runtime().print_full_traceback:
+                raise e
+            raise e from None
+
+
+@contextmanager
+def record() -> Iterator[LaunchGraph]:
+    """Records all the kernel launches happening in scope, so that they can be replayed later on.
+
+    Kernels are still launched normally while recording. Only CPU backends are supported.
+
+    Example::
+
+        >>> with ti.record() as graph:
+        >>>     step(state, dt=0.01)
+        >>> graph.replay(1000)
+
+    Returns:
+        LaunchGraph: The recorded launches.
+    """
+    runtime = impl.get_runtime()
+    arch = impl.current_cfg().arch
+    if arch not in (_ti_core.x64, _ti_core.arm64):
+        raise GsTaichiRuntimeError(f"ti.record() is only supported on CPU, not on {_ti_core.arch_name(arch)}.")
+    if runtime.launch_recorder is not None:
+        raise GsTaichiRuntimeError("ti.record() cannot be nested.")
+    graph = LaunchGraph()
+    runtime.launch_recorder = graph
+    try:
+        yield graph
+    finally:
+        runtime.launch_recorder = None
+
+
+__all__ = ["record"]
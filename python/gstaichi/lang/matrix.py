@@ -1671,9 +1671,13 @@ class MatrixNdarray(Ndarray):
         return Matrix([[NdarrayHostAccess(self, key, (i, j)) for j in range(self.m)] for i in range(self.n)])
 
     @python_scope
-    def to_numpy(self):
+    def to_numpy(self, copy=True):
         """Converts this ndarray to a `numpy.ndarray`.
 
+        Args:
+            copy (bool): If False, returns a view sharing memory with this ndarray instead of a copy, see
+                :meth:`~gstaichi.lang._ndarray.Ndarray.numpy_view`. Only supported on CPU backends.
+
         Example::
 
             >>> arr = ti.MatrixNdarray(2, 2, ti.f32, shape=(2, 1))
@@ -1684,6 +1688,8 @@ class MatrixNdarray(Ndarray):
              [[[0. 0.]
                [0. 0.]]]]
         """
+        if not copy:
+            return self.numpy_view()
         return self._ndarray_matrix_to_numpy(as_vector=0)
 
     @python_scope
@@ -1782,9 +1788,13 @@ class VectorNdarray(Ndarray):
         return Vector([NdarrayHostAccess(self, key, (i,)) for i in range(self.n)])
 
     @python_scope
-    def to_numpy(self):
+    def to_numpy(self, copy=True):
         """Converts this vector ndarray to a `numpy.ndarray`.
 
+        Args:
+            copy (bool): If False, returns a view sharing memory with this ndarray instead of a copy, see
+                :meth:`~gstaichi.lang._ndarray.Ndarray.numpy_view`. Only supported on CPU backends.
+
         Example::
 
             >>> a = ti.VectorNdarray(3, ti.f32, (2, 2))
@@ -1795,6 +1805,8 @@ class VectorNdarray(Ndarray):
                    [[0., 0., 0.],
                     [0., 0., 0.]]], dtype=float32)
         """
+        if not copy:
+            return self.numpy_view()
         return self._ndarray_matrix_to_numpy(as_vector=1)
 
     @python_scope
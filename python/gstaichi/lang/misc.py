@@ -306,6 +306,10 @@ def init(
     require_version: str | None = None,
     print_non_pure: bool = False,
     src_ll_cache: bool = True,
+    src_ll_cache_backend: str = "files",
+    structural_template_keys: bool = False,
+    max_kernel_instances: int | None = None,
+    max_kernel_instances_per_kernel: int | None = None,
     **kwargs,
 ):
     """Initializes the GsTaichi runtime.
@@ -322,6 +326,22 @@ def init(
                         @ti.pure
         src_ll_cache: enable SRC-LL-CACHE, which will accelerate loading from cache, across all architectures,
                       for pure kernels (i.e. kernels declared as @ti.pure)
+        src_ll_cache_backend: storage of the python side of SRC-LL-CACHE. "files" stores one file per cache key,
+                              "index" stores all the keys in a single memory-mapped file, loaded once per process
+                              and written at exit, which is much faster for large numbers of kernels.
+        structural_template_keys: instantiate kernels based on the content of @ti.data_oriented objects and of
+                                  list/dict/set template arguments, i.e. the type and value of their members, instead
+                                  of their identity. Distinct objects with identical content then share the same
+                                  kernel instantiation. Their ndarray members, and their field members on CPU and
+                                  CUDA, are passed to the kernels at launch like ndarray arguments, so that only their
+                                  dtype and shape matter, or number of dimensions for ndarrays. Only the fields
+                                  created with a shape, e.g. ti.field(ti.f32, shape=n), can be passed this way. Other
+                                  fields are compiled in the kernels, so objects referencing different ones still get
+                                  separate instantiations.
+        max_kernel_instances: maximum number of materialized kernel instantiations kept in memory, across all the
+                              kernels. The least recently used ones are evicted beyond that, and materialized again on
+                              demand, reusing their compiled code. Unlimited by default.
+        max_kernel_instances_per_kernel: same as max_kernel_instances, for each kernel separately.
         **kwargs: GsTaichi provides highly customizable compilation through
             ``kwargs``, which allows for fine grained control of GsTaichi compiler
             behavior. Below we list some of the most frequently used ones. For a
@@ -329,6 +349,33 @@ def init(
             https://github.com/taichi-dev/gstaichi/blob/master/gstaichi/program/compile_config.h.
 
             * ``cpu_max_num_threads`` (int): Sets the number of threads used by the CPU thread pool.
+            * ``cpu_thread_spin_us`` (int): Microseconds the CPU thread pool busy-waits for the next parallel task
+              before putting its threads to sleep. Lowers the launch latency of small kernels launched back to back,
+              at the cost of burning CPU time. Default to 0, i.e. sleep right away.
+            * ``cpu_thread_affinity`` (bool): Pins each thread of the CPU thread pool to its own core (Linux and
+              Windows only). Default to False.
+            * ``cpu_concurrent_tasks`` (bool): Runs consecutive top-level for loops of a kernel that do not touch the same
+              fields or ndarrays at the same time on CPU, each one on a single thread, instead of one after the other
+              on all the threads. Pays off for kernels made of many small loops. Default to False.
+            * ``async_launch`` (bool): Returns from kernel launches on CPU without waiting for the kernels to finish,
+              so that Python can prepare the next launches in the meantime. The kernels still run one after the other,
+              in order. Reading fields or ndarrays from Python, ``to_numpy()``, kernels returning values and
+              ``ti.sync()`` wait for the pending kernels. Kernels taking numpy arrays or torch tensors as arguments are
+              run synchronously. Errors raised by a kernel are reported at the next synchronization. Ignored when the
+              kernel profiler is enabled. Default to False.
+            * ``cpu_gc_free_list_threshold`` (int): Defers the reclamation of the cells deactivated in pointer and
+              dynamic SNodes on CPU until fewer free cells than this are left to allocate from, instead of reclaiming
+              them after every kernel deactivating some. Pays off when many cells are deactivated and activated again
+              at every step. Default to 0, i.e. disabled.
+            * ``kernel_profiler_max_traced_records`` (int): Only keeps the most recent records of the kernel profiler
+              beyond this number, so that it can stay enabled for long runs. The statistics and percentiles of each
+              kernel still cover all its records. Default to 0, i.e. unlimited.
+            * ``timeline`` (bool): Records the time spent by the host thread materializing, transforming, compiling,
+              loading from the offline cache and launching each kernel instance, as well as waiting for the device,
+              which can be saved as a Chrome trace using ``ti.profiler.save_timeline()``. Default to False.
+            * ``compile_profiler`` (bool): Records the time spent compiling each kernel instance, pass by pass, along
+              with the number of IR statements before and after each pass. See ``ti.profiler.compile_stats()``.
+              Default to False.
             * ``debug`` (bool): Enables the debug mode, under which GsTaichi does a few more things like boundary checks.
             * ``print_ir`` (bool): Prints the CHI IR of the GsTaichi kernels.
             *``offline_cache`` (bool): Enables offline cache of the compiled kernels. Default to True. When this is enabled GsTaichi will cache compiled kernel on your local disk to accelerate future calls.
@@ -414,6 +461,15 @@ def init(
     if len(unexpected_keys):
         raise KeyError(f'Unrecognized keyword argument(s) for ti.init: {", ".join(unexpected_keys)}')
 
+    if src_ll_cache_backend not in ("files", "index"):
+        raise ValueError(f'Invalid src_ll_cache_backend="{src_ll_cache_backend}", should be "files" or "index"')
+    for name, value in (
+        ("max_kernel_instances", max_kernel_instances),
+        ("max_kernel_instances_per_kernel", max_kernel_instances_per_kernel),
+    ):
+        if value is not None and value < 1:
+            raise ValueError(f"Invalid {name}={value}, should be at least 1")
+
     # dispatch configurations that are not in ti.cfg:
     runtime = impl.get_runtime()
     if not _test_mode:
@@ -422,6 +478,10 @@ def init(
         runtime.print_full_traceback = spec_cfg.print_full_traceback
         runtime.unrolling_limit = spec_cfg.unrolling_limit
         runtime.src_ll_cache = src_ll_cache
+        runtime.src_ll_cache_backend = src_ll_cache_backend
+        runtime.structural_template_keys = structural_template_keys
+        runtime.max_kernel_instances = max_kernel_instances
+        runtime.max_kernel_instances_per_kernel = max_kernel_instances_per_kernel
         runtime.print_non_pure = print_non_pure
         _logging.set_logging_level(spec_cfg.log_level.lower())
 
@@ -440,6 +500,7 @@ def init(
 
     # create a new program:
     impl.get_runtime().create_program()
+    impl.get_runtime().timeline = cfg.timeline
 
     _logging.trace("Materializing runtime...")
     impl.get_runtime().prog.materialize_runtime()
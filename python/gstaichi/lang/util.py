@@ -328,7 +328,11 @@ def get_traceback(stacklevel=1):
 def is_data_oriented(obj: Any) -> bool:
     # Use getattr on class instead of object to bypass custom __getattr__ method that is
     # overwritten at instance level and very slow.
-    return getattr(type(obj), "_data_oriented", False)
+    return is_data_oriented_type(type(obj))
+
+
+def is_data_oriented_type(obj_type: type) -> bool:
+    return getattr(obj_type, "_data_oriented", False)
 
 
 def is_ti_template(annotation: Any) -> bool:
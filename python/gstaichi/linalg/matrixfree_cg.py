@@ -5,7 +5,7 @@ from math import sqrt
 from gstaichi.lang import misc
 from gstaichi.lang.exception import GsTaichiRuntimeError, GsTaichiTypeError
 from gstaichi.lang.impl import field, fields_builder, grouped
-from gstaichi.lang.kernel_impl import data_oriented, kernel
+from gstaichi.lang.kernel_impl import data_oriented, fuse, kernel
 from gstaichi.types import primitive_types, template
 
 
@@ -98,6 +98,9 @@ def MatrixFreeCG(A, b, x, tol=1e-6, maxiter=5000, quiet=True):
         for I in grouped(p):
             p[I] = r[I] + beta[None] * p[I]
 
+    # A single pass over the vectors
+    update_x_and_r = fuse(update_x, update_r)
+
     def solve():
         succeeded = True
         A._matvec(x, Ax)
@@ -114,8 +117,7 @@ def MatrixFreeCG(A, b, x, tol=1e-6, maxiter=5000, quiet=True):
                 A._matvec(p, Ap)  # compute Ap = A x p
                 pAp = reduce(p, Ap)
                 alpha[None] = old_rTr / pAp
-                update_x()
-                update_r()
+                update_x_and_r()
                 new_rTr = reduce(r, r)
                 if sqrt(new_rTr) < tol:
                     if not quiet:
@@ -256,6 +258,10 @@ def MatrixFreeBICGSTAB(A, b, x, tol=1e-6, maxiter=5000, quiet=True):
         for I in grouped(r):
             r[I] = s[I] - omega[None] * t[I]
 
+    # Single passes over the vectors
+    update_s_and_shat = fuse(update_s, update_shat)
+    update_x_and_r = fuse(update_x, update_r)
+
     def solve():
         succeeded = True
         A._matvec(x, Ax)
@@ -281,15 +287,13 @@ def MatrixFreeBICGSTAB(A, b, x, tol=1e-6, maxiter=5000, quiet=True):
                 A._matvec(p, Ap)
                 alpha_lower = reduce(r_tld, Ap)
                 alpha[None] = rho[None] / alpha_lower
-                update_s()
-                update_shat()
+                update_s_and_shat()
                 A._matvec(s_hat, Ashat)
                 copy(orig=Ashat, dest=t)
                 omega_upper = reduce(t, s)
                 omega_lower = reduce(t, t)
                 omega[None] = omega_upper / (omega_lower + 1e-16) if omega_lower == 0.0 else omega_upper / omega_lower
-                update_x()
-                update_r()
+                update_x_and_r()
                 rTr = reduce(r, r)
                 if not quiet:
                     print(f">>> Iter = {i+1:4}, Residual = {sqrt(rTr):e}")
@@ -1,6 +1,9 @@
 # type: ignore
 
+from gstaichi.profiler.compile_profiler import *
 from gstaichi.profiler.kernel_metrics import *
 from gstaichi.profiler.kernel_profiler import *
+from gstaichi.profiler.launch_profiler import *
 from gstaichi.profiler.memory_profiler import *
 from gstaichi.profiler.scoped_profiler import *
+from gstaichi.profiler.timeline import *
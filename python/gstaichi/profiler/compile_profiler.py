@@ -0,0 +1,118 @@
+# type: ignore
+
+from dataclasses import dataclass, field
+
+from gstaichi.lang.impl import get_runtime
+
+
+@dataclass
+class CompilePassStats:
+    """Time spent in a pass of a compilation pipeline, summed over its runs.
+
+    Passes are identified by the IR dump following them when ``ti.init(print_ir=True)``, so the time of a pass also
+    covers the analyses run since the previous dump.
+
+    Args:
+        pipeline (str): Compilation pipeline running the pass: ``compile_to_offloads``, run once per kernel,
+            ``offload_to_executable``, run once per offloaded task, or ``llvm`` for the LLVM code generation and
+            optimization.
+        name (str): Name of the pass.
+        num_runs (int): Number of times the pass ran, e.g. once per offloaded task.
+        time (float): Total wall-clock time spent in the pass, in seconds.
+        statements_before (int): Total number of IR statements before the runs of the pass.
+        statements_after (int): Total number of IR statements after the runs of the pass.
+    """
+
+    pipeline: str
+    name: str
+    num_runs: int
+    time: float
+    statements_before: int
+    statements_after: int
+
+
+@dataclass
+class KernelCompileStats:
+    """Time spent compiling a kernel instance.
+
+    Args:
+        kernel_name (str): Name of the kernel instance.
+        num_compilations (int): Number of times the instance was compiled. Instances loaded from the offline cache are
+            not compiled.
+        total_time (float): Total wall-clock time spent compiling the instance, in seconds. The offloaded tasks of a
+            kernel are compiled in parallel, so that the time of its passes may add up to more than this.
+        passes (list[CompilePassStats]): Statistics of each pass, in the order they were first run.
+    """
+
+    kernel_name: str
+    num_compilations: int
+    total_time: float
+    passes: list[CompilePassStats] = field(default_factory=list)
+
+
+def compile_stats():
+    """Returns the time spent compiling each kernel instance, pass by pass.
+
+    The compile profiler must be enabled using ``ti.init(compile_profiler=True)``. It times the passes turning the
+    kernels into CHI IR, then into executable code, and counts the IR statements before and after each of them, to
+    find the kernels and passes that are slow to compile. Kernels loaded from the offline cache are not compiled, so
+    it may be disabled using ``ti.init(offline_cache=False)`` to profile all the kernels.
+
+    Example::
+
+            >>> import gstaichi as ti
+            >>> ti.init(arch=ti.cpu, compile_profiler=True, offline_cache=False)
+            >>> ...  # Run some kernels
+            >>> slowest = max(ti.profiler.compile_stats(), key=lambda stats: stats.total_time)
+            >>> slowest_pass = max(slowest.passes, key=lambda stats: stats.time)
+
+    Returns:
+        list[KernelCompileStats]: One entry per compiled kernel instance, in the order they were first compiled.
+    """
+    return [
+        KernelCompileStats(
+            kernel_name=stats.kernel_name,
+            num_compilations=stats.num_compilations,
+            total_time=stats.total_time,
+            passes=[
+                CompilePassStats(
+                    pipeline=p.pipeline,
+                    name=p.pass_name,
+                    num_runs=p.num_runs,
+                    time=p.time,
+                    statements_before=p.statements_before,
+                    statements_after=p.statements_after,
+                )
+                for p in stats.passes
+            ],
+        )
+        for stats in get_runtime().prog.get_compile_profiler_stats()
+    ]
+
+
+def print_compile_profiler_info(max_kernels=10, max_passes=10):
+    """Prints the kernel instances slowest to compile, along with their slowest passes.
+
+    See :func:`compile_stats`.
+
+    Args:
+        max_kernels (int): Maximum number of kernel instances to print.
+        max_passes (int): Maximum number of passes to print for each kernel instance.
+    """
+    all_stats = sorted(compile_stats(), key=lambda stats: stats.total_time, reverse=True)
+    print(f"{'time [ms]':>10} {'runs':>5} {'statements':>21}  kernel / pass")
+    for stats in all_stats[:max_kernels]:
+        print(f"{stats.total_time * 1e3:>10.3f} {stats.num_compilations:>5} {'':>21}  {stats.kernel_name}")
+        for p in sorted(stats.passes, key=lambda p: p.time, reverse=True)[:max_passes]:
+            statements = f"{p.statements_before} -> {p.statements_after}"
+            print(f"{p.time * 1e3:>10.3f} {p.num_runs:>5} {statements:>21}    {p.pipeline}: {p.name}")
+    total_time = sum(stats.total_time for stats in all_stats)
+    print(f"{total_time * 1e3:>10.3f} {'':>5} {'':>21}  total ({len(all_stats)} kernel instances)")
+
+
+def clear_compile_profiler_info():
+    """Clears the statistics recorded by the compile profiler."""
+    get_runtime().prog.clear_compile_profiler_stats()
+
+
+__all__ = ["clear_compile_profiler_info", "compile_stats", "print_compile_profiler_info"]
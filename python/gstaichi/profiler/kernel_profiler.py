@@ -10,34 +10,27 @@ from gstaichi.profiler.kernel_metrics import default_cupti_metrics
 class StatisticalResult:
     """Statistical result of records.
 
-    Profiling records with the same kernel name will be counted in a ``StatisticalResult`` instance via function ``insert_record(time)``.
+    Profiling records with the same kernel name are counted by the backend, which also keeps a histogram of bounded
+    size of their elapsed times. The percentiles of the elapsed time are estimated from this histogram, within 1%.
     Currently, only the kernel elapsed time is counted, other statistics related to the kernel will be added in the feature.
     """
 
-    def __init__(self, name):
-        self.name = name
-        self.counter = 0
-        self.min_time = 0.0
-        self.max_time = 0.0
-        self.total_time = 0.0
+    # Percentiles of the elapsed time which are reported
+    PERCENTILES = (50, 90, 95, 99)
+
+    def __init__(self, result):
+        self.name = result.name
+        self.counter = result.counter
+        self.min_time = result.min
+        self.max_time = result.max
+        self.total_time = result.total
+        self.stddev_time = result.stddev()
+        self.percentiles = {p: result.percentile(p / 100.0) for p in self.PERCENTILES}
 
     def __lt__(self, other):
         # For sorted()
         return self.total_time < other.total_time
 
-    def insert_record(self, time):
-        """Insert records with the same kernel name.
-
-        Currently, only the kernel elapsed time is counted.
-        """
-        if self.counter == 0:
-            self.min_time = time
-            self.max_time = time
-        self.counter += 1
-        self.total_time += time
-        self.min_time = min(self.min_time, time)
-        self.max_time = max(self.max_time, time)
-
 
 class KernelProfiler:
     """Kernel profiler of GsTaichi.
@@ -122,6 +115,12 @@ class KernelProfiler:
         # TODO : query self.StatisticalResult in python scope
         return impl.get_runtime().prog.query_kernel_profile_info(name)
 
+    def get_thread_busy_time(self):
+        """For docstring of this function, see :func:`~gstaichi.profiler.get_kernel_profiler_thread_busy_time`."""
+        if self._check_not_turned_on_with_warning_message():
+            return []
+        return impl.get_runtime().prog.get_kernel_profiler_thread_busy_times()
+
     def set_metrics(self, metric_list=default_cupti_metrics):
         """For docstring of this function, see :func:`~gstaichi.profiler.set_kernel_profiler_metrics`."""
         if self._check_not_turned_on_with_warning_message():
@@ -169,6 +168,8 @@ class KernelProfiler:
             self._print_statistics_info()
         # TRACE mode : print records of launched kernel
         elif mode == self.TRACE:
+            # Only copied when needed, since there are many more records than kernels
+            self._traced_records = impl.get_runtime().prog.get_kernel_profiler_records()
             self._print_kernel_info()
         else:
             raise ValueError("Arg `mode` must be of type 'str', and has the value 'count' or 'trace'.")
@@ -197,18 +198,15 @@ class KernelProfiler:
         impl.get_runtime().prog.sync_kernel_profiler()
         impl.get_runtime().prog.update_kernel_profiler()
         self._clear_frontend()
-        self._traced_records = impl.get_runtime().prog.get_kernel_profiler_records()
 
     def _count_statistics(self):
         """Counts the statistics of launched kernels during the profiling period.
 
         The profiling records with the same kernel name are counted as a profiling result.
         """
-        for record in self._traced_records:
-            if self._statistical_results.get(record.name) is None:
-                self._statistical_results[record.name] = StatisticalResult(record.name)
-            self._statistical_results[record.name].insert_record(record.kernel_time)
-            self._total_time_ms += record.kernel_time
+        for result in impl.get_runtime().prog.get_kernel_profiler_statistical_results():
+            self._statistical_results[result.name] = StatisticalResult(result)
+            self._total_time_ms += result.total
         self._statistical_results = {
             k: v
             for k, v in sorted(
@@ -231,7 +229,10 @@ class KernelProfiler:
 
         # headers
         table_header = table_header = self._make_table_header("count")
-        column_header = "[      %     total   count |      min       avg       max   ] Kernel name"
+        percentiles_header = "".join(f"{'p' + str(p):>9} " for p in StatisticalResult.PERCENTILES)
+        column_header = (
+            f"[      %     total   count |      min       avg       max {percentiles_header}   stddev   ] Kernel name"
+        )
         # partition line
         line_length = max(len(column_header), len(table_header))
         outer_partition_line = "=" * line_length
@@ -243,7 +244,10 @@ class KernelProfiler:
         for key in self._statistical_results:
             result = self._statistical_results[key]
             fraction = result.total_time / self._total_time_ms * 100.0
-            string_list.append("[{:6.2f}% {:7.3f} s {:6d}x |{:9.3f} {:9.3f} {:9.3f} ms] {}")
+            percentiles_format = "{:9.3f} " * len(StatisticalResult.PERCENTILES)
+            string_list.append(
+                "[{:6.2f}% {:7.3f} s {:6d}x |{:9.3f} {:9.3f} {:9.3f} " + percentiles_format + "{:9.3f} ms] {}"
+            )
             values_list.append(
                 [
                     fraction,
@@ -252,6 +256,8 @@ class KernelProfiler:
                     result.min_time,
                     result.total_time / result.counter,  # avg_time
                     result.max_time,
+                    *result.percentiles.values(),
+                    result.stddev_time,
                     result.name,
                 ]
             )
@@ -260,6 +266,14 @@ class KernelProfiler:
         summary_line = "[100.00%] Total execution time: "
         summary_line += f"{self._total_time_ms/1000:7.3f} s   "
         summary_line += f"number of results: {len(self._statistical_results)}"
+        busy_times = [t for t in self.get_thread_busy_time() if t > 0.0]
+        if busy_times:
+            avg_busy_time = sum(busy_times) / len(busy_times)
+            summary_line += (
+                f"\nCPU threads busy time: {len(busy_times)} threads | min {min(busy_times):7.3f} s "
+                f"avg {avg_busy_time:7.3f} s max {max(busy_times):7.3f} s | "
+                f"balance {avg_busy_time / max(busy_times) * 100.0:6.2f}%"
+            )
 
         # print
         print(outer_partition_line)
@@ -356,7 +370,8 @@ def print_kernel_profiler_info(mode="count"):
     """Print the profiling results of GsTaichi kernels.
 
     To enable this profiler, set ``kernel_profiler=True`` in ``ti.init()``.
-    ``'count'`` mode: print the statistics (min,max,avg time) of launched kernels,
+    ``'count'`` mode: print the statistics (min,max,avg time, percentiles and standard deviation of the time) of
+    launched kernels,
     ``'trace'`` mode: print the records of launched kernels with specific profiling metrics (time, memory load/store and core utilization etc.),
     and defaults to ``'count'``.
 
@@ -388,15 +403,19 @@ def print_kernel_profiler_info(mode="count"):
 
 
 def query_kernel_profiler_info(name):
-    """Query kernel elapsed time(min,avg,max) on devices using the kernel name.
+    """Query kernel elapsed time(min,avg,max,percentiles) on devices using the kernel name.
 
     To enable this profiler, set `kernel_profiler=True` in `ti.init`.
 
+    The percentiles are estimated from a histogram of bounded size of the elapsed times, within 1%. When the kernel is
+    made of several offloaded tasks, their statistics are added up.
+
     Args:
         name (str): kernel name.
 
     Returns:
-        KernelProfilerQueryResult (class): with member variables(counter, min, max, avg)
+        KernelProfilerQueryResult (class): with member variables(counter, min, max, avg, percentiles). ``percentiles``
+        maps 50, 90, 95 and 99 to the corresponding percentiles of the elapsed time.
 
     Example::
 
@@ -420,6 +439,7 @@ def query_kernel_profiler_info(name):
         >>> print("kernel elapsed time(min_in_ms) =",query_result.min)
         >>> print("kernel elapsed time(max_in_ms) =",query_result.max)
         >>> print("kernel elapsed time(avg_in_ms) =",query_result.avg)
+        >>> print("kernel elapsed time(p99_in_ms) =",query_result.percentiles[99])
 
     Note:
         [1] To get the correct result, query_kernel_profiler_info() must be used in conjunction with
@@ -442,6 +462,37 @@ def get_kernel_profiler_total_time():
     return get_default_kernel_profiler().get_total_time()
 
 
+def get_kernel_profiler_thread_busy_time():
+    """Get the time spent running kernel tasks by each thread of the CPU thread pool.
+
+    Comparing these times shows how evenly the work of parallel for loops is balanced between the threads.
+    The counters are reset by :func:`~gstaichi.profiler.clear_kernel_profiler_info`.
+
+    To enable this profiler, set ``kernel_profiler=True`` in ``ti.init``.
+
+    Returns:
+        times (list[float]): busy time of each thread in second, empty on non-CPU backends.
+
+    Example::
+
+        >>> import gstaichi as ti
+
+        >>> ti.init(ti.cpu, kernel_profiler=True)
+        >>> n = 1024*1024
+        >>> var = ti.field(ti.f32, shape=n)
+
+        >>> @ti.kernel
+        >>> def fill():
+        >>>     for i in range(n):
+        >>>         var[i] = ti.sqrt(i)
+
+        >>> fill()
+        >>> busy_times = ti.profiler.get_kernel_profiler_thread_busy_time()
+        >>> print("load balance =", sum(busy_times) / len(busy_times) / max(busy_times))
+    """
+    return get_default_kernel_profiler().get_thread_busy_time()
+
+
 def set_kernel_profiler_toolkit(toolkit_name="default"):
     """Set the toolkit used by KernelProfiler.
 
@@ -578,6 +629,7 @@ def collect_kernel_profiler_metrics(metric_list=default_cupti_metrics):
 __all__ = [
     "clear_kernel_profiler_info",
     "collect_kernel_profiler_metrics",
+    "get_kernel_profiler_thread_busy_time",
     "get_kernel_profiler_total_time",
     "print_kernel_profiler_info",
     "query_kernel_profiler_info",
@@ -0,0 +1,190 @@
+# type: ignore
+
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from gstaichi.lang.impl import get_runtime
+
+
+@dataclass
+class KernelLaunchStats:
+    """Time spent in Python launching a kernel, stage by stage, along with the hits of its caches.
+
+    Args:
+        name (str): Name of the kernel.
+        num_calls (int): Number of calls of the kernel.
+        stage_times (dict[str, float]): Total wall-clock time spent in each stage of the calls, in seconds:
+
+            * ``process_args``: matching the arguments with the parameters of the kernel,
+            * ``template_lookup``: looking up the instance matching the arguments,
+            * ``materialize``: materializing the instance if needed,
+            * ``set_args``: setting the arguments of the launch context, or restoring it from cache,
+            * ``compile``: compiling the instance if needed,
+            * ``launch_kernel``: launching the instance.
+        mapping_cache_hits (int): Calls whose instance was found in the cache of the template mapper, by argument
+            identity.
+        mapping_cache_misses (int): Calls whose instance had to be looked up from the features of the arguments.
+        launch_ctx_cache_hits (int): Calls whose launch context was restored from cache.
+        launch_ctx_cache_misses (int): Calls whose launch context had to be built argument by argument.
+    """
+
+    STAGES = ("process_args", "template_lookup", "materialize", "set_args", "compile", "launch_kernel")
+
+    name: str
+    num_calls: int = 0
+    stage_times: dict[str, float] = field(default_factory=lambda: dict.fromkeys(KernelLaunchStats.STAGES, 0.0))
+    mapping_cache_hits: int = 0
+    mapping_cache_misses: int = 0
+    launch_ctx_cache_hits: int = 0
+    launch_ctx_cache_misses: int = 0
+
+    @property
+    def total_time(self):
+        return sum(self.stage_times.values())
+
+    @property
+    def mapping_cache_hit_ratio(self):
+        num_lookups = self.mapping_cache_hits + self.mapping_cache_misses
+        return self.mapping_cache_hits / num_lookups if num_lookups else 0.0
+
+    @property
+    def launch_ctx_cache_hit_ratio(self):
+        num_lookups = self.launch_ctx_cache_hits + self.launch_ctx_cache_misses
+        return self.launch_ctx_cache_hits / num_lookups if num_lookups else 0.0
+
+
+class LaunchProfiler:
+    """Times the stages of the kernel calls, see :func:`enable_launch_profiler`.
+
+    The stages of a call are delimited by calls to :func:`mark`, each one attributing the time elapsed since the
+    previous one to the stage it names. Kernels launched outside of a call, e.g. by ``launch_batch``, are ignored.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._current = None
+        self._stage_start = 0.0
+
+    def begin_call(self, kernel):
+        try:
+            stats = self._stats[kernel]
+        except KeyError:
+            stats = self._stats[kernel] = KernelLaunchStats(kernel.func.__name__)
+        stats.num_calls += 1
+        self._current = stats
+        self._stage_start = perf_counter()
+
+    def mark(self, stage):
+        if self._current is None:
+            return
+        now = perf_counter()
+        self._current.stage_times[stage] += now - self._stage_start
+        self._stage_start = now
+
+    def end_call(self, stage):
+        self.mark(stage)
+        self._current = None
+
+    def cancel_call(self):
+        # The stages of a call raising an exception are left as timed so far
+        self._current = None
+
+    def record_mapping_cache(self, mapper, args):
+        if self._current is None:
+            return
+        start = perf_counter()
+        if mapper._mapping_cache_tracker.get(tuple([id(arg) for arg in args])):
+            self._current.mapping_cache_hits += 1
+        else:
+            self._current.mapping_cache_misses += 1
+        # Not attributed to any stage
+        self._stage_start += perf_counter() - start
+
+    def record_launch_ctx_cache(self, hit):
+        if self._current is None:
+            return
+        if hit:
+            self._current.launch_ctx_cache_hits += 1
+        else:
+            self._current.launch_ctx_cache_misses += 1
+
+    def get_stats(self):
+        return list(self._stats.values())
+
+    def clear(self):
+        self._stats.clear()
+
+
+def enable_launch_profiler():
+    """Starts timing the stages of the kernel calls in Python.
+
+    For each kernel, the profiler counts its calls, the hits of the cache of its template mapper and of its launch
+    context cache, and the time spent in each stage of its calls, to find where the Python overhead of launching
+    small kernels goes. This does not include the execution of the kernels, see the kernel profiler for that.
+    Nothing is recorded nor timed when the profiler is disabled.
+
+    Example::
+
+            >>> import gstaichi as ti
+            >>> ti.init(arch=ti.cpu)
+            >>> ti.profiler.enable_launch_profiler()
+            >>> ...  # Run some kernels
+            >>> ti.profiler.print_launch_profiler_info()
+    """
+    runtime = get_runtime()
+    if runtime.launch_profiler is None:
+        runtime.launch_profiler = LaunchProfiler()
+
+
+def disable_launch_profiler():
+    """Stops timing the stages of the kernel calls, and discards the statistics recorded so far."""
+    get_runtime().launch_profiler = None
+
+
+def launch_stats():
+    """Returns the launch statistics of each kernel called since the launch profiler was enabled or cleared.
+
+    See :func:`enable_launch_profiler`.
+
+    Returns:
+        list[KernelLaunchStats]: One entry per kernel, in the order they were first called.
+    """
+    launch_profiler = get_runtime().launch_profiler
+    if launch_profiler is None:
+        raise RuntimeError(
+            "The launch profiler is disabled, please enable it using ti.profiler.enable_launch_profiler()."
+        )
+    return launch_profiler.get_stats()
+
+
+def print_launch_profiler_info():
+    """Prints the launch statistics of each kernel, the slowest to launch first.
+
+    See :func:`launch_stats`.
+    """
+    all_stats = sorted(launch_stats(), key=lambda stats: stats.total_time, reverse=True)
+    stages = KernelLaunchStats.STAGES
+    header = " ".join(f"{stage + ' us':>16}" for stage in stages)
+    print(f"{'calls':>8} {'mapping hits':>12} {'ctx hits':>8} {header}  kernel")
+    for stats in all_stats:
+        times = " ".join(f"{stats.stage_times[stage] / stats.num_calls * 1e6:>16.2f}" for stage in stages)
+        print(
+            f"{stats.num_calls:>8} {stats.mapping_cache_hit_ratio:>12.1%} {stats.launch_ctx_cache_hit_ratio:>8.1%} "
+            f"{times}  {stats.name}"
+        )
+
+
+def clear_launch_profiler_info():
+    """Discards the statistics recorded by the launch profiler."""
+    launch_profiler = get_runtime().launch_profiler
+    if launch_profiler is not None:
+        launch_profiler.clear()
+
+
+__all__ = [
+    "clear_launch_profiler_info",
+    "disable_launch_profiler",
+    "enable_launch_profiler",
+    "launch_stats",
+    "print_launch_profiler_info",
+]
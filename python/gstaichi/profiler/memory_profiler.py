@@ -1,5 +1,7 @@
 # type: ignore
 
+from dataclasses import dataclass
+
 from gstaichi.lang.impl import get_runtime
 
 
@@ -12,4 +14,61 @@ def print_memory_profiler_info():
     get_runtime().prog.print_memory_profiler_info()
 
 
-__all__ = ["print_memory_profiler_info"]
+@dataclass
+class KernelInstancesInfo:
+    """Memory held by the materialized instances of a kernel.
+
+    Args:
+        name (str): Name of the kernel.
+        num_instances (int): Number of materialized instances currently in memory.
+        num_ir_statements (int): Total number of IR statements of these instances.
+        compiled_bytes (int): Total size of the compiled code of these instances, in bytes.
+    """
+
+    name: str
+    num_instances: int
+    num_ir_statements: int
+    compiled_bytes: int
+
+
+def get_kernel_instances_info():
+    """Returns the memory held by the materialized instances of every kernel.
+
+    The number of instances kept in memory can be limited using
+    ``ti.init(max_kernel_instances=..., max_kernel_instances_per_kernel=...)``.
+
+    Returns:
+        list[KernelInstancesInfo]: One entry per kernel having at least one instance in memory, largest first.
+    """
+    infos = []
+    for kernel in get_runtime().kernels:
+        if not kernel.materialized_kernels:
+            continue
+        infos.append(
+            KernelInstancesInfo(
+                name=kernel.func.__name__,
+                num_instances=len(kernel.materialized_kernels),
+                num_ir_statements=sum(t_kernel.num_statements() for t_kernel in kernel.materialized_kernels.values()),
+                compiled_bytes=sum(ckd.size_in_bytes() for ckd in kernel.compiled_kernel_data_by_key.values() if ckd),
+            )
+        )
+    return sorted(infos, key=lambda info: (info.compiled_bytes, info.num_ir_statements), reverse=True)
+
+
+def print_kernel_instances_info():
+    """Prints the memory held by the materialized instances of every kernel.
+
+    See :func:`get_kernel_instances_info`.
+    """
+    infos = get_kernel_instances_info()
+    print(f"{'instances':>10} {'IR statements':>14} {'compiled bytes':>15}  kernel")
+    for info in infos:
+        print(f"{info.num_instances:>10} {info.num_ir_statements:>14} {info.compiled_bytes:>15}  {info.name}")
+    print(
+        f"{sum(info.num_instances for info in infos):>10} "
+        f"{sum(info.num_ir_statements for info in infos):>14} "
+        f"{sum(info.compiled_bytes for info in infos):>15}  total"
+    )
+
+
+__all__ = ["get_kernel_instances_info", "print_kernel_instances_info", "print_memory_profiler_info"]
@@ -0,0 +1,57 @@
+# type: ignore
+
+from gstaichi._lib import core as _ti_core
+from gstaichi.lang.impl import get_runtime
+
+
+def enable_timeline():
+    """Starts recording the host-side timeline.
+
+    The timeline records spans for the main phases the host threads go through for each kernel instance, along with
+    the name of the kernel and the id of its template instance:
+
+    * ``materialize``, ``ast_transform``: building the IR of an instance from its Python source,
+    * ``compile_kernel``, ``load_offline_cache``: compiling an instance, or loading it from the offline cache,
+    * ``launch``, ``pack_args``, ``launch_kernel``: launching an instance, including packing its arguments,
+    * ``synchronize``: waiting for the device to complete the launched kernels.
+
+    This is equivalent to ``ti.init(timeline=True)``. Recording is cheap, but the spans are kept in memory until
+    :func:`clear_timeline` is called.
+
+    Example::
+
+            >>> import gstaichi as ti
+            >>> ti.init(arch=ti.cpu, timeline=True)
+            >>> ...  # Run some kernels
+            >>> ti.sync()
+            >>> ti.profiler.save_timeline("timeline.json")
+    """
+    get_runtime().timeline = True
+    _ti_core.set_timeline_enabled(True)
+
+
+def disable_timeline():
+    """Stops recording the host-side timeline. The spans recorded so far are kept until cleared or saved."""
+    get_runtime().timeline = False
+    _ti_core.set_timeline_enabled(False)
+
+
+def clear_timeline():
+    """Discards the spans recorded by the host-side timeline."""
+    get_runtime().prog.timeline_clear()
+
+
+def save_timeline(filename):
+    """Saves the spans recorded by the host-side timeline, then discards them.
+
+    The spans are saved in the Chrome trace event format, which can be opened with ``chrome://tracing`` or
+    https://ui.perfetto.dev.
+
+    Args:
+        filename (str): Path of the JSON file to write.
+    """
+    get_runtime().prog.timeline_save(filename)
+    get_runtime().prog.timeline_clear()
+
+
+__all__ = ["clear_timeline", "disable_timeline", "enable_timeline", "save_timeline"]
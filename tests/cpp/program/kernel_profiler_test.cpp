@@ -0,0 +1,30 @@
+#include "gtest/gtest.h"
+
+#include "gstaichi/program/kernel_profiler.h"
+
+namespace gstaichi::lang {
+
+TEST(KernelProfilerTest, Percentiles) {
+  KernelProfileStatisticalResult result("kernel");
+  // 1 to 1000 ms
+  for (int i = 1000; i >= 1; i--) {
+    result.insert_record(i);
+  }
+  EXPECT_EQ(result.counter, 1000);
+  EXPECT_NEAR(result.percentile(0.5), 500, 5);
+  EXPECT_NEAR(result.percentile(0.95), 950, 9.5);
+  EXPECT_NEAR(result.percentile(0.99), 990, 9.9);
+  EXPECT_EQ(result.percentile(0.0), 1);
+  EXPECT_EQ(result.percentile(1.0), 1000);
+  EXPECT_NEAR(result.stddev(), 288.67, 0.01);
+}
+
+TEST(KernelProfilerTest, ExtremeTimes) {
+  KernelProfileStatisticalResult result("kernel");
+  result.insert_record(0.0);
+  result.insert_record(1e9);
+  EXPECT_EQ(result.percentile(0.5), 0.0);
+  EXPECT_EQ(result.percentile(1.0), 1e9);
+}
+
+}  // namespace gstaichi::lang
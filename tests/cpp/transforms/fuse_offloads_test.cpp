@@ -0,0 +1,107 @@
+#include "gtest/gtest.h"
+
+#include "gstaichi/ir/analysis.h"
+#include "gstaichi/ir/ir_builder.h"
+#include "gstaichi/ir/snode.h"
+#include "gstaichi/ir/statements.h"
+#include "gstaichi/ir/transforms.h"
+#include "gstaichi/struct/struct.h"
+#include "tests/cpp/struct/fake_struct_compiler.h"
+
+namespace gstaichi::lang {
+namespace {
+
+class FuseOffloadsTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    root_snode_ = std::make_unique<SNode>(/*depth=*/0, /*t=*/SNodeType::root);
+    const std::vector<Axis> axes = {Axis{0}};
+    auto &dense = root_snode_->dense(axes, /*sizes=*/128);
+    a_ = &dense.insert_children(SNodeType::place);
+    a_->dt = PrimitiveType::i32;
+    b_ = &dense.insert_children(SNodeType::place);
+    b_->dt = PrimitiveType::i32;
+    c_ = &dense.insert_children(SNodeType::place);
+    c_->dt = PrimitiveType::i32;
+    FakeStructCompiler sc;
+    sc.run(*root_snode_);
+
+    block_ = std::make_unique<Block>();
+  }
+
+  // Appends a range-for task over [0, end) doing `dst[i] = src[i + shift]`,
+  // or `dst[i] = i` if no `src` is given.
+  OffloadedStmt *add_task(SNode *dst,
+                          SNode *src = nullptr,
+                          int shift = 0,
+                          int end = 128) {
+    auto task = std::make_unique<OffloadedStmt>(
+        /*task_type=*/OffloadedTaskType::range_for,
+        /*arch=*/Arch::x64, nullptr);
+    task->const_begin = true;
+    task->const_end = true;
+    task->end_value = end;
+    IRBuilder builder;
+    builder.set_insertion_point({task->body.get(), 0});
+    auto *index = builder.get_loop_index(task.get());
+    Stmt *value = index;
+    if (src) {
+      Stmt *src_index = index;
+      if (shift) {
+        src_index = builder.create_add(index, builder.get_int32(shift));
+      }
+      auto *src_ptr = builder.create_global_ptr(src, {src_index});
+      value = builder.create_global_load(src_ptr);
+    }
+    auto *dst_ptr = builder.create_global_ptr(dst, {index});
+    builder.create_global_store(dst_ptr, value);
+    auto *task_ptr = task.get();
+    block_->insert(std::move(task));
+    return task_ptr;
+  }
+
+  std::unique_ptr<SNode> root_snode_{nullptr};
+  SNode *a_{nullptr};
+  SNode *b_{nullptr};
+  SNode *c_{nullptr};
+  std::unique_ptr<Block> block_{nullptr};
+};
+
+TEST_F(FuseOffloadsTest, SameIteration) {
+  auto *write_a = add_task(a_);
+  add_task(b_, a_);
+  add_task(c_, b_);
+  irpass::fuse_offloads(block_.get());
+  ASSERT_EQ(block_->size(), 1);
+  EXPECT_EQ(block_->statements[0].get(), write_a);
+  // Every loop index now refers to the remaining task
+  int num_loop_indices = 0;
+  irpass::analysis::gather_statements(write_a->body.get(), [&](Stmt *stmt) {
+    if (auto *loop_index = stmt->cast<LoopIndexStmt>()) {
+      EXPECT_EQ(loop_index->loop, write_a);
+      num_loop_indices++;
+    }
+    return false;
+  });
+  EXPECT_EQ(num_loop_indices, 3);
+}
+
+TEST_F(FuseOffloadsTest, CrossIterationDependency) {
+  add_task(a_);
+  // Reads a_[i + 1], written by another iteration
+  add_task(b_, a_, /*shift=*/1);
+  // Only reads b_ at the current iteration
+  add_task(c_, b_);
+  irpass::fuse_offloads(block_.get());
+  EXPECT_EQ(block_->size(), 2);
+}
+
+TEST_F(FuseOffloadsTest, DifferentIterationSpaces) {
+  add_task(a_);
+  add_task(b_, /*src=*/nullptr, /*shift=*/0, /*end=*/64);
+  irpass::fuse_offloads(block_.get());
+  EXPECT_EQ(block_->size(), 2);
+}
+
+}  // namespace
+}  // namespace gstaichi::lang
@@ -0,0 +1,114 @@
+#include "gtest/gtest.h"
+
+#include "gstaichi/ir/ir_builder.h"
+#include "gstaichi/ir/snode.h"
+#include "gstaichi/ir/statements.h"
+#include "gstaichi/ir/transforms.h"
+#include "gstaichi/struct/struct.h"
+#include "tests/cpp/struct/fake_struct_compiler.h"
+
+namespace gstaichi::lang {
+namespace {
+
+class MarkConcurrentOffloadsTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    root_snode_ = std::make_unique<SNode>(/*depth=*/0, /*t=*/SNodeType::root);
+    const std::vector<Axis> axes = {Axis{0}};
+    auto &dense = root_snode_->dense(axes, /*sizes=*/128);
+    a_ = &dense.insert_children(SNodeType::place);
+    a_->dt = PrimitiveType::i32;
+    b_ = &dense.insert_children(SNodeType::place);
+    b_->dt = PrimitiveType::i32;
+    c_ = &dense.insert_children(SNodeType::place);
+    c_->dt = PrimitiveType::i32;
+    FakeStructCompiler sc;
+    sc.run(*root_snode_);
+
+    block_ = std::make_unique<Block>();
+  }
+
+  // Appends a range-for task doing `dst[0] = src[0]`, or `dst[0] = 0` if no
+  // `src` is given.
+  OffloadedStmt *add_task(SNode *dst, SNode *src = nullptr) {
+    auto task = std::make_unique<OffloadedStmt>(
+        /*task_type=*/OffloadedTaskType::range_for,
+        /*arch=*/Arch::x64, nullptr);
+    task->const_begin = true;
+    task->const_end = true;
+    task->end_value = 128;
+    IRBuilder builder;
+    builder.set_insertion_point({task->body.get(), 0});
+    auto *zero = builder.get_int32(0);
+    Stmt *value = zero;
+    if (src) {
+      auto *src_ptr = builder.create_global_ptr(src, {zero});
+      value = builder.create_global_load(src_ptr);
+    }
+    auto *dst_ptr = builder.create_global_ptr(dst, {zero});
+    builder.create_global_store(dst_ptr, value);
+    auto *task_ptr = task.get();
+    block_->insert(std::move(task));
+    return task_ptr;
+  }
+
+  std::unique_ptr<SNode> root_snode_{nullptr};
+  SNode *a_{nullptr};
+  SNode *b_{nullptr};
+  SNode *c_{nullptr};
+  std::unique_ptr<Block> block_{nullptr};
+};
+
+TEST_F(MarkConcurrentOffloadsTest, IndependentTasks) {
+  auto *write_a = add_task(a_);
+  auto *write_b = add_task(b_);
+  irpass::mark_concurrent_offloads(block_.get());
+  EXPECT_FALSE(write_a->concurrent_with_previous);
+  EXPECT_TRUE(write_b->concurrent_with_previous);
+}
+
+TEST_F(MarkConcurrentOffloadsTest, ReadAfterWrite) {
+  auto *write_a = add_task(a_);
+  auto *read_a = add_task(b_, a_);
+  auto *write_a_again = add_task(a_);
+  irpass::mark_concurrent_offloads(block_.get());
+  EXPECT_FALSE(write_a->concurrent_with_previous);
+  EXPECT_FALSE(read_a->concurrent_with_previous);
+  // Writes a_ after it is read
+  EXPECT_FALSE(write_a_again->concurrent_with_previous);
+}
+
+TEST_F(MarkConcurrentOffloadsTest, ConcurrentReads) {
+  auto *a_to_b = add_task(b_, a_);
+  auto *a_to_c = add_task(c_, a_);
+  auto *b_to_c = add_task(c_, b_);
+  auto *write_a = add_task(a_);
+  irpass::mark_concurrent_offloads(block_.get());
+  EXPECT_FALSE(a_to_b->concurrent_with_previous);
+  EXPECT_TRUE(a_to_c->concurrent_with_previous);
+  // Reads b_ and writes c_, which the group writes
+  EXPECT_FALSE(b_to_c->concurrent_with_previous);
+  EXPECT_TRUE(write_a->concurrent_with_previous);
+}
+
+TEST_F(MarkConcurrentOffloadsTest, ClearListAfterStructFor) {
+  auto struct_for = std::make_unique<OffloadedStmt>(
+      /*task_type=*/OffloadedTaskType::struct_for,
+      /*arch=*/Arch::x64, nullptr);
+  struct_for->snode = a_;
+  auto *struct_for_ptr = struct_for.get();
+  block_->insert(std::move(struct_for));
+  // Clears the element list the struct-for above iterates
+  auto clear_list = std::make_unique<OffloadedStmt>(
+      /*task_type=*/OffloadedTaskType::serial,
+      /*arch=*/Arch::x64, nullptr);
+  clear_list->body->insert(Stmt::make<ClearListStmt>(a_->parent));
+  auto *clear_list_ptr = clear_list.get();
+  block_->insert(std::move(clear_list));
+  irpass::mark_concurrent_offloads(block_.get());
+  EXPECT_FALSE(struct_for_ptr->concurrent_with_previous);
+  EXPECT_FALSE(clear_list_ptr->concurrent_with_previous);
+}
+
+}  // namespace
+}  // namespace gstaichi::lang
@@ -161,17 +161,19 @@ def _ti_init_same_arch() -> None:
 
 @test_utils.test()
 def test_args_hasher_field() -> None:
-    """
-    Check fields are correctly disabled.
-
-    More context: https://github.com/Genesis-Embodied-AI/gstaichi/pull/163
-    """
+    seen = set()
     for dtype in [ti.i32, ti.i64, ti.f32, ti.f64]:
         for shape in [(2,), (5,), (2, 5)]:
-            _ti_init_same_arch()
-            arg = ti.field(dtype, shape)
-            hash = args_hasher.hash_args(False, [arg], [None])
-            assert hash is None
+            for it in (0, 1):
+                _ti_init_same_arch()
+                arg = ti.field(dtype, shape)
+                hash = args_hasher.hash_args(False, [arg], [None])
+                assert hash is not None
+                if it == 0:
+                    assert hash not in seen
+                    seen.add(hash)
+                else:
+                    assert hash in seen
 
 
 @test_utils.test()
@@ -183,7 +185,9 @@ def test_args_hasher_field_vector() -> None:
                 _ti_init_same_arch()
                 arg = ti.Vector.field(n, dtype, shape)
                 hash = args_hasher.hash_args(False, [arg], [None])
-                assert hash is None
+                assert hash is not None
+                assert hash not in seen
+                seen.add(hash)
 
 
 @test_utils.test()
@@ -196,7 +200,30 @@ def test_args_hasher_field_matrix() -> None:
                     _ti_init_same_arch()
                     arg = ti.Matrix.field(m, n, dtype, shape)
                     hash = args_hasher.hash_args(False, [arg], [None])
-                    assert hash is None
+                    assert hash is not None
+                    assert hash not in seen
+                    seen.add(hash)
+
+
+@test_utils.test()
+def test_args_hasher_field_layout() -> None:
+    def get_hashes(offset=None, layout=ti.Layout.AOS, extra_field_first=False) -> tuple[str | None, str | None]:
+        _ti_init_same_arch()
+        if extra_field_first:
+            ti.field(ti.f32, (3,))
+        a = ti.field(ti.i32, (4,), offset=offset)
+        b = ti.Vector.field(3, ti.f32, (4,), layout=layout)
+        return args_hasher.hash_args(False, [a], [None]), args_hasher.hash_args(False, [b], [None])
+
+    base_a, base_b = get_hashes()
+    assert base_a is not None and base_b is not None
+    assert (base_a, base_b) == get_hashes()
+    assert get_hashes(offset=(2,))[0] != base_a
+    assert get_hashes(layout=ti.Layout.SOA)[1] != base_b
+    # Position in the SNode tree
+    hashes = get_hashes(extra_field_first=True)
+    assert hashes[0] != base_a
+    assert hashes[1] != base_b
 
 
 @test_utils.test()
@@ -206,7 +233,7 @@ def test_args_hasher_field_vs_ndarray() -> None:
     ndarray_hash = args_hasher.hash_args(False, [a_ndarray], [None])
     field_hash = args_hasher.hash_args(False, [a_field], [None])
     assert ndarray_hash is not None
-    assert field_hash is None
+    assert field_hash is not None
     assert ndarray_hash != field_hash
 
 
@@ -302,3 +329,38 @@ def test_args_hasher_named_tuple() -> None:
     geom = Geom(pos=ti.field(dtype=ti.types.vector(3, ti.f32), shape=(1,)))
     set_pos(geom, np.ones((1, 3), dtype=np.float32))
     assert np.all(geom.pos.to_numpy() == np.ones((1, 3), dtype=np.float32))
+
+
+@test_utils.test()
+def test_args_hasher_signature_cache() -> None:
+    @dataclasses.dataclass
+    class Inner:
+        a: ti.types.NDArray
+        b: int
+        c: int = dataclasses.field(metadata={FIELD_METADATA_CACHE_VALUE: True})
+
+    @dataclasses.dataclass
+    class Outer:
+        inner: Inner
+        d: ti.types.NDArray
+
+    def make_args(c: int, dtype) -> list:
+        return [Outer(inner=Inner(a=ti.ndarray(dtype, (2,)), b=3, c=c), d=ti.ndarray(ti.f32, (2, 2))), 0.0]
+
+    arg_metas = [None, ArgMetadata(ti.Template, "x")]
+    base = args_hasher.hash_args(False, make_args(1, ti.i32), arg_metas)
+    num_hits = args_hasher.g_num_signature_hits
+    assert base is not None
+    assert args_hasher.hash_args(False, make_args(1, ti.i32), arg_metas) == base
+    assert args_hasher.g_num_signature_hits == num_hits + 1
+    # Hashes computed from the signature cache must be the same as the ones computed from scratch
+    args_hasher._hash_by_signature.clear()
+    assert args_hasher.hash_args(False, make_args(1, ti.i32), arg_metas) == base
+
+    assert args_hasher.hash_args(False, make_args(2, ti.i32), arg_metas) != base
+    assert args_hasher.hash_args(False, make_args(1, ti.i64), arg_metas) != base
+    args = make_args(1, ti.i32)
+    args[1] = -0.0
+    assert args_hasher.hash_args(False, args, arg_metas) != base
+    with pytest.raises(ValueError):
+        args_hasher.hash_args(True, args, arg_metas)
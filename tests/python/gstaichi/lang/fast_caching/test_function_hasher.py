@@ -140,3 +140,24 @@ def test_function_hasher_validate_hashed_function_infos(monkeypatch, tmp_path: p
 
     setup_folder("child_diff_same.py")
     assert function_hasher.validate_hashed_function_infos(hashed_fileinfos)
+
+
+@test_utils.test()
+def test_function_hasher_memo(tmp_path: pathlib.Path) -> None:
+    filepath = tmp_path / "somefile.py"
+    filepath.write_text("def f1():\n    pass\n\n\ndef f2():\n    pass\n")
+    info1 = _wrap_inspect.FunctionSourceInfo(function_name="f1", filepath=str(filepath), start_lineno=0, end_lineno=1)
+    info2 = _wrap_inspect.FunctionSourceInfo(function_name="f2", filepath=str(filepath), start_lineno=4, end_lineno=5)
+
+    function_hasher.clear_memo()
+    hashed_infos = function_hasher.hash_functions([info1, info2])
+    for _ in range(10):
+        assert function_hasher.validate_hashed_function_infos(hashed_infos)
+    assert function_hasher.g_num_file_reads == 1
+    assert function_hasher.g_num_hash_misses == 2
+    assert function_hasher.g_num_hash_hits == 20
+
+    filepath.write_text("def f1():\n    return\n\n\ndef f2():\n    pass\n")
+    assert not function_hasher.validate_hashed_function_infos(hashed_infos)
+    assert function_hasher.validate_hashed_function_infos(hashed_infos[1:])
+    assert function_hasher.g_num_file_reads == 2
@@ -0,0 +1,139 @@
+import multiprocessing
+import pathlib
+
+import gstaichi as ti
+from gstaichi._test_tools import ti_init_same_arch
+from gstaichi.lang._fast_caching import python_side_cache_index
+from gstaichi.lang._fast_caching.python_side_cache_index import PythonSideCacheIndex
+
+from tests import test_utils
+
+
+def test_python_side_cache_index_store_load(tmp_path: pathlib.Path) -> None:
+    cache = PythonSideCacheIndex(str(tmp_path))
+    assert cache.try_load("abc") is None
+    cache.store("abc", "value1")
+    cache.store("def", "value2")
+    assert cache.try_load("abc") == "value1"
+    # Nothing is written until flushed
+    assert not (tmp_path / python_side_cache_index.INDEX_FILENAME).exists()
+    cache.flush()
+
+    cache2 = PythonSideCacheIndex(str(tmp_path))
+    assert len(cache2) == 2
+    assert cache2.try_load("abc") == "value1"
+    assert cache2.try_load("def") == "value2"
+    cache2.store("abc", "value3")
+    cache2.flush()
+
+    # Entries appended by another instance are picked up on miss
+    assert cache.try_load("abc") == "value1"
+    cache.store("ghi", "value4")
+    cache.flush()
+    assert cache.try_load("abc") == "value3"
+    assert cache2.try_load("ghi") == "value4"
+
+
+def test_python_side_cache_index_corrupted_tail(tmp_path: pathlib.Path) -> None:
+    cache = PythonSideCacheIndex(str(tmp_path))
+    cache.store("abc", "value1")
+    cache.flush()
+    with open(tmp_path / python_side_cache_index.INDEX_FILENAME, "ab") as f:
+        f.write(b"\x00\x0a\xe2\xff\xfe\x80\x99JUNK")
+
+    cache2 = PythonSideCacheIndex(str(tmp_path))
+    assert cache2.try_load("abc") == "value1"
+    cache2.store("def", "value2")
+    cache2.flush()
+
+    cache3 = PythonSideCacheIndex(str(tmp_path))
+    assert cache3.try_load("abc") == "value1"
+    assert cache3.try_load("def") == "value2"
+
+
+def test_python_side_cache_index_corrupted_file(tmp_path: pathlib.Path) -> None:
+    (tmp_path / python_side_cache_index.INDEX_FILENAME).write_bytes(b"\x00\x0a\xe2\xff\xfe\x80\x99JUNK")
+    cache = PythonSideCacheIndex(str(tmp_path))
+    assert len(cache) == 0
+    cache.store("abc", "value1")
+    cache.flush()
+    assert PythonSideCacheIndex(str(tmp_path)).try_load("abc") == "value1"
+
+
+def test_python_side_cache_index_lru_eviction(tmp_path: pathlib.Path) -> None:
+    cache = PythonSideCacheIndex(str(tmp_path))
+    for i in range(10):
+        cache.store(f"key{i}", "x" * 100)
+        cache.flush()
+    # Make key0 the most recently used entry
+    assert cache.try_load("key0") is not None
+    cache.flush()
+
+    num_evicted = cache.evict(max_size_bytes=600)
+    assert num_evicted > 0
+    assert len(cache) == 10 - num_evicted
+    assert (tmp_path / python_side_cache_index.INDEX_FILENAME).stat().st_size <= 600
+    assert cache.try_load("key0") is not None
+    assert cache.try_load("key9") is not None
+    assert cache.try_load("key1") is None
+
+    cache2 = PythonSideCacheIndex(str(tmp_path))
+    assert len(cache2) == len(cache)
+    assert cache2.try_load("key0") is not None
+
+
+def test_python_side_cache_index_eviction_on_flush(tmp_path: pathlib.Path) -> None:
+    cache = PythonSideCacheIndex(str(tmp_path), max_size_bytes=2000)
+    for i in range(100):
+        cache.store(f"key{i}", "x" * 100)
+        cache.flush()
+    assert (tmp_path / python_side_cache_index.INDEX_FILENAME).stat().st_size <= 2000
+    assert cache.try_load("key99") is not None
+    assert cache.try_load("key0") is None
+
+
+def _store_from_process(cache_folder: str, process_id: int, num_keys: int) -> None:
+    cache = PythonSideCacheIndex(cache_folder)
+    for i in range(num_keys):
+        cache.store(f"p{process_id}_{i}", f"value{process_id}_{i}")
+        if i % 7 == 0:
+            cache.flush()
+    cache.flush()
+
+
+def test_python_side_cache_index_concurrent_processes(tmp_path: pathlib.Path) -> None:
+    num_processes = 4
+    num_keys = 50
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_store_from_process, args=(str(tmp_path), i, num_keys)) for i in range(num_processes)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+    cache = PythonSideCacheIndex(str(tmp_path))
+    assert len(cache) == num_processes * num_keys
+    for process_id in range(num_processes):
+        for i in range(num_keys):
+            assert cache.try_load(f"p{process_id}_{i}") == f"value{process_id}_{i}"
+
+
+@test_utils.test()
+def test_src_ll_cache_index_backend(tmp_path: pathlib.Path) -> None:
+    ti_init_same_arch(offline_cache_file_path=str(tmp_path), offline_cache=True, src_ll_cache_backend="index")
+
+    @ti.kernel(fastcache=True)
+    def has_pure() -> None:
+        pass
+
+    has_pure()
+    assert has_pure._primal.src_ll_cache_observations.cache_stored
+    assert list(tmp_path.glob("python_side_cache/*.cache.txt")) == []
+
+    ti_init_same_arch(offline_cache_file_path=str(tmp_path), offline_cache=True, src_ll_cache_backend="index")
+    has_pure()
+    assert has_pure._primal.src_ll_cache_observations.cache_validated
+    assert has_pure._primal.src_ll_cache_observations.cache_loaded
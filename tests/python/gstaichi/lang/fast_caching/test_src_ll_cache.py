@@ -180,6 +180,36 @@ def test_src_ll_cache_repeat_after_load(tmp_path: pathlib.Path) -> None:
         assert a[0] == 6 + i
 
 
+@test_utils.test()
+def test_src_ll_cache_field_args(tmp_path: pathlib.Path) -> None:
+    @ti.kernel(fastcache=True)
+    def add_fields(a: ti.Template, b: ti.Template) -> None:
+        for I in ti.grouped(a):
+            a[I] += b[I].sum()
+
+    def run(b_n: int) -> SrcLlCacheObservations:
+        ti_init_same_arch(offline_cache_file_path=str(tmp_path), offline_cache=True)
+        a = ti.field(ti.i32, (4,), offset=(1,))
+        b = ti.Vector.field(b_n, ti.i32, (4,), offset=(1,))
+        b.fill(1)
+        add_fields(a, b)
+        assert (a.to_numpy() == b_n).all()
+        return add_fields._primal.src_ll_cache_observations
+
+    observations = run(2)
+    assert observations.cache_key_generated
+    assert not observations.cache_loaded
+    assert observations.cache_stored
+
+    observations = run(2)
+    assert observations.cache_validated
+    assert observations.cache_loaded
+
+    observations = run(3)
+    assert observations.cache_key_generated
+    assert not observations.cache_loaded
+
+
 @pytest.mark.parametrize("src_ll_cache", [None, False, True])
 @test_utils.test()
 def test_src_ll_cache_flag(tmp_path: pathlib.Path, src_ll_cache: bool) -> None:
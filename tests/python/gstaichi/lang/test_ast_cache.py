@@ -0,0 +1,74 @@
+import ast
+import importlib
+import os
+import pathlib
+import sys
+
+import gstaichi as ti
+from gstaichi.lang import _ast_cache
+
+from tests import test_utils
+
+
+@test_utils.test()
+def test_ast_cache_hits_for_inlined_funcs() -> None:
+    @ti.func
+    def add_one(x):
+        return x + 1
+
+    @ti.kernel
+    def k1(a: ti.types.NDArray[ti.i32, 1]) -> None:
+        v = a[0]
+        for _ in ti.static(range(8)):
+            v = add_one(v)
+        a[0] = v
+
+    _ast_cache.clear()
+    a = ti.ndarray(ti.i32, (1,))
+    k1(a)
+    assert a[0] == 8
+    # The kernel itself and the first call of 'add_one' miss, all the other inlined calls hit
+    assert _ast_cache.g_num_misses == 2
+    assert _ast_cache.g_num_hits >= 7
+
+
+@test_utils.test()
+def test_ast_cache_returns_independent_copies() -> None:
+    def foo(x):
+        return x + 1
+
+    _ast_cache.clear()
+    info, src, tree = _ast_cache.get_source_info_src_and_tree(foo)
+    expected = ast.dump(tree, include_attributes=True)
+    tree.body[0].name = "bar"
+    tree.body[0].body.clear()
+
+    info_cached, src_cached, tree_cached = _ast_cache.get_source_info_src_and_tree(foo)
+    assert _ast_cache.g_num_hits == 1
+    assert info_cached == info
+    assert src_cached == src
+    assert tree_cached is not tree
+    assert ast.dump(tree_cached, include_attributes=True) == expected
+
+
+@test_utils.test()
+def test_ast_cache_invalidated_by_file_change(monkeypatch, tmp_path: pathlib.Path) -> None:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module_path = tmp_path / "ast_cache_mod.py"
+    module_path.write_text("def foo(x):\n    return x + 1\n")
+    mod = importlib.import_module("ast_cache_mod")
+    try:
+        _ast_cache.clear()
+        _, _, tree = _ast_cache.get_source_info_src_and_tree(mod.foo)
+        _ast_cache.get_source_info_src_and_tree(mod.foo)
+        assert _ast_cache.g_num_misses == 1
+        assert _ast_cache.g_num_hits == 1
+
+        module_path.write_text("def foo(x):\n    return x + 2\n")
+        stat = module_path.stat()
+        os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        _, _, tree_new = _ast_cache.get_source_info_src_and_tree(mod.foo)
+        assert _ast_cache.g_num_misses == 2
+        assert ast.dump(tree_new) != ast.dump(tree)
+    finally:
+        del sys.modules["ast_cache_mod"]
@@ -1,5 +1,7 @@
+import dataclasses
 import pathlib
 
+import numpy as np
 import pytest
 
 import gstaichi as ti
@@ -227,3 +229,152 @@ def test_fastcache_kernel_parameter() -> None:
     some_class.da5(a)
     assert not some_class.da5._primal.src_ll_cache_observations.cache_key_generated
     assert a[0] == 15
+
+
+@test_utils.test()
+def test_compile_many() -> None:
+    @ti.kernel
+    def k1(a: ti.types.NDArray[ti.i32, 1], value: ti.i32) -> None:
+        for i in a:
+            a[i] = value
+
+    @ti.kernel
+    def k2(a: ti.types.NDArray[ti.i32, 1], n: ti.template()) -> None:
+        for i in a:
+            a[i] += n
+
+    @ti.data_oriented
+    class SomeClass:
+        def __init__(self) -> None:
+            self.offset = 100
+
+        @ti.kernel
+        def da1(self, a: ti.types.NDArray[ti.i32, 1]) -> None:
+            for i in a:
+                a[i] += self.offset
+
+    a = ti.ndarray(ti.i32, (10,))
+    some_class = SomeClass()
+    ti.compile_many([(k1, (a, 0)), (k2, (a, 1)), (k2, (a, 2)), (k2, (a, 2)), (some_class.da1, (a,))])
+    assert len(k1._primal.compiled_kernel_data_by_key) == 1
+    assert len(k2._primal.compiled_kernel_data_by_key) == 2
+    assert len(some_class.da1._primal.compiled_kernel_data_by_key) == 1
+
+    k1(a, 3)
+    k2(a, 1)
+    k2(a, 2)
+    some_class.da1(a)
+    assert a[0] == 106
+    assert len(k1._primal.materialized_kernels) == 1
+    assert len(k2._primal.materialized_kernels) == 2
+
+
+@test_utils.test()
+def test_compile_many_invalid_kernel() -> None:
+    @ti.func
+    def f1() -> None:
+        pass
+
+    with pytest.raises(ti.GsTaichiSyntaxError, match="Expecting a GsTaichi kernel"):
+        ti.compile_many([(f1, ())])
+
+
+@test_utils.test()
+def test_launch_ctx_cache_scalar_args() -> None:
+    @dataclasses.dataclass(frozen=True)
+    class State:
+        x: ti.types.NDArray[ti.f32, 1]
+        scale: ti.f32
+        offset: ti.i32
+
+    @ti.kernel
+    def step(state: State, dt: ti.f32, n: ti.u32) -> None:
+        for i in range(n):
+            state.x[i] += dt * state.scale + state.offset
+
+    x = ti.ndarray(ti.f32, (4,))
+    state = State(x=x, scale=2.0, offset=1)
+    expected = np.zeros(4, dtype=np.float32)
+    for dt, n in [(0.5, 4), (0.25, 2), (1, 3), (np.float32(0.125), np.uint32(4))]:
+        step(state, dt, n)
+        expected[:n] += dt * 2.0 + 1
+        np.testing.assert_allclose(x.to_numpy(), expected)
+    # A single cache entry, shared by all the different scalar values
+    assert len(step._primal._launch_ctx_cache) == 1
+
+    state2 = State(x=x, scale=3.0, offset=0)
+    step(state2, 1.0, 4)
+    expected += 3.0
+    np.testing.assert_allclose(x.to_numpy(), expected)
+
+    with pytest.raises(ti.GsTaichiRuntimeTypeError):
+        step(state, 1.0, 1.5)
+
+
+@test_utils.test()
+def test_launch_batch() -> None:
+    @ti.kernel
+    def reset_env(a: ti.types.NDArray[ti.f32, 2], env: ti.i32, value: ti.f32) -> None:
+        for j in range(a.shape[1]):
+            a[env, j] = value + j
+
+    num_envs = 16
+    a = ti.ndarray(ti.f32, (num_envs, 3))
+    b = ti.ndarray(ti.f32, (num_envs, 3))
+    reset_env.launch_batch([(a, env, env * 0.5) for env in range(num_envs)] + [(b, 0, 1.0), (b, 1, 2)])
+    expected = np.arange(num_envs, dtype=np.float32)[:, None] * 0.5 + np.arange(3, dtype=np.float32)[None, :]
+    np.testing.assert_allclose(a.to_numpy(), expected)
+    np.testing.assert_allclose(b.to_numpy()[:2], [[1.0, 2.0, 3.0], [2.0, 3.0, 4.0]])
+    assert len(reset_env._primal.materialized_kernels) == 1
+
+    # Numpy arrays cannot share a launch context, so they go through the usual path
+    c = np.zeros((2, 3), dtype=np.float32)
+    reset_env.launch_batch([(c, 0, 1.0), (c, 1, 2.0)])
+    np.testing.assert_allclose(c, [[1.0, 2.0, 3.0], [2.0, 3.0, 4.0]])
+
+    with pytest.raises(ti.GsTaichiRuntimeTypeError):
+        reset_env.launch_batch([(a, 0, 1.0), (a, 1.5, 1.0)])
+
+    @ti.kernel
+    def ret() -> ti.i32:
+        return 1
+
+    with pytest.raises(ti.GsTaichiRuntimeError, match="cannot be launched in batch"):
+        ret.launch_batch([(), ()])
+
+
+@test_utils.test()
+def test_max_kernel_instances() -> None:
+    ti_init_same_arch(max_kernel_instances=3, max_kernel_instances_per_kernel=2)
+
+    @ti.kernel
+    def k1(a: ti.types.NDArray[ti.i32, 1], n: ti.template()) -> None:
+        a[0] += n
+
+    @ti.kernel
+    def k2(a: ti.types.NDArray[ti.i32, 1], n: ti.template()) -> None:
+        a[1] += n
+
+    a = ti.ndarray(ti.i32, (2,))
+    for n in range(4):
+        k1(a, n)
+    assert a[0] == 6
+    assert len(k1._primal.materialized_kernels) == 2
+    # Evicted instances are materialized again on demand
+    k1(a, 0)
+    assert a[0] == 6
+    assert len(k1._primal.materialized_kernels) == 2
+
+    k2(a, 1)
+    k2(a, 2)
+    assert a[1] == 3
+    assert len(k1._primal.materialized_kernels) + len(k2._primal.materialized_kernels) == 3
+    assert len(k2._primal.materialized_kernels) == 2
+
+    infos = {info.name: info for info in ti.profiler.get_kernel_instances_info()}
+    assert infos["k2"].num_instances == 2
+    assert infos["k2"].num_ir_statements > 0
+    assert infos["k2"].compiled_bytes > 0
+
+    with pytest.raises(ValueError, match="max_kernel_instances"):
+        ti_init_same_arch(max_kernel_instances=0)
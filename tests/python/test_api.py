@@ -113,6 +113,7 @@ user_api[ti] = [
     "cache_read_only",
     "cast",
     "ceil",
+    "compile_many",
     "cos",
     "cpu",
     "cuda",
@@ -134,6 +135,7 @@ user_api[ti] = [
     "floor",
     "frexp",
     "func",
+    "fuse",
     "get_addr",
     "global_thread_idx",
     "gpu",
@@ -191,6 +193,7 @@ user_api[ti] = [
     "raw_div",
     "raw_mod",
     "real_func",
+    "record",
     "ref",
     "rescale_index",
     "reset",
@@ -240,7 +243,7 @@ user_api[ti.ad] = [
     "grad_replaced",
     "no_grad",
 ]
-user_api[ti.algorithms] = ["PrefixSumExecutor", "parallel_sort"]
+user_api[ti.algorithms] = ["PrefixSumExecutor", "parallel_sort", "radix_sort", "segmented_reduce", "segmented_scan"]
 user_api[ti.Field] = [
     "copy_from",
     "dtype",
@@ -359,10 +362,11 @@ user_api[ti.MatrixNdarray] = [
     "fill",
     "from_numpy",
     "get_type",
+    "numpy_view",
     "to_dlpack",
     "to_numpy",
 ]
-user_api[ti.Ndarray] = ["copy_from", "element_shape", "fill", "get_type", "to_dlpack"]
+user_api[ti.Ndarray] = ["copy_from", "element_shape", "fill", "get_type", "numpy_view", "to_dlpack"]
 user_api[ti.SNode] = [
     "bitmasked",
     "deactivate_all",
@@ -395,6 +399,7 @@ user_api[ti.ScalarNdarray] = [
     "fill",
     "from_numpy",
     "get_type",
+    "numpy_view",
     "to_dlpack",
     "to_numpy",
 ]
@@ -419,6 +424,7 @@ user_api[ti.VectorNdarray] = [
     "fill",
     "from_numpy",
     "get_type",
+    "numpy_view",
     "to_dlpack",
     "to_numpy",
 ]
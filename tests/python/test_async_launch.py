@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+import gstaichi as ti
+from gstaichi.lang.util import has_pytorch
+
+from tests import test_utils
+
+
+@test_utils.test(arch=ti.cpu, async_launch=True)
+def test_async_launch_fields_and_ndarrays():
+    n = 1024
+    x = ti.field(ti.f32, shape=n)
+    y = ti.ndarray(ti.f32, (n,))
+
+    @ti.kernel
+    def step(y: ti.types.ndarray(), dt: ti.f32):
+        for i in x:
+            x[i] += dt
+            y[i] = 2 * x[i]
+
+    @ti.kernel
+    def total() -> ti.f32:
+        s = 0.0
+        for i in x:
+            s += x[i]
+        return s
+
+    for k in range(100):
+        step(y, 0.5)
+    # Kernels returning values are synchronization points
+    assert total() == n * 50.0
+    for k in range(100):
+        step(y, 0.5)
+    # So are host accessors and to_numpy
+    assert x[n - 1] == 100.0
+    np.testing.assert_allclose(x.to_numpy(), np.full(n, 100.0))
+    np.testing.assert_allclose(y.to_numpy(), np.full(n, 200.0))
+
+
+@test_utils.test(arch=ti.cpu, async_launch=True)
+def test_async_launch_sync():
+    n = 256
+    x = ti.ndarray(ti.i32, (n,))
+    x_np = np.zeros(n, dtype=np.int32)
+
+    @ti.kernel
+    def inc(x: ti.types.ndarray()):
+        for i in x:
+            x[i] += 1
+
+    view = x.numpy_view()
+    for k in range(50):
+        inc(x)
+    ti.sync()
+    np.testing.assert_array_equal(view, np.full(n, 50))
+
+    # numpy arrays are updated in place by the time the launch returns
+    inc(x_np)
+    np.testing.assert_array_equal(x_np, np.ones(n))
+
+
+@test_utils.test(arch=ti.cpu, async_launch=True)
+def test_async_launch_temporary_ndarrays():
+    n = 4096
+    total = ti.field(ti.i32, shape=())
+
+    @ti.kernel
+    def fill(a: ti.types.ndarray(), v: ti.i32):
+        for i in a:
+            a[i] = v
+
+    @ti.kernel
+    def accumulate(a: ti.types.ndarray()):
+        for i in a:
+            total[None] += a[i]
+
+    for k in range(20):
+        # Freed while the launches using it may still be pending
+        a = ti.ndarray(ti.i32, (n,))
+        fill(a, k)
+        accumulate(a)
+        del a
+    assert total[None] == n * sum(range(20))
+
+
+@pytest.mark.skipif(not has_pytorch(), reason="Pytorch not installed.")
+@test_utils.test(arch=ti.cpu, async_launch=True)
+def test_async_launch_dlpack():
+    import torch
+
+    n = 1024
+    x = ti.field(ti.f32, shape=n)
+    y = ti.ndarray(ti.f32, (n,))
+
+    @ti.kernel
+    def step(y: ti.types.ndarray(), dt: ti.f32):
+        for i in x:
+            x[i] += dt
+            y[i] = 2 * x[i]
+
+    for k in range(100):
+        step(y, 0.5)
+    # Exporting to DLPack waits for the pending launches
+    x_torch = torch.utils.dlpack.from_dlpack(x.to_dlpack())
+    y_torch = torch.utils.dlpack.from_dlpack(y.to_dlpack())
+    np.testing.assert_allclose(x_torch.numpy(), np.full(n, 50.0))
+    np.testing.assert_allclose(y_torch.numpy(), np.full(n, 100.0))
@@ -0,0 +1,59 @@
+import pytest
+
+import gstaichi as ti
+
+from tests import test_utils
+
+
+@test_utils.test(arch=ti.cpu, compile_profiler=True, offline_cache=False)
+def test_compile_stats():
+    x = ti.field(ti.f32, shape=16)
+    y = ti.field(ti.f32, shape=16)
+
+    @ti.kernel
+    def two_loops(scale: ti.f32):
+        for i in x:
+            x[i] = i * scale
+        for i in y:
+            y[i] = x[i] + 1.0
+
+    ti.profiler.clear_compile_profiler_info()
+    two_loops(2.0)
+    two_loops(3.0)
+
+    all_stats = [stats for stats in ti.profiler.compile_stats() if stats.kernel_name.startswith("two_loops")]
+    assert len(all_stats) == 1
+    stats = all_stats[0]
+    assert stats.num_compilations == 1
+    assert stats.total_time > 0
+
+    passes = {(p.pipeline, p.name): p for p in stats.passes}
+    for key in [
+        ("compile_to_offloads", "Lowered"),
+        ("compile_to_offloads", "Offloaded"),
+        ("offload_to_executable", "Access lowered"),
+        ("llvm", "Emitted"),
+        ("llvm", "Optimized"),
+    ]:
+        assert key in passes
+    for p in stats.passes:
+        assert p.num_runs > 0
+        assert p.time >= 0
+        assert p.statements_before >= 0 and p.statements_after >= 0
+    # Each offloaded task goes through the passes of offload_to_executable on its own
+    assert passes[("compile_to_offloads", "Offloaded")].num_runs == 1
+    assert passes[("offload_to_executable", "Access lowered")].num_runs == 2
+    # The IR statements after each pass are the ones before the next one
+    compile_to_offloads = [p for p in stats.passes if p.pipeline == "compile_to_offloads"]
+    for prev, next in zip(compile_to_offloads, compile_to_offloads[1:]):
+        assert prev.statements_after == next.statements_before
+
+    ti.profiler.print_compile_profiler_info()
+    ti.profiler.clear_compile_profiler_info()
+    assert ti.profiler.compile_stats() == []
+
+
+@test_utils.test(arch=ti.cpu)
+def test_compile_stats_disabled():
+    with pytest.raises(RuntimeError, match="compile_profiler=True"):
+        ti.profiler.compile_stats()
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+import gstaichi as ti
+from gstaichi._test_tools import ti_init_same_arch
+
+from tests import test_utils
+
+
+@pytest.mark.parametrize("cpu_thread_spin_us", [0, 1, 1000])
+@pytest.mark.parametrize("cpu_thread_affinity", [False, True])
+@test_utils.test(arch=ti.cpu)
+def test_thread_pool_back_to_back_launches(cpu_thread_spin_us, cpu_thread_affinity):
+    ti_init_same_arch(cpu_thread_spin_us=cpu_thread_spin_us, cpu_thread_affinity=cpu_thread_affinity)
+
+    n = 4096
+    x = ti.ndarray(ti.i32, (n,))
+
+    @ti.kernel
+    def inc(x: ti.types.ndarray(), m: ti.i32):
+        for i in range(m):
+            x[i] += 1
+
+    # Alternate between tasks keeping all the threads busy and tasks only waking up a few of them
+    expected = np.zeros(n, dtype=np.int32)
+    for k in range(200):
+        m = n if k % 2 == 0 else 1 + k % 64
+        inc(x, m)
+        expected[:m] += 1
+    np.testing.assert_array_equal(x.to_numpy(), expected)
+
+
+@test_utils.test(arch=ti.cpu, kernel_profiler=True, cpu_max_num_threads=4)
+def test_thread_pool_skewed_struct_for():
+    n = 1024
+    x = ti.field(ti.i32)
+    block = ti.root.pointer(ti.i, n // 8)
+    block.dense(ti.i, 8).place(x)
+
+    @ti.kernel
+    def activate():
+        for i in range(n):
+            if (i // 8) % 4 == 0 or i < n // 4:
+                x[i] = 0
+
+    @ti.kernel
+    def skewed():
+        for i in x:
+            # Only the first blocks are costly, so that most of them must be stolen from their initial thread
+            s = 0
+            if i < n // 8:
+                for k in range(1000):
+                    s += k % 7
+            x[i] += 1 + s
+
+    activate()
+    skewed()
+    s = sum(k % 7 for k in range(1000))
+    expected = np.zeros(n, dtype=np.int32)
+    for i in range(n):
+        if (i // 8) % 4 == 0 or i < n // 4:
+            expected[i] = 1 + (s if i < n // 8 else 0)
+    np.testing.assert_array_equal(x.to_numpy(), expected)
+
+    busy_times = ti.profiler.get_kernel_profiler_thread_busy_time()
+    assert len(busy_times) == 4
+    assert sum(busy_times) > 0.0
+    ti.profiler.clear_kernel_profiler_info()
+    assert ti.profiler.get_kernel_profiler_thread_busy_time() == [0.0] * 4
+
+
+@test_utils.test(arch=ti.cpu, cpu_concurrent_tasks=True)
+def test_concurrent_offloaded_tasks():
+    n = 2048
+    a = ti.field(ti.i32, shape=n)
+    b = ti.field(ti.i32, shape=n)
+    c = ti.field(ti.i32, shape=n)
+    total = ti.field(ti.i32, shape=())
+    d = ti.ndarray(ti.i32, (n,))
+
+    @ti.kernel
+    def step(d: ti.types.ndarray()):
+        # Independent loops, which may run concurrently
+        for i in range(n):
+            a[i] += i
+        for i in range(n):
+            b[i] += 2 * i
+        for i in range(n):
+            d[i] += 3
+        # Depends on the loops above
+        for i in range(n):
+            c[i] = a[i] + b[i]
+        total[None] = 0
+        for i in range(n):
+            total[None] += c[i] - a[i] - b[i] + d[i]
+
+    for _ in range(10):
+        step(d)
+    idx = np.arange(n, dtype=np.int32)
+    np.testing.assert_array_equal(a.to_numpy(), 10 * idx)
+    np.testing.assert_array_equal(b.to_numpy(), 20 * idx)
+    np.testing.assert_array_equal(c.to_numpy(), 30 * idx)
+    np.testing.assert_array_equal(d.to_numpy(), np.full(n, 30, dtype=np.int32))
+    assert total[None] == 30 * n
+
+
+@pytest.mark.parametrize("sparse", ["pointer", "dynamic"])
+@test_utils.test(arch=ti.cpu, require=ti.extension.sparse, cpu_concurrent_tasks=True)
+def test_concurrent_offloaded_tasks_sparse(sparse):
+    n = 1024
+    x = ti.field(ti.i32)
+    y = ti.field(ti.i32)
+    if sparse == "pointer":
+        ti.root.pointer(ti.i, n // 8).dense(ti.i, 8).place(x, y)
+    else:
+        ti.root.dynamic(ti.i, n, chunk_size=32).place(x, y)
+
+    @ti.kernel
+    def activate():
+        for i in range(n // 2):
+            x[i] = i
+
+    @ti.kernel
+    def step():
+        # The element list of the second struct-for must not be rebuilt while the first one iterates it
+        for i in x:
+            x[i] += 1
+        for i in y:
+            y[i] += x[i]
+
+    activate()
+    for _ in range(10):
+        step()
+    idx = np.arange(n // 2, dtype=np.int32)
+    np.testing.assert_array_equal(x.to_numpy()[: n // 2], idx + 10)
+    np.testing.assert_array_equal(y.to_numpy()[: n // 2], 10 * idx + 55)
@@ -0,0 +1,177 @@
+import numpy as np
+import pytest
+
+import gstaichi as ti
+from gstaichi.lang import impl
+
+from tests import test_utils
+
+
+def _num_tasks_launched(kernel):
+    ti.profiler.clear_kernel_profiler_info()
+    kernel()
+    ti.sync()
+    return len(impl.get_runtime().prog.get_kernel_profiler_records())
+
+
+@test_utils.test()
+def test_fuse_struct_fors():
+    n = 128
+    x = ti.field(ti.i32, shape=n)
+    y = ti.field(ti.i32, shape=n)
+    z = ti.field(ti.i32, shape=n)
+
+    @ti.kernel
+    def x_to_y():
+        for i in x:
+            y[i] = x[i] + 1
+
+    @ti.kernel
+    def y_to_z():
+        for i in y:
+            z[i] = y[i] + 4
+
+    x.from_numpy(np.arange(n, dtype=np.int32) * 10)
+    x_to_y_to_z = ti.fuse(x_to_y, y_to_z)
+    x_to_y_to_z()
+    np.testing.assert_array_equal(y.to_numpy(), x.to_numpy() + 1)
+    np.testing.assert_array_equal(z.to_numpy(), x.to_numpy() + 5)
+
+
+@test_utils.test(arch=ti.cpu, kernel_profiler=True)
+def test_fuse_into_single_task():
+    n = 64
+    x = ti.field(ti.f32, shape=(n, n))
+    y = ti.field(ti.f32, shape=(n, n))
+    a = ti.field(ti.f32, shape=())
+
+    @ti.kernel
+    def scale_x():
+        for I in ti.grouped(x):
+            x[I] *= a[None]
+
+    @ti.kernel
+    def accumulate_y():
+        for I in ti.grouped(y):
+            y[I] += x[I]
+
+    @ti.kernel
+    def copy_y():
+        for i, j in x:
+            x[i, j] = y[i, j]
+
+    x.fill(1.0)
+    a[None] = 2.0
+    fused = ti.fuse(scale_x, accumulate_y, copy_y)
+    assert _num_tasks_launched(fused) == 1
+    np.testing.assert_allclose(x.to_numpy(), np.full((n, n), 2.0))
+    np.testing.assert_allclose(y.to_numpy(), np.full((n, n), 2.0))
+
+
+@test_utils.test(arch=ti.cpu, kernel_profiler=True)
+def test_fuse_range_fors():
+    n = 100
+    x = ti.field(ti.i32, shape=n)
+    total = ti.field(ti.i32, shape=())
+
+    @ti.kernel
+    def fill():
+        for i in range(n):
+            x[i] = i
+
+    @ti.kernel
+    def double():
+        for i in range(n):
+            x[i] *= 2
+
+    @ti.kernel
+    def sum_x():
+        for i in range(n):
+            total[None] += x[i]
+
+    fused = ti.fuse(fill, double, sum_x)
+    assert _num_tasks_launched(fused) == 1
+    assert total[None] == n * (n - 1)
+
+
+@test_utils.test(arch=ti.cpu, kernel_profiler=True)
+def test_fuse_cross_iteration_dependency():
+    n = 100
+    x = ti.field(ti.i32, shape=n + 1)
+    y = ti.field(ti.i32, shape=n)
+    total = ti.field(ti.i32, shape=())
+
+    @ti.kernel
+    def fill_x():
+        for i in range(n):
+            x[i + 1] = i
+
+    @ti.kernel
+    def shift():
+        for i in range(n):
+            y[i] = x[i + 1]
+
+    @ti.kernel
+    def sum_y():
+        for i in range(n):
+            total[None] += y[i]
+
+    @ti.kernel
+    def reset_y():
+        for i in range(n):
+            y[i] = total[None]
+
+    # The elements of x are not read by the iteration writing them, and the last loop reads total while it is being
+    # accumulated, so only shift and sum_y can be merged
+    fused = ti.fuse(fill_x, shift, sum_y, reset_y)
+    assert _num_tasks_launched(fused) == 3
+    np.testing.assert_array_equal(y.to_numpy(), np.full(n, n * (n - 1) // 2, dtype=np.int32))
+
+
+@test_utils.test()
+def test_fuse_data_oriented():
+    @ti.data_oriented
+    class Solver:
+        def __init__(self, n):
+            self.x = ti.field(ti.f32, shape=n)
+            self.r = ti.field(ti.f32, shape=n)
+            self.p = ti.field(ti.f32, shape=n)
+
+        @ti.kernel
+        def update_x(self):
+            for i in self.x:
+                self.x[i] += 0.5 * self.p[i]
+
+        @ti.kernel
+        def update_r(self):
+            for i in self.r:
+                self.r[i] -= 0.5 * self.p[i]
+
+    solver = Solver(32)
+    solver.p.fill(2.0)
+    solver.r.fill(3.0)
+    update = ti.fuse(solver.update_x, solver.update_r)
+    update()
+    update()
+    np.testing.assert_allclose(solver.x.to_numpy(), np.full(32, 2.0))
+    np.testing.assert_allclose(solver.r.to_numpy(), np.full(32, 1.0))
+
+
+@test_utils.test(arch=ti.cpu)
+def test_fuse_kernel_with_args():
+    x = ti.field(ti.f32, shape=8)
+
+    @ti.kernel
+    def fill(value: ti.f32):
+        for i in x:
+            x[i] = value
+
+    @ti.kernel
+    def clear():
+        for i in x:
+            x[i] = 0
+
+    with pytest.raises(ti.GsTaichiSyntaxError, match="cannot be fused"):
+        ti.fuse(clear, fill)
+    with pytest.raises(ti.GsTaichiSyntaxError, match="At least one kernel"):
+        ti.fuse()
@@ -89,3 +89,78 @@ def test_pointer_gc():
 
         # Note that being inactive doesn't mean it's not allocated.
         assert L._num_dynamically_allocated == 1
+
+
+@test_utils.test(arch=ti.cpu, cpu_max_num_threads=4)
+def test_pointer_gc_parallel():
+    # Enough cells for the reclamation to be split across threads
+    n = 128
+    x = ti.field(dtype=ti.i32)
+    L = ti.root.pointer(ti.ij, n)
+    L.dense(ti.ij, 2).place(x)
+
+    @ti.kernel
+    def activate(step: ti.i32):
+        for i, j in ti.ndrange(n, n):
+            if (i + j + step) % 2 == 0:
+                x[i * 2, j * 2] = step + 1
+
+    @ti.kernel
+    def check(step: ti.i32) -> ti.i32:
+        errors = 0
+        for i, j in x:
+            expected = 0
+            if i % 2 == 0 and j % 2 == 0:
+                expected = step + 1
+            if x[i, j] != expected:
+                errors += 1
+        return errors
+
+    @ti.kernel
+    def dirty():
+        for i, j in x:
+            x[i, j] = -1
+
+    for step in range(4):
+        activate(step)
+        # The other elements of the reactivated cells were cleared
+        assert check(step) == 0
+        dirty()
+        L.deactivate_all()
+    assert L._num_dynamically_allocated == n * n // 2
+
+
+@test_utils.test(arch=ti.cpu, cpu_gc_free_list_threshold=1000)
+def test_pointer_gc_free_list_threshold():
+    x = ti.field(dtype=ti.i32)
+    L = ti.root.pointer(ti.i, 4096)
+    L.dense(ti.i, 4).place(x)
+
+    @ti.kernel
+    def activate(begin: ti.i32, end: ti.i32):
+        for i in range(begin, end):
+            x[i * 4] = 1
+
+    @ti.kernel
+    def deactivate(begin: ti.i32, end: ti.i32):
+        for i in range(begin, end):
+            ti.deactivate(L, i)
+
+    @ti.kernel
+    def count() -> ti.i32:
+        total = 0
+        for i in x:
+            total += x[i]
+        return total
+
+    activate(0, 2000)
+    deactivate(0, 2000)
+    # Fewer free cells than the threshold were left, so the cells were reclaimed
+    assert L._num_dynamically_allocated == 2000
+    for step in range(30):
+        begin = 2000 + step * 64
+        activate(begin, begin + 100)
+        assert count() == 100
+        deactivate(begin, begin + 100)
+        # The deactivated cells are reclaimed lazily, before running out of free cells
+        assert L._num_dynamically_allocated == 2000
@@ -0,0 +1,47 @@
+import gstaichi as ti
+from gstaichi.lang import impl
+
+from tests import test_utils
+
+
+@test_utils.test(arch=ti.cpu, kernel_profiler=True)
+def test_query_percentiles():
+    x = ti.field(ti.f32, shape=1024)
+
+    @ti.kernel
+    def fill(n: ti.i32):
+        for i in range(n):
+            x[i % 1024] = ti.sqrt(i)
+
+    ti.profiler.clear_kernel_profiler_info()
+    for i in range(100):
+        fill(1000 if i < 90 else 1000000)
+    result = ti.profiler.query_kernel_profiler_info(fill.__name__)
+    assert result.counter == 100
+    assert sorted(result.percentiles) == [50, 90, 95, 99]
+    p = result.percentiles
+    assert result.min <= p[50] <= p[90] <= p[95] <= p[99] <= result.max
+    # The slow launches are only in the tail
+    assert p[95] > 10 * p[50]
+
+
+@test_utils.test(arch=ti.cpu, kernel_profiler=True, kernel_profiler_max_traced_records=16)
+def test_max_traced_records(capfd):
+    x = ti.field(ti.i32, shape=())
+
+    @ti.kernel
+    def inc():
+        x[None] += 1
+
+    ti.profiler.clear_kernel_profiler_info()
+    for _ in range(100):
+        inc()
+    ti.sync()
+    assert len(impl.get_runtime().prog.get_kernel_profiler_records()) <= 16
+    # The statistics still cover all the launches
+    assert ti.profiler.query_kernel_profiler_info(inc.__name__).counter == 100
+    capfd.readouterr()
+    ti.profiler.print_kernel_profiler_info()
+    out, _ = capfd.readouterr()
+    assert "p99" in out and "stddev" in out
+    assert "100x" in out
@@ -0,0 +1,122 @@
+import dataclasses
+import gc
+
+import numpy as np
+import pytest
+
+import gstaichi as ti
+from gstaichi._test_tools import ti_init_same_arch
+
+from tests import test_utils
+
+
+@test_utils.test(arch=ti.cpu)
+def test_record_replay():
+    @dataclasses.dataclass(frozen=True)
+    class State:
+        x: ti.types.NDArray[ti.f32, 1]
+        v: ti.types.NDArray[ti.f32, 1]
+        damping: ti.f32
+
+    @ti.kernel
+    def update_v(state: State, dt: ti.f32) -> None:
+        for i in state.x:
+            state.v[i] = state.v[i] * state.damping - dt * state.x[i]
+
+    @ti.kernel
+    def update_x(state: State, dt: ti.f32) -> None:
+        for i in state.x:
+            state.x[i] += dt * state.v[i]
+
+    def step(state: State, dt: float) -> None:
+        update_v(state, dt)
+        update_x(state, dt)
+
+    n = 8
+    x_np = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    state = State(x=ti.ndarray(ti.f32, (n,)), v=ti.ndarray(ti.f32, (n,)), damping=0.5)
+    state.x.from_numpy(x_np)
+
+    x_ref = x_np.copy()
+    v_ref = np.zeros(n, dtype=np.float32)
+
+    def step_ref(dt: float) -> None:
+        nonlocal x_ref, v_ref
+        v_ref = v_ref * np.float32(0.5) - np.float32(dt) * x_ref
+        x_ref = x_ref + np.float32(dt) * v_ref
+
+    with ti.record() as graph:
+        step(state, 0.1)
+    step_ref(0.1)
+    assert len(graph.launches) == 2
+    np.testing.assert_allclose(state.x.to_numpy(), x_ref, rtol=1e-5)
+
+    graph.replay(3)
+    for _ in range(3):
+        step_ref(0.1)
+    np.testing.assert_allclose(state.x.to_numpy(), x_ref, rtol=1e-5)
+
+    graph.set_args(dt=0.2)
+    graph.launches[0].set_arg("state.damping", 0.25)
+    graph.replay(2)
+    for _ in range(2):
+        v_ref = v_ref * np.float32(0.25) - np.float32(0.2) * x_ref
+        x_ref = x_ref + np.float32(0.2) * v_ref
+    np.testing.assert_allclose(state.x.to_numpy(), x_ref, rtol=1e-5)
+    np.testing.assert_allclose(state.v.to_numpy(), v_ref, rtol=1e-5)
+
+    with pytest.raises(ti.GsTaichiRuntimeError):
+        graph.set_args(not_an_arg=1.0)
+    with pytest.raises(ti.GsTaichiRuntimeTypeError):
+        graph.set_args(dt="0.1")
+
+
+@test_utils.test(arch=ti.cpu)
+def test_record_not_nested():
+    with ti.record():
+        with pytest.raises(ti.GsTaichiRuntimeError):
+            with ti.record():
+                pass
+
+
+@test_utils.test(arch=ti.cpu)
+def test_record_replay_after_reset():
+    @ti.kernel
+    def inc(a: ti.types.NDArray[ti.i32, 1]) -> None:
+        a[0] += 1
+
+    a = ti.ndarray(ti.i32, (1,))
+    with ti.record() as graph:
+        inc(a)
+    graph.replay(4)
+    assert a[0] == 5
+
+    ti.init(arch=ti.cpu)
+    with pytest.raises(ti.GsTaichiRuntimeError):
+        graph.replay()
+
+
+@test_utils.test(arch=ti.cpu)
+def test_record_pins_instances():
+    ti_init_same_arch(max_kernel_instances_per_kernel=1)
+
+    @ti.kernel
+    def inc(a: ti.types.NDArray[ti.i32, 1], n: ti.template()) -> None:
+        a[0] += n
+
+    a = ti.ndarray(ti.i32, (1,))
+    with ti.record() as graph:
+        inc(a, 1)
+    # The recorded instance is not evicted as long as the graph is alive
+    inc(a, 2)
+    inc(a, 3)
+    assert len(inc._primal.materialized_kernels) == 2
+    graph.replay()
+    assert a[0] == 7
+
+    del graph
+    gc.collect()
+    assert inc._primal._pinned_instance_keys == {}
+    inc(a, 4)
+    assert len(inc._primal.materialized_kernels) == 1
+    assert a[0] == 11
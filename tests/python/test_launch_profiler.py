@@ -0,0 +1,98 @@
+import pytest
+
+import gstaichi as ti
+
+from tests import test_utils
+
+
+@test_utils.test(arch=ti.cpu)
+def test_launch_stats():
+    x = ti.ndarray(ti.f32, shape=8)
+
+    @ti.kernel
+    def inc(arr: ti.types.ndarray()):
+        for i in arr:
+            arr[i] += 1.0
+
+    ti.profiler.enable_launch_profiler()
+    for _ in range(5):
+        inc(x)
+    assert x[0] == 5.0
+
+    all_stats = ti.profiler.launch_stats()
+    assert [stats.name for stats in all_stats] == ["inc"]
+    stats = all_stats[0]
+    assert stats.num_calls == 5
+    # The first call looks up and builds everything, the next ones reuse the caches
+    assert stats.mapping_cache_misses == 1
+    assert stats.mapping_cache_hits == 4
+    assert stats.launch_ctx_cache_misses == 1
+    assert stats.launch_ctx_cache_hits == 4
+    assert stats.mapping_cache_hit_ratio == pytest.approx(0.8)
+    assert stats.launch_ctx_cache_hit_ratio == pytest.approx(0.8)
+    stages = {"process_args", "template_lookup", "materialize", "set_args", "compile", "launch_kernel"}
+    assert set(stats.stage_times) == stages
+    assert all(t >= 0 for t in stats.stage_times.values())
+    assert stats.stage_times["compile"] > 0
+    assert stats.total_time == pytest.approx(sum(stats.stage_times.values()))
+
+    ti.profiler.print_launch_profiler_info()
+    ti.profiler.clear_launch_profiler_info()
+    assert ti.profiler.launch_stats() == []
+
+    ti.profiler.disable_launch_profiler()
+    inc(x)
+    with pytest.raises(RuntimeError, match="enable_launch_profiler"):
+        ti.profiler.launch_stats()
+
+
+@test_utils.test(arch=ti.cpu)
+def test_launch_stats_scalar_arg():
+    x = ti.ndarray(ti.f32, shape=8)
+
+    @ti.kernel
+    def fill(arr: ti.types.ndarray(), value: ti.f32):
+        for i in arr:
+            arr[i] = value
+
+    ti.profiler.enable_launch_profiler()
+    for _ in range(5):
+        fill(x, 2.0)
+    assert x[0] == 2.0
+
+    stats = ti.profiler.launch_stats()[0]
+    assert stats.num_calls == 5
+    # Floats cannot be weakly referenced, so that the calls are never cached by the template mapper, unlike their
+    # launch context, whose scalar arguments are patched
+    assert stats.mapping_cache_misses == 5
+    assert stats.mapping_cache_hits == 0
+    assert stats.launch_ctx_cache_misses == 1
+    assert stats.launch_ctx_cache_hits == 4
+    ti.profiler.disable_launch_profiler()
+
+
+@test_utils.test(arch=ti.cpu)
+def test_launch_stats_failed_call():
+    x = ti.ndarray(ti.f32, shape=8)
+
+    @ti.kernel
+    def foo(a: ti.i32):
+        pass
+
+    @ti.kernel
+    def fill(arr: ti.types.ndarray(), value: ti.f32):
+        for i in arr:
+            arr[i] = value
+
+    ti.profiler.enable_launch_profiler()
+    with pytest.raises(ti.GsTaichiRuntimeTypeError):
+        foo(1.2)
+    # Launches outside of a call are not attributed to the call that failed
+    fill.launch_batch([(x, 1.0), (x, 2.0)])
+
+    stats = {stats.name: stats for stats in ti.profiler.launch_stats()}
+    assert list(stats) == ["foo"]
+    assert stats["foo"].num_calls == 1
+    assert stats["foo"].stage_times["compile"] == 0
+    assert stats["foo"].stage_times["launch_kernel"] == 0
+    ti.profiler.disable_launch_profiler()
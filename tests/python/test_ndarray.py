@@ -379,6 +379,46 @@ def test_ndarray_matrix_numpy_io():
     assert (x_np.flatten() == x.to_numpy().flatten()).all()
 
 
+@test_utils.test(arch=ti.cpu)
+def test_ndarray_numpy_view():
+    @ti.kernel
+    def inc(a: ti.types.NDArray[ti.f32, 2]) -> None:
+        for i, j in a:
+            a[i, j] += 1
+
+    x = ti.ndarray(ti.f32, (3, 4))
+    x_np = np.arange(12, dtype=np.float32).reshape(3, 4)
+    x.from_numpy(x_np)
+    view = x.to_numpy(copy=False)
+    assert view.shape == (3, 4) and view.dtype == np.float32
+    np.testing.assert_array_equal(view, x_np)
+
+    # Changes made by kernels are visible without converting again, and conversely
+    inc(x)
+    np.testing.assert_array_equal(view, x_np + 1)
+    view[1, 2] = -1.0
+    assert x[1, 2] == -1.0
+
+    # The view keeps the ndarray alive
+    del x
+    np.testing.assert_array_equal(view[0], x_np[0] + 1)
+
+    v = ti.Vector.ndarray(3, ti.i32, (2,))
+    v.from_numpy(np.array([[1, 2, 3], [4, 5, 6]], dtype=np.int32))
+    np.testing.assert_array_equal(v.numpy_view(), v.to_numpy())
+    m = ti.Matrix.ndarray(2, 2, ti.f64, (2,))
+    m.fill(3.0)
+    assert m.to_numpy(copy=False).shape == (2, 2, 2)
+    assert (m.to_numpy(copy=False) == 3.0).all()
+
+
+@test_utils.test(exclude=[ti.cpu])
+def test_ndarray_numpy_view_not_cpu():
+    x = ti.ndarray(ti.f32, (3,))
+    with pytest.raises(GsTaichiRuntimeError, match="only supported on CPU"):
+        x.to_numpy(copy=False)
+
+
 @test_utils.test(arch=supported_archs_gstaichi_ndarray)
 def test_matrix_ndarray_python_scope():
     a = ti.Matrix.ndarray(2, 2, ti.i32, 5)
@@ -1,6 +1,7 @@
 import pytest
 
 import gstaichi as ti
+from gstaichi._test_tools import ti_init_same_arch
 from gstaichi.lang.misc import get_host_arch_list
 
 from tests import test_utils
@@ -297,3 +298,87 @@ def test_oop_with_static_decorator():
     assert a.kernel_static() == 42
 
     assert a.raw_static() == 3
+
+
+@test_utils.test(arch=[ti.cpu, ti.cuda])
+def test_oop_structural_template_keys():
+    ti_init_same_arch(structural_template_keys=True)
+
+    x = ti.field(ti.i32, shape=4)
+    y = ti.field(ti.i32, shape=4)
+    z = ti.field(ti.i32, shape=8)
+
+    @ti.data_oriented
+    class Env:
+        def __init__(self, field, scale, config):
+            self.field = field
+            self.scale = scale
+            self.config = config
+
+    @ti.kernel
+    def fill(env: ti.template()) -> None:
+        for i in env.field:
+            env.field[i] = env.scale * i + env.config["offset"]
+
+    fill(Env(x, 2, {"offset": 1}))
+    fill(Env(x, 2, {"offset": 1}))
+    assert x.to_numpy().tolist() == [1, 3, 5, 7]
+    assert len(fill._primal.materialized_kernels) == 1
+
+    # Fields are passed at launch, so that distinct fields with the same dtype and shape share the same instantiation
+    fill(Env(y, 2, {"offset": 1}))
+    assert y.to_numpy().tolist() == [1, 3, 5, 7]
+    assert len(fill._primal.materialized_kernels) == 1
+
+    fill(Env(x, 3, {"offset": 1}))
+    assert x.to_numpy().tolist() == [1, 4, 7, 10]
+    fill(Env(z, 3, {"offset": 0}))
+    assert z.to_numpy().tolist() == [0, 3, 6, 9, 12, 15, 18, 21]
+    assert len(fill._primal.materialized_kernels) == 3
+
+    # Objects that cannot be identified by their content fall back to their identity
+    env = Env(x, 1, {"offset": 0})
+    env.myself = env
+    fill(env)
+    assert x.to_numpy().tolist() == [0, 1, 2, 3]
+    assert len(fill._primal.materialized_kernels) == 4
+
+
+@test_utils.test(arch=[ti.cpu, ti.cuda])
+def test_oop_structural_template_keys_bound_members():
+    ti_init_same_arch(structural_template_keys=True)
+
+    @ti.data_oriented
+    class State:
+        def __init__(self):
+            self.pos = ti.Vector.ndarray(3, ti.f32, shape=4)
+            self.vel = ti.Vector.field(3, ti.f32, shape=4)
+            self.buffers = [ti.ndarray(ti.i32, shape=4)]
+
+        @ti.kernel
+        def step(self) -> None:
+            for i in self.pos:
+                self.vel[i] = ti.Vector([1.0, 2.0, 3.0]) * self.vel.shape[0]
+                self.pos[i] += self.vel[i]
+                self.buffers[0][i] += i
+
+    states = [State(), State()]
+    for state in states:
+        state.step()
+        state.step()
+    for state in states:
+        assert state.pos.to_numpy().tolist() == [[8.0, 16.0, 24.0]] * 4
+        assert state.vel.to_numpy().tolist() == [[4.0, 8.0, 12.0]] * 4
+        assert state.buffers[0].to_numpy().tolist() == [0, 2, 4, 6]
+    assert len(State.step._primal.materialized_kernels) == 1
+
+    # Members are looked up at every launch, so that they can be reassigned to arrays with the same features
+    state = states[0]
+    state.pos = ti.Vector.ndarray(3, ti.f32, shape=2)
+    state.step()
+    assert state.pos.to_numpy().tolist() == [[4.0, 8.0, 12.0]] * 2
+    assert len(State.step._primal.materialized_kernels) == 1
+
+    state.pos = ti.ndarray(ti.f32, shape=4)
+    with pytest.raises(ti.GsTaichiRuntimeTypeError, match=r"Member self\.pos does not match"):
+        state.step()
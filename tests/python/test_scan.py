@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import gstaichi as ti
@@ -61,3 +62,41 @@ def test_scan_with_offset(dtype, N, offset):
     for i in range(N):
         cur_sum += arr_aux[i + offset]
         assert arr[i + offset] == cur_sum
+
+
+@pytest.mark.parametrize("dtype", [ti.i32, ti.i64, ti.f32, ti.f64])
+@pytest.mark.parametrize("N", [1, 1000, 100001])
+@pytest.mark.parametrize("exclusive", [False, True])
+@pytest.mark.parametrize("use_ndarray", [False, True])
+@test_utils.test(arch=ti.cpu)
+def test_scan_cpu(dtype, N, exclusive, use_ndarray):
+    np_dtype = {ti.i32: np.int32, ti.i64: np.int64, ti.f32: np.float32, ti.f64: np.float64}[dtype]
+    values = np.random.randint(-100, 100, N).astype(np_dtype)
+    arr = ti.ndarray(dtype, N) if use_ndarray else ti.field(dtype, N)
+    arr.from_numpy(values)
+
+    executor = ti.algorithms.PrefixSumExecutor(N)
+    executor.run(arr, exclusive=exclusive)
+
+    expected = np.cumsum(values, dtype=np.float64 if dtype in (ti.f32, ti.f64) else np_dtype)
+    if exclusive:
+        expected = np.concatenate(([0], expected[:-1]))
+    np.testing.assert_allclose(arr.to_numpy(), expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize("offset", [0, -1, 23333])
+@test_utils.test(arch=ti.cpu, cpu_max_num_threads=4)
+def test_scan_cpu_partial_with_offset(offset):
+    N = 50000
+    arr = ti.field(ti.i32, N, offset=offset)
+    values = np.arange(N, dtype=np.int32) % 2
+    arr.from_numpy(values)
+
+    # Only the first elements are scanned
+    executor = ti.algorithms.PrefixSumExecutor(N - 100)
+    executor.run(arr)
+    executor.run(arr)
+
+    expected = values.copy()
+    expected[: N - 100] = np.cumsum(np.cumsum(values[: N - 100]))
+    np.testing.assert_array_equal(arr.to_numpy(), expected)
@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+import gstaichi as ti
+
+from tests import test_utils
+
+_NP_DTYPES = {ti.i32: np.int32, ti.u32: np.uint32, ti.i64: np.int64, ti.f32: np.float32, ti.f64: np.float64}
+
+_NP_OPS = {"add": np.add, "min": np.minimum, "max": np.maximum}
+
+
+def _random_offsets(N, num_segments, rng):
+    # A few very large segments spanning several blocks, many small ones and some empty ones
+    cuts = np.concatenate([[0, N, N // 3, N // 3], rng.integers(0, N // 10, num_segments - 3)])
+    return np.sort(cuts).astype(np.int32)
+
+
+def _identity(op, np_dtype):
+    if op == "add":
+        return np_dtype(0)
+    if np.issubdtype(np_dtype, np.floating):
+        return np_dtype(np.inf if op == "min" else -np.inf)
+    info = np.iinfo(np_dtype)
+    return np_dtype(info.max if op == "min" else info.min)
+
+
+def _reference_reduce(values, offsets, op):
+    np_op = _NP_OPS[op]
+    return np.array(
+        [
+            np_op.reduce(values[begin:end]) if end > begin else _identity(op, values.dtype.type)
+            for begin, end in zip(offsets[:-1], offsets[1:])
+        ],
+        dtype=values.dtype,
+    )
+
+
+def _reference_scan(values, offsets, op, exclusive):
+    np_op = _NP_OPS[op]
+    result = np.empty_like(values)
+    for begin, end in zip(offsets[:-1], offsets[1:]):
+        if end == begin:
+            continue
+        scanned = np_op.accumulate(values[begin:end])
+        if exclusive:
+            result[begin] = _identity(op, values.dtype.type)
+            result[begin + 1 : end] = scanned[:-1]
+        else:
+            result[begin:end] = scanned
+    return result
+
+
+def _random_values(np_dtype, N, rng):
+    if np.issubdtype(np_dtype, np.floating):
+        # Integers, so that sums do not depend on the order of the additions
+        return rng.integers(-100, 100, N).astype(np_dtype)
+    return rng.integers(0, 100, N).astype(np_dtype)
+
+
+@pytest.mark.parametrize("dtype", [ti.i32, ti.u32, ti.i64, ti.f32, ti.f64])
+@pytest.mark.parametrize("op", ["add", "min", "max"])
+@pytest.mark.parametrize("use_ndarray", [False, True])
+@test_utils.test(arch=ti.cpu, cpu_max_num_threads=4)
+def test_segmented_reduce(dtype, op, use_ndarray):
+    N = 50000
+    num_segments = 200
+    rng = np.random.default_rng(0)
+    np_dtype = _NP_DTYPES[dtype]
+    values_np = _random_values(np_dtype, N, rng)
+    offsets_np = _random_offsets(N, num_segments, rng)
+
+    make = ti.ndarray if use_ndarray else ti.field
+    values = make(dtype, N)
+    offsets = make(ti.i32, num_segments + 1)
+    out = make(dtype, num_segments)
+    values.from_numpy(values_np)
+    offsets.from_numpy(offsets_np)
+    assert ti.algorithms.segmented_reduce(values, out, offsets=offsets, op=op) == num_segments
+    np.testing.assert_array_equal(out.to_numpy(), _reference_reduce(values_np, offsets_np, op))
+    # The values are left unchanged
+    np.testing.assert_array_equal(values.to_numpy(), values_np)
+
+
+@pytest.mark.parametrize("dtype", [ti.i32, ti.i64, ti.f32, ti.f64])
+@pytest.mark.parametrize("op", ["add", "min", "max"])
+@pytest.mark.parametrize("exclusive", [False, True])
+@pytest.mark.parametrize("use_ndarray", [False, True])
+@test_utils.test(arch=ti.cpu, cpu_max_num_threads=4)
+def test_segmented_scan(dtype, op, exclusive, use_ndarray):
+    N = 50000
+    rng = np.random.default_rng(1)
+    np_dtype = _NP_DTYPES[dtype]
+    values_np = _random_values(np_dtype, N, rng)
+    offsets_np = _random_offsets(N, 100, rng)
+
+    make = ti.ndarray if use_ndarray else ti.field
+    values = make(dtype, N)
+    offsets = make(ti.i32, offsets_np.shape[0])
+    values.from_numpy(values_np)
+    offsets.from_numpy(offsets_np)
+    ti.algorithms.segmented_scan(values, offsets=offsets, op=op, exclusive=exclusive)
+    np.testing.assert_array_equal(values.to_numpy(), _reference_scan(values_np, offsets_np, op, exclusive))
+
+
+@pytest.mark.parametrize("use_ndarray", [False, True])
+@test_utils.test(arch=ti.cpu, cpu_max_num_threads=4)
+def test_segmented_reduce_by_key(use_ndarray):
+    N = 30000
+    rng = np.random.default_rng(2)
+    # Particles sorted by cell, with runs of very different lengths
+    keys_np = np.sort(rng.integers(0, 50, N) ** 2).astype(np.int32)
+    values_np = rng.integers(0, 10, N).astype(np.float32)
+
+    make = ti.ndarray if use_ndarray else ti.field
+    keys = make(ti.i32, N)
+    values = make(ti.f32, N)
+    out = make(ti.f32, N)
+    out_keys = make(ti.i32, N)
+    keys.from_numpy(keys_np)
+    values.from_numpy(values_np)
+    num_segments = ti.algorithms.segmented_reduce(values, out, keys=keys, out_keys=out_keys)
+
+    unique_keys, offsets_np = np.unique(keys_np, return_index=True)
+    offsets_np = np.append(offsets_np, N)
+    assert num_segments == unique_keys.shape[0]
+    np.testing.assert_array_equal(out_keys.to_numpy()[:num_segments], unique_keys)
+    np.testing.assert_array_equal(out.to_numpy()[:num_segments], _reference_reduce(values_np, offsets_np, "add"))
+
+    ti.algorithms.segmented_scan(values, keys=keys, op="max")
+    np.testing.assert_array_equal(values.to_numpy(), _reference_scan(values_np, offsets_np, "max", False))
+
+
+@test_utils.test(arch=ti.cpu)
+def test_segmented_small():
+    values = ti.ndarray(ti.i32, 5)
+    values.from_numpy(np.array([1, 2, 3, 4, 5], dtype=np.int32))
+    offsets = ti.ndarray(ti.i32, 5)
+    offsets.from_numpy(np.array([0, 0, 2, 2, 5], dtype=np.int32))
+    out = ti.ndarray(ti.i32, 4)
+    assert ti.algorithms.segmented_reduce(values, out, offsets=offsets) == 4
+    np.testing.assert_array_equal(out.to_numpy(), [0, 3, 0, 12])
+    ti.algorithms.segmented_scan(values, offsets=offsets, exclusive=True)
+    np.testing.assert_array_equal(values.to_numpy(), [0, 1, 0, 3, 7])
+
+
+@test_utils.test(arch=ti.cpu)
+def test_segmented_invalid_arguments():
+    values = ti.field(ti.i32, 8)
+    offsets = ti.field(ti.i32, 3)
+    offsets.from_numpy(np.array([0, 4, 7], dtype=np.int32))
+    out = ti.field(ti.i32, 2)
+    with pytest.raises(ValueError, match="end at the number of values"):
+        ti.algorithms.segmented_reduce(values, out, offsets=offsets)
+    with pytest.raises(ValueError, match="Exactly one of offsets and keys"):
+        ti.algorithms.segmented_scan(values)
+    with pytest.raises(ValueError, match="Unsupported segmented operation"):
+        ti.algorithms.segmented_scan(values, offsets=offsets, op="mul")
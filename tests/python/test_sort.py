@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import gstaichi as ti
@@ -60,3 +61,59 @@ def test_sort_with_offset(dtype, N, offset):
         if i < N - 1:
             assert keys_host[i] <= keys_host[i + 1]
         assert keys_host[i] == values_host[i]
+
+
+@pytest.mark.parametrize("dtype", [ti.i32, ti.u32, ti.i64, ti.u64, ti.f32, ti.f64])
+@pytest.mark.parametrize("N", [1, 1000, 100001])
+@pytest.mark.parametrize("use_ndarray", [False, True])
+@test_utils.test(arch=ti.cpu)
+def test_radix_sort(dtype, N, use_ndarray):
+    np_dtype = {
+        ti.i32: np.int32,
+        ti.u32: np.uint32,
+        ti.i64: np.int64,
+        ti.u64: np.uint64,
+        ti.f32: np.float32,
+        ti.f64: np.float64,
+    }[dtype]
+    rng = np.random.default_rng(N)
+    if dtype in (ti.f32, ti.f64):
+        keys_np = (rng.standard_normal(N) * 1e3).astype(np_dtype)
+    else:
+        info = np.iinfo(np_dtype)
+        keys_np = rng.integers(info.min, info.max, N, dtype=np_dtype, endpoint=True)
+    # Values are the original positions, so that the order of equal keys can be checked
+    keys_np[: N // 2] = keys_np[N // 2 : 2 * (N // 2)]
+    values_np = np.arange(N, dtype=np.int32)
+
+    make = ti.ndarray if use_ndarray else ti.field
+    keys = make(dtype, N)
+    values = make(ti.i32, N)
+    keys.from_numpy(keys_np)
+    values.from_numpy(values_np)
+    ti.algorithms.radix_sort(keys, values)
+
+    order = np.argsort(keys_np, kind="stable")
+    np.testing.assert_array_equal(keys.to_numpy(), keys_np[order])
+    np.testing.assert_array_equal(values.to_numpy(), values_np[order])
+
+
+@pytest.mark.parametrize("offset", [0, -5, 1000])
+@test_utils.test(arch=ti.cpu, cpu_max_num_threads=4)
+def test_radix_sort_keys_only(offset):
+    N = 30000
+    # Cell indices, whose highest bytes are the same for all the keys
+    keys_np = np.random.randint(0, 1 << 12, N).astype(np.int32)
+    keys = ti.field(ti.i32, N, offset=offset)
+    keys.from_numpy(keys_np)
+    ti.algorithms.parallel_sort(keys)
+    np.testing.assert_array_equal(keys.to_numpy(), np.sort(keys_np))
+
+
+@test_utils.test(arch=ti.cpu)
+def test_radix_sort_special_floats():
+    keys_np = np.array([0.0, -0.0, np.inf, -np.inf, 1.5, -1.5, 1e-40, -1e-40, 3.0, -3.0] * 1000, dtype=np.float32)
+    keys = ti.ndarray(ti.f32, keys_np.shape[0])
+    keys.from_numpy(keys_np)
+    ti.algorithms.parallel_sort(keys)
+    np.testing.assert_array_equal(keys.to_numpy(), np.sort(keys_np))
@@ -0,0 +1,121 @@
+import json
+import pathlib
+
+import pytest
+
+import gstaichi as ti
+
+from tests import test_utils
+
+
+def _load_spans(filename):
+    events = json.loads(pathlib.Path(filename).read_text())
+    thread_names = {e["tid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+    spans = [e for e in events if e["ph"] in ("B", "E")]
+    for e in spans:
+        assert e["tid"] in thread_names
+    return spans
+
+
+@test_utils.test(arch=ti.cpu, timeline=True, offline_cache=False)
+def test_timeline_kernel_spans(tmp_path: pathlib.Path):
+    x = ti.field(ti.i32, shape=8)
+
+    @ti.kernel
+    def fill(value: ti.i32, offset: ti.template()):
+        for i in x:
+            x[i] = value + offset
+
+    fill(1, 0)
+    fill(2, 0)
+    fill(3, 1)
+    ti.sync()
+    filename = str(tmp_path / "timeline.json")
+    ti.profiler.save_timeline(filename)
+
+    spans = _load_spans(filename)
+    begins = [e for e in spans if e["ph"] == "B"]
+    names = {e["name"] for e in begins}
+    for name in ("materialize", "ast_transform", "compile_kernel", "launch", "pack_args", "launch_kernel"):
+        assert name in names
+    assert "synchronize" in names
+
+    # One instance per value of the template argument, each materialized once and launched as many times as called
+    fill_spans = [e for e in begins if e.get("args", {}).get("kernel") == "fill"]
+    materialized = [e["args"]["instance_id"] for e in fill_spans if e["name"] == "materialize"]
+    launched = [e["args"]["instance_id"] for e in fill_spans if e["name"] == "launch"]
+    assert len(materialized) == 2 and materialized[0] != materialized[1]
+    assert launched == [materialized[0], materialized[0], materialized[1]]
+    compiled = [e for e in begins if e["name"] == "compile_kernel" and e["args"]["kernel"].startswith("fill_")]
+    assert len(compiled) == 2
+
+    # Spans are properly nested on each thread
+    stacks = {}
+    for e in spans:
+        stack = stacks.setdefault(e["tid"], [])
+        if e["ph"] == "B":
+            stack.append(e)
+        else:
+            assert stack.pop()["name"] == e["name"]
+    assert all(not stack for stack in stacks.values())
+
+
+@test_utils.test(arch=ti.cpu, timeline=True)
+def test_timeline_failed_launch(tmp_path: pathlib.Path):
+    @ti.kernel
+    def foo(a: ti.i32):
+        pass
+
+    with pytest.raises(ti.GsTaichiRuntimeTypeError):
+        foo(1.2)
+    filename = str(tmp_path / "timeline.json")
+    ti.profiler.save_timeline(filename)
+
+    # The spans are closed even though packing the arguments failed
+    phases = [e["ph"] for e in _load_spans(filename) if e["name"] == "pack_args"]
+    assert phases == ["B", "E"]
+
+
+@test_utils.test(arch=ti.cpu, timeline=True)
+def test_timeline_launch_batch(tmp_path: pathlib.Path):
+    x = ti.ndarray(ti.f32, shape=8)
+
+    @ti.kernel
+    def fill(arr: ti.types.ndarray(), value: ti.f32):
+        for i in arr:
+            arr[i] = value
+
+    fill.launch_batch([(x, 1.0), (x, 2.0), (x, 3.0)])
+    assert x[0] == 3.0
+    filename = str(tmp_path / "timeline.json")
+    ti.profiler.save_timeline(filename)
+
+    # A single launch span for the whole run, around the launches of each call
+    begins = [e for e in _load_spans(filename) if e["ph"] == "B"]
+    launches = [e for e in begins if e["name"] == "launch"]
+    assert len(launches) == 1 and launches[0]["args"]["kernel"] == "fill"
+    assert len([e for e in begins if e["name"] == "launch_kernel"]) == 3
+
+
+@test_utils.test(arch=ti.cpu)
+def test_timeline_enable_disable(tmp_path: pathlib.Path):
+    @ti.kernel
+    def noop():
+        pass
+
+    noop()
+    filename = str(tmp_path / "timeline.json")
+    ti.profiler.save_timeline(filename)
+    assert _load_spans(filename) == []
+
+    ti.profiler.enable_timeline()
+    noop()
+    ti.profiler.disable_timeline()
+    noop()
+    ti.profiler.save_timeline(filename)
+    launches = [e for e in _load_spans(filename) if e["name"] == "launch"]
+    assert len(launches) == 2  # Begin and end of the first launch only
+
+    # Spans are discarded once saved
+    ti.profiler.save_timeline(filename)
+    assert _load_spans(filename) == []